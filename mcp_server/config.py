@@ -18,6 +18,8 @@ RAW_PATH = os.path.join(DATA_ROOT, 'raw')
 INTERIM_PATH = os.path.join(DATA_ROOT, 'interim')
 PROCESSED_PATH = os.path.join(DATA_ROOT, 'processed')
 CACHE_PATH = os.path.join(DATA_ROOT, 'cache')
+PRICE_STORE_PATH = os.getenv("PRICE_STORE_PATH", os.path.join(DATA_ROOT, 'prices'))
+FACTOR_SNAPSHOT_PATH = os.getenv("FACTOR_SNAPSHOT_PATH", os.path.join(DATA_ROOT, 'snapshots'))
 
 # ---- Visualization presets & defaults ----
 PRESENT_PRESET = os.getenv("PRESENT_PRESET", "modern").lower()
@@ -63,7 +65,54 @@ EVENT_WEIGHTS_PATH = os.getenv("EVENT_WEIGHTS_PATH", os.path.join(os.path.dirnam
 WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", os.path.join(DATA_ROOT, "watchlist.json"))
 SCHEDULER_TIMEZONE = os.getenv("SCHEDULER_TIMEZONE", "Asia/Seoul")
 
+# ---- Factor snapshot (nightly precomputed factor table) ----
+FACTOR_SNAPSHOT_MAX_AGE_DAYS = int(os.getenv("FACTOR_SNAPSHOT_MAX_AGE_DAYS", "4"))  # asof 미지정 요청이 쓸 최신 스냅샷의 최대 경과일 (주말/휴일 포함)
+FACTOR_SNAPSHOT_KEEP = int(os.getenv("FACTOR_SNAPSHOT_KEEP", "30"))  # 보관할 스냅샷 수 (오래된 날짜부터 삭제)
+
+# ---- Market context (VIX / breadth / sector ETF moves shared across tools) ----
+MARKET_CONTEXT_BUCKET_SEC = int(os.getenv("MARKET_CONTEXT_BUCKET_SEC", "900"))  # 시장 공통 입력 재계산 주기 (초, 버킷당 1회)
+
+# ---- MCP tool execution ----
+TOOL_WORKERS = int(os.getenv("TOOL_WORKERS", "16"))  # 블로킹 툴 본문을 실행할 워커 스레드 수
+TOOL_MAX_CONCURRENT = int(os.getenv("TOOL_MAX_CONCURRENT", "8"))  # 툴별 기본 동시 실행 수
+TOOL_CONCURRENCY_LIMITS = os.getenv("TOOL_CONCURRENCY_LIMITS", "")  # "backtest_strategy=2,rank_stocks=2" 형태 오버라이드
+FACTOR_FETCH_LIMITS = os.getenv("FACTOR_FETCH_LIMITS", "financial=4,technical=4,sentiment=3")  # rank_stocks 팩터 그룹별 동시 업스트림 호출 수
+
+# ---- HTTP client pool (shared keep-alive connections for external APIs) ----
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "10"))  # 호스트별 최대 동시 연결 수
+HTTP_MAX_KEEPALIVE_PER_HOST = int(os.getenv("HTTP_MAX_KEEPALIVE_PER_HOST", "5"))  # 호스트별 유지할 유휴 연결 수
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # 유휴 연결 유지 시간 (초)
+HTTP_HOST_LIMITS = os.getenv("HTTP_HOST_LIMITS", "")  # "data.sec.gov=8,api.finnhub.io=4" 형태 호스트별 연결 수 오버라이드
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "auto")  # auto(h2 설치 시 HTTP/2) / true / false
+
+# ---- Async LLM client (streaming, bounded concurrency, hedged model fallback, response cache) ----
+LLM_MAX_CONCURRENT = int(os.getenv("LLM_MAX_CONCURRENT", "4"))  # 동시에 진행할 Gemini 요청 수 (헤지 요청 포함, 프로세스 전체)
+LLM_HEDGE_AFTER_SEC = float(os.getenv("LLM_HEDGE_AFTER_SEC", "8"))  # 이 시간 안에 첫 토큰이 없으면 다음 폴백 모델을 동시에 요청 (0 이하: 실패 시에만)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")  # 요약/감성/JSON 응답을 프롬프트 해시로 캐시
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", str(24 * 60 * 60)))  # LLM 응답 캐시 유지 시간 (초)
+LLM_SENTIMENT_BATCH_TOKENS = int(os.getenv("LLM_SENTIMENT_BATCH_TOKENS", "6000"))  # 여러 종목 LLM 감성 배치당 입력 토큰 예산 (추정치)
+LLM_SENTIMENT_BATCH_MAX_TICKERS = int(os.getenv("LLM_SENTIMENT_BATCH_MAX_TICKERS", "10"))  # 배치당 최대 종목 수
+LLM_SENTIMENT_TOKENS_PER_TICKER = int(os.getenv("LLM_SENTIMENT_TOKENS_PER_TICKER", "256"))  # 배치 응답 출력 토큰 (종목당 추가분)
+LLM_HEDGE_SYNC = os.getenv("LLM_HEDGE_SYNC", "true").lower() in ("1", "true", "yes")  # call_llm_resilient 첫 라운드를 헤지 경로로 실행
+
+# ---- Cache (L1 in-process tier in front of the L2 backend) ----
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "disk")  # L2 백엔드: disk(diskcache) / redis / memory
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))  # fakeredis:// 는 테스트용 인메모리
+CACHE_REDIS_NAMESPACE = os.getenv("CACHE_REDIS_NAMESPACE", "pmmcp:")  # Redis 키 접두사 (다른 앱과 키 공간 분리)
+CACHE_L1_ENABLED = os.getenv("CACHE_L1_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_L1_MAX_ITEMS = int(os.getenv("CACHE_L1_MAX_ITEMS", "2048"))  # L1 최대 항목 수
+CACHE_L1_MAX_MB = float(os.getenv("CACHE_L1_MAX_MB", "128"))  # L1 최대 추정 크기 (MB)
+CACHE_L1_MAX_TTL = int(os.getenv("CACHE_L1_MAX_TTL", "300"))  # L1 보관 상한 (초, 다른 프로세스의 L2 갱신 반영 지연 상한)
+CACHE_FLIGHT_TIMEOUT = float(os.getenv("CACHE_FLIGHT_TIMEOUT", "120"))  # single-flight 대기 상한 (초과 시 직접 계산)
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", "4"))  # stale-while-revalidate 백그라운드 갱신 스레드 수
+CACHE_REFRESH_MAX_QUEUE = int(os.getenv("CACHE_REFRESH_MAX_QUEUE", "256"))  # 갱신 대기열 상한 (초과분은 stale 반환만)
+CACHE_CODEC_ENABLED = os.getenv("CACHE_CODEC_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto")  # auto(zstd 설치 시 zstd, 아니면 zlib) / zstd / zlib / none
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))  # 이 크기 이상 직렬화 결과만 압축
+
 os.makedirs(RAW_PATH, exist_ok=True)
 os.makedirs(INTERIM_PATH, exist_ok=True)
 os.makedirs(PROCESSED_PATH, exist_ok=True)
 os.makedirs(CACHE_PATH, exist_ok=True)
+os.makedirs(PRICE_STORE_PATH, exist_ok=True)
+os.makedirs(FACTOR_SNAPSHOT_PATH, exist_ok=True)
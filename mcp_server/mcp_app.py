@@ -2,6 +2,7 @@ from __future__ import annotations
 from mcp.server.fastmcp import FastMCP
 from typing import List, Dict, Optional
 from datetime import datetime
+import logging
 
 from mcp_server.tools.market_data import get_prices
 from mcp_server.tools.news_search import search_news
@@ -13,11 +14,14 @@ from mcp_server.tools.obsidian import write_markdown
 from mcp_server.pipelines.theme_report import run_theme_report
 from mcp_server.pipelines.portfolio_report import run_portfolio_report
 from mcp_server.tools.presenter import present_theme_overview, present_portfolio_overview
-from mcp_server.tools.collect import compute_basic_metrics
+from mcp_server.tools.collect import compute_basic_metrics_many
 from mcp_server.tools.parse import parse_holdings_text
 import yfinance as yf
 import pandas as pd
 from mcp_server.tools.yf_utils import normalize_yf_columns
+from mcp_server.tools.tool_executor import offload_tools
+
+logger = logging.getLogger(__name__)
 
 mcp = FastMCP(
     "PM-MCP",
@@ -28,6 +32,8 @@ mcp = FastMCP(
     host="0.0.0.0",
     port=8010,
 )
+# 툴 본문(블로킹 호출 포함)을 워커 풀에서 실행해 SSE 이벤트 루프를 비워둠
+offload_tools(mcp)
 
 
 # Core tools
@@ -89,10 +95,10 @@ async def portfolio_evaluate(holdings: List[str]) -> List[Dict]:
 async def portfolio_evaluate_detailed(holdings: List[str]) -> List[Dict]:
     """보유주 페이즈 + 기본 메트릭(모멘텀/변동성/낙폭/상관) 병합 결과."""
     base = evaluate_holdings(holdings)
+    metrics_by_ticker = compute_basic_metrics_many([e.get("ticker") for e in base])
     out: List[Dict] = []
     for e in base:
-        t = e.get("ticker")
-        metrics = compute_basic_metrics(t)
+        metrics = metrics_by_ticker.get(e.get("ticker")) or {"ticker": e.get("ticker")}
         merged = dict(metrics)
         merged.update({k: v for k, v in e.items() if k not in merged})
         out.append(merged)
@@ -384,9 +390,10 @@ async def market_write_prices_csv(ticker: str, start: Optional[str] = None, end:
 
 @mcp.tool()
 async def cache_stats() -> Dict:
-    """캐시 통계 조회: 크기, 항목 수, 디렉토리 경로"""
+    """캐시 통계 조회: L2 백엔드, 크기, 항목 수, 디렉토리 경로, L1/L2 적중률, 접두사별 코덱 크기/시간 (+ 로컬 가격 저장소)"""
     from mcp_server.tools.cache_manager import cache_manager
-    return cache_manager.stats()
+    from mcp_server.tools.price_store import get_price_store
+    return {**cache_manager.stats(), "price_store": get_price_store().stats()}
 
 
 @mcp.tool()
@@ -428,6 +435,30 @@ async def circuit_reset(name: Optional[str] = None) -> Dict:
     return {"reset": "all", "message": "모든 서킷 브레이커가 리셋되었습니다."}
 
 
+@mcp.tool()
+async def llm_stats() -> Dict:
+    """LLM 모델별 지표: 첫 토큰 지연(TTFT), 초당 토큰, 헤지 시작/승리 횟수, 실패/취소 수 + 응답 캐시 적중률/절약 토큰"""
+    from mcp_server.tools.llm_async import get_async_llm, get_llm_stats
+    from mcp_server.tools.llm_cache import get_llm_cache_stats
+    client = get_async_llm()
+    return {
+        "models": get_llm_stats().snapshot(),
+        "cache": get_llm_cache_stats(),
+        "max_concurrent": client.max_concurrent,
+        "hedge_after_sec": client.hedge_after,
+        "in_flight": client.in_flight,
+    }
+
+
+# ===== 툴 실행기 상태 =====
+
+@mcp.tool()
+async def executor_status() -> Dict:
+    """툴 실행 워커 풀 상태: 툴별 동시 실행 한도, 대기열 깊이, 대기/실행 시간"""
+    from mcp_server.tools.tool_executor import get_tool_executor
+    return get_tool_executor().stats()
+
+
 # ===== 스케줄러 관리 도구 =====
 
 @mcp.tool()
@@ -467,6 +498,7 @@ async def scheduler_run_job(job_id: str) -> Dict:
     - weekly_report: 주간 리포트 생성
     - cache_cleanup: 캐시 정리
     - metrics_precompute: 메트릭 사전 계산
+    - factor_snapshot: 팩터 스냅샷 빌드 (워치리스트 + 테마 유니버스)
     """
     from mcp_server.tools.scheduler import get_scheduler
     scheduler = get_scheduler()
@@ -531,7 +563,8 @@ async def ranking_advanced(
     use_market_adjustment: bool = True,
     sector_neutral: bool = False,
     dip_weight: float = 0.12,
-    use_dip_bonus: bool = True
+    use_dip_bonus: bool = True,
+    asof: Optional[str] = None
 ) -> List[Dict]:
     """고급 랭킹: 섹터별 가중치 + 시장 상황 반영 + Z-score 정규화
 
@@ -548,6 +581,7 @@ async def ranking_advanced(
         sector_neutral: 섹터 내 상대 비교 (True면 동일 섹터 내에서만 비교)
         dip_weight: 딥 보너스 가중치
         use_dip_bonus: 딥 보너스 사용 여부
+        asof: 팩터 스냅샷 기준일 (YYYY-MM-DD, 미지정 시 최신 야간 스냅샷)
     """
     from mcp_server.tools.ranking_engine import rank_advanced_async
     tickers = [t.strip() for t in tickers_csv.split(',') if t.strip()]
@@ -558,12 +592,13 @@ async def ranking_advanced(
         sector_neutral=sector_neutral,
         dip_weight=dip_weight,
         use_dip_bonus=use_dip_bonus,
+        asof=asof,
     )
 
 
 @mcp.tool()
 async def market_condition() -> Dict:
-    """현재 시장 상황 감지: 강세(bull)/약세(bear)/횡보(neutral)"""
+    """현재 시장 상황 감지: 강세(bull)/약세(bear)/횡보(neutral) + VIX/breadth/섹터 ETF 등락 (시장 컨텍스트)"""
     from mcp_server.tools.ranking_engine import get_ranking_engine
     engine = get_ranking_engine()
     return engine.detect_market()
@@ -818,29 +853,28 @@ async def news_sentiment_analyze(
         - timeline: 날짜별 뉴스 타임라인
         - investment_signal: 투자 신호 해석
     """
-    from mcp_server.tools.news_sentiment import analyze_ticker_news
+    from mcp_server.tools.news_sentiment import analyze_ticker_news, analyze_tickers_news
     tickers = [t.strip() for t in tickers_csv.split(',') if t.strip()]
 
     if len(tickers) == 1:
         return analyze_ticker_news(tickers[0], lookback_days=lookback_days, use_llm=use_llm)
 
-    # 여러 종목인 경우
-    results = {}
-    for ticker in tickers[:5]:  # 최대 5개
-        results[ticker] = analyze_ticker_news(ticker, lookback_days=lookback_days, use_llm=use_llm)
-    return results
+    # 여러 종목인 경우 (최대 5개, LLM 감성은 종목을 묶어 배치 호출)
+    return analyze_tickers_news(tickers[:5], lookback_days=lookback_days, use_llm=use_llm)
 
 
 @mcp.tool()
 async def news_sentiment_compare(
     tickers_csv: str,
-    lookback_days: int = 7
+    lookback_days: int = 7,
+    use_llm: bool = False
 ) -> Dict:
     """여러 종목 뉴스 감성 비교
 
     Args:
         tickers_csv: 쉼표로 구분된 티커 목록
         lookback_days: 뉴스 검색 기간
+        use_llm: LLM 감성 포함 (여러 종목을 한 프롬프트로 묶어 배치 호출)
 
     Returns:
         - tickers: 종목별 감성 점수 및 랭킹
@@ -849,7 +883,7 @@ async def news_sentiment_compare(
     """
     from mcp_server.tools.news_sentiment import compare_tickers_sentiment
     tickers = [t.strip() for t in tickers_csv.split(',') if t.strip()]
-    return compare_tickers_sentiment(tickers[:10], lookback_days=lookback_days)
+    return compare_tickers_sentiment(tickers[:10], lookback_days=lookback_days, use_llm=use_llm)
 
 
 @mcp.tool()
@@ -868,15 +902,7 @@ async def news_sentiment_text(text: str) -> Dict:
         - matched_keywords: 매칭된 키워드
     """
     from mcp_server.tools.news_sentiment import get_analyzer
-    analyzer = get_analyzer()
-    sentiment = analyzer.analyze_text(text)
-    impact = analyzer.analyze_impact(text)
-    return {
-        **sentiment,
-        "impact": impact["impact"],
-        "impact_score": impact["score"],
-        "impact_factors": impact["factors"]
-    }
+    return get_analyzer().analyze_many([text])[0]
 
 
 @mcp.tool()
@@ -2268,13 +2294,74 @@ async def backtest_strategy(
         }
 
 
+@mcp.tool()
+async def backtest_portfolio(
+    tickers_csv: str,
+    market: str = "US",
+    start_date: str = "2023-01-01",
+    end_date: str = "2024-12-31",
+    rebalance_period: int = 30,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+    weighting: str = "equal"
+) -> Dict:
+    """여러 종목 팩터 백테스트 + 바스켓 성과
+
+    가격은 배치 조회 한 번, 벤치마크(SPY/^KS11)는 한 번만 조회하고 종목별 시뮬레이션은 병렬 실행
+
+    Args:
+        tickers_csv: 종목 코드 (쉼표 구분, 예: "AAPL,MSFT,GOOGL")
+        market: 시장 구분 ("US", "KR")
+        start_date: 시작일 (YYYY-MM-DD)
+        end_date: 종료일 (YYYY-MM-DD)
+        rebalance_period: 리밸런싱 주기 (일)
+        buy_threshold: 매수 임계값 (팩터 점수 0-100)
+        sell_threshold: 매도 임계값
+        initial_capital: 초기 자본 (종목별/바스켓 공통)
+        weighting: 바스켓 비중 ("equal")
+
+    Returns:
+        {
+            "results": {"AAPL": {...backtest_strategy 와 같은 형식...}, ...},
+            "failed": {"XXX": "No price data for XXX"},
+            "weights": {"AAPL": 0.5, "MSFT": 0.5},
+            "aggregate": {"final_value": ..., "total_return": ..., "performance": {...}, "benchmark": {...}}
+        }
+    """
+    try:
+        from mcp_server.tools.backtest_engine import BacktestEngine
+
+        tickers = [t.strip() for t in tickers_csv.split(',') if t.strip()]
+        return BacktestEngine.run_portfolio_backtest(
+            tickers=tickers,
+            market=market,
+            start_date=start_date,
+            end_date=end_date,
+            rebalance_period=rebalance_period,
+            buy_threshold=buy_threshold,
+            sell_threshold=sell_threshold,
+            initial_capital=initial_capital,
+            weighting=weighting
+        )
+
+    except Exception as e:
+        logger.error(f"Portfolio backtest failed: {e}")
+        return {
+            "error": str(e),
+            "tickers": tickers_csv,
+            "market": market
+        }
+
+
 @mcp.tool()
 async def rank_stocks(
     tickers_csv: str,
     market: str = "US",
     include_technical: bool = True,
     include_financial: bool = True,
-    include_sentiment: bool = True
+    include_sentiment: bool = True,
+    asof: Optional[str] = None
 ) -> List[Dict]:
     """다종목 팩터 기반 랭킹
 
@@ -2286,6 +2373,7 @@ async def rank_stocks(
         include_technical: 기술적 팩터 포함
         include_financial: 재무 팩터 포함
         include_sentiment: 감성 팩터 포함
+        asof: 팩터 스냅샷 기준일 (YYYY-MM-DD, 미지정 시 최신 야간 스냅샷)
 
     Returns:
         [
@@ -2316,7 +2404,8 @@ async def rank_stocks(
             market=market,
             include_technical=include_technical,
             include_financial=include_financial,
-            include_sentiment=include_sentiment
+            include_sentiment=include_sentiment,
+            asof=asof
         )
 
         # 추천 등급 추가
@@ -2341,7 +2430,8 @@ async def theme_analyze_with_factors(
     market: str = "US",
     backtest_start: str = "2024-01-01",
     backtest_end: str = "2024-12-31",
-    factor_weights: Optional[Dict[str, float]] = None
+    factor_weights: Optional[Dict[str, float]] = None,
+    asof: Optional[str] = None
 ) -> Dict:
     """테마 기반 종합 투자 분석
 
@@ -2361,6 +2451,7 @@ async def theme_analyze_with_factors(
         backtest_start: 백테스트 시작일 (YYYY-MM-DD, 기본: 2024-01-01)
         backtest_end: 백테스트 종료일 (YYYY-MM-DD, 기본: 2024-12-31)
         factor_weights: 팩터 가중치 커스터마이징 (예: {"financial": 0.5, "technical": 0.3, "sentiment": 0.2})
+        asof: 팩터 스냅샷 기준일 (YYYY-MM-DD, 미지정 시 최신 야간 스냅샷)
 
     Returns:
         테마 분석 결과:
@@ -2414,7 +2505,8 @@ async def theme_analyze_with_factors(
             market=market,
             backtest_start=backtest_start,
             backtest_end=backtest_end,
-            factor_weights=factor_weights
+            factor_weights=factor_weights,
+            asof=asof
         )
 
         return result
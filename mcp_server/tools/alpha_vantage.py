@@ -13,10 +13,10 @@ from __future__ import annotations
 from typing import Dict, List, Optional, Any
 import os
 import logging
-import requests
 
 from mcp_server.config import ALPHA_VANTAGE_API_KEY, ALPHA_VANTAGE_CALL_DELAY
 from mcp_server.tools.cache_manager import cache_manager, TTL
+from mcp_server.tools.http_client import http_get
 from mcp_server.tools.resilience import (
     retry_with_backoff, Timeout, CircuitBreaker, CircuitOpenError
 )
@@ -47,7 +47,7 @@ def _call_api(function: str, symbol: str, **params) -> Dict:
             "apikey": api_key,
             **params
         }
-        resp = requests.get(BASE_URL, params=query_params, timeout=Timeout.DEFAULT)
+        resp = http_get(BASE_URL, params=query_params, timeout=Timeout.DEFAULT)
         resp.raise_for_status()
         data = resp.json()
 
@@ -1,8 +1,7 @@
 from __future__ import annotations
 from typing import List, Dict, Optional, Tuple
-import yfinance as yf
-from .market_data import get_fundamentals_snapshot, get_momentum_metrics
-from .yf_utils import normalize_yf_columns
+from .market_data import get_fundamentals_many, get_price_history
+from .price_panel import PricePanel, dip_bonus_from_close
 from mcp_server.config import SCORE_WEIGHTS, SCORE_SECTOR_NEUTRAL, SECTOR_FACTOR_WEIGHTS
 
 def _parse_weights(s: str) -> Dict[str, float]:
@@ -30,23 +29,10 @@ def _to_float(x) -> float:
 
 def compute_dip_bonus_by_prices(ticker: str, lookback_days: int = 180) -> float:
     try:
-        hist = normalize_yf_columns(
-            yf.download(ticker, period="1y", interval="1d", progress=False, auto_adjust=True)
-        )
+        hist = get_price_history(ticker, period="1y")
         if hist.empty:
             return 0.0
-        closes = hist["Close"]
-        window = closes.tail(min(len(closes), lookback_days))
-        recent_high = _to_float(window.max())
-        last = _to_float(closes.iloc[-1])
-        ret10 = _to_float(closes.pct_change(10).iloc[-1])
-        if recent_high <= 0:
-            return 0.0
-        drawdown = max(0.0, (recent_high - last) / recent_high)
-        dd_score = min(drawdown / 0.30, 1.0)
-        mom_score = max(0.0, min((ret10 + 0.05) / 0.10, 1.0))
-        bonus = 0.5 * dd_score + 0.5 * (dd_score * mom_score)
-        return round(bonus, 4)
+        return dip_bonus_from_close(hist["Close"], lookback_days)
     except Exception:
         return 0.0
 
@@ -108,8 +94,12 @@ def rank_tickers_with_fundamentals(
     - quality: profitability와 동일 기준을 기본으로 사용(간단화)
     """
     weights = weights or DEFAULT_WEIGHTS
-    fundamentals = [get_fundamentals_snapshot(t) for t in tickers]
-    momentum = [get_momentum_metrics(t) for t in tickers]
+    # 요청 단위 가격 패널 - 모멘텀/딥 계산이 종목당 한 번 읽은 종가를 공유
+    panel = PricePanel(period="1y").load(tickers)
+    # 펀더멘털/공시 캐시는 종목별 조회 대신 일괄 조회 (캐시 적중 시 L2 왕복 1회씩)
+    fetched = get_fundamentals_many(tickers)
+    fundamentals = [fetched.get(t) or {} for t in tickers]
+    momentum = [panel.momentum(t) for t in tickers]
     sector_weights_map = _parse_sector_weights(SECTOR_FACTOR_WEIGHTS)
 
     pe = [f.get("pe") for f in fundamentals]
@@ -154,8 +144,8 @@ def rank_tickers_with_fundamentals(
 
     # Event score (EDGAR 제목 키워드)
     try:
-        from .filings import keyword_event_score
-        ev_raw = [keyword_event_score(t) for t in tickers]
+        from .filings import keyword_event_scores
+        ev_raw = keyword_event_scores(tickers)
     except Exception:
         ev_raw = [0.5] * len(tickers)
     ev_score = _rank_normalized(ev_raw, higher_is_better=True)
@@ -177,7 +167,7 @@ def rank_tickers_with_fundamentals(
         )
         dip_bonus = 0.0
         if use_dip_bonus:
-            dip_bonus = dip_weight * compute_dip_bonus_by_prices(t)
+            dip_bonus = dip_weight * panel.dip_bonus(t)
         item = {
             "ticker": t,
             "sector": sector,
@@ -253,27 +243,30 @@ async def rank_tickers_with_fundamentals_async(
     Returns:
         랭킹된 티커 리스트 (score 내림차순)
     """
-    from mcp_server.tools.async_utils import parallel_map
+    from mcp_server.tools.async_utils import parallel_map, make_async
 
     weights = weights or DEFAULT_WEIGHTS
     sector_weights_map = _parse_sector_weights(SECTOR_FACTOR_WEIGHTS)
 
-    # 병렬로 데이터 수집
-    fundamentals, momentum = await asyncio.gather(
-        parallel_map(get_fundamentals_snapshot, tickers, max_concurrent),
-        parallel_map(get_momentum_metrics, tickers, max_concurrent),
+    # 병렬로 데이터 수집 (가격은 요청 단위 패널로 한 번만, 펀더멘털 캐시는 일괄 조회)
+    panel = PricePanel(period="1y")
+    fetched, _ = await asyncio.gather(
+        make_async(get_fundamentals_many)(tickers),
+        make_async(panel.load)(tickers),
     )
+    fundamentals = [fetched.get(t) or {} for t in tickers]
+    momentum = await parallel_map(panel.momentum, tickers, max_concurrent)
 
-    # 이벤트 스코어 병렬 수집
+    # 이벤트 스코어 (공시 캐시 일괄 조회, 미스만 3개씩 병렬 조회)
     try:
-        from .filings import keyword_event_score
-        ev_raw = await parallel_map(keyword_event_score, tickers, max_concurrent=3)
+        from .filings import keyword_event_scores
+        ev_raw = await make_async(keyword_event_scores)(tickers, max_workers=3)
     except Exception:
         ev_raw = [0.5] * len(tickers)
 
-    # 딥 보너스 병렬 계산
+    # 딥 보너스 (패널 종가에서 계산)
     if use_dip_bonus:
-        dip_bonuses = await parallel_map(compute_dip_bonus_by_prices, tickers, max_concurrent)
+        dip_bonuses = [panel.dip_bonus(t) for t in tickers]
     else:
         dip_bonuses = [0.0] * len(tickers)
 
@@ -7,15 +7,16 @@ Backtest Engine Module
 
 import numpy as np
 import pandas as pd
-import yfinance as yf
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 from mcp_server.tools.financial_factors import FinancialFactors
 from mcp_server.tools.technical_indicators import TechnicalFactors
 from mcp_server.tools.sentiment_analysis import SentimentFactors
 from mcp_server.tools.factor_aggregator import FactorAggregator
+from mcp_server.tools.market_data import get_prices, get_prices_bulk
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +34,8 @@ class BacktestEngine:
         rebalance_period: int = 30,
         buy_threshold: float = 60.0,
         sell_threshold: float = 40.0,
-        initial_capital: float = 10000.0
+        initial_capital: float = 10000.0,
+        mode: str = "vectorized"
     ) -> Dict:
         """팩터 기반 백테스트 실행
 
@@ -47,140 +49,364 @@ class BacktestEngine:
             buy_threshold: 매수 임계값 (팩터 점수)
             sell_threshold: 매도 임계값
             initial_capital: 초기 자본
+            mode: "vectorized" (지표 일괄 계산 + 배열 시뮬레이션) 또는 "loop" (시점별 재계산)
 
         Returns:
             백테스트 결과
         """
         try:
-            # 가격 데이터 다운로드
-            stock = yf.Ticker(ticker)
-            prices = stock.history(start=start_date, end=end_date)
+            # 가격 데이터 (로컬 가격 저장소 - 누락 구간만 다운로드)
+            prices = BacktestEngine._load_prices(ticker, start_date, end_date, market)
 
             if prices.empty:
                 raise ValueError(f"No price data for {ticker}")
 
-            # 리밸런싱 날짜 생성
-            rebalance_dates = pd.date_range(
-                start=prices.index[0],
-                end=prices.index[-1],
-                freq=f'{rebalance_period}D'
+            result = BacktestEngine._backtest_prices(
+                prices, ticker, market, start_date, end_date, factor_weights, rebalance_period,
+                buy_threshold, sell_threshold, initial_capital, mode,
             )
+            result['equity_curve'] = result['equity_curve'].to_dict()
+            return result
 
-            # 거래 기록
-            trades = []
-            position = 0  # 0: 보유 없음, 1: 보유 중
-            shares = 0
-            cash = initial_capital
-
-            for date in rebalance_dates:
-                # 가장 가까운 거래일 찾기
-                if date not in prices.index:
-                    nearby_dates = prices.index[prices.index >= date]
-                    if len(nearby_dates) == 0:
-                        continue
-                    date = nearby_dates[0]
-
-                current_price = prices.loc[date, 'Close']
-
-                # 팩터 점수 계산 (해당 시점 기준)
-                try:
-                    # 기술적 팩터 (최근 6개월 데이터)
-                    hist_data = prices.loc[:date].tail(120)
-                    tech_factors = TechnicalFactors.calculate_all(hist_data) if len(hist_data) > 20 else {}
-
-                    # 재무 팩터 (백테스트에서는 현재 시점 데이터 사용)
-                    # 실제로는 해당 시점의 재무제표가 필요하나 단순화
-                    fin_factors = FinancialFactors.calculate_all(ticker, market)
-
-                    # 감성 팩터는 백테스트에서 제외 (과거 데이터 없음)
-                    all_factors = {**tech_factors, **fin_factors}
-
-                    # 정규화 및 점수 계산
-                    normalized = FactorAggregator.normalize_factors(all_factors)
-                    composite_score = FactorAggregator.calculate_composite_score(normalized, factor_weights)
-
-                except Exception as e:
-                    logger.warning(f"Factor calculation failed at {date}: {e}")
-                    composite_score = 50.0
-
-                # 매매 로직
-                if composite_score >= buy_threshold and position == 0:
-                    # 매수
-                    shares = cash / current_price
-                    cash = 0
-                    position = 1
-                    trades.append({
-                        'date': date,
-                        'action': 'BUY',
-                        'price': current_price,
-                        'shares': shares,
-                        'factor_score': composite_score,
-                        'portfolio_value': shares * current_price
-                    })
-
-                elif composite_score <= sell_threshold and position == 1:
-                    # 매도
-                    cash = shares * current_price
-                    portfolio_value = cash
-                    trades.append({
-                        'date': date,
-                        'action': 'SELL',
-                        'price': current_price,
-                        'shares': shares,
-                        'factor_score': composite_score,
-                        'portfolio_value': portfolio_value,
-                        'profit': cash - initial_capital,
-                        'return': ((cash - initial_capital) / initial_capital) * 100
-                    })
-                    shares = 0
-                    position = 0
+        except Exception as e:
+            logger.error(f"Backtest failed: {e}")
+            raise
 
-            # 마지막 포지션 정리
-            final_date = prices.index[-1]
-            final_price = prices.loc[final_date, 'Close']
-            if position == 1:
-                cash = shares * final_price
+    @staticmethod
+    def run_portfolio_backtest(
+        tickers: List[str],
+        market: str = "US",
+        start_date: str = "2023-01-01",
+        end_date: str = "2024-12-31",
+        factor_weights: Optional[Dict[str, float]] = None,
+        rebalance_period: int = 30,
+        buy_threshold: float = 60.0,
+        sell_threshold: float = 40.0,
+        initial_capital: float = 10000.0,
+        weighting: str = "equal",
+        scores: Optional[Dict[str, float]] = None,
+        mode: str = "vectorized",
+        max_workers: int = 8
+    ) -> Dict:
+        """여러 종목 백테스트 + 바스켓 성과
+
+        가격은 get_prices_bulk 한 번, 벤치마크는 한 번만 조회하고 종목별 시뮬레이션은 병렬 실행.
+
+        Args:
+            tickers: 종목 리스트
+            weighting: 바스켓 비중 ("equal" 동일 비중 / "score" 점수 비례)
+            scores: weighting="score" 일 때 종목별 점수 (예: composite_score)
+            max_workers: 종목별 시뮬레이션 스레드 수
+            (나머지는 run_backtest 와 동일, initial_capital 은 종목별/바스켓 공통)
+
+        Returns:
+            종목별 결과(results), 실패 종목(failed), 바스켓 성과(aggregate)
+        """
+        tickers = list(dict.fromkeys(t for t in tickers if t))
+        price_map = BacktestEngine._load_prices_many(tickers, start_date, end_date, market)
+        bench_prices = BacktestEngine._load_prices(BacktestEngine.benchmark_ticker(market), start_date, end_date)
+
+        results: Dict[str, Dict] = {}
+        failed: Dict[str, str] = {t: f"No price data for {t}" for t in tickers if t not in price_map}
+
+        def _run(ticker: str) -> Dict:
+            return BacktestEngine._backtest_prices(
+                price_map[ticker], ticker, market, start_date, end_date, factor_weights, rebalance_period,
+                buy_threshold, sell_threshold, initial_capital, mode, bench_prices,
+            )
+
+        if price_map:
+            with ThreadPoolExecutor(max_workers=max(1, min(len(price_map), max_workers))) as executor:
+                futures = {executor.submit(_run, t): t for t in price_map}
+                for future in as_completed(futures):
+                    ticker = futures[future]
+                    try:
+                        results[ticker] = future.result()
+                    except Exception as e:
+                        logger.warning(f"Backtest failed for {ticker}: {e}")
+                        failed[ticker] = str(e)
+
+        ordered = [t for t in tickers if t in results]
+        weights = BacktestEngine._basket_weights(ordered, weighting, scores)
+        aggregate = BacktestEngine._aggregate_basket(
+            results, weights, initial_capital, market, start_date, end_date, bench_prices
+        )
+
+        for r in results.values():
+            r['equity_curve'] = r['equity_curve'].to_dict()
+
+        return {
+            'tickers': tickers,
+            'start_date': start_date,
+            'end_date': end_date,
+            'weighting': weighting,
+            'weights': weights,
+            'results': {t: results[t] for t in ordered},
+            'failed': failed,
+            'aggregate': aggregate
+        }
+
+    @staticmethod
+    def _basket_weights(
+        tickers: List[str],
+        weighting: str = "equal",
+        scores: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """바스켓 비중 (점수 비례 시 0 이하/누락 점수는 0, 전부 0 이면 동일 비중)"""
+        if not tickers:
+            return {}
+        if weighting == "score" and scores:
+            raw = {t: max(0.0, float(scores.get(t) or 0.0)) for t in tickers}
+            total = sum(raw.values())
+            if total > 0:
+                return {t: v / total for t, v in raw.items()}
+        return {t: 1.0 / len(tickers) for t in tickers}
+
+    @staticmethod
+    def _aggregate_basket(
+        results: Dict[str, Dict],
+        weights: Dict[str, float],
+        initial_capital: float,
+        market: str,
+        start_date: str,
+        end_date: str,
+        bench_prices: Optional[pd.DataFrame] = None
+    ) -> Dict:
+        """종목별 자산 곡선을 비중대로 합친 바스켓 성과 (매수 후 보유, 리밸런싱 없음)"""
+        if not weights:
+            return {'error': 'No successful backtests'}
+
+        growth = pd.DataFrame({
+            t: results[t]['equity_curve'] / results[t]['initial_capital'] for t in weights
+        }).sort_index().ffill().fillna(1.0)
+        equity = growth.mul(pd.Series(weights)).sum(axis=1) * initial_capital
+        final_value = float(equity.iloc[-1])
+
+        benchmark = BacktestEngine.compare_with_benchmark(
+            equity, equity.to_frame('Close'), BacktestEngine.benchmark_ticker(market), start_date, end_date, bench_prices
+        )
+        return {
+            'initial_capital': initial_capital,
+            'final_value': final_value,
+            'total_return': ((final_value - initial_capital) / initial_capital) * 100,
+            'performance': BacktestEngine.curve_performance(equity),
+            'equity_curve': equity.to_dict(),
+            'benchmark': benchmark
+        }
+
+    @staticmethod
+    def curve_performance(equity: pd.Series) -> Dict:
+        """일별 자산 곡선 기준 성과 지표 (CAGR, MDD, 연환산 변동성/샤프)"""
+        if equity.empty or equity.iloc[0] <= 0:
+            return {'CAGR': 0.0, 'Total_Return': 0.0, 'Max_Drawdown': 0.0, 'Volatility': 0.0, 'Sharpe_Ratio': 0.0}
+
+        total_return = (equity.iloc[-1] / equity.iloc[0] - 1) * 100
+        years = (equity.index[-1] - equity.index[0]).days / 365.25
+        cagr = (((equity.iloc[-1] / equity.iloc[0]) ** (1 / years)) - 1) * 100 if years > 0 else 0.0
+        max_dd = float(((equity.cummax() - equity) / equity.cummax()).max() * 100)
+        daily = equity.pct_change().dropna()
+        vol = float(daily.std() * np.sqrt(252)) if len(daily) > 1 else 0.0
+        sharpe = float(daily.mean() * 252 / vol) if vol > 0 else 0.0
+
+        return {
+            'CAGR': round(cagr, 2),
+            'Total_Return': round(total_return, 2),
+            'Max_Drawdown': round(max_dd, 2),
+            'Volatility': round(vol * 100, 2),
+            'Sharpe_Ratio': round(sharpe, 2)
+        }
+
+    @staticmethod
+    def _backtest_prices(
+        prices: pd.DataFrame,
+        ticker: str,
+        market: str,
+        start_date: str,
+        end_date: str,
+        factor_weights: Optional[Dict[str, float]] = None,
+        rebalance_period: int = 30,
+        buy_threshold: float = 60.0,
+        sell_threshold: float = 40.0,
+        initial_capital: float = 10000.0,
+        mode: str = "vectorized",
+        bench_prices: Optional[pd.DataFrame] = None
+    ) -> Dict:
+        """조회된 가격 데이터로 백테스트 (equity_curve 는 Series, bench_prices 가 있으면 재조회 안 함)"""
+        if mode == "vectorized":
+            from mcp_server.tools.backtest_vectorized import run_vectorized_backtest
+
+            vec = run_vectorized_backtest(
+                prices, ticker, market, factor_weights, rebalance_period,
+                buy_threshold, sell_threshold, initial_capital,
+            )
+            trades, final_value = vec['trades'], vec['final_value']
+            performance, equity_curve = vec['performance'], vec['equity_curve']
+        else:
+            trades, final_value = BacktestEngine._run_loop(
+                prices, ticker, market, factor_weights, rebalance_period,
+                buy_threshold, sell_threshold, initial_capital,
+            )
+            performance = BacktestEngine.calculate_performance(trades, prices, initial_capital, final_value)
+            equity_curve = BacktestEngine.generate_equity_curve(trades, prices, initial_capital)
+
+        # 벤치마크 비교
+        benchmark = BacktestEngine.compare_with_benchmark(
+            equity_curve, prices, BacktestEngine.benchmark_ticker(market), start_date, end_date, bench_prices
+        )
+
+        return {
+            'ticker': ticker,
+            'start_date': start_date,
+            'end_date': end_date,
+            'initial_capital': initial_capital,
+            'final_value': final_value,
+            'total_return': ((final_value - initial_capital) / initial_capital) * 100,
+            'trades': trades,
+            'trade_count': len(trades),
+            'performance': performance,
+            'equity_curve': equity_curve,
+            'benchmark': benchmark
+        }
+
+    @staticmethod
+    def benchmark_ticker(market: str) -> str:
+        """시장별 벤치마크 티커"""
+        return "SPY" if market == "US" else "^KS11"
+
+    @staticmethod
+    def _run_loop(
+        prices: pd.DataFrame,
+        ticker: str,
+        market: str,
+        factor_weights: Optional[Dict[str, float]],
+        rebalance_period: int,
+        buy_threshold: float,
+        sell_threshold: float,
+        initial_capital: float
+    ) -> Tuple[List[Dict], float]:
+        """시점별 루프 백테스트 (리밸런싱마다 지표 재계산) - 거래 내역, 최종 가치"""
+        # 리밸런싱 날짜 생성
+        rebalance_dates = pd.date_range(
+            start=prices.index[0],
+            end=prices.index[-1],
+            freq=f'{rebalance_period}D'
+        )
+
+        # 거래 기록
+        trades = []
+        position = 0  # 0: 보유 없음, 1: 보유 중
+        shares = 0
+        cash = initial_capital
+
+        for date in rebalance_dates:
+            # 가장 가까운 거래일 찾기
+            if date not in prices.index:
+                nearby_dates = prices.index[prices.index >= date]
+                if len(nearby_dates) == 0:
+                    continue
+                date = nearby_dates[0]
+
+            current_price = prices.loc[date, 'Close']
+
+            # 팩터 점수 계산 (해당 시점 기준)
+            try:
+                # 기술적 팩터 (최근 6개월 데이터)
+                hist_data = prices.loc[:date].tail(120)
+                tech_factors = TechnicalFactors.calculate_all(hist_data) if len(hist_data) > 20 else {}
+
+                # 재무 팩터 (백테스트에서는 현재 시점 데이터 사용)
+                # 실제로는 해당 시점의 재무제표가 필요하나 단순화
+                fin_factors = FinancialFactors.calculate_all(ticker, market)
+
+                # 감성 팩터는 백테스트에서 제외 (과거 데이터 없음)
+                all_factors = {**tech_factors, **fin_factors}
+
+                # 정규화 및 점수 계산
+                normalized = FactorAggregator.normalize_factors(all_factors)
+                composite_score = FactorAggregator.calculate_composite_score(normalized, factor_weights)
+
+            except Exception as e:
+                logger.warning(f"Factor calculation failed at {date}: {e}")
+                composite_score = 50.0
+
+            # 매매 로직
+            if composite_score >= buy_threshold and position == 0:
+                # 매수
+                shares = cash / current_price
+                cash = 0
+                position = 1
+                trades.append({
+                    'date': date,
+                    'action': 'BUY',
+                    'price': current_price,
+                    'shares': shares,
+                    'factor_score': composite_score,
+                    'portfolio_value': shares * current_price
+                })
+
+            elif composite_score <= sell_threshold and position == 1:
+                # 매도
+                cash = shares * current_price
+                portfolio_value = cash
                 trades.append({
-                    'date': final_date,
+                    'date': date,
                     'action': 'SELL',
-                    'price': final_price,
+                    'price': current_price,
                     'shares': shares,
-                    'factor_score': 0.0,
-                    'portfolio_value': cash,
+                    'factor_score': composite_score,
+                    'portfolio_value': portfolio_value,
                     'profit': cash - initial_capital,
                     'return': ((cash - initial_capital) / initial_capital) * 100
                 })
+                shares = 0
+                position = 0
+
+        # 마지막 포지션 정리
+        final_date = prices.index[-1]
+        final_price = prices.loc[final_date, 'Close']
+        if position == 1:
+            cash = shares * final_price
+            trades.append({
+                'date': final_date,
+                'action': 'SELL',
+                'price': final_price,
+                'shares': shares,
+                'factor_score': 0.0,
+                'portfolio_value': cash,
+                'profit': cash - initial_capital,
+                'return': ((cash - initial_capital) / initial_capital) * 100
+            })
+
+        final_value = cash if position == 0 else shares * final_price
+
+        return trades, final_value
 
-            final_value = cash if position == 0 else shares * final_price
-
-            # 성과 분석
-            performance = BacktestEngine.calculate_performance(trades, prices, initial_capital, final_value)
-
-            # 자산 곡선
-            equity_curve = BacktestEngine.generate_equity_curve(trades, prices, initial_capital)
-
-            # 벤치마크 비교
-            benchmark = BacktestEngine.compare_with_benchmark(
-                equity_curve, prices, "SPY" if market == "US" else "^KS11", start_date, end_date
-            )
-
-            return {
-                'ticker': ticker,
-                'start_date': start_date,
-                'end_date': end_date,
-                'initial_capital': initial_capital,
-                'final_value': final_value,
-                'total_return': ((final_value - initial_capital) / initial_capital) * 100,
-                'trades': trades,
-                'trade_count': len(trades),
-                'performance': performance,
-                'equity_curve': equity_curve.to_dict() if isinstance(equity_curve, pd.Series) else equity_curve,
-                'benchmark': benchmark
-            }
+    @staticmethod
+    def _load_prices(ticker: str, start_date: str, end_date: str, market: Optional[str] = None) -> pd.DataFrame:
+        """로컬 가격 저장소에서 일봉 조회 (Date 인덱스)"""
+        df = get_prices(ticker, start=start_date, end=end_date, market=market)
+        if df is None or df.empty or 'Date' not in df.columns:
+            return pd.DataFrame()
+        return df.set_index('Date')
 
-        except Exception as e:
-            logger.error(f"Backtest failed: {e}")
-            raise
+    @staticmethod
+    def _load_prices_many(
+        tickers: List[str], start_date: str, end_date: str, market: Optional[str] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """여러 종목 일봉을 한 번의 배치 조회로 (종목 → Date 인덱스 OHLCV, 데이터 없는 종목 제외)"""
+        panels = get_prices_bulk(tickers, start=start_date, end=end_date, market=market)
+        out: Dict[str, pd.DataFrame] = {}
+        for t in tickers:
+            if t not in panels['close'].columns:
+                continue
+            df = pd.DataFrame({
+                col: panels[col.lower()][t] for col in ('Open', 'High', 'Low', 'Close', 'Volume')
+                if t in panels[col.lower()].columns
+            }).dropna(subset=['Close'])
+            if not df.empty:
+                df.index.name = 'Date'
+                out[t] = df
+        return out
 
     @staticmethod
     def calculate_performance(
@@ -338,7 +564,8 @@ class BacktestEngine:
         prices: pd.DataFrame,
         benchmark_ticker: str,
         start_date: str,
-        end_date: str
+        end_date: str,
+        bench_prices: Optional[pd.DataFrame] = None
     ) -> Dict:
         """벤치마크 비교
 
@@ -348,14 +575,15 @@ class BacktestEngine:
             benchmark_ticker: 벤치마크 티커
             start_date: 시작일
             end_date: 종료일
+            bench_prices: 미리 조회한 벤치마크 가격 (여러 종목 백테스트 시 공유)
 
         Returns:
             벤치마크 비교 결과
         """
         try:
-            # 벤치마크 데이터 다운로드
-            benchmark = yf.Ticker(benchmark_ticker)
-            bench_prices = benchmark.history(start=start_date, end=end_date)
+            # 벤치마크 데이터 (로컬 가격 저장소)
+            if bench_prices is None:
+                bench_prices = BacktestEngine._load_prices(benchmark_ticker, start_date, end_date)
 
             if bench_prices.empty:
                 return {'error': 'Benchmark data not available'}
@@ -396,46 +624,60 @@ class BacktestEngine:
         market: str,
         start_date: str,
         end_date: str,
-        weight_candidates: List[Dict[str, float]],
-        rebalance_period: int = 30
+        weight_candidates: Optional[List[Dict[str, float]]] = None,
+        rebalance_period: int = 30,
+        search: str = "grid",
+        n_samples: int = 100,
+        eta: int = 3,
+        patience: int = 0,
+        seed: Optional[int] = None
     ) -> Dict:
-        """가중치 최적화 (그리드 서치)
+        """가중치 최적화 (그리드/랜덤/successive halving 탐색)
+
+        가격과 팩터 패널을 한 번만 만들어 모든 후보가 공유하고, 벤치마크는 최적 후보에만 조회한다.
 
         Args:
             ticker: 종목 코드
             market: 시장
             start_date: 시작일
             end_date: 종료일
-            weight_candidates: 가중치 조합 리스트
+            weight_candidates: 가중치 조합 리스트 (None 이면 무작위 생성)
             rebalance_period: 리밸런싱 주기
+            search: "grid" / "random" / "halving"
+            n_samples: random 탐색 후보 수
+            eta: halving 단계별 생존 비율의 역수
+            patience: 개선 없는 배치가 이만큼 이어지면 조기 종료 (0 이면 비활성)
+            seed: 무작위 추출 시드
 
         Returns:
             최적 가중치 및 성과
         """
-        best_result = None
-        best_return = -float('inf')
+        from mcp_server.tools.weight_optimizer import load_panel, optimize
+        from mcp_server.tools.backtest_vectorized import run_vectorized_backtest
 
-        for weights in weight_candidates:
-            try:
-                result = BacktestEngine.run_backtest(
-                    ticker=ticker,
-                    market=market,
-                    start_date=start_date,
-                    end_date=end_date,
-                    factor_weights=weights,
-                    rebalance_period=rebalance_period
-                )
-
-                if result['total_return'] > best_return:
-                    best_return = result['total_return']
-                    best_result = {
-                        'weights': weights,
-                        'performance': result['performance'],
-                        'total_return': result['total_return']
-                    }
+        try:
+            prices, panel = load_panel(ticker, market, start_date, end_date, rebalance_period)
+            best = optimize(
+                prices, ticker, market, weight_candidates, rebalance_period,
+                search=search, n_samples=n_samples, eta=eta, patience=patience, seed=seed, panel=panel,
+            )
+            if 'error' in best:
+                return best
 
-            except Exception as e:
-                logger.warning(f"Optimization failed for weights {weights}: {e}")
-                continue
+            result = run_vectorized_backtest(
+                prices, ticker, market, best['weights'], rebalance_period, panel=panel
+            )
+            benchmark = BacktestEngine.compare_with_benchmark(
+                result['equity_curve'], prices, BacktestEngine.benchmark_ticker(market), start_date, end_date
+            )
+            return {
+                'weights': best['weights'],
+                'performance': result['performance'],
+                'total_return': best['total_return'],
+                'benchmark': benchmark,
+                'search': best['search']
+            }
 
-        return best_result if best_result else {'error': 'Optimization failed'}
+        except Exception as e:
+            logger.warning(f"Optimization failed for {ticker}: {e}")
+            return {'error': 'Optimization failed'}
@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+Vectorized Backtest Module
+
+BacktestEngine.run_backtest(mode="vectorized") 구현.
+
+기존 루프는 리밸런싱 날짜마다 ``prices.loc[:date].tail(120)`` 를 잘라 ta 라이브러리로
+10개 기술 지표를 다시 계산하고, 결과가 바뀌지 않는 FinancialFactors.calculate_all 도
+매번 호출한다. 이 모듈은:
+
+1. 모든 리밸런싱 시점의 120일 윈도우를 (시점 × 120) 행렬로 쌓아 종합 점수에 반영되는
+   기술 지표를 한 번에 계산 (ta 구현과 동일 공식 - 재귀 지표는 윈도우 시작점 기준)
+2. 재무 팩터는 한 번만 계산
+3. 카테고리 점수/종합 점수/매매 신호를 배열로 평가
+4. 포지션과 체결을 NumPy 로 시뮬레이션
+
+하므로 신호와 체결은 루프 버전과 같다. 카테고리 점수 패널(FactorPanel)은 가중치와
+무관하므로 가중치 탐색 시 재사용할 수 있다.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from mcp_server.tools.factor_aggregator import FactorAggregator
+from mcp_server.tools.technical_indicators import TechnicalFactors, TA_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+LOOKBACK = 120          # 루프 버전의 tail(120)
+MIN_WINDOW = 50         # TechnicalFactors.calculate_all 최소 행 수
+
+# 종합 점수(technical 카테고리)에 실제로 반영되는 지표
+# (MACD, OBV 는 calculate_all 이 계산하지만 CATEGORY_FACTORS 에 없어 점수에 영향 없음)
+SCORED_TECH_KEYS = ('RSI', 'Stochastic', 'Williams_R', 'CCI', 'MA_Cross', 'ADX', 'BB_Width', 'ATR')
+
+
+# ===== 윈도우 행렬 지표 (각 입력: (m, L) 행렬, 출력: 윈도우 마지막 시점 값 (m,)) =====
+
+def _rsi(close: np.ndarray, window: int = 14) -> np.ndarray:
+    diff = np.diff(close, axis=1)
+    up = np.concatenate([np.zeros((len(close), 1)), np.where(diff > 0, diff, 0.0)], axis=1)
+    down = np.concatenate([np.zeros((len(close), 1)), np.where(diff < 0, -diff, 0.0)], axis=1)
+    alpha = 1.0 / window
+    ema_up, ema_down = up[:, 0].copy(), down[:, 0].copy()
+    for j in range(1, close.shape[1]):
+        ema_up = ((1 - alpha) * ema_up + alpha * up[:, j]) / ((1 - alpha) + alpha)
+        ema_down = ((1 - alpha) * ema_down + alpha * down[:, j]) / ((1 - alpha) + alpha)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + ema_up / ema_down))
+    return np.where(ema_down == 0, 100.0, rsi)
+
+
+def _stochastic(high, low, close, window: int = 14) -> np.ndarray:
+    smin = low[:, -window:].min(axis=1)
+    smax = high[:, -window:].max(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 * (close[:, -1] - smin) / (smax - smin)
+
+
+def _williams_r(high, low, close, lbp: int = 14) -> np.ndarray:
+    hh = high[:, -lbp:].max(axis=1)
+    ll = low[:, -lbp:].min(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return -100 * (hh - close[:, -1]) / (hh - ll)
+
+
+def _cci(high, low, close, window: int = 20, constant: float = 0.015) -> np.ndarray:
+    tp = ((high + low + close) / 3.0)[:, -window:]
+    mean = tp.mean(axis=1)
+    mad = np.abs(tp - mean[:, None]).mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (tp[:, -1] - mean) / (constant * mad)
+
+
+def _ma_cross(close, short: int = 20, long: int = 50) -> np.ndarray:
+    diff = close[:, -short:].mean(axis=1) - close[:, -long:].mean(axis=1)
+    return (diff / close[:, -1]) * 100
+
+
+def _bb_width(close, window: int = 20, window_dev: int = 2) -> np.ndarray:
+    c = close[:, -window:]
+    mavg = c.mean(axis=1)
+    mstd = c.std(axis=1, ddof=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (((mavg + window_dev * mstd) - (mavg - window_dev * mstd)) / mavg) * 100
+
+
+def _true_range(high, low, close) -> np.ndarray:
+    tr = high - low
+    prev = close[:, :-1]
+    tr[:, 1:] = np.maximum.reduce([tr[:, 1:], np.abs(high[:, 1:] - prev), np.abs(low[:, 1:] - prev)])
+    return tr
+
+
+def _atr(high, low, close, window: int = 14) -> np.ndarray:
+    tr = _true_range(high, low, close)
+    atr = tr[:, :window].mean(axis=1)
+    for j in range(window, close.shape[1]):
+        atr = (atr * (window - 1) + tr[:, j]) / float(window)
+    return atr
+
+
+def _adx(high, low, close, window: int = 14) -> np.ndarray:
+    """ta.trend.ADXIndicator.adx() 마지막 값 (Wilder 평활 + ta 구현의 경계 처리 포함)"""
+    m, n = close.shape
+    k = n - (window - 1)
+    prev_close = close[:, :-1]
+    # 원본 인덱스 1..n-1 → 배열 인덱스 0..n-2
+    dm = np.maximum(high[:, 1:], prev_close) - np.minimum(low[:, 1:], prev_close)
+    diff_up = high[:, 1:] - high[:, :-1]
+    diff_down = low[:, :-1] - low[:, 1:]
+    pos = np.where((diff_up > diff_down) & (diff_up > 0), diff_up, 0.0)
+    neg = np.where((diff_down > diff_up) & (diff_down > 0), diff_down, 0.0)
+
+    def smooth(x):
+        out = np.zeros((m, k))
+        out[:, 0] = x[:, :window].sum(axis=1)
+        # ta 구현은 마지막 원소를 채우지 않음 (0 유지)
+        for i in range(1, k - 1):
+            out[:, i] = out[:, i - 1] - (out[:, i - 1] / float(window)) + x[:, window - 1 + i]
+        return out
+
+    trs, dip, din = smooth(dm), smooth(pos), smooth(neg)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_pos = np.where(trs != 0, 100 * (dip / trs), 0.0)
+        di_neg = np.where(trs != 0, 100 * (din / trs), 0.0)
+        total = di_pos + di_neg
+        dx = np.where(total != 0, 100 * np.abs((di_pos - di_neg) / total), 0.0)
+
+    adx = dx[:, 0:window].mean(axis=1)
+    for i in range(window + 1, k):
+        adx = ((adx * (window - 1)) + dx[:, i - 1]) / float(window)
+    return adx
+
+
+def window_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> Dict[str, np.ndarray]:
+    """같은 길이 윈도우 묶음의 마지막 시점 지표 (TechnicalFactors.calculate_all 기본 기간)"""
+    return {
+        'RSI': _rsi(close, 14),
+        'Stochastic': _stochastic(high, low, close, 14),
+        'Williams_R': _williams_r(high, low, close, 14),
+        'ADX': _adx(high, low, close, 14),
+        'CCI': _cci(high, low, close, 20),
+        'MA_Cross': _ma_cross(close, 20, 50),
+        'BB_Width': _bb_width(close, 20),
+        'ATR': _atr(high, low, close, 14),
+    }
+
+
+def normalize_array(key: str, values: np.ndarray) -> np.ndarray:
+    """FactorAggregator.normalize_factors 의 배열 버전 (NaN 은 결측으로 유지)"""
+    if key not in FactorAggregator.FACTOR_RANGES:
+        return values
+    min_val, max_val, direction = FactorAggregator.FACTOR_RANGES[key]
+    clipped = np.clip(values, min_val, max_val)
+    if direction == 'higher':
+        score = ((clipped - min_val) / (max_val - min_val)) * 100
+    elif direction == 'lower':
+        score = (1 - (clipped - min_val) / (max_val - min_val)) * 100
+    elif direction == 'optimal_0':
+        score = (1 - np.abs(clipped) / max(abs(min_val), abs(max_val))) * 100
+    elif direction == 'optimal_1':
+        score = (1 - np.abs(clipped - 1.0) / max(abs(max_val - 1.0), abs(min_val - 1.0))) * 100
+    elif direction == 'optimal_50':
+        normalized_val = ((clipped - min_val) / (max_val - min_val)) * 100
+        score = (1 - np.abs(normalized_val - 50) / 50) * 100
+    else:
+        score = np.full_like(clipped, 50.0)
+    return np.clip(score, 0, 100)
+
+
+# ===== 팩터 패널 =====
+
+@dataclass
+class FactorPanel:
+    """리밸런싱 시점별 카테고리 점수 (가중치와 무관 - 가중치 탐색 시 재사용)"""
+    ticker: str
+    dates: pd.DatetimeIndex                 # 리밸런싱 거래일 (m,)
+    prices: np.ndarray                      # 해당 시점 종가 (m,)
+    category_scores: Dict[str, np.ndarray]  # 카테고리 → (m,) 점수
+    has_factors: np.ndarray                 # 팩터가 하나도 없으면 False → 종합 점수 50
+    fin_factors: Dict[str, float] = field(default_factory=dict)
+
+
+def rebalance_positions(index: pd.DatetimeIndex, rebalance_period: int) -> np.ndarray:
+    """루프 버전과 같은 리밸런싱 시점 (각 달력일 이후 첫 거래일의 위치)"""
+    calendar = pd.date_range(start=index[0], end=index[-1], freq=f'{rebalance_period}D')
+    pos = index.searchsorted(calendar, side='left')
+    return pos[pos < len(index)]
+
+
+def _technical_panel(prices: pd.DataFrame, positions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """리밸런싱 시점별 기술 지표 (정규화 전, 결측 NaN) + 지표 계산 여부 마스크"""
+    m = len(positions)
+    out = {k: np.full(m, np.nan) for k in SCORED_TECH_KEYS}
+    computed = np.zeros(m, dtype=bool)
+    required = ['Close', 'High', 'Low', 'Volume']
+    if not TA_AVAILABLE or m == 0 or not all(c in prices.columns for c in required):
+        return out, computed
+
+    high = prices['High'].to_numpy(dtype=float)
+    low = prices['Low'].to_numpy(dtype=float)
+    close = prices['Close'].to_numpy(dtype=float)
+    lengths = np.minimum(positions + 1, LOOKBACK)
+
+    for length in np.unique(lengths):
+        if length < MIN_WINDOW:
+            continue  # calculate_all 이 빈 dict 반환하는 구간
+        rows = np.flatnonzero(lengths == length)
+        starts = positions[rows] + 1 - length
+        idx = starts[:, None] + np.arange(length)[None, :]
+        h, l, c = high[idx], low[idx], close[idx]
+
+        # 결측 포함 윈도우는 기존 구현으로 계산 (ta 의 NaN 처리와 동일 결과 보장)
+        clean = ~(np.isnan(h).any(axis=1) | np.isnan(l).any(axis=1) | np.isnan(c).any(axis=1))
+        if clean.any():
+            values = window_indicators(h[clean], l[clean], c[clean])
+            for k in SCORED_TECH_KEYS:
+                out[k][rows[clean]] = values[k]
+            computed[rows[clean]] = True
+        for r in rows[~clean]:
+            window = prices.iloc[positions[r] + 1 - length: positions[r] + 1]
+            tech = TechnicalFactors.calculate_all(window)
+            for k in SCORED_TECH_KEYS:
+                out[k][r] = tech.get(k, np.nan)
+            computed[r] = bool(tech)
+    return out, computed
+
+
+def build_factor_panel(
+    prices: pd.DataFrame,
+    ticker: str,
+    market: str = "US",
+    rebalance_period: int = 30,
+    fin_factors: Optional[Dict[str, float]] = None,
+) -> FactorPanel:
+    """가격 데이터 → 리밸런싱 시점별 카테고리 점수 패널"""
+    positions = rebalance_positions(prices.index, rebalance_period)
+
+    if fin_factors is None:
+        from mcp_server.tools.financial_factors import FinancialFactors
+        try:
+            fin_factors = FinancialFactors.calculate_all(ticker, market)
+        except Exception as e:
+            logger.warning(f"Financial factors failed for {ticker}: {e}")
+            fin_factors = {}
+
+    norm_fin = FactorAggregator.normalize_factors(fin_factors)
+    tech, tech_computed = _technical_panel(prices, positions)
+    norm_tech = {k: normalize_array(k, v) for k, v in tech.items()}
+
+    m = len(positions)
+    category_scores: Dict[str, np.ndarray] = {}
+    for category, keys in FactorAggregator.CATEGORY_FACTORS.items():
+        if category == 'technical':
+            stacked = np.column_stack([norm_tech[k] for k in SCORED_TECH_KEYS]) if m else np.zeros((0, 1))
+            counts = (~np.isnan(stacked)).sum(axis=1)
+            sums = np.nansum(stacked, axis=1)
+            with np.errstate(invalid='ignore'):
+                category_scores[category] = np.where(counts > 0, sums / np.maximum(counts, 1), 50.0)
+        else:
+            vals = [norm_fin[k] for k in keys if k in norm_fin and not pd.isna(norm_fin[k])]
+            category_scores[category] = np.full(m, np.mean(vals) if vals else 50.0)
+
+    # 루프 버전: 기술/재무 팩터가 모두 비면 종합 점수 50
+    has_factors = tech_computed | bool(norm_fin)
+    return FactorPanel(
+        ticker=ticker,
+        dates=prices.index[positions],
+        prices=prices['Close'].to_numpy(dtype=float)[positions],
+        category_scores=category_scores,
+        has_factors=has_factors,
+        fin_factors=dict(fin_factors),
+    )
+
+
+def composite_scores(panel: FactorPanel, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """FactorAggregator.calculate_composite_score 의 배열 버전"""
+    if weights is None:
+        weights = FactorAggregator.DEFAULT_WEIGHTS.copy()
+    total_weight = sum(weights.values())
+    acc = np.zeros(len(panel.dates))
+    for category in FactorAggregator.CATEGORY_FACTORS:
+        if category in weights:
+            acc = acc + panel.category_scores[category] * weights[category]
+    composite = acc / total_weight if total_weight > 0 else np.full(len(panel.dates), 50.0)
+    composite = np.where(panel.has_factors, composite, 50.0)
+    return np.round(composite, 2)
+
+
+# ===== 포지션/체결 시뮬레이션 =====
+
+def positions_from_scores(scores: np.ndarray, buy_threshold: float, sell_threshold: float) -> np.ndarray:
+    """리밸런싱 시점별 보유 여부 (매수 임계 이상 → 1, 매도 임계 이하 → 0, 그 외 유지)"""
+    if buy_threshold > sell_threshold:
+        state = np.where(scores >= buy_threshold, 1.0, np.where(scores <= sell_threshold, 0.0, np.nan))
+        return pd.Series(state).ffill().fillna(0.0).to_numpy(dtype=int)
+    # 임계값이 겹치면 상태 전이가 매 시점 토글될 수 있어 순차 평가
+    held = np.zeros(len(scores), dtype=int)
+    position = 0
+    for i, s in enumerate(scores):
+        if s >= buy_threshold and position == 0:
+            position = 1
+        elif s <= sell_threshold and position == 1:
+            position = 0
+        held[i] = position
+    return held
+
+
+def simulate(
+    panel: FactorPanel,
+    scores: np.ndarray,
+    final_date,
+    final_price: float,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+) -> Tuple[List[Dict], float]:
+    """신호 배열 → 거래 내역 (루프 버전과 같은 형식), 최종 가치"""
+    held = positions_from_scores(scores, buy_threshold, sell_threshold)
+    change = np.diff(np.concatenate([[0], held]))
+    buys = np.flatnonzero(change == 1)
+    sells = np.flatnonzero(change == -1)
+
+    # 왕복 거래별 자본 체인: cash_k = cash_{k-1} / buy_price * sell_price
+    buy_px = panel.prices[buys]
+    sell_px = panel.prices[sells]
+    open_last = len(buys) > len(sells)
+    exit_px = np.append(sell_px, final_price) if open_last else sell_px
+    cash_before = initial_capital * np.concatenate([[1.0], np.cumprod(exit_px / buy_px)[:-1]]) if len(buys) else np.array([])
+    shares = cash_before / buy_px
+    cash_after = shares * exit_px
+
+    trades: List[Dict] = []
+    for k, b in enumerate(buys):
+        trades.append({
+            'date': panel.dates[b],
+            'action': 'BUY',
+            'price': panel.prices[b],
+            'shares': shares[k],
+            'factor_score': float(scores[b]),
+            'portfolio_value': shares[k] * panel.prices[b],
+        })
+        if k < len(sells):
+            s = sells[k]
+            trades.append({
+                'date': panel.dates[s],
+                'action': 'SELL',
+                'price': panel.prices[s],
+                'shares': shares[k],
+                'factor_score': float(scores[s]),
+                'portfolio_value': cash_after[k],
+                'profit': cash_after[k] - initial_capital,
+                'return': ((cash_after[k] - initial_capital) / initial_capital) * 100,
+            })
+
+    if open_last:
+        # 마지막 포지션 정리
+        cash = cash_after[-1]
+        trades.append({
+            'date': final_date,
+            'action': 'SELL',
+            'price': final_price,
+            'shares': shares[-1],
+            'factor_score': 0.0,
+            'portfolio_value': cash,
+            'profit': cash - initial_capital,
+            'return': ((cash - initial_capital) / initial_capital) * 100,
+        })
+        final_value = cash
+    else:
+        final_value = cash_after[-1] if len(buys) else initial_capital
+    return trades, final_value
+
+
+def equity_curve(trades: List[Dict], prices: pd.DataFrame, initial_capital: float) -> pd.Series:
+    """BacktestEngine.generate_equity_curve 의 벡터화 버전"""
+    close = prices['Close'].to_numpy(dtype=float)
+    if not trades:
+        return pd.Series(initial_capital, index=prices.index, dtype=float)
+    trade_dates = pd.DatetimeIndex([t['date'] for t in trades])
+    last = trade_dates.searchsorted(prices.index, side='right') - 1
+    is_buy = np.array([t['action'] == 'BUY' for t in trades])
+    shares = np.array([t['shares'] for t in trades], dtype=float)
+    values = np.array([t['portfolio_value'] for t in trades], dtype=float)
+
+    safe = np.maximum(last, 0)
+    equity = np.where(is_buy[safe], shares[safe] * close, values[safe])
+    equity = np.where(last >= 0, equity, initial_capital)
+    return pd.Series(equity, index=prices.index, dtype=float)
+
+
+def run_vectorized_backtest(
+    prices: pd.DataFrame,
+    ticker: str,
+    market: str = "US",
+    factor_weights: Optional[Dict[str, float]] = None,
+    rebalance_period: int = 30,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+    panel: Optional[FactorPanel] = None,
+) -> Dict:
+    """가격 데이터 기준 벡터화 백테스트 (벤치마크 비교 제외)
+
+    Returns:
+        trades / final_value / performance / equity_curve(Series) / factor_scores
+    """
+    from mcp_server.tools.backtest_engine import BacktestEngine
+
+    panel = panel or build_factor_panel(prices, ticker, market, rebalance_period)
+    scores = composite_scores(panel, factor_weights)
+    trades, final_value = simulate(
+        panel, scores, prices.index[-1], prices['Close'].iloc[-1],
+        buy_threshold, sell_threshold, initial_capital,
+    )
+    performance = BacktestEngine.calculate_performance(trades, prices, initial_capital, final_value)
+    return {
+        'trades': trades,
+        'final_value': final_value,
+        'performance': performance,
+        'equity_curve': equity_curve(trades, prices, initial_capital),
+        'factor_scores': scores,
+    }
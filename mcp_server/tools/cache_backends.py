@@ -0,0 +1,293 @@
+"""
+캐시 백엔드 - CacheManager 의 L2 저장소 (disk / redis / memory 교체 가능)
+
+모든 백엔드는 CacheManager 가 쓰던 diskcache 호출 형태를 그대로 따른다:
+    get(key, default, expire_time=False) / set(key, value, expire) / delete / clear / expire / volume / len
+여기에 여러 워커/호스트가 워밍된 시장 데이터를 공유할 때 쓰는 일괄 조회/저장을 더한다:
+    get_many(keys) → {key: (value, expire_time)}  (적중 키만, expire_time 은 epoch 초 또는 None)
+    set_many(mapping, expire)
+    scan(pattern) → 패턴(fnmatch, 예: "factor:*")에 맞는 키
+
+- DiskBackend: diskcache FanoutCache (기본, 단일 호스트의 여러 프로세스 공유). 일괄 연산은 한 트랜잭션
+- RedisBackend: redis-py 호환 클라이언트 (여러 호스트 공유). 일괄 연산은 파이프라인 1회 왕복
+  "fakeredis://" URL 은 fakeredis 인메모리 서버 (테스트용)
+- MemoryBackend: 프로세스 내 dict (테스트/단일 프로세스용, Redis 와 같이 pickle 로 격리)
+"""
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+from fnmatch import fnmatchcase
+import pickle
+import threading
+import time
+import logging
+
+from diskcache import FanoutCache
+
+logger = logging.getLogger(__name__)
+
+_MISS = object()
+
+
+class CacheBackend:
+    """L2 백엔드 인터페이스"""
+    name = "base"
+
+    def get(self, key: str, default: Any = None, expire_time: bool = False) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        raise NotImplementedError
+
+    def expire(self) -> int:
+        """만료 항목 정리 (스스로 만료시키는 백엔드는 0)"""
+        return 0
+
+    def volume(self) -> int:
+        """저장 크기 추정 (바이트)"""
+        return 0
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.scan())
+
+    def scan(self, pattern: str = "*") -> Iterator[str]:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        out = {}
+        for key in keys:
+            value, expire_at = self.get(key, _MISS, expire_time=True)
+            if value is not _MISS:
+                out[key] = (value, expire_at)
+        return out
+
+    def set_many(self, mapping: Mapping[str, Any], expire: Optional[float] = None) -> int:
+        return sum(1 for key, value in mapping.items() if self.set(key, value, expire))
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class DiskBackend(CacheBackend):
+    """diskcache FanoutCache (샤드 4개) - 일괄 연산은 전체 샤드 트랜잭션 1회"""
+    name = "disk"
+
+    def __init__(self, directory: str, size_limit: int = int(1e9), shards: int = 4):
+        self.directory = directory
+        self._cache = FanoutCache(directory, shards=shards, size_limit=size_limit, timeout=1)  # 락 타임아웃 1초
+
+    def get(self, key: str, default: Any = None, expire_time: bool = False) -> Any:
+        return self._cache.get(key, default=default, expire_time=expire_time)
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        return self._cache.set(key, value, expire=expire)
+
+    def delete(self, key: str) -> bool:
+        return self._cache.delete(key)
+
+    def clear(self) -> int:
+        return self._cache.clear()
+
+    def expire(self) -> int:
+        return self._cache.expire()
+
+    def volume(self) -> int:
+        return self._cache.volume()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def scan(self, pattern: str = "*") -> Iterator[str]:
+        for key in self._cache:
+            if isinstance(key, str) and fnmatchcase(key, pattern):
+                yield key
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        with self._cache.transact():
+            return super().get_many(keys)
+
+    def set_many(self, mapping: Mapping[str, Any], expire: Optional[float] = None) -> int:
+        with self._cache.transact():
+            return super().set_many(mapping, expire)
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": self.name, "directory": self.directory}
+
+
+class MemoryBackend(CacheBackend):
+    """프로세스 내 dict + 만료 시각 (값은 pickle 로 저장해 호출자 간 공유 객체 변경을 막음)"""
+    name = "memory"
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str, default: Any = None, expire_time: bool = False) -> Any:
+        with self._lock:
+            entry = self._live(key)
+        if entry is None:
+            return (default, None) if expire_time else default
+        value = pickle.loads(entry[0])
+        return (value, entry[1]) if expire_time else value
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._data[key] = (data, None if expire is None else time.time() + expire)
+        return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._data)
+            self._data.clear()
+        return count
+
+    def expire(self) -> int:
+        with self._lock:
+            now = time.time()
+            expired = [k for k, (_, exp) in self._data.items() if exp is not None and exp <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def volume(self) -> int:
+        with self._lock:
+            return sum(len(data) for data, _ in self._data.values())
+
+    def scan(self, pattern: str = "*") -> Iterator[str]:
+        with self._lock:
+            keys = [k for k in self._data if self._live(k) is not None]
+        return iter([k for k in keys if fnmatchcase(k, pattern)])
+
+
+class RedisBackend(CacheBackend):
+    """redis-py 호환 클라이언트 - 키는 namespace 접두사로 격리, 값은 pickle 바이트
+
+    get 은 GET+PTTL 을, get_many/set_many 는 전체 키를 파이프라인 1회 왕복으로 처리.
+    만료는 Redis 가 처리하므로 expire() 는 0.
+    """
+    name = "redis"
+
+    def __init__(self, client: Any, namespace: str = "pmmcp:", url: Optional[str] = None):
+        self.client = client
+        self.namespace = namespace
+        self.url = url
+
+    @classmethod
+    def from_url(cls, url: str, namespace: str = "pmmcp:") -> "RedisBackend":
+        """redis:// URL 로 연결 (연결 확인 실패 시 예외), fakeredis:// 는 fakeredis 인메모리 서버"""
+        if url.startswith("fakeredis://"):
+            import fakeredis
+            client = fakeredis.FakeRedis()
+        else:
+            import redis
+            client = redis.from_url(url, socket_connect_timeout=2, socket_timeout=2)
+        client.ping()
+        return cls(client, namespace, url)
+
+    def _k(self, key: str) -> str:
+        return self.namespace + key
+
+    @staticmethod
+    def _expire_at(pttl: Optional[int]) -> Optional[float]:
+        return None if pttl is None or pttl < 0 else time.time() + pttl / 1000.0
+
+    def get(self, key: str, default: Any = None, expire_time: bool = False) -> Any:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.get(self._k(key))
+        pipe.pttl(self._k(key))
+        data, pttl = pipe.execute()
+        if data is None:
+            return (default, None) if expire_time else default
+        value = pickle.loads(data)
+        return (value, self._expire_at(pttl)) if expire_time else value
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> bool:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return bool(self.client.set(self._k(key), data, px=None if expire is None else max(1, int(expire * 1000))))
+
+    def delete(self, key: str) -> bool:
+        return bool(self.client.delete(self._k(key)))
+
+    def clear(self) -> int:
+        count = 0
+        batch = []
+        for raw in self.client.scan_iter(match=self.namespace + "*", count=500):
+            batch.append(raw)
+            if len(batch) >= 500:
+                count += self.client.delete(*batch)
+                batch = []
+        if batch:
+            count += self.client.delete(*batch)
+        return count
+
+    def volume(self) -> int:
+        try:
+            return int(self.client.info("memory").get("used_memory", 0))
+        except Exception:
+            return 0
+
+    def scan(self, pattern: str = "*") -> Iterator[str]:
+        skip = len(self.namespace)
+        for raw in self.client.scan_iter(match=self.namespace + pattern, count=500):
+            yield (raw.decode() if isinstance(raw, bytes) else raw)[skip:]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, Optional[float]]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        pipe.mget([self._k(k) for k in keys])
+        for key in keys:
+            pipe.pttl(self._k(key))
+        values, *pttls = pipe.execute()
+        return {
+            key: (pickle.loads(data), self._expire_at(pttl))
+            for key, data, pttl in zip(keys, values, pttls) if data is not None
+        }
+
+    def set_many(self, mapping: Mapping[str, Any], expire: Optional[float] = None) -> int:
+        if not mapping:
+            return 0
+        px = None if expire is None else max(1, int(expire * 1000))
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(self._k(key), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), px=px)
+        return sum(1 for ok in pipe.execute() if ok)
+
+    def info(self) -> Dict[str, Any]:
+        return {"backend": self.name, "url": self.url, "namespace": self.namespace}
+
+
+def create_backend(kind: str, directory: str, size_limit: int = int(1e9),
+                   redis_url: Optional[str] = None, namespace: str = "pmmcp:") -> CacheBackend:
+    """설정값으로 백엔드 생성 (redis 연결 실패 시 disk 로 대체)"""
+    kind = (kind or "disk").lower()
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "redis":
+        try:
+            return RedisBackend.from_url(redis_url or "redis://localhost:6379/0", namespace)
+        except ImportError:
+            logger.warning("redis package not installed, falling back to disk cache")
+        except Exception as e:
+            logger.warning(f"Redis connection failed: {e}, falling back to disk cache")
+    elif kind != "disk":
+        logger.warning(f"Unknown cache backend '{kind}', using disk")
+    return DiskBackend(directory, size_limit)
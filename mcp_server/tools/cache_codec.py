@@ -0,0 +1,392 @@
+"""
+캐시 값 코덱 - diskcache 에 저장하기 전 DataFrame/dict 를 압축 직렬화
+
+CacheManager.set 이 전체 DataFrame 과 큰 dict 를 그대로 pickle 하던 것을, 값 유형별 코덱으로
+바이트로 만든 뒤 (선택) 압축해 저장한다. diskcache 는 bytes 를 pickle 없이 BLOB 으로 저장하므로
+조회 시에도 unpickle 비용이 코덱 디코딩으로 바뀐다.
+
+코덱 (앞에서부터 가능한 첫 번째 사용, 선택 라이브러리가 없으면 건너뜀):
+    - DataFrame/Series: npframe (열별 바이트 셔플 NumPy 버퍼) → arrow (pyarrow IPC) → pickle
+      arrow 는 npframe 이 받지 않는 프레임(문자열/object 열 등) 중 디코딩 결과가 dtype·인덱스까지
+      원본과 같은 것만 사용 (검증 실패 시 pickle 로 폴백)
+    - dict/list: orjson → msgpack → pickle  (JSON 으로 손실 없이 왕복 가능한 값만)
+압축: zstd (zstandard) 또는 zlib, CACHE_COMPRESS_MIN_BYTES 이상이고 실제로 줄어들 때만.
+
+저장 형식: MAGIC(4) + 코덱 id(1) + 압축 id(1) + payload
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import math
+import pickle
+import struct
+import threading
+import time
+import zlib
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+MAGIC = b"\x00PMC"
+_HEADER = len(MAGIC) + 2
+
+
+# ===== 값 판별 =====
+
+def _json_safe(value: Any, depth: int = 0) -> bool:
+    """JSON 으로 손실 없이 왕복 가능한 값인지 (str 키, 유한 float, 중첩 dict/list)"""
+    if depth > 32:
+        return False
+    t = type(value)
+    if t is str or t is bool or t is int or value is None:
+        return True
+    if t is float:
+        return math.isfinite(value)
+    if t is dict:
+        return all(type(k) is str and _json_safe(v, depth + 1) for k, v in value.items())
+    if t is list:
+        return all(_json_safe(v, depth + 1) for v in value)
+    return False
+
+
+def _npframe_supported(df: pd.DataFrame) -> bool:
+    if not all(type(c) is str for c in df.columns) or not df.columns.is_unique:
+        return False
+    if not all(isinstance(dt, np.dtype) and dt.kind in "iufbM" for dt in df.dtypes):
+        return False
+    idx = df.index
+    if isinstance(idx, pd.RangeIndex):
+        return True
+    return isinstance(idx.dtype, np.dtype) and idx.dtype.kind in "iufM" and not isinstance(idx, pd.MultiIndex)
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    """DataFrame/Series 가 값·dtype·인덱스·이름까지 동일한지 (비검증 코덱 왕복 확인용)"""
+    if type(a) is not type(b):
+        return False
+    try:
+        if isinstance(a, pd.DataFrame):
+            pd.testing.assert_frame_equal(a, b, check_exact=True)
+        elif isinstance(a, pd.Series):
+            pd.testing.assert_series_equal(a, b, check_exact=True)
+        else:
+            return a == b
+    except AssertionError:
+        return False
+    return True
+
+
+# ===== 코덱 =====
+
+class Codec:
+    """코덱 인터페이스 - accepts(value) 가 True 인 값만 encode"""
+    name = "base"
+    id = 0
+    available = True  # 선택 라이브러리 설치 여부
+    exact = True      # False 면 인코딩 직후 디코딩해 원본과 같을 때만 사용
+
+    def accepts(self, value: Any) -> bool:
+        raise NotImplementedError
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+def _shuffle(arr: np.ndarray) -> bytes:
+    """바이트 셔플 - 같은 자릿수 바이트끼리 모아 float 열의 압축률을 높임 (blosc 방식)"""
+    return arr.view(np.uint8).reshape(-1, arr.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(buf: memoryview, dtype: np.dtype, n: int, offset: int) -> np.ndarray:
+    raw = np.frombuffer(buf, dtype=np.uint8, count=n * dtype.itemsize, offset=offset)
+    return np.ascontiguousarray(raw.reshape(dtype.itemsize, n).T).view(dtype).reshape(n)
+
+
+class NumpyFrameCodec(Codec):
+    """DataFrame/Series → JSON 헤더 + 열별 바이트 셔플 NumPy 버퍼 (숫자/불리언/datetime64 열만)"""
+    name = "npframe"
+    id = 1
+
+    def accepts(self, value: Any) -> bool:
+        if isinstance(value, pd.Series):
+            return (value.name is None or type(value.name) is str) and _npframe_supported(value.to_frame(name="s"))
+        return isinstance(value, pd.DataFrame) and _npframe_supported(value)
+
+    def encode(self, value: Any) -> bytes:
+        series = isinstance(value, pd.Series)
+        df = value.to_frame(name=value.name if value.name is not None else "__series__") if series else value
+        buffers: List[bytes] = []
+        cols = []
+        for name in df.columns:
+            arr = np.ascontiguousarray(df[name].to_numpy())
+            buffers.append(_shuffle(arr))
+            cols.append({"name": name, "dtype": arr.dtype.str})
+        idx = df.index
+        if isinstance(idx, pd.RangeIndex):
+            index = {"kind": "range", "start": idx.start, "stop": idx.stop, "step": idx.step, "name": idx.name}
+        else:
+            arr = np.ascontiguousarray(idx.to_numpy())
+            buffers.append(_shuffle(arr))
+            index = {"kind": "array", "dtype": arr.dtype.str, "name": idx.name}
+        header = json.dumps({
+            "n": len(df), "cols": cols, "index": index,
+            "series": series, "series_name": value.name if series else None,
+            "columns_name": None if series else df.columns.name,
+        }).encode()
+        return struct.pack("<I", len(header)) + header + b"".join(buffers)
+
+    def decode(self, data: bytes) -> Any:
+        (hlen,) = struct.unpack_from("<I", data, 0)
+        meta = json.loads(data[4:4 + hlen])
+        buf = memoryview(data)
+        n, offset = meta["n"], 4 + hlen
+        columns = {}
+        for col in meta["cols"]:
+            dtype = np.dtype(col["dtype"])
+            columns[col["name"]] = _unshuffle(buf, dtype, n, offset)
+            offset += dtype.itemsize * n
+        index_meta = meta["index"]
+        if index_meta["kind"] == "range":
+            index = pd.RangeIndex(index_meta["start"], index_meta["stop"], index_meta["step"], name=index_meta["name"])
+        else:
+            dtype = np.dtype(index_meta["dtype"])
+            index = pd.Index(_unshuffle(buf, dtype, n, offset), name=index_meta["name"])
+        df = pd.DataFrame(columns, index=index, copy=False)
+        if meta["series"]:
+            s = df.iloc[:, 0]
+            s.name = meta["series_name"]
+            return s
+        df.columns.name = meta["columns_name"]
+        return df
+
+
+class ArrowFrameCodec(Codec):
+    """DataFrame → Arrow IPC 스트림 (pyarrow 설치 시)
+
+    to_pandas 가 dtype 을 바꾸는 경우가 있어 (nullable/범주/tz/인덱스 종류 등) exact=False.
+    """
+    name = "arrow"
+    id = 2
+    available = ARROW_AVAILABLE
+    exact = False
+
+    def accepts(self, value: Any) -> bool:
+        return ARROW_AVAILABLE and isinstance(value, pd.DataFrame) and all(type(c) is str for c in value.columns)
+
+    def encode(self, value: Any) -> bytes:
+        table = pa.Table.from_pandas(value, preserve_index=True)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, data: bytes) -> Any:
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all().to_pandas()
+
+
+class OrjsonCodec(Codec):
+    """JSON 안전 dict/list → orjson"""
+    name = "orjson"
+    id = 3
+    available = ORJSON_AVAILABLE
+
+    def accepts(self, value: Any) -> bool:
+        return ORJSON_AVAILABLE and isinstance(value, (dict, list)) and _json_safe(value)
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value)
+
+    def decode(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """JSON 안전 dict/list → msgpack (msgpack 설치 시)"""
+    name = "msgpack"
+    id = 4
+    available = MSGPACK_AVAILABLE
+
+    def accepts(self, value: Any) -> bool:
+        return MSGPACK_AVAILABLE and isinstance(value, (dict, list)) and _json_safe(value)
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+class PickleCodec(Codec):
+    """나머지 DataFrame/dict/list → pickle (압축 적용 대상으로 만들기 위해 직접 직렬화)"""
+    name = "pickle"
+    id = 5
+
+    def accepts(self, value: Any) -> bool:
+        return True
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def decode(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+# ===== 압축 =====
+
+_COMPRESSORS: Dict[int, Tuple[str, Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    0: ("none", lambda b: b, lambda b: b),
+    1: ("zlib", lambda b: zlib.compress(b, 1), zlib.decompress),
+}
+if ZSTD_AVAILABLE:
+    _COMPRESSORS[2] = (
+        "zstd",
+        lambda b: zstandard.ZstdCompressor(level=3).compress(b),
+        lambda b: zstandard.ZstdDecompressor().decompress(b),
+    )
+
+
+def resolve_compression(name: str) -> int:
+    """설정 문자열 → 압축 id ("auto" 는 zstd 가능 시 zstd, 아니면 zlib)"""
+    name = (name or "auto").lower()
+    if name == "auto":
+        return 2 if ZSTD_AVAILABLE else 1
+    for cid, (cname, _, _) in _COMPRESSORS.items():
+        if cname == name:
+            return cid
+    logger.warning(f"Cache compression '{name}' not available, using zlib")
+    return 1
+
+
+# ===== 코덱 레지스트리 =====
+
+class CacheCodec:
+    """값 유형별 코덱 선택 + 압축 + 접두사별 크기/시간 통계
+
+    encode() 는 DataFrame/Series/dict/list 만 바이트로 바꾸고 나머지는 그대로 반환.
+    decode() 는 MAGIC 으로 시작하는 bytes 만 복원하고 나머지는 그대로 반환.
+    """
+
+    def __init__(self, codecs: Optional[List[Codec]] = None, compression: str = "auto", compress_min_bytes: int = 1024):
+        self.codecs = codecs or [NumpyFrameCodec(), ArrowFrameCodec(), OrjsonCodec(), MsgpackCodec(), PickleCodec()]
+        self._by_id = {c.id: c for c in self.codecs}
+        self.compression = resolve_compression(compression)
+        self.compress_min_bytes = compress_min_bytes
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, codec: Codec, first: bool = True) -> None:
+        """코덱 추가 (first=True 면 기존 코덱보다 먼저 시도)"""
+        self.codecs = [codec] + self.codecs if first else self.codecs[:-1] + [codec, self.codecs[-1]]
+        self._by_id[codec.id] = codec
+
+    @staticmethod
+    def handles(value: Any) -> bool:
+        return isinstance(value, (pd.DataFrame, pd.Series, dict, list))
+
+    def encode(self, key: str, value: Any) -> Any:
+        if not self.handles(value):
+            return value
+        start = time.perf_counter()
+        for codec in self.codecs:
+            try:
+                if not codec.accepts(value):
+                    continue
+                raw = codec.encode(value)
+                if not codec.exact and not _same_value(value, codec.decode(raw)):
+                    logger.debug(f"Codec {codec.name} does not round-trip {key}, trying next")
+                    continue
+            except Exception as e:
+                logger.debug(f"Codec {codec.name} failed for {key}: {e}")
+                continue
+            cid = 0
+            payload = raw
+            if self.compression and len(raw) >= self.compress_min_bytes:
+                compressed = _COMPRESSORS[self.compression][1](raw)
+                if len(compressed) < len(raw):
+                    cid, payload = self.compression, compressed
+            data = MAGIC + bytes((codec.id, cid)) + payload
+            self._record(key, codec.name, "encode", time.perf_counter() - start, len(raw), len(data))
+            return data
+        return value
+
+    def decode(self, key: str, value: Any) -> Any:
+        if not (isinstance(value, bytes) and value[:len(MAGIC)] == MAGIC and len(value) >= _HEADER):
+            return value
+        start = time.perf_counter()
+        codec = self._by_id.get(value[len(MAGIC)])
+        compressor = _COMPRESSORS.get(value[len(MAGIC) + 1])
+        if codec is None or compressor is None:
+            raise ValueError(f"Unknown cache codec for {key}")
+        decoded = codec.decode(compressor[2](value[_HEADER:]))
+        self._record(key, codec.name, "decode", time.perf_counter() - start)
+        return decoded
+
+    def _record(self, key: str, codec: str, op: str, seconds: float, raw: int = 0, stored: int = 0) -> None:
+        prefix = key.split(":", 1)[0]
+        with self._lock:
+            s = self._stats.setdefault(prefix, {
+                "encoded": 0, "decoded": 0, "raw_bytes": 0, "stored_bytes": 0,
+                "encode_ms": 0.0, "decode_ms": 0.0, "codecs": {},
+            })
+            if op == "encode":
+                s["encoded"] += 1
+                s["raw_bytes"] += raw
+                s["stored_bytes"] += stored
+                s["encode_ms"] += seconds * 1000
+                s["codecs"][codec] = s["codecs"].get(codec, 0) + 1
+            else:
+                s["decoded"] += 1
+                s["decode_ms"] += seconds * 1000
+
+    def stats(self) -> Dict[str, Any]:
+        """접두사별 저장 크기 / 인코딩·디코딩 시간"""
+        with self._lock:
+            prefixes = {}
+            for prefix, s in self._stats.items():
+                prefixes[prefix] = {
+                    **s,
+                    "codecs": dict(s["codecs"]),
+                    "encode_ms": round(s["encode_ms"], 3),
+                    "decode_ms": round(s["decode_ms"], 3),
+                    "avg_stored_bytes": round(s["stored_bytes"] / s["encoded"]) if s["encoded"] else 0,
+                    "compression_ratio": round(s["raw_bytes"] / s["stored_bytes"], 2) if s["stored_bytes"] else 0.0,
+                }
+        return {
+            "codecs": [c.name for c in self.codecs if c.available],
+            "compression": _COMPRESSORS[self.compression][0],
+            "prefixes": prefixes,
+        }
@@ -1,46 +1,47 @@
 """캐싱 레이어 - Phase 3 Week 4
 
-Redis 기반 캐싱으로 팩터 분석 성능 최적화
+팩터/테마 분석 결과 캐싱. 저장소는 cache_manager.CacheManager (L1 + disk/redis/memory L2 백엔드) 와 통합되어
+키/통계/만료 정책을 공유한다. redis_url 을 주면 해당 Redis 를 L2 로 쓰는 별도 매니저를 만든다.
 """
 
-import json
 import hashlib
 import logging
 from typing import Any, Optional, Dict, Callable
-from datetime import datetime, timedelta
 from functools import wraps
 
 logger = logging.getLogger(__name__)
 
 
 class CacheLayer:
-    """Redis 기반 캐싱 레이어"""
+    """CacheManager 기반 캐싱 레이어 (기존 Redis 전용 API 유지)"""
 
-    def __init__(self, redis_url: Optional[str] = None, enabled: bool = True):
+    def __init__(self, redis_url: Optional[str] = None, enabled: bool = True, manager: Optional[Any] = None):
         """캐시 레이어 초기화
 
         Args:
-            redis_url: Redis 연결 URL (default: redis://localhost:6379/0)
+            redis_url: Redis 연결 URL (None 이면 전역 CacheManager 의 설정 백엔드 사용, CACHE_BACKEND)
             enabled: 캐싱 활성화 여부
+            manager: 사용할 CacheManager (테스트용)
         """
         self.enabled = enabled
-        self.redis_client = None
+        self.manager = manager
 
         if not self.enabled:
             logger.info("Caching is disabled")
             return
 
+        if self.manager is not None:
+            return
+
+        from mcp_server.tools.cache_manager import CacheManager, cache_manager
+        if redis_url is None:
+            self.manager = cache_manager
+            return
+
         try:
-            import redis
-            self.redis_url = redis_url or "redis://localhost:6379/0"
-            self.redis_client = redis.from_url(
-                self.redis_url,
-                decode_responses=True,
-                socket_connect_timeout=2,
-                socket_timeout=2
-            )
-            # 연결 테스트
-            self.redis_client.ping()
+            from mcp_server.tools.cache_backends import RedisBackend
+            self.redis_url = redis_url
+            self.manager = CacheManager(backend=RedisBackend.from_url(redis_url))
             logger.info(f"Redis cache connected: {self.redis_url}")
         except ImportError:
             logger.warning("redis package not installed, caching disabled")
@@ -58,20 +59,9 @@ class CacheLayer:
         Returns:
             캐시된 값 (없으면 None)
         """
-        if not self.enabled or not self.redis_client:
-            return None
-
-        try:
-            value = self.redis_client.get(key)
-            if value:
-                logger.debug(f"Cache hit: {key}")
-                return json.loads(value)
-            else:
-                logger.debug(f"Cache miss: {key}")
-                return None
-        except Exception as e:
-            logger.warning(f"Cache get failed for {key}: {e}")
+        if not self.enabled or self.manager is None:
             return None
+        return self.manager.get(key)
 
     def set(
         self,
@@ -89,20 +79,36 @@ class CacheLayer:
         Returns:
             성공 여부
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled or self.manager is None:
             return False
+        return self.manager.set(key, value, ttl)
 
-        try:
-            serialized = json.dumps(value, default=str)
-            if ttl:
-                self.redis_client.setex(key, ttl, serialized)
-            else:
-                self.redis_client.set(key, serialized)
-            logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
-            return True
-        except Exception as e:
-            logger.warning(f"Cache set failed for {key}: {e}")
+    def get_many(self, keys: list) -> Dict[str, Any]:
+        """여러 키 일괄 조회 (L2 왕복 1회)
+
+        Args:
+            keys: 캐시 키 목록
+
+        Returns:
+            {키: 값} (적중한 키만)
+        """
+        if not self.enabled or self.manager is None:
+            return {}
+        return self.manager.get_many(keys)
+
+    def set_many(self, mapping: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """여러 키 일괄 저장 (L2 왕복 1회)
+
+        Args:
+            mapping: {키: 값}
+            ttl: TTL (초 단위, None이면 영구)
+
+        Returns:
+            성공 여부
+        """
+        if not self.enabled or self.manager is None:
             return False
+        return self.manager.set_many(mapping, ttl)
 
     def delete(self, key: str) -> bool:
         """캐시에서 값 삭제
@@ -111,18 +117,14 @@ class CacheLayer:
             key: 캐시 키
 
         Returns:
-            성공 여부
+            삭제 여부 (키가 없었으면 False)
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled or self.manager is None:
             return False
-
-        try:
-            self.redis_client.delete(key)
+        deleted = self.manager.delete(key)
+        if deleted:
             logger.debug(f"Cache deleted: {key}")
-            return True
-        except Exception as e:
-            logger.warning(f"Cache delete failed for {key}: {e}")
-            return False
+        return deleted
 
     def clear_pattern(self, pattern: str) -> int:
         """패턴에 맞는 캐시 일괄 삭제
@@ -133,19 +135,12 @@ class CacheLayer:
         Returns:
             삭제된 키 개수
         """
-        if not self.enabled or not self.redis_client:
-            return 0
-
-        try:
-            keys = list(self.redis_client.scan_iter(match=pattern))
-            if keys:
-                deleted = self.redis_client.delete(*keys)
-                logger.info(f"Cache cleared: {deleted} keys matching '{pattern}'")
-                return deleted
-            return 0
-        except Exception as e:
-            logger.warning(f"Cache clear failed for pattern {pattern}: {e}")
+        if not self.enabled or self.manager is None:
             return 0
+        deleted = self.manager.delete_pattern(pattern)
+        if deleted:
+            logger.info(f"Cache cleared: {deleted} keys matching '{pattern}'")
+        return deleted
 
     @staticmethod
     def generate_key(prefix: str, **kwargs) -> str:
@@ -176,7 +171,9 @@ class CacheLayer:
         ttl: int = 3600,
         key_func: Optional[Callable] = None
     ):
-        """함수 결과 캐싱 데코레이터
+        """함수 결과 캐싱 데코레이터 - CacheManager.cached 에 위임
+
+        키 체계, single-flight, None 미캐싱, .invalidate(*args, **kwargs) 가 cache_manager.cached 와 같다.
 
         Args:
             prefix: 캐시 키 prefix
@@ -190,35 +187,15 @@ class CacheLayer:
                 return result
         """
         def decorator(func):
+            if self.enabled and self.manager is not None:
+                return self.manager.cached(ttl=ttl, prefix=prefix, key_func=key_func)(func)
+
+            # 캐싱 비활성화 시 바로 실행
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # 캐싱 비활성화 시 바로 실행
-                if not self.enabled:
-                    return func(*args, **kwargs)
-
-                # 캐시 키 생성
-                if key_func:
-                    cache_key = key_func(*args, **kwargs)
-                else:
-                    # 기본 키: prefix:arg1:arg2:kwarg1=val1:kwarg2=val2
-                    key_parts = [prefix]
-                    key_parts.extend([str(arg) for arg in args])
-                    key_parts.extend([f"{k}={v}" for k, v in sorted(kwargs.items())])
-                    cache_key = ":".join(key_parts)
-
-                # 캐시 확인
-                cached_value = self.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
-
-                # 캐시 미스: 함수 실행
-                result = func(*args, **kwargs)
-
-                # 결과 캐싱
-                self.set(cache_key, result, ttl)
-
-                return result
+                return func(*args, **kwargs)
 
+            wrapper.invalidate = lambda *args, **kwargs: False
             return wrapper
         return decorator
 
@@ -228,32 +205,28 @@ class CacheLayer:
         Returns:
             캐시 통계 정보
         """
-        if not self.enabled or not self.redis_client:
+        if not self.enabled or self.manager is None:
             return {
                 'enabled': False,
                 'status': 'disabled'
             }
 
-        try:
-            info = self.redis_client.info('stats')
-            return {
-                'enabled': True,
-                'status': 'connected',
-                'total_keys': self.redis_client.dbsize(),
-                'hits': info.get('keyspace_hits', 0),
-                'misses': info.get('keyspace_misses', 0),
-                'hit_rate': self._calculate_hit_rate(
-                    info.get('keyspace_hits', 0),
-                    info.get('keyspace_misses', 0)
-                )
-            }
-        except Exception as e:
-            logger.warning(f"Failed to get cache stats: {e}")
+        stats = self.manager.stats()
+        if not stats:
             return {
                 'enabled': True,
                 'status': 'error',
-                'error': str(e)
             }
+        hits = stats['l1']['hits'] + stats['l2']['hits']
+        return {
+            'enabled': True,
+            'status': 'connected',
+            'backend': stats.get('backend'),
+            'total_keys': stats['item_count'],
+            'hits': hits,
+            'misses': stats['misses'],
+            'hit_rate': self._calculate_hit_rate(hits, stats['misses'])
+        }
 
     @staticmethod
     def _calculate_hit_rate(hits: int, misses: int) -> float:
@@ -1,22 +1,44 @@
 """
-캐시 관리자 모듈 - diskcache 기반 TTL 캐싱 시스템
+캐시 관리자 모듈 - TTL 캐싱 시스템 (L2 백엔드: diskcache 기본, Redis / 메모리 교체 가능)
 
 Features:
 - 데이터 유형별 TTL 정책
 - 데코레이터 패턴으로 쉬운 적용
-- 동시성 안전 (diskcache 내장 락)
+- 동시성 안전 (diskcache 내장 락 / Redis)
+- L2 백엔드 교체 (CACHE_BACKEND=disk|redis|memory) - 여러 uvicorn 워커/호스트가 Redis 로 워밍된 데이터 공유
 - 캐시 통계 및 관리 기능
+- 프로세스 내 L1 LRU (diskcache = L2) - 자주 읽는 키는 SQLite/unpickle 생략
+- single-flight: 같은 키의 동시 미스는 한 번만 계산하고 나머지는 결과를 기다림 (스레드/asyncio)
+- stale-while-revalidate: soft TTL 이후 stale 값을 즉시 반환하고 백그라운드 갱신 (TTL.*_SWR)
+- 일괄 조회/저장 (get_many / set_many / cached_many): 여러 키를 L2 왕복 1회 (disk 트랜잭션 / Redis 파이프라인)
+- 값 코덱: DataFrame/dict 는 L2 저장 전 NumPy 버퍼/orjson + 압축으로 직렬화 (cache_codec, 접두사별 크기/시간 통계)
 """
 from __future__ import annotations
-from typing import Optional, Any, Callable, TypeVar, ParamSpec
+from typing import Optional, Any, Callable, Dict, Hashable, Iterable, List, Mapping, TypeVar, ParamSpec, NamedTuple, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
 from functools import wraps
+import asyncio
+import copy
+import inspect
 from datetime import datetime
+import threading
 import hashlib
 import json
+import sys
+import time
 import os
 import logging
 
-from diskcache import Cache, FanoutCache
+
+from mcp_server.config import (
+    CACHE_L1_ENABLED, CACHE_L1_MAX_ITEMS, CACHE_L1_MAX_MB, CACHE_L1_MAX_TTL, CACHE_FLIGHT_TIMEOUT,
+    CACHE_REFRESH_WORKERS, CACHE_REFRESH_MAX_QUEUE,
+    CACHE_CODEC_ENABLED, CACHE_COMPRESSION, CACHE_COMPRESS_MIN_BYTES,
+    CACHE_BACKEND, CACHE_REDIS_URL, CACHE_REDIS_NAMESPACE,
+)
+from mcp_server.tools.cache_backends import CacheBackend, create_backend
+from mcp_server.tools.cache_codec import CacheCodec
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +52,15 @@ P = ParamSpec("P")
 T = TypeVar("T")
 
 
+class SWR(NamedTuple):
+    """stale-while-revalidate TTL 정책
+
+    soft 이전: 신선한 값 / soft~hard: stale 값을 즉시 반환하고 백그라운드 갱신 / hard 이후: 만료 (차단 조회)
+    """
+    soft: int
+    hard: int
+
+
 class TTL:
     """TTL 상수 (초 단위)"""
     REALTIME = 15 * 60          # 15분 - 실시간 가격
@@ -41,6 +72,141 @@ class TTL:
     METRICS = 4 * 60 * 60       # 4시간 - 계산된 메트릭
     LONG = 7 * 24 * 60 * 60     # 7일 - 장기 캐시
 
+    # stale-while-revalidate 정책 (soft 는 기존 TTL, hard 까지는 stale 값 즉시 반환)
+    REALTIME_SWR = SWR(REALTIME, INTRADAY)
+    DAILY_SWR = SWR(DAILY, 24 * 60 * 60)
+    METRICS_SWR = SWR(METRICS, 24 * 60 * 60)
+    NEWS_SWR = SWR(NEWS, 6 * 60 * 60)
+    FILING_SWR = SWR(FILING, LONG)
+    FUNDAMENTAL_SWR = SWR(FUNDAMENTAL, LONG)
+
+
+class _Stamped:
+    """soft TTL 이 있는 값의 저장 형식 (get 은 값만 반환, get_swr 은 stale 여부도 반환)"""
+    __slots__ = ("value", "fresh_until")
+
+    def __init__(self, value: Any, fresh_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+
+    def __getstate__(self):
+        return (self.value, self.fresh_until)
+
+    def __setstate__(self, state):
+        self.value, self.fresh_until = state
+
+
+def _approx_size(value: Any) -> int:
+    """L1 크기 추정 (바이트) - 피클링 없이 컨테이너는 한 단계까지만 합산"""
+    if isinstance(value, _Stamped):
+        value = value.value
+    if type(value).__module__.startswith("pandas") and hasattr(value, "memory_usage"):
+        try:
+            usage = value.memory_usage(deep=False)
+            return int(getattr(usage, "sum", lambda: usage)())
+        except Exception:
+            pass
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(v) for v in value)
+    return size
+
+
+def _detach(value: Any) -> Any:
+    """L1 에 넣고 꺼낼 때의 사본 - 호출자가 결과를 수정해도 캐시 값은 유지
+
+    diskcache 는 매번 새 객체를 unpickle 하므로 같은 보장을 위해 컨테이너는 중첩까지 깊은 복사
+    (얕은 복사면 안쪽 dict/list 가 L1 항목 및 single-flight 후행 호출자와 공유됨).
+    """
+    if isinstance(value, _Stamped):
+        return _Stamped(_detach(value.value), value.fresh_until)
+    if isinstance(value, (dict, list, tuple, set)):
+        return copy.deepcopy(value)
+    if type(value).__module__.startswith("pandas") and callable(getattr(value, "copy", None)):
+        return value.copy(deep=True)
+    return value
+
+
+class L1Cache:
+    """프로세스 내 LRU (항목 수 + 추정 바이트 상한, 항목별 만료 시각)
+
+    - 만료 시각은 L2 의 남은 TTL 과 max_ttl 중 짧은 쪽
+    - 같은 프로세스의 set/delete/clear 는 즉시 반영, 다른 프로세스의 L2 갱신은 max_ttl 이내 반영
+    """
+
+    def __init__(self, max_items: int = 2048, max_bytes: int = 128 * 1024 * 1024, max_ttl: int = 300):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.max_ttl = max_ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()  # key → (value, expires_at, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    _MISS = object()
+
+    def get(self, key: str) -> Any:
+        """값 조회 (없거나 만료되면 L1Cache._MISS)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return self._MISS
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                self._bytes -= size
+                return self._MISS
+            self._data.move_to_end(key)
+        return _detach(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """값 저장 (ttl 은 L2 기준 남은 초, None 이면 max_ttl)"""
+        ttl = self.max_ttl if ttl is None else min(ttl, self.max_ttl)
+        if ttl <= 0:
+            self.delete(key)
+            return
+        size = _approx_size(value)
+        if size > self.max_bytes:
+            self.delete(key)
+            return
+        value = _detach(value)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (value, time.time() + ttl, size)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_items or self._bytes > self.max_bytes):
+                _, (_, _, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return False
+            self._bytes -= entry[2]
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "items": len(self._data),
+                "size_bytes": self._bytes,
+                "max_items": self.max_items,
+                "max_bytes": self.max_bytes,
+                "max_ttl": self.max_ttl,
+                "evictions": self.evictions,
+            }
+
 
 class CacheManager:
     """통합 캐시 관리자
@@ -60,30 +226,53 @@ class CacheManager:
 
     _instance: Optional["CacheManager"] = None
 
-    def __new__(cls, cache_dir: Optional[str] = None, size_limit: int = int(1e9)):
-        """싱글톤 패턴"""
+    def __new__(cls, cache_dir: Optional[str] = None, size_limit: int = int(1e9), l1: Optional[L1Cache] = None,
+                backend: Optional[CacheBackend] = None):
+        """싱글톤 패턴 (backend 를 직접 주면 별도 인스턴스)"""
+        if backend is not None:
+            instance = super().__new__(cls)
+            instance._initialized = False
+            return instance
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self, cache_dir: Optional[str] = None, size_limit: int = int(1e9)):
+    def __init__(self, cache_dir: Optional[str] = None, size_limit: int = int(1e9), l1: Optional[L1Cache] = None,
+                 backend: Optional[CacheBackend] = None):
         if self._initialized:
             return
 
         self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
-        os.makedirs(self.cache_dir, exist_ok=True)
 
-        # FanoutCache: 여러 샤드로 동시성 향상
-        self.cache = FanoutCache(
-            self.cache_dir,
-            shards=4,
-            size_limit=size_limit,
-            timeout=1  # 락 타임아웃 1초
-        )
+        # L2 백엔드 (기본 disk = FanoutCache 4샤드, redis 연결 실패 시 disk 로 대체)
+        if backend is None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            backend = create_backend(CACHE_BACKEND, self.cache_dir, size_limit, CACHE_REDIS_URL, CACHE_REDIS_NAMESPACE)
+        self.cache = backend
+
+        # L1: 프로세스 내 LRU (CACHE_L1_ENABLED=false 면 비활성)
+        if l1 is None and CACHE_L1_ENABLED:
+            l1 = L1Cache(CACHE_L1_MAX_ITEMS, int(CACHE_L1_MAX_MB * 1024 * 1024), CACHE_L1_MAX_TTL)
+        self.l1 = l1
+        self._counters = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "l2_reads": 0, "flights": 0, "coalesced": 0}
+        self._counter_lock = threading.Lock()
+
+        # single-flight: 캐시 키 → 진행 중인 계산 (스레드/이벤트 루프 간 공유 가능한 concurrent Future)
+        self._flights: dict = {}
+        self._flight_lock = threading.Lock()
+
+        # stale-while-revalidate 백그라운드 갱신 (키당 1건, 대기열 상한 초과 시 생략)
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        self._refreshing: dict = {}  # key → "queued" | "running"
+        self._refresh_counters = {"stale_served": 0, "completed": 0, "failed": 0, "dropped": 0}
+
+        # L2 값 코덱 (CACHE_CODEC_ENABLED=false 면 diskcache 기본 pickle, 기존 pickle 값은 항상 그대로 읽힘)
+        self.codec = CacheCodec(compression=CACHE_COMPRESSION, compress_min_bytes=CACHE_COMPRESS_MIN_BYTES) \
+            if CACHE_CODEC_ENABLED else None
 
         self._initialized = True
-        logger.info(f"CacheManager initialized: {self.cache_dir}")
+        logger.info(f"CacheManager initialized: {self.cache.info()}")
 
     def _make_key(self, prefix: str, *args, **kwargs) -> str:
         """캐시 키 생성"""
@@ -91,29 +280,165 @@ class CacheManager:
         key_hash = hashlib.md5(key_data.encode()).hexdigest()[:12]
         return f"{prefix}:{key_hash}"
 
+    def _count(self, name: str) -> None:
+        with self._counter_lock:
+            self._counters[name] += 1
+
     def get(self, key: str, default: Any = None) -> Any:
-        """캐시에서 값 조회"""
+        """캐시에서 값 조회 (L1 → L2 순, L2 적중 시 남은 TTL 만큼 L1 에 적재)
+
+        soft TTL 이 지난 stale 값도 hard TTL 이전이면 반환 (갱신 여부는 get_swr 로 확인)
+        """
+        value = self._lookup(key, default, count=True)
+        return value.value if isinstance(value, _Stamped) else value
+
+    def get_swr(self, key: str, default: Any = None) -> Tuple[Any, bool]:
+        """(값, stale 여부) - stale 은 soft TTL 이 지났지만 hard TTL 이전인 값"""
+        value = self._lookup(key, default, count=True)
+        if isinstance(value, _Stamped):
+            return value.value, value.fresh_until <= time.time()
+        return value, False
+
+    def _peek(self, key: str) -> Any:
+        """통계에 집계하지 않는 조회 (값만)"""
+        value = self._lookup(key, None, count=False)
+        return value.value if isinstance(value, _Stamped) else value
+
+    def _lookup(self, key: str, default: Any = None, count: bool = True) -> Any:
+        if self.l1 is not None:
+            value = self.l1.get(key)
+            if value is not L1Cache._MISS:
+                if count:
+                    self._count("l1_hits")
+                logger.debug(f"Cache L1 HIT: {key}")
+                return value
         try:
-            value = self.cache.get(key, default=default)
+            self._count("l2_reads")
+            value, expire_time = self.cache.get(key, default=default, expire_time=True)
             if value is not default:
+                value = self._decode(key, value)
+                if count:
+                    self._count("l2_hits")
                 logger.debug(f"Cache HIT: {key}")
+                if self.l1 is not None:
+                    self.l1.set(key, value, None if expire_time is None else expire_time - time.time())
+            elif count:
+                self._count("misses")
             return value
         except Exception as e:
             logger.warning(f"Cache get error: {key} - {e}")
             return default
 
-    def set(self, key: str, value: Any, ttl: int) -> bool:
-        """캐시에 값 저장"""
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """여러 키 일괄 조회 → {키: 값} (적중 키만). L1 에 없는 키는 L2 왕복 1회로 조회"""
+        return {k: v.value if isinstance(v, _Stamped) else v for k, v in self._lookup_many(keys).items()}
+
+    def get_many_swr(self, keys: Iterable[str]) -> Dict[str, Tuple[Any, bool]]:
+        """여러 키 일괄 조회 → {키: (값, stale 여부)} (적중 키만)"""
+        now = time.time()
+        return {
+            k: (v.value, v.fresh_until <= now) if isinstance(v, _Stamped) else (v, False)
+            for k, v in self._lookup_many(keys).items()
+        }
+
+    def _lookup_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, Any] = {}
+        todo = keys
+        if self.l1 is not None:
+            todo = []
+            for key in keys:
+                value = self.l1.get(key)
+                if value is L1Cache._MISS:
+                    todo.append(key)
+                else:
+                    found[key] = value
+        with self._counter_lock:
+            self._counters["l1_hits"] += len(found)
+        if not todo:
+            return found
+
         try:
-            self.cache.set(key, value, expire=ttl)
+            self._count("l2_reads")
+            rows = self.cache.get_many(todo)
+        except Exception as e:
+            logger.warning(f"Cache get_many error: {len(todo)} keys - {e}")
+            rows = {}
+        now = time.time()
+        for key, (value, expire_time) in rows.items():
+            try:
+                value = self._decode(key, value)
+            except Exception as e:
+                logger.warning(f"Cache decode error: {key} - {e}")
+                continue
+            found[key] = value
+            if self.l1 is not None:
+                self.l1.set(key, value, None if expire_time is None else expire_time - now)
+        with self._counter_lock:
+            hits = sum(1 for key in todo if key in found)
+            self._counters["l2_hits"] += hits
+            self._counters["misses"] += len(todo) - hits
+        logger.debug(f"Cache get_many: {len(keys)} keys, {len(found)} hits")
+        return found
+
+    def set(self, key: str, value: Any, ttl: Union[int, SWR]) -> bool:
+        """캐시에 값 저장 (L1/L2 동시 기록, ttl 이 SWR 이면 hard TTL 로 저장하고 soft 시각 기록)"""
+        if isinstance(ttl, SWR):
+            value = _Stamped(value, time.time() + ttl.soft)
+            ttl = ttl.hard
+        try:
+            self.cache.set(key, self._encode(key, value), expire=ttl)
+            if self.l1 is not None:
+                self.l1.set(key, value, ttl)
             logger.debug(f"Cache SET: {key} (TTL={ttl}s)")
             return True
         except Exception as e:
+            if self.l1 is not None:
+                self.l1.delete(key)
             logger.warning(f"Cache set error: {key} - {e}")
             return False
 
+    def _encode(self, key: str, value: Any) -> Any:
+        """L2 저장 형식으로 변환 (_Stamped 는 안쪽 값만 인코딩)"""
+        if self.codec is None:
+            return value
+        if isinstance(value, _Stamped):
+            return _Stamped(self.codec.encode(key, value.value), value.fresh_until)
+        return self.codec.encode(key, value)
+
+    def _decode(self, key: str, value: Any) -> Any:
+        if self.codec is None:
+            return value
+        if isinstance(value, _Stamped):
+            return _Stamped(self.codec.decode(key, value.value), value.fresh_until)
+        return self.codec.decode(key, value)
+
+    def set_many(self, mapping: Mapping[str, Any], ttl: Union[int, SWR]) -> bool:
+        """여러 키 일괄 저장 (L2 왕복 1회, L1 동시 기록)"""
+        if not mapping:
+            return True
+        if isinstance(ttl, SWR):
+            fresh_until = time.time() + ttl.soft
+            mapping = {k: _Stamped(v, fresh_until) for k, v in mapping.items()}
+            ttl = ttl.hard
+        try:
+            self.cache.set_many({k: self._encode(k, v) for k, v in mapping.items()}, expire=ttl)
+            if self.l1 is not None:
+                for key, value in mapping.items():
+                    self.l1.set(key, value, ttl)
+            logger.debug(f"Cache SET many: {len(mapping)} keys (TTL={ttl}s)")
+            return True
+        except Exception as e:
+            if self.l1 is not None:
+                for key in mapping:
+                    self.l1.delete(key)
+            logger.warning(f"Cache set_many error: {len(mapping)} keys - {e}")
+            return False
+
     def delete(self, key: str) -> bool:
-        """캐시에서 키 삭제"""
+        """캐시에서 키 삭제 (L1 포함)"""
+        if self.l1 is not None:
+            self.l1.delete(key)
         try:
             return self.cache.delete(key)
         except Exception as e:
@@ -124,6 +449,8 @@ class CacheManager:
         """전체 캐시 삭제"""
         try:
             count = len(self.cache)
+            if self.l1 is not None:
+                self.l1.clear()
             self.cache.clear()
             logger.info(f"Cache cleared: {count} items")
             return count
@@ -131,6 +458,15 @@ class CacheManager:
             logger.warning(f"Cache clear error: {e}")
             return 0
 
+    def delete_pattern(self, pattern: str) -> int:
+        """패턴(fnmatch, 예: "factor:*")에 맞는 키 일괄 삭제 (L1 포함)"""
+        try:
+            keys = list(self.cache.scan(pattern))
+        except Exception as e:
+            logger.warning(f"Cache scan error: {pattern} - {e}")
+            return 0
+        return sum(1 for key in keys if self.delete(key))
+
     def expire(self) -> int:
         """만료된 캐시 정리"""
         try:
@@ -142,14 +478,115 @@ class CacheManager:
             logger.warning(f"Cache expire error: {e}")
             return 0
 
+    def hit_stats(self) -> dict:
+        """L1/L2 적중률 (조회 수 대비)"""
+        with self._counter_lock:
+            c = dict(self._counters)
+        lookups = c["l1_hits"] + c["l2_hits"] + c["misses"]
+
+        def rate(n: int) -> float:
+            return round(n / lookups * 100, 2) if lookups else 0.0
+
+        l1 = {"enabled": self.l1 is not None, "hits": c["l1_hits"], "hit_rate": rate(c["l1_hits"])}
+        if self.l1 is not None:
+            l1.update(self.l1.stats())
+        with self._flight_lock:
+            in_flight = len(self._flights)
+        return {
+            "lookups": lookups,
+            "l1": l1,
+            "l2": {"hits": c["l2_hits"], "hit_rate": rate(c["l2_hits"]), "reads": c["l2_reads"]},
+            "misses": c["misses"],
+            "hit_rate": rate(c["l1_hits"] + c["l2_hits"]),
+            "single_flight": {"flights": c["flights"], "coalesced": c["coalesced"], "in_flight": in_flight},
+            "refresh": self.refresh_stats(),
+        }
+
+    # ===== stale-while-revalidate =====
+
+    def refresh_in_background(self, key: str, refresh: Callable[[], Any]) -> bool:
+        """stale 키 백그라운드 갱신 예약 (같은 키가 이미 대기/진행 중이거나 대기열이 가득 차면 False)
+
+        refresh 는 새 값을 계산해 캐시에 기록하는 함수 (예외는 로그만 남김).
+        """
+        with self._counter_lock:
+            self._refresh_counters["stale_served"] += 1
+            if key in self._refreshing:
+                return False
+            queued = sum(1 for state in self._refreshing.values() if state == "queued")
+            if queued >= CACHE_REFRESH_MAX_QUEUE:
+                self._refresh_counters["dropped"] += 1
+                return False
+            self._refreshing[key] = "queued"
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+                )
+            pool = self._refresh_pool
+
+        def run() -> None:
+            with self._counter_lock:
+                self._refreshing[key] = "running"
+            try:
+                refresh()
+                outcome = "completed"
+            except Exception as e:
+                logger.warning(f"Background refresh failed: {key} - {e}")
+                outcome = "failed"
+            with self._counter_lock:
+                self._refreshing.pop(key, None)
+                self._refresh_counters[outcome] += 1
+
+        pool.submit(run)
+        return True
+
+    def refresh_stats(self) -> dict:
+        """백그라운드 갱신 대기열 깊이 및 누적 카운터"""
+        with self._counter_lock:
+            states = list(self._refreshing.values())
+            return {
+                "queued": states.count("queued"),
+                "running": states.count("running"),
+                "max_queue": CACHE_REFRESH_MAX_QUEUE,
+                "workers": CACHE_REFRESH_WORKERS,
+                **self._refresh_counters,
+            }
+
+    # ===== single-flight =====
+
+    def _join_flight(self, key: str) -> tuple:
+        """(future, leader 여부) - 진행 중인 계산이 있으면 그 Future 에 합류"""
+        with self._flight_lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = Future()
+            self._flights[key] = flight
+        self._count("flights")
+        return flight, True
+
+    def _end_flight(self, key: str, flight: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._flight_lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        if flight.done():
+            return
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(result)
+
     def stats(self) -> dict:
-        """캐시 통계"""
+        """캐시 통계 (L2 크기 + L1/L2 적중률 + 접두사별 코덱 크기/시간)"""
         try:
             return {
                 "directory": self.cache_dir,
+                **self.cache.info(),
                 "size_bytes": self.cache.volume(),
                 "size_mb": round(self.cache.volume() / (1024 * 1024), 2),
                 "item_count": len(self.cache),
+                **self.hit_stats(),
+                "codec": self.codec.stats() if self.codec is not None else {"enabled": False},
             }
         except Exception as e:
             logger.warning(f"Cache stats error: {e}")
@@ -157,16 +594,18 @@ class CacheManager:
 
     def cached(
         self,
-        ttl: int,
+        ttl: Union[int, SWR],
         prefix: str = "",
-        key_func: Optional[Callable[..., str]] = None
+        key_func: Optional[Callable[..., str]] = None,
+        single_flight: bool = True
     ) -> Callable[[Callable[P, T]], Callable[P, T]]:
-        """캐싱 데코레이터
+        """캐싱 데코레이터 (동기/async 함수 모두 지원)
 
         Args:
-            ttl: 캐시 만료 시간 (초)
+            ttl: 캐시 만료 시간 (초) 또는 SWR 정책 (예: TTL.METRICS_SWR - soft 이후 stale 즉시 반환 + 백그라운드 갱신)
             prefix: 캐시 키 접두사
             key_func: 커스텀 키 생성 함수 (선택)
+            single_flight: 같은 키의 동시 미스를 한 번의 계산으로 합침 (기본 True)
 
         사용 예시:
             @cache_manager.cached(ttl=TTL.DAILY, prefix="prices")
@@ -174,35 +613,97 @@ class CacheManager:
                 ...
         """
         def decorator(func: Callable[P, T]) -> Callable[P, T]:
-            @wraps(func)
-            def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
-                # 캐시 키 생성
-                func_prefix = prefix or func.__name__
+            def make_key(*args, **kwargs) -> str:
                 if key_func:
-                    cache_key = key_func(*args, **kwargs)
-                else:
-                    cache_key = self._make_key(func_prefix, *args, **kwargs)
-
-                # 캐시 조회
-                cached_value = self.get(cache_key)
-                if cached_value is not None:
-                    return cached_value
+                    return key_func(*args, **kwargs)
+                return self._make_key(prefix or func.__name__, *args, **kwargs)
 
-                # 함수 실행 및 캐싱
-                result = func(*args, **kwargs)
+            def store(cache_key: str, result: Any) -> Any:
                 if result is not None:
                     self.set(cache_key, result, ttl)
-
                 return result
 
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                    cache_key = make_key(*args, **kwargs)
+                    cached_value, stale = self.get_swr(cache_key)
+                    if cached_value is not None:
+                        if stale:
+                            self.refresh_in_background(
+                                cache_key, lambda: store(cache_key, asyncio.run(func(*args, **kwargs)))
+                            )
+                        return cached_value
+                    if not single_flight:
+                        return store(cache_key, await func(*args, **kwargs))
+
+                    flight, leader = self._join_flight(cache_key)
+                    if not leader:
+                        self._count("coalesced")
+                        try:
+                            # shield: 대기 취소가 다른 대기자/리더의 Future 를 취소하지 않도록
+                            return _detach(await asyncio.wait_for(
+                                asyncio.shield(asyncio.wrap_future(flight)), CACHE_FLIGHT_TIMEOUT
+                            ))
+                        except asyncio.TimeoutError:
+                            if flight.done():
+                                raise  # 리더 함수 자체의 TimeoutError
+                            logger.warning(f"Single-flight wait timed out: {cache_key}")
+                            return store(cache_key, await func(*args, **kwargs))
+                    try:
+                        result = self._peek(cache_key)  # 직전 리더가 막 채웠을 수 있음
+                        if result is None:
+                            result = store(cache_key, await func(*args, **kwargs))
+                    except BaseException as e:
+                        self._end_flight(cache_key, flight, error=e)
+                        raise
+                    # 리더가 반환값을 수정해도 후행 호출자가 보는 값은 그대로
+                    self._end_flight(cache_key, flight, _detach(result))
+                    return result
+
+                wrapper = async_wrapper
+            else:
+                @wraps(func)
+                def sync_wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+                    # 캐시 조회 (soft TTL 이 지났으면 stale 값 반환 + 백그라운드 갱신)
+                    cache_key = make_key(*args, **kwargs)
+                    cached_value, stale = self.get_swr(cache_key)
+                    if cached_value is not None:
+                        if stale:
+                            self.refresh_in_background(cache_key, lambda: store(cache_key, func(*args, **kwargs)))
+                        return cached_value
+                    if not single_flight:
+                        return store(cache_key, func(*args, **kwargs))
+
+                    # 같은 키를 계산 중인 스레드가 있으면 그 결과를 기다림
+                    flight, leader = self._join_flight(cache_key)
+                    if not leader:
+                        self._count("coalesced")
+                        try:
+                            return _detach(flight.result(timeout=CACHE_FLIGHT_TIMEOUT))
+                        except FutureTimeout:
+                            if flight.done():
+                                raise  # 리더 함수 자체의 TimeoutError
+                            logger.warning(f"Single-flight wait timed out: {cache_key}")
+                            return store(cache_key, func(*args, **kwargs))
+
+                    # 함수 실행 및 캐싱
+                    try:
+                        result = self._peek(cache_key)  # 직전 리더가 막 채웠을 수 있음
+                        if result is None:
+                            result = store(cache_key, func(*args, **kwargs))
+                    except BaseException as e:
+                        self._end_flight(cache_key, flight, error=e)
+                        raise
+                    # 리더가 반환값을 수정해도 후행 호출자가 보는 값은 그대로
+                    self._end_flight(cache_key, flight, _detach(result))
+                    return result
+
+                wrapper = sync_wrapper
+
             # 캐시 무효화 메서드 추가
             def invalidate(*args: P.args, **kwargs: P.kwargs) -> bool:
-                func_prefix = prefix or func.__name__
-                if key_func:
-                    cache_key = key_func(*args, **kwargs)
-                else:
-                    cache_key = self._make_key(func_prefix, *args, **kwargs)
-                return self.delete(cache_key)
+                return self.delete(make_key(*args, **kwargs))
 
             wrapper.invalidate = invalidate  # type: ignore
             wrapper.cache_manager = self  # type: ignore
@@ -210,15 +711,75 @@ class CacheManager:
             return wrapper
         return decorator
 
+    def cached_many(
+        self,
+        ttl: Union[int, SWR],
+        prefix: str = "",
+        key_func: Optional[Callable[..., str]] = None
+    ) -> Callable[[Callable[..., Dict[Hashable, Any]]], Callable[..., Dict[Hashable, Any]]]:
+        """배치 함수 캐싱 데코레이터 - func(items, *args, **kwargs) → {item: 결과}
+
+        항목별 키를 get_many 로 한 번에 조회하고, 캐시에 없는 항목만 모아 func 를 한 번 호출한 뒤
+        set_many 로 한 번에 저장. 키는 단건 cached 와 같은 규칙(_make_key(prefix, item, *args, **kwargs))이라
+        같은 prefix 의 단건 캐시 항목을 그대로 공유한다. stale 항목은 즉시 반환하고 묶어서 백그라운드 갱신.
+
+        사용 예시:
+            @cache_manager.cached_many(ttl=TTL.FUNDAMENTAL_SWR, prefix="fundamentals")
+            def get_fundamentals_many(tickers: List[str]) -> Dict[str, dict]:
+                ...
+        """
+        def decorator(func: Callable[..., Dict[Hashable, Any]]) -> Callable[..., Dict[Hashable, Any]]:
+            def make_key(item: Hashable, *args, **kwargs) -> str:
+                if key_func:
+                    return key_func(item, *args, **kwargs)
+                return self._make_key(prefix or func.__name__, item, *args, **kwargs)
+
+            @wraps(func)
+            def wrapper(items: Iterable[Hashable], *args, **kwargs) -> Dict[Hashable, Any]:
+                items = list(dict.fromkeys(items))
+                keys = {item: make_key(item, *args, **kwargs) for item in items}
+                hits = self.get_many_swr(keys.values())
+
+                def compute(todo: List[Hashable]) -> Dict[Hashable, Any]:
+                    results = func(todo, *args, **kwargs) or {}
+                    fresh = {item: results[item] for item in todo if results.get(item) is not None}
+                    self.set_many({keys[item]: value for item, value in fresh.items()}, ttl)
+                    return fresh
+
+                out: Dict[Hashable, Any] = {}
+                missing, stale = [], []
+                for item, key in keys.items():
+                    if key in hits:
+                        out[item], is_stale = hits[key]
+                        if is_stale:
+                            stale.append(item)
+                    else:
+                        missing.append(item)
+                if stale:
+                    batch_key = self._make_key(f"{prefix or func.__name__}:batch", sorted(keys[i] for i in stale))
+                    self.refresh_in_background(batch_key, lambda: compute(stale))
+                if missing:
+                    out.update(compute(missing))
+                return {item: out[item] for item in items if item in out}
+
+            def invalidate(item: Hashable, *args, **kwargs) -> bool:
+                return self.delete(make_key(item, *args, **kwargs))
+
+            wrapper.invalidate = invalidate  # type: ignore
+            wrapper.cache_manager = self  # type: ignore
+            return wrapper
+        return decorator
+
 
 # 글로벌 캐시 매니저 인스턴스
 cache_manager = CacheManager()
 
 
 def cached(
-    ttl: int,
+    ttl: Union[int, SWR],
     prefix: str = "",
-    key_func: Optional[Callable[..., str]] = None
+    key_func: Optional[Callable[..., str]] = None,
+    single_flight: bool = True
 ) -> Callable[[Callable[P, T]], Callable[P, T]]:
     """편의용 글로벌 캐싱 데코레이터
 
@@ -229,7 +790,16 @@ def cached(
         def get_fundamentals(ticker: str):
             ...
     """
-    return cache_manager.cached(ttl=ttl, prefix=prefix, key_func=key_func)
+    return cache_manager.cached(ttl=ttl, prefix=prefix, key_func=key_func, single_flight=single_flight)
+
+
+def cached_many(
+    ttl: Union[int, SWR],
+    prefix: str = "",
+    key_func: Optional[Callable[..., str]] = None
+) -> Callable[[Callable[..., Dict[Hashable, Any]]], Callable[..., Dict[Hashable, Any]]]:
+    """편의용 글로벌 배치 캐싱 데코레이터 (CacheManager.cached_many 참고)"""
+    return cache_manager.cached_many(ttl=ttl, prefix=prefix, key_func=key_func)
 
 
 def get_cache() -> CacheManager:
@@ -243,7 +813,7 @@ def cache_get(key: str, default: Any = None) -> Any:
     return cache_manager.get(key, default)
 
 
-def cache_set(key: str, value: Any, ttl: int) -> bool:
+def cache_set(key: str, value: Any, ttl: Union[int, SWR]) -> bool:
     """캐시에 값 저장"""
     return cache_manager.set(key, value, ttl)
 
@@ -1,15 +1,19 @@
 from __future__ import annotations
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import os
 import json
 import math
+import logging
 
 import pandas as pd
 import yfinance as yf
 
 from mcp_server.tools.cache_manager import cache_manager, TTL, cached
 from mcp_server.tools.yf_utils import normalize_yf_columns
+from mcp_server.tools.market_data import get_prices_bulk
+
+logger = logging.getLogger(__name__)
 
 
 # 레거시 호환용 JSON 캐시 디렉토리 (기존 캐시 읽기용)
@@ -56,85 +60,166 @@ def _corr(a: pd.Series, b: pd.Series, window: int) -> Optional[float]:
         return None
 
 
+def _metrics_key(ticker: str, period: str, interval: str) -> str:
+    return f"metrics:{ticker}:{period}:{interval}"
+
+
+def _load_closes(ticker: str, period: str, interval: str) -> Tuple[pd.Series, Optional[pd.Series]]:
+    """(종목 종가, SPY 종가) 조회."""
+    closes, spy = _load_closes_many([ticker], period, interval)
+    return closes[ticker], spy
+
+
+def _load_closes_many(tickers: List[str], period: str, interval: str) -> Tuple[Dict[str, pd.Series], Optional[pd.Series]]:
+    """({종목: 종가}, SPY 종가) 조회 - SPY 는 배치당 1회.
+
+    일봉은 ``get_prices_bulk`` 한 번으로 종목들과 SPY를 함께 가져오고
+    (로컬 가격 저장소 경유), 그 외 interval은 yfinance 개별 조회.
+    """
+    if interval == "1d":
+        closes = get_prices_bulk(list(tickers) + ["SPY"], period=period)["close"]
+        out = {t: closes[t].dropna() if t in closes.columns else pd.Series(dtype=float) for t in tickers}
+        spy = closes["SPY"].dropna() if "SPY" in closes.columns else None
+        return out, spy
+
+    def _download(symbol: str) -> pd.DataFrame:
+        return normalize_yf_columns(
+            yf.download(symbol, period=period, interval=interval, progress=False, auto_adjust=True)
+        )
+
+    out = {}
+    for t in tickers:
+        try:
+            hist = _download(t)
+            out[t] = hist["Close"].dropna() if "Close" in hist.columns else pd.Series(dtype=float)
+        except Exception:
+            out[t] = pd.Series(dtype=float)
+    try:
+        spy = _download("SPY")["Close"]
+    except Exception:
+        spy = None
+    return out, spy
+
+
+def _full_metrics(close: pd.Series, spy: Optional[pd.Series]) -> Dict:
+    """전체 시계열로 메트릭 계산 (일봉 외 interval, 증분 엔진과 같은 정의)"""
+    return {
+        # 모멘텀(일수 기준 대략치): 1M~12M
+        "mom1": _pct(close, 21), "mom3": _pct(close, 63), "mom6": _pct(close, 126), "mom12": _pct(close, 252),
+        "ret20": _pct(close, 20),
+        # 변동성/최대낙폭/상관
+        "vol30": _stdev(close, 30), "vol60": _stdev(close, 60),
+        "dd180": _max_drawdown(close, 180),
+        "corr_spy": _corr(close, spy, 90) if spy is not None else None,
+    }
+
+
 def compute_basic_metrics(ticker: str, period: str = "2y", interval: str = "1d", use_cache: bool = True) -> Dict:
     """가격 기반 핵심 메트릭 산출: 모멘텀, 변동성, 최대낙폭, SPY 상관.
-    diskcache 기반 TTL 캐싱 적용 (4시간).
+    diskcache 기반 stale-while-revalidate 캐싱 (4시간 신선, 24시간까지 stale 즉시 반환 + 백그라운드 갱신).
+    일봉은 종목별 롤링 상태를 새 bar 만큼만 갱신 (metrics_engine).
     """
-    cache_key = f"metrics:{ticker}:{period}:{interval}"
+    cache_key = _metrics_key(ticker, period, interval)
 
-    # 캐시 확인 (TTL 자동 관리)
+    # 캐시 확인 (soft TTL 이 지났으면 stale 값 반환 + 백그라운드 갱신)
     if use_cache:
-        cached_data = cache_manager.get(cache_key)
+        cached_data, stale = cache_manager.get_swr(cache_key)
         if cached_data is not None:
+            if stale:
+                cache_manager.refresh_in_background(
+                    cache_key, lambda: _compute_metrics_batch([ticker], period, interval, True)
+                )
             return cached_data
 
-    # 레거시 JSON 캐시 확인 (하위 호환)
-    legacy_cache_file = _cache_path(f"metrics_{ticker}.json")
-
-    try:
-        hist = normalize_yf_columns(
-            yf.download(ticker, period=period, interval=interval, progress=False, auto_adjust=True)
+    return _compute_metrics_batch([ticker], period, interval, use_cache)[ticker]
+
+
+def compute_basic_metrics_many(
+    tickers: List[str], period: str = "2y", interval: str = "1d", use_cache: bool = True
+) -> Dict[str, Dict]:
+    """compute_basic_metrics 의 배치 버전: 메트릭 캐시를 한 번에 조회하고 없는 종목만 한 배치로 계산 (입력 순서 유지)"""
+    keys = {t: _metrics_key(t, period, interval) for t in dict.fromkeys(tickers)}
+    hits = cache_manager.get_many_swr(keys.values()) if use_cache else {}
+
+    out: Dict[str, Dict] = {}
+    stale, missing = [], []
+    for ticker, cache_key in keys.items():
+        if cache_key in hits:
+            out[ticker], is_stale = hits[cache_key]
+            if is_stale:
+                stale.append(ticker)
+        else:
+            missing.append(ticker)
+    if stale:
+        cache_manager.refresh_in_background(
+            cache_manager._make_key("metrics:batch", period, interval, sorted(stale)),
+            lambda: _compute_metrics_batch(stale, period, interval, True),
         )
-        if hist.empty or "Close" not in hist.columns:
-            raise RuntimeError("no price data")
-        close = hist["Close"].dropna()
+    if missing:
+        out.update(_compute_metrics_batch(missing, period, interval, use_cache))
+    return {t: out[t] for t in keys}
 
-        # 모멘텀(일수 기준 대략치): 1M~12M
-        mom1 = _pct(close, 21)
-        mom3 = _pct(close, 63)
-        mom6 = _pct(close, 126)
-        mom12 = _pct(close, 252)
-        ret20 = _pct(close, 20)
 
-        # 변동성/최대낙폭/상관
-        vol30 = _stdev(close, 30)
-        vol60 = _stdev(close, 60)
-        dd180 = _max_drawdown(close, 180)
-        try:
-            spy_df = normalize_yf_columns(
-                yf.download("SPY", period=period, interval=interval, progress=False, auto_adjust=True)
-            )
-            spy = spy_df["Close"]
-            corr_spy = _corr(close, spy, 90)
-        except Exception:
-            corr_spy = None
-
-        data = {
-            "ticker": ticker,
-            "mom1": mom1, "mom3": mom3, "mom6": mom6, "mom12": mom12,
-            "ret20": ret20,
-            "vol30": vol30, "vol60": vol60,
-            "dd180": dd180,
-            "corr_spy": corr_spy,
-            "asof": datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
-        }
-
-        # diskcache에 저장 (TTL 4시간)
-        if use_cache:
-            cache_manager.set(cache_key, data, TTL.METRICS)
+def _compute_metrics_batch(tickers: List[str], period: str, interval: str, use_cache: bool) -> Dict[str, Dict]:
+    """메트릭 계산 + 캐시 기록 (가격/SPY 배치 1회 조회, 실패 종목은 만료 전 캐시 값 / 레거시 JSON 폴백)"""
+    try:
+        closes, spy = _load_closes_many(tickers, period, interval)
+    except Exception as e:
+        logger.warning(f"Metrics price load failed for {len(tickers)} tickers: {e}")
+        closes, spy = {}, None
+    valid = {t: c for t, c in closes.items() if not c.empty}
+
+    try:
+        if interval == "1d":
+            from mcp_server.tools.metrics_engine import get_metrics_engine
+            raw = get_metrics_engine().compute_many(valid, spy, period, interval)
+        else:
+            raw = {t: _full_metrics(c, spy) for t, c in valid.items()}
+    except Exception as e:
+        logger.warning(f"Metrics computation failed: {e}")
+        raw = {}
+
+    asof = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    out: Dict[str, Dict] = {}
+    fresh: Dict[str, Dict] = {}
+    for ticker in tickers:
+        cache_key = _metrics_key(ticker, period, interval)
+        if ticker not in raw:
+            out[ticker] = _fallback_metrics(ticker, cache_key)
+            continue
+        data = {"ticker": ticker, **raw[ticker], "asof": asof}
+        fresh[cache_key] = data
+        out[ticker] = data
 
         # 레거시 JSON도 함께 저장 (하위 호환)
         try:
-            with open(legacy_cache_file, "w", encoding="utf-8") as f:
+            with open(_cache_path(f"metrics_{ticker}.json"), "w", encoding="utf-8") as f:
                 json.dump(data, f, ensure_ascii=False)
         except Exception:
             pass
 
-        return data
-    except Exception:
-        # diskcache에서 만료된 데이터라도 있으면 반환
-        stale_data = cache_manager.get(cache_key)
-        if stale_data:
-            return stale_data
-
-        # 레거시 JSON 캐시 폴백
-        if os.path.exists(legacy_cache_file):
-            try:
-                with open(legacy_cache_file, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {"ticker": ticker}
+    # diskcache에 저장 (4시간 신선, 24시간 stale 허용)
+    if use_cache and fresh:
+        cache_manager.set_many(fresh, TTL.METRICS_SWR)
+    return out
+
+
+def _fallback_metrics(ticker: str, cache_key: str) -> Dict:
+    """계산 실패 시 만료 전 캐시 값 → 레거시 JSON → 빈 메트릭"""
+    # diskcache에서 soft TTL 이 지난 데이터라도 있으면 반환
+    stale_data = cache_manager.get(cache_key)
+    if stale_data:
+        return stale_data
+
+    # 레거시 JSON 캐시 폴백
+    legacy_cache_file = _cache_path(f"metrics_{ticker}.json")
+    if os.path.exists(legacy_cache_file):
+        try:
+            with open(legacy_cache_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {"ticker": ticker}
 
 
 def get_cached_metrics(ticker: str, period: str = "2y", interval: str = "1d") -> Dict:
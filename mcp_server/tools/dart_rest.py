@@ -21,7 +21,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import requests
+from mcp_server.tools.http_client import http_get
 
 logger = logging.getLogger(__name__)
 
@@ -91,7 +91,7 @@ def _do_refresh_corp_codes() -> None:
     from xml.etree import ElementTree as ET
 
     try:
-        r = requests.get(
+        r = http_get(
             f"{DART_BASE_URL}/corpCode.xml",
             params={"crtfc_key": api_key},
             timeout=60,
@@ -280,7 +280,7 @@ def get_financials(
     }
 
     try:
-        r = requests.get(
+        r = http_get(
             f"{DART_BASE_URL}/fnlttSinglAcntAll.json",
             params=params,
             timeout=timeout,
@@ -300,7 +300,7 @@ def get_financials(
     if status != "000" or not rows:
         try:
             params["fs_div"] = "OFS"
-            r2 = requests.get(f"{DART_BASE_URL}/fnlttSinglAcntAll.json",
+            r2 = http_get(f"{DART_BASE_URL}/fnlttSinglAcntAll.json",
                               params=params, timeout=timeout)
             r2.raise_for_status()
             d2 = r2.json()
@@ -3,12 +3,16 @@
 Factor Aggregator Module
 
 팩터 정규화, 가중치 기반 종합 점수 계산, 다종목 랭킹 기능 제공
+(다종목 팩터 수집은 재무/기술/감성 그룹별 병렬 파이프라인, 시장 공통 입력은 요청당 1회)
 """
 
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
 import logging
+import threading
+import time
 
 from mcp_server.tools.financial_factors import FinancialFactors
 from mcp_server.tools.technical_indicators import TechnicalFactors
@@ -85,6 +89,18 @@ class FactorAggregator:
         'sentiment': 0.30,
     }
 
+    # 카테고리별 팩터 분류 (종합 점수 합산 순서)
+    CATEGORY_FACTORS = {
+        'profitability': ['ROE', 'ROA', 'ROIC', 'Operating_Margin', 'Net_Margin'],
+        'health': ['Debt_to_Equity', 'Current_Ratio', 'Quick_Ratio', 'Interest_Coverage', 'Debt_to_Asset'],
+        'efficiency': ['Asset_Turnover', 'Inventory_Turnover', 'Receivables_Turnover', 'Working_Capital_Turnover', 'FCF_to_Sales'],
+        'dividend': ['Dividend_Yield', 'Payout_Ratio', 'Dividend_Growth'],
+        'growth': ['Revenue_Growth', 'EPS_Growth'],
+        'technical': ['RSI', 'MACD_Signal', 'Stochastic', 'Williams_R', 'CCI', 'MA_Cross', 'ADX', 'BB_Width', 'ATR', 'Volume_Ratio'],
+        'sentiment': ['News_Sentiment', 'News_Volume', 'News_Sentiment_Std', 'Filing_Sentiment', 'Risk_Factor_Count',
+                      'Put_Call_Ratio', 'Market_VIX', 'Short_Interest_Ratio', 'Analyst_Rating', 'Target_Price_Upside'],
+    }
+
     @staticmethod
     def normalize_factors(factors: Dict[str, float]) -> Dict[str, float]:
         """팩터를 0-100 범위로 정규화
@@ -159,55 +175,159 @@ class FactorAggregator:
         if weights is None:
             weights = FactorAggregator.DEFAULT_WEIGHTS.copy()
 
-        # 카테고리별 팩터 분류
-        profitability_factors = ['ROE', 'ROA', 'ROIC', 'Operating_Margin', 'Net_Margin']
-        health_factors = ['Debt_to_Equity', 'Current_Ratio', 'Quick_Ratio', 'Interest_Coverage', 'Debt_to_Asset']
-        efficiency_factors = ['Asset_Turnover', 'Inventory_Turnover', 'Receivables_Turnover', 'Working_Capital_Turnover', 'FCF_to_Sales']
-        dividend_factors = ['Dividend_Yield', 'Payout_Ratio', 'Dividend_Growth']
-        growth_factors = ['Revenue_Growth', 'EPS_Growth']
-
-        technical_factors = ['RSI', 'MACD_Signal', 'Stochastic', 'Williams_R', 'CCI', 'MA_Cross', 'ADX', 'BB_Width', 'ATR', 'Volume_Ratio']
-
-        sentiment_factors = ['News_Sentiment', 'News_Volume', 'News_Sentiment_Std', 'Filing_Sentiment', 'Risk_Factor_Count',
-                           'Put_Call_Ratio', 'Market_VIX', 'Short_Interest_Ratio', 'Analyst_Rating', 'Target_Price_Upside']
-
-        # 카테고리별 평균 계산
+        # 카테고리별 평균 계산 (값이 없는 카테고리는 중립 50)
         category_scores = {}
+        for category, keys in FactorAggregator.CATEGORY_FACTORS.items():
+            vals = [factors[k] for k in keys if k in factors and not pd.isna(factors[k])]
+            category_scores[category] = np.mean(vals) if vals else 50.0
 
-        # 수익성
-        prof_vals = [factors[k] for k in profitability_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['profitability'] = np.mean(prof_vals) if prof_vals else 50.0
+        # 가중 평균
+        total_weight = sum(weights.values())
+        composite_score = sum(category_scores[cat] * weights[cat] for cat in category_scores if cat in weights)
+        composite_score = composite_score / total_weight if total_weight > 0 else 50.0
 
-        # 건전성
-        health_vals = [factors[k] for k in health_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['health'] = np.mean(health_vals) if health_vals else 50.0
+        return round(composite_score, 2)
 
-        # 효율성
-        eff_vals = [factors[k] for k in efficiency_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['efficiency'] = np.mean(eff_vals) if eff_vals else 50.0
+    # 팩터 그룹 (업스트림별 동시 실행 한도는 FACTOR_FETCH_LIMITS)
+    FACTOR_FAMILIES = ('financial', 'technical', 'sentiment')
+    # 기술적 지표 입력 가격 구간 (PriceStore 경유)
+    TECHNICAL_PERIOD = "6mo"
 
-        # 배당
-        div_vals = [factors[k] for k in dividend_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['dividend'] = np.mean(div_vals) if div_vals else 50.0
+    @staticmethod
+    def prefetch_prices(tickers: List[str], market: str = "US") -> None:
+        """기술적 지표용 가격을 PriceStore 에 일괄 적재 (그룹 요청 1회, 실패 시 종목별 조회로 대체)"""
+        from mcp_server.tools.market_data import get_prices_bulk
+        try:
+            get_prices_bulk(tickers, period=FactorAggregator.TECHNICAL_PERIOD,
+                            market="KR" if market == "KR" else None)
+        except Exception as e:
+            logger.warning(f"Bulk price prefetch failed for {len(tickers)} tickers: {e}")
 
-        # 성장
-        growth_vals = [factors[k] for k in growth_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['growth'] = np.mean(growth_vals) if growth_vals else 50.0
+    @staticmethod
+    def fetch_family(family: str, ticker: str, market: str = "US", market_vix: Optional[float] = None) -> Optional[Dict[str, float]]:
+        """팩터 그룹 하나 수집 (재무/감성 실패는 예외 전달, 가격 이력이 없으면 technical 은 None)"""
+        if family == 'financial':
+            return FinancialFactors.calculate_all(ticker, market)
+        if family == 'technical':
+            from mcp_server.tools.market_data import get_price_history
+            df = get_price_history(ticker, period=FactorAggregator.TECHNICAL_PERIOD,
+                                   market="KR" if market == "KR" else None)
+            return TechnicalFactors.calculate_all(df) if not df.empty else None
+        if family == 'sentiment':
+            return SentimentFactors.calculate_all(ticker, market, days=7, market_vix=market_vix)
+        raise ValueError(f"Unknown factor family: {family}")
 
-        # 기술적
-        tech_vals = [factors[k] for k in technical_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['technical'] = np.mean(tech_vals) if tech_vals else 50.0
+    @staticmethod
+    def collect_factor_groups(
+        ticker: str,
+        market: str = "US",
+        include_technical: bool = True,
+        include_financial: bool = True,
+        include_sentiment: bool = True
+    ) -> Dict[str, Dict[str, float]]:
+        """종목의 원시 팩터를 그룹별로 수집 ({"financial": {...}, "technical": {...}, "sentiment": {...}})
 
-        # 감성
-        sent_vals = [factors[k] for k in sentiment_factors if k in factors and not pd.isna(factors[k])]
-        category_scores['sentiment'] = np.mean(sent_vals) if sent_vals else 50.0
+        재무/감성 수집 실패는 예외로 전달, 기술적 지표 실패는 경고 후 생략.
+        """
+        groups, errors = FactorAggregator.collect_factor_groups_many(
+            [ticker], market,
+            include_technical=include_technical,
+            include_financial=include_financial,
+            include_sentiment=include_sentiment
+        )
+        if ticker in errors:
+            raise errors[ticker]
+        return groups[ticker]
 
-        # 가중 평균
-        total_weight = sum(weights.values())
-        composite_score = sum(category_scores[cat] * weights[cat] for cat in category_scores if cat in weights)
-        composite_score = composite_score / total_weight if total_weight > 0 else 50.0
+    @staticmethod
+    def collect_factor_groups_many(
+        tickers: List[str],
+        market: str = "US",
+        include_technical: bool = True,
+        include_financial: bool = True,
+        include_sentiment: bool = True,
+        limits: Optional[Dict[str, int]] = None,
+        stage_timings: Optional[Dict[str, float]] = None
+    ) -> Tuple[Dict[str, Dict[str, Dict[str, float]]], Dict[str, Exception]]:
+        """여러 종목의 팩터 그룹을 단계별로 병렬 수집 → ({종목: 그룹}, {종목: 예외})
 
-        return round(composite_score, 2)
+        1) 시장 공통 입력(VIX)과 기술적 지표용 가격(get_prices_bulk)은 요청당 1회 조회
+        2) 재무/기술/감성 그룹별 스레드 풀(업스트림별 동시 실행 한도)에 전 종목을 동시에 제출
+        3) 모든 그룹이 끝날 때까지 대기(barrier) 후 종목별로 합침
+
+        Args:
+            limits: 그룹별 동시 실행 수 (기본: config.FACTOR_FETCH_LIMITS)
+            stage_timings: 주어지면 단계별 소요 시간(초)을 기록
+        """
+        from mcp_server.config import FACTOR_FETCH_LIMITS
+        from mcp_server.tools.tool_executor import parse_limits
+
+        started = time.perf_counter()
+        tickers = list(dict.fromkeys(tickers))
+        if not tickers:
+            return {}, {}
+        include = {'financial': include_financial, 'technical': include_technical, 'sentiment': include_sentiment}
+        families = [f for f in FactorAggregator.FACTOR_FAMILIES if include[f]]
+        limits = {**parse_limits(FACTOR_FETCH_LIMITS), **(limits or {})}
+        finished: Dict[str, float] = {}  # 그룹별 마지막 작업 완료 시각
+        lock = threading.Lock()
+
+        def run(family: str, ticker: str, market_vix: Optional[float]):
+            try:
+                return FactorAggregator.fetch_family(family, ticker, market, market_vix)
+            finally:
+                with lock:
+                    finished[family] = max(finished.get(family, 0.0), time.perf_counter())
+
+        pools = {
+            f: ThreadPoolExecutor(max_workers=max(1, min(limits.get(f, 4), len(tickers) or 1)),
+                                  thread_name_prefix=f"factor-{f}")
+            for f in families
+        }
+        futures = {}
+        timings: Dict[str, float] = {}
+        try:
+            for family in families:
+                market_vix = None
+                if family == 'sentiment':
+                    # 시장 공통 입력은 한 번만 (재무/기술 그룹은 이미 진행 중)
+                    t0 = time.perf_counter()
+                    market_vix = SentimentFactors.fetch_market_vix()
+                    timings['market'] = time.perf_counter() - t0
+                elif family == 'technical' and len(tickers) > 1:
+                    # 종목별 가격 조회가 저장소에서 끝나도록 빠진 구간을 한 번에 채움
+                    t0 = time.perf_counter()
+                    FactorAggregator.prefetch_prices(tickers, market)
+                    timings['prices'] = time.perf_counter() - t0
+                for ticker in tickers:
+                    futures[(family, ticker)] = pools[family].submit(run, family, ticker, market_vix)
+            wait(futures.values())  # barrier: 스코어링은 모든 입력이 준비된 뒤
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+        groups: Dict[str, Dict[str, Dict[str, float]]] = {t: {} for t in tickers}
+        errors: Dict[str, Exception] = {}
+        for (family, ticker), future in futures.items():
+            try:
+                factors = future.result()
+            except Exception as e:
+                if family == 'technical':
+                    logger.warning(f"Technical factors failed for {ticker}: {e}")
+                else:
+                    errors.setdefault(ticker, e)
+                continue
+            if factors is not None:
+                groups[ticker][family] = factors
+        for ticker in errors:
+            groups.pop(ticker, None)
+
+        for family in families:
+            timings[family] = finished.get(family, started) - started
+        timings['fetch'] = time.perf_counter() - started
+        if stage_timings is not None:
+            stage_timings.update({k: round(v, 3) for k, v in timings.items()})
+        return groups, errors
 
     @staticmethod
     def rank_stocks(
@@ -216,10 +336,16 @@ class FactorAggregator:
         factor_weights: Optional[Dict[str, float]] = None,
         include_technical: bool = True,
         include_financial: bool = True,
-        include_sentiment: bool = True
+        include_sentiment: bool = True,
+        asof: Optional[str] = None,
+        use_snapshot: bool = True,
+        stage_timings: Optional[Dict[str, float]] = None
     ) -> List[Dict]:
         """다종목 팩터 기반 랭킹
 
+        스냅샷에 없는 종목의 팩터는 그룹별 병렬 파이프라인(collect_factor_groups_many)으로 수집하고,
+        모든 입력이 모인 뒤 스코어링한다.
+
         Args:
             tickers: 종목 코드 리스트
             market: 시장 (US/KR)
@@ -227,36 +353,52 @@ class FactorAggregator:
             include_technical: 기술적 팩터 포함 여부
             include_financial: 재무 팩터 포함 여부
             include_sentiment: 감성 팩터 포함 여부
+            asof: 이 날짜(YYYY-MM-DD) 이전 가장 최근 팩터 스냅샷 사용 (None 이면 최신 스냅샷)
+            use_snapshot: False 면 스냅샷 없이 전 종목 실시간 계산
+            stage_timings: 주어지면 단계별 소요 시간(초)을 기록
+                (snapshot/market/financial/technical/sentiment/fetch/scoring/total)
 
         Returns:
             종목별 점수 및 랭킹 정보
         """
+        started = time.perf_counter()
+        timings: Dict[str, float] = {}
         results = []
-
+        include = {'financial': include_financial, 'technical': include_technical, 'sentiment': include_sentiment}
+
+        # 야간 팩터 스냅샷에 있는 종목은 저장된 원시 팩터 사용 (없는 종목만 실시간 수집)
+        snapshot_groups: Dict[str, Dict[str, Dict[str, float]]] = {}
+        if use_snapshot:
+            from mcp_server.tools.factor_snapshot import get_factor_snapshot
+            snapshot = get_factor_snapshot(asof, market=market)
+            if snapshot is not None:
+                snapshot_groups = snapshot.factor_groups(tickers)
+        timings['snapshot'] = round(time.perf_counter() - started, 3)
+
+        live, errors = {}, {}
+        missing = [t for t in tickers if t not in snapshot_groups]
+        if missing:
+            live, errors = FactorAggregator.collect_factor_groups_many(
+                missing, market,
+                include_technical=include_technical,
+                include_financial=include_financial,
+                include_sentiment=include_sentiment,
+                stage_timings=timings
+            )
+
+        scoring_started = time.perf_counter()
         for ticker in tickers:
             try:
-                # 팩터 수집
+                # 팩터 수집 결과
+                if ticker in snapshot_groups:
+                    groups = {g: f for g, f in snapshot_groups[ticker].items() if include.get(g)}
+                elif ticker in errors:
+                    raise errors[ticker]
+                else:
+                    groups = live[ticker]
                 all_factors = {}
-
-                if include_financial:
-                    fin_factors = FinancialFactors.calculate_all(ticker, market)
-                    all_factors.update(fin_factors)
-
-                if include_technical:
-                    try:
-                        from mcp_server.tools.technical_indicators import TechnicalFactors
-                        import yfinance as yf
-                        stock = yf.Ticker(ticker)
-                        df = stock.history(period="6mo")
-                        if not df.empty:
-                            tech_factors = TechnicalFactors.calculate_all(df)
-                            all_factors.update(tech_factors)
-                    except Exception as e:
-                        logger.warning(f"Technical factors failed for {ticker}: {e}")
-
-                if include_sentiment:
-                    sent_factors = SentimentFactors.calculate_all(ticker, market, days=7)
-                    all_factors.update(sent_factors)
+                for group in ('financial', 'technical', 'sentiment'):
+                    all_factors.update(groups.get(group, {}))
 
                 # 정규화
                 normalized = FactorAggregator.normalize_factors(all_factors)
@@ -288,6 +430,11 @@ class FactorAggregator:
         for i, result in enumerate(results, 1):
             result['rank'] = i
 
+        timings['scoring'] = round(time.perf_counter() - scoring_started, 3)
+        timings['total'] = round(time.perf_counter() - started, 3)
+        if stage_timings is not None:
+            stage_timings.update(timings)
+        logger.debug(f"rank_stocks stage timings: {timings}")
         return results
 
     @staticmethod
@@ -330,28 +477,9 @@ class FactorAggregator:
         if weights is None:
             weights = FactorAggregator.DEFAULT_WEIGHTS.copy()
 
-        profitability_factors = ['ROE', 'ROA', 'ROIC', 'Operating_Margin', 'Net_Margin']
-        health_factors = ['Debt_to_Equity', 'Current_Ratio', 'Quick_Ratio', 'Interest_Coverage', 'Debt_to_Asset']
-        efficiency_factors = ['Asset_Turnover', 'Inventory_Turnover', 'Receivables_Turnover', 'Working_Capital_Turnover', 'FCF_to_Sales']
-        dividend_factors = ['Dividend_Yield', 'Payout_Ratio', 'Dividend_Growth']
-        growth_factors = ['Revenue_Growth', 'EPS_Growth']
-        technical_factors = ['RSI', 'MACD_Signal', 'Stochastic', 'Williams_R', 'CCI', 'MA_Cross', 'ADX', 'BB_Width', 'ATR', 'Volume_Ratio']
-        sentiment_factors = ['News_Sentiment', 'News_Volume', 'News_Sentiment_Std', 'Filing_Sentiment', 'Risk_Factor_Count',
-                           'Put_Call_Ratio', 'Market_VIX', 'Short_Interest_Ratio', 'Analyst_Rating', 'Target_Price_Upside']
-
         breakdown = {}
 
-        categories = {
-            'profitability': profitability_factors,
-            'health': health_factors,
-            'efficiency': efficiency_factors,
-            'dividend': dividend_factors,
-            'growth': growth_factors,
-            'technical': technical_factors,
-            'sentiment': sentiment_factors
-        }
-
-        for category, factor_list in categories.items():
+        for category, factor_list in FactorAggregator.CATEGORY_FACTORS.items():
             vals = [normalized_factors[k] for k in factor_list if k in normalized_factors and not pd.isna(normalized_factors[k])]
             avg_score = np.mean(vals) if vals else 50.0
             weight = weights.get(category, 0.0)
@@ -0,0 +1,441 @@
+"""야간 팩터 스냅샷 테이블 (날짜별 버전, 컬럼형 memory-mapped NumPy).
+
+Why this exists
+---------------
+``AdvancedRankingEngine``, ``FactorAggregator.rank_stocks`` and
+``ThemeFactorIntegrator`` used to gather technical, financial and
+sentiment factors per request, one upstream round per ticker.  The
+nightly ``factor_snapshot`` job now computes every raw factor for the
+watchlist plus the watched theme universes once, and the rankers read
+those rows back by as-of date.  Only tickers missing from the snapshot
+are computed live.  Cross-sectional normalisation (z-score, 0-100
+scaling) still runs per request, so rankings over any subset of the
+snapshot match a live run on the same inputs.
+
+Layout
+------
+``{FACTOR_SNAPSHOT_PATH}/{YYYY-MM-DD}/`` — one directory per as-of date:
+
+- ``values.npy``  — float64 (columns, tickers).  Each factor column is a
+  contiguous row, so reading one factor touches one page range of the
+  memory map.
+- ``present.npy`` — bool, same shape.  A factor key that was absent
+  differs from a NaN value (``normalize_factors`` maps NaN to 50).
+- ``meta.json``   — schema version, as-of date, build time, market,
+  ticker / column / sector lists.
+
+Column names are namespaced: ``rank.<factor>`` / ``rank.dip_bonus`` /
+``raw.<metric>`` for the advanced ranking engine,
+``financial.*`` / ``technical.*`` / ``sentiment.*`` for
+``FactorAggregator``, and ``ok.ranking`` / ``ok.aggregator`` coverage
+flags.
+
+A rebuild of the same date is written to a temp directory and swapped
+in with ``os.replace``, so a reader never sees a partial snapshot.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.config import FACTOR_SNAPSHOT_PATH, FACTOR_SNAPSHOT_MAX_AGE_DAYS
+
+if TYPE_CHECKING:
+    from mcp_server.tools.ranking_engine import FactorScores
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+# AdvancedRankingEngine 원시 메트릭 (calculate_factors 의 raw_metrics 키)
+RAW_METRICS: Tuple[str, ...] = (
+    "pe", "pb", "eps", "revenueGrowth", "earningsGrowth", "profitMargins",
+    "roe", "roa", "roic", "mom1", "mom3", "mom6", "mom12", "volatility", "eventScore",
+)
+# FactorAggregator 팩터 그룹 (rank_stocks 합산 순서)
+FACTOR_GROUPS: Tuple[str, ...] = ("financial", "technical", "sentiment")
+
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
+def _ranking_columns() -> List[str]:
+    from mcp_server.tools.ranking_engine import FACTORS
+    return [f"rank.{f}" for f in FACTORS] + ["rank.dip_bonus"] + [f"raw.{m}" for m in RAW_METRICS]
+
+
+def _as_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class FactorSnapshot:
+    """한 날짜의 팩터 테이블 (values/present 는 memory map)"""
+
+    def __init__(self, asof: str, meta: Dict, values: np.ndarray, present: np.ndarray):
+        self.asof = asof
+        self.meta = meta
+        self.values = values
+        self.present = present
+        self.tickers: List[str] = list(meta["tickers"])
+        self.columns: List[str] = list(meta["columns"])
+        self.sectors: List[Optional[str]] = list(meta.get("sectors") or [None] * len(self.tickers))
+        self.market: Optional[str] = meta.get("market")
+        self._row = {t: i for i, t in enumerate(self.tickers)}
+        self._col = {c: j for j, c in enumerate(self.columns)}
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._row
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def _covered(self, tickers: Sequence[str], flag: str) -> List[str]:
+        j = self._col.get(flag)
+        if j is None:
+            return []
+        return [t for t in dict.fromkeys(tickers) if t in self._row and self.values[j, self._row[t]] == 1.0]
+
+    def column(self, name: str) -> np.ndarray:
+        """팩터 한 열 (종목 순서, 없는 값은 NaN)"""
+        j = self._col[name]
+        return np.where(self.present[j], self.values[j], np.nan)
+
+    def frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """종목 × 팩터 DataFrame (분석/디버깅용)"""
+        names = list(columns) if columns is not None else self.columns
+        idx = [self._col[c] for c in names]
+        data = np.where(self.present[idx], self.values[idx], np.nan).T
+        return pd.DataFrame(data, index=pd.Index(self.tickers, name="ticker"), columns=names)
+
+    def ranking_factors(self, tickers: Sequence[str]) -> Dict[str, Tuple["FactorScores", float]]:
+        """AdvancedRankingEngine 용 {종목: (원시 팩터, 딥 보너스)} - 스냅샷에 있는 종목만"""
+        from mcp_server.tools.ranking_engine import FACTORS, FactorScores
+
+        covered = self._covered(tickers, "ok.ranking")
+        if not covered:
+            return {}
+        rows = [self._row[t] for t in covered]
+        names = [f"rank.{f}" for f in FACTORS] + ["rank.dip_bonus"] + [f"raw.{m}" for m in RAW_METRICS]
+        cols = [self._col[c] for c in names]
+        block = self.values[np.ix_(cols, rows)]
+        mask = self.present[np.ix_(cols, rows)] & ~np.isnan(block)
+
+        out = {}
+        for k, ticker in enumerate(covered):
+            vals = [float(block[j, k]) if mask[j, k] else None for j in range(len(names))]
+            factors = dict(zip(FACTORS, vals[:len(FACTORS)]))
+            raw = dict(zip(RAW_METRICS, vals[len(FACTORS) + 1:]))
+            out[ticker] = (
+                FactorScores(ticker=ticker, sector=self.sectors[rows[k]], raw_metrics=raw, **factors),
+                vals[len(FACTORS)] if vals[len(FACTORS)] is not None else 0.0,
+            )
+        return out
+
+    def factor_groups(self, tickers: Sequence[str]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """FactorAggregator 용 {종목: {"financial": {...}, "technical": {...}, "sentiment": {...}}}"""
+        covered = self._covered(tickers, "ok.aggregator")
+        if not covered:
+            return {}
+        group_cols = {
+            g: [(c.split(".", 1)[1], j) for c, j in self._col.items() if c.startswith(g + ".")]
+            for g in FACTOR_GROUPS
+        }
+        out = {}
+        for ticker in covered:
+            i = self._row[ticker]
+            groups = {}
+            for g, cols in group_cols.items():
+                factors = {name: float(self.values[j, i]) for name, j in cols if self.present[j, i]}
+                if factors:
+                    groups[g] = factors
+            out[ticker] = groups
+        return out
+
+
+class FactorSnapshotStore:
+    """날짜별 팩터 스냅샷 저장소
+
+    사용 예시:
+        store = get_factor_snapshot_store()
+        snapshot = store.load("2026-03-02")   # 3/2 이전 가장 최근 스냅샷
+        df = snapshot.frame(["rank.momentum", "financial.ROE"])
+    """
+
+    def __init__(self, root: str = FACTOR_SNAPSHOT_PATH):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+        self._loaded: Dict[str, Tuple[int, FactorSnapshot]] = {}
+        self._lock = threading.Lock()
+
+    def _dir(self, asof: str) -> str:
+        return os.path.join(self.root, asof)
+
+    def dates(self) -> List[str]:
+        """저장된 스냅샷 날짜 (오름차순)"""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            n for n in names
+            if _DATE_RE.match(n) and os.path.exists(os.path.join(self.root, n, "meta.json"))
+        )
+
+    def write(
+        self,
+        asof: str,
+        tickers: List[str],
+        columns: List[str],
+        values: np.ndarray,
+        present: np.ndarray,
+        sectors: Optional[List[Optional[str]]] = None,
+        market: Optional[str] = None,
+    ) -> str:
+        """스냅샷 기록 (같은 날짜는 원자적으로 교체)"""
+        if not _DATE_RE.match(asof):
+            raise ValueError(f"asof must be YYYY-MM-DD: {asof}")
+        final = self._dir(asof)
+        tmp = os.path.join(self.root, f".{asof}.{os.getpid()}.{threading.get_ident()}.tmp")
+        os.makedirs(tmp)
+        try:
+            np.save(os.path.join(tmp, "values.npy"), np.ascontiguousarray(values, dtype=np.float64))
+            np.save(os.path.join(tmp, "present.npy"), np.ascontiguousarray(present, dtype=bool))
+            meta = {
+                "schema": SCHEMA_VERSION,
+                "asof": asof,
+                "built_at": datetime.now().isoformat(timespec="seconds"),
+                "market": market,
+                "tickers": list(tickers),
+                "columns": list(columns),
+                "sectors": list(sectors) if sectors is not None else [None] * len(tickers),
+            }
+            with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+
+            old = None
+            if os.path.exists(final):
+                old = f"{tmp}.old"
+                os.replace(final, old)
+            os.replace(tmp, final)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        if old:
+            # 열린 memory map 은 삭제 후에도 유효 (POSIX)
+            shutil.rmtree(old, ignore_errors=True)
+        return final
+
+    def _open(self, asof: str) -> Optional[FactorSnapshot]:
+        path = self._dir(asof)
+        meta_path = os.path.join(path, "meta.json")
+        try:
+            mtime = os.stat(meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            hit = self._loaded.get(asof)
+            if hit is not None and hit[0] == mtime:
+                return hit[1]
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("schema") != SCHEMA_VERSION:
+                logger.info("Factor snapshot %s has schema %s, skipping", asof, meta.get("schema"))
+                return None
+            values = np.load(os.path.join(path, "values.npy"), mmap_mode="r")
+            present = np.load(os.path.join(path, "present.npy"), mmap_mode="r")
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Factor snapshot %s read failed: %s", asof, e)
+            return None
+        snapshot = FactorSnapshot(asof, meta, values, present)
+        with self._lock:
+            self._loaded[asof] = (mtime, snapshot)
+        return snapshot
+
+    def load(
+        self,
+        asof: Optional[str] = None,
+        max_age_days: Optional[int] = None,
+        market: Optional[str] = None,
+    ) -> Optional[FactorSnapshot]:
+        """asof 이하 가장 최근 스냅샷 (asof 미지정 시 최신)
+
+        Args:
+            asof: 기준일 (YYYY-MM-DD)
+            max_age_days: 선택된 스냅샷이 기준일(미지정 시 오늘)보다 이만큼 넘게 오래되면 None
+            market: 지정 시 같은 시장으로 빌드된 스냅샷만 사용
+        """
+        ref = pd.Timestamp(asof).date() if asof else date.today()
+        for d in reversed(self.dates()):
+            if d > ref.isoformat():
+                continue
+            if max_age_days is not None and (ref - date.fromisoformat(d)).days > max_age_days:
+                return None
+            snapshot = self._open(d)
+            if snapshot is None:
+                continue
+            if market is not None and snapshot.market not in (None, market):
+                continue
+            return snapshot
+        return None
+
+    def prune(self, keep: int) -> int:
+        """최근 keep 개만 남기고 삭제"""
+        dates = self.dates()
+        removed = 0
+        for d in dates[:max(0, len(dates) - keep)]:
+            shutil.rmtree(self._dir(d), ignore_errors=True)
+            with self._lock:
+                self._loaded.pop(d, None)
+            removed += 1
+        return removed
+
+    def stats(self) -> Dict:
+        """저장소 통계"""
+        dates = self.dates()
+        size = 0
+        for d in dates:
+            for name in ("values.npy", "present.npy", "meta.json"):
+                try:
+                    size += os.path.getsize(os.path.join(self._dir(d), name))
+                except OSError:
+                    pass
+        return {
+            "directory": self.root,
+            "snapshots": len(dates),
+            "latest": dates[-1] if dates else None,
+            "size_mb": round(size / (1024 * 1024), 2),
+        }
+
+
+def build_factor_snapshot(
+    tickers: List[str],
+    asof: Optional[str] = None,
+    market: str = "US",
+    include_aggregator: bool = True,
+    store: Optional[FactorSnapshotStore] = None,
+) -> Dict:
+    """전 종목 팩터를 계산해 asof 날짜 스냅샷으로 저장 (야간 작업용)
+
+    Args:
+        tickers: 대상 종목 (워치리스트 + 테마 유니버스)
+        asof: 스냅샷 날짜 (기본: 오늘)
+        market: FactorAggregator 팩터 수집 시장
+        include_aggregator: FactorAggregator 팩터(재무/기술/감성) 포함 여부
+
+    Returns:
+        빌드 요약 (종목/컬럼 수, 실패 종목, 경로, 소요 시간)
+    """
+    from mcp_server.tools.ranking_engine import FACTORS, get_ranking_engine
+
+    start = time.time()
+    tickers = list(dict.fromkeys(tickers))
+    asof = asof or date.today().isoformat()
+    store = store or get_factor_snapshot_store()
+
+    # 1) 고급 랭킹 원시 팩터 (가격 패널 1회 조회)
+    try:
+        factors, dips = get_ranking_engine().collect_factors(tickers)
+        ranking = {f.ticker: (f, d) for f, d in zip(factors, dips)}
+    except Exception as e:
+        logger.warning(f"Factor snapshot: ranking factors failed: {e}")
+        ranking = {}
+
+    # 2) FactorAggregator 그룹 팩터 (그룹별 병렬 파이프라인, VIX 1회)
+    groups: Dict[str, Dict[str, Dict[str, float]]] = {}
+    failed: Dict[str, str] = {}
+    if include_aggregator and tickers:
+        from mcp_server.tools.factor_aggregator import FactorAggregator
+        groups, errors = FactorAggregator.collect_factor_groups_many(tickers, market)
+        for ticker, e in errors.items():
+            logger.warning(f"Factor snapshot: aggregator factors failed for {ticker}: {e}")
+            failed[ticker] = str(e)
+
+    # 3) 컬럼 구성 (그룹 팩터는 처음 나온 순서)
+    columns = _ranking_columns()
+    seen = set(columns)
+    for ticker in tickers:
+        for g, fs in (groups.get(ticker) or {}).items():
+            for name in fs:
+                col = f"{g}.{name}"
+                if col not in seen:
+                    seen.add(col)
+                    columns.append(col)
+    columns += ["ok.ranking", "ok.aggregator"]
+    col = {c: j for j, c in enumerate(columns)}
+
+    values = np.full((len(columns), len(tickers)), np.nan)
+    present = np.zeros((len(columns), len(tickers)), dtype=bool)
+    sectors: List[Optional[str]] = [None] * len(tickers)
+
+    def put(name: str, i: int, value) -> None:
+        v = _as_float(value)
+        if v is not None:
+            values[col[name], i] = v
+            present[col[name], i] = True
+
+    for i, ticker in enumerate(tickers):
+        if ticker in ranking:
+            f, dip = ranking[ticker]
+            sectors[i] = f.sector
+            for name in FACTORS:
+                put(f"rank.{name}", i, getattr(f, name))
+            put("rank.dip_bonus", i, dip)
+            for name in RAW_METRICS:
+                put(f"raw.{name}", i, (f.raw_metrics or {}).get(name))
+        put("ok.ranking", i, 1.0 if ticker in ranking else 0.0)
+
+        g = groups.get(ticker)
+        for group, fs in (g or {}).items():
+            for name, value in fs.items():
+                put(f"{group}.{name}", i, value)
+        put("ok.aggregator", i, 1.0 if g is not None else 0.0)
+
+    path = store.write(asof, tickers, columns, values, present, sectors=sectors, market=market)
+    summary = {
+        "asof": asof,
+        "tickers": len(tickers),
+        "columns": len(columns),
+        "ranking_ok": len(ranking),
+        "aggregator_ok": len(groups),
+        "failed": failed,
+        "path": path,
+        "elapsed_sec": round(time.time() - start, 2),
+    }
+    logger.info(f"Factor snapshot {asof} built: {summary['tickers']} tickers, {summary['columns']} columns")
+    return summary
+
+
+# 싱글톤 인스턴스
+_snapshot_store: Optional[FactorSnapshotStore] = None
+
+
+def get_factor_snapshot_store() -> FactorSnapshotStore:
+    """팩터 스냅샷 저장소 싱글톤 인스턴스 반환"""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = FactorSnapshotStore()
+    return _snapshot_store
+
+
+def get_factor_snapshot(asof: Optional[str] = None, market: Optional[str] = None) -> Optional[FactorSnapshot]:
+    """랭킹에 쓸 스냅샷: asof 지정 시 그 이하 최신, 미지정 시 FACTOR_SNAPSHOT_MAX_AGE_DAYS 이내 최신"""
+    try:
+        return get_factor_snapshot_store().load(
+            asof, max_age_days=None if asof else FACTOR_SNAPSHOT_MAX_AGE_DAYS, market=market
+        )
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Factor snapshot lookup failed: {e}")
+        return None
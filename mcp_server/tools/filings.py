@@ -2,9 +2,9 @@ from __future__ import annotations
 from typing import List, Dict, Optional
 import os
 import logging
-import requests
 from .llm import summarize_items
 from .cache_manager import cache_manager, TTL
+from .http_client import http_get
 from .resilience import (
     retry_with_backoff, Timeout, RetryConfig,
     circuit_sec, CircuitOpenError
@@ -15,7 +15,6 @@ logger = logging.getLogger(__name__)
 SEC_TICKERS_URL = "https://www.sec.gov/files/company_tickers.json"
 SEC_SUBMISSIONS_URL = "https://data.sec.gov/submissions/CIK{cik}.json"
 
-_session = requests.Session()
 _ticker_cache: Dict[str, str] = {}  # 인메모리 캐시 (CIK 매핑용)
 
 
@@ -39,7 +38,7 @@ def _headers() -> Dict[str, str]:
 def _fetch_sec_tickers() -> dict:
     """SEC 티커 목록 조회 (재시도 + 서킷 브레이커)"""
     def _do_request():
-        resp = _session.get(SEC_TICKERS_URL, headers=_headers(), timeout=Timeout.SEC_EDGAR)
+        resp = http_get(SEC_TICKERS_URL, headers=_headers(), timeout=Timeout.SEC_EDGAR)
         resp.raise_for_status()
         return resp.json()
     return circuit_sec.call(_do_request)
@@ -77,7 +76,7 @@ def _zero_pad_10(cik_str: str) -> str:
 def _fetch_sec_submissions(cik: str) -> dict:
     """SEC 제출물 조회 (재시도 + 서킷 브레이커)"""
     def _do_request():
-        resp = _session.get(
+        resp = http_get(
             SEC_SUBMISSIONS_URL.format(cik=_zero_pad_10(cik)),
             headers=_headers(),
             timeout=Timeout.SEC_EDGAR
@@ -88,7 +87,7 @@ def _fetch_sec_submissions(cik: str) -> dict:
 
 
 def fetch_recent_filings(ticker: str, forms: Optional[List[str]] = None, limit: int = 10, use_cache: bool = True) -> List[Dict]:
-    """SEC 공시 조회 (6시간 캐시, 재시도 + 서킷 브레이커 적용)"""
+    """SEC 공시 조회 (6시간 신선, 7일까지 stale 즉시 반환 + 백그라운드 갱신, 재시도 + 서킷 브레이커 적용)"""
     forms = forms or ["8-K", "10-Q", "10-K"]
 
     # 캐시 키 생성
@@ -96,10 +95,56 @@ def fetch_recent_filings(ticker: str, forms: Optional[List[str]] = None, limit:
     cache_key = f"filings:{ticker}:{forms_key}:{limit}"
 
     if use_cache:
-        cached_result = cache_manager.get(cache_key)
+        cached_result, stale = cache_manager.get_swr(cache_key)
         if cached_result is not None:
+            if stale:
+                cache_manager.refresh_in_background(
+                    cache_key, lambda: _fetch_recent_filings(ticker, forms, limit, cache_key, True)
+                )
             return cached_result
 
+    return _fetch_recent_filings(ticker, forms, limit, cache_key, use_cache)
+
+
+def fetch_recent_filings_many(
+    tickers: List[str], forms: Optional[List[str]] = None, limit: int = 10, max_workers: int = 1
+) -> Dict[str, List[Dict]]:
+    """여러 종목 SEC 공시 (fetch_recent_filings 와 캐시 항목 공유).
+
+    캐시는 한 번의 일괄 조회로 확인하고 (stale 은 즉시 반환 + 백그라운드 갱신), 없는 종목만 SEC 조회.
+    max_workers: 캐시 미스 종목 동시 조회 수 (SEC 요청 한도 고려)
+    """
+    forms = forms or ["8-K", "10-Q", "10-K"]
+    forms_key = ",".join(sorted(forms))
+    keys = {t: f"filings:{t}:{forms_key}:{limit}" for t in dict.fromkeys(tickers)}
+
+    out: Dict[str, List[Dict]] = {}
+    missing = []
+    hits = cache_manager.get_many_swr(keys.values())
+    for ticker, cache_key in keys.items():
+        if cache_key not in hits:
+            missing.append(ticker)
+            continue
+        out[ticker], stale = hits[cache_key]
+        if stale:
+            cache_manager.refresh_in_background(
+                cache_key, lambda t=ticker, k=cache_key: _fetch_recent_filings(t, forms, limit, k, True)
+            )
+
+    def fetch(ticker: str) -> List[Dict]:
+        return _fetch_recent_filings(ticker, forms, limit, keys[ticker], True)
+
+    if max_workers > 1 and len(missing) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as pool:
+            out.update(zip(missing, pool.map(fetch, missing)))
+    else:
+        out.update((t, fetch(t)) for t in missing)
+    return out
+
+
+def _fetch_recent_filings(ticker: str, forms: List[str], limit: int, cache_key: str, use_cache: bool) -> List[Dict]:
+    """SEC 조회 + 캐시 기록 (실패 시 만료 전 캐시 값 폴백)"""
     cik_str = get_cik_from_ticker(ticker)
     if not cik_str:
         return []
@@ -132,7 +177,7 @@ def fetch_recent_filings(ticker: str, forms: Optional[List[str]] = None, limit:
 
         # 결과 캐싱
         if use_cache and out:
-            cache_manager.set(cache_key, out, TTL.FILING)
+            cache_manager.set(cache_key, out, TTL.FILING_SWR)
 
         logger.debug(f"Fetched {len(out)} filings for {ticker}")
         return out
@@ -169,8 +214,17 @@ def _load_event_weights() -> Dict[str, float]:
 
 
 def keyword_event_score(ticker: str, limit: int = 10) -> float:
+    return _score_filings(fetch_recent_filings(ticker, limit=limit), _load_event_weights())
+
+
+def keyword_event_scores(tickers: List[str], limit: int = 10, max_workers: int = 1) -> List[float]:
+    """keyword_event_score 의 배치 버전 (공시 캐시 일괄 조회, 입력 순서대로 반환)"""
+    filings = fetch_recent_filings_many(tickers, limit=limit, max_workers=max_workers)
     weights = _load_event_weights()
-    filings = fetch_recent_filings(ticker, limit=limit)
+    return [_score_filings(filings.get(t, []), weights) for t in tickers]
+
+
+def _score_filings(filings: List[Dict], weights: Dict[str, float]) -> float:
     if not filings:
         return 0.5
     score = 0.0
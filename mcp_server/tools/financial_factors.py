@@ -12,9 +12,9 @@ import pandas as pd
 import numpy as np
 from typing import Dict, Optional
 import logging
-import yfinance as yf
 from .yf_utils import normalize_ticker_multi_market, is_yfinance_supported
 from .cache_manager import cached, TTL
+from .ticker_info import get_ticker_info
 
 logger = logging.getLogger(__name__)
 
@@ -118,7 +118,7 @@ class FinancialFactors:
     # 그룹 1: 수익성 지표 (5개)
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_profit_v2")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_profit_v2")
     def calculate_profitability(ticker: str, market: str = "US") -> Dict[str, float]:
         """수익성 지표 계산
 
@@ -170,7 +170,7 @@ class FinancialFactors:
             # (KIS / DART / PyKrx) take over cleanly.
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
 
             # ROE (Return on Equity)
@@ -241,7 +241,7 @@ class FinancialFactors:
     # 그룹 2: 재무 건전성 지표 (5개)
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_health")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_health")
     def calculate_financial_health(ticker: str, market: str = "US") -> Dict[str, float]:
         """재무 건전성 지표 계산
 
@@ -286,7 +286,7 @@ class FinancialFactors:
             # (KIS / DART / PyKrx) take over cleanly.
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
             balance = stock.balance_sheet
             financials = stock.financials
@@ -348,7 +348,7 @@ class FinancialFactors:
     # 그룹 3: 효율성 지표 (5개)
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_eff")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_eff")
     def calculate_efficiency(ticker: str, market: str = "US") -> Dict[str, float]:
         """효율성 지표 계산
 
@@ -392,7 +392,7 @@ class FinancialFactors:
             # (KIS / DART / PyKrx) take over cleanly.
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
             financials = stock.financials
             balance = stock.balance_sheet
@@ -491,7 +491,7 @@ class FinancialFactors:
     # 그룹 4: 배당 지표 (3개)
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_div")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_div")
     def calculate_dividend(ticker: str, market: str = "US") -> Dict[str, float]:
         """배당 지표 계산
 
@@ -514,7 +514,7 @@ class FinancialFactors:
             # (KIS / DART / PyKrx) take over cleanly.
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
 
             # Dividend Yield
@@ -572,7 +572,7 @@ class FinancialFactors:
     # 그룹 5: 성장성 지표 (2개)
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_growth")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_growth")
     def calculate_growth(ticker: str, market: str = "US") -> Dict[str, float]:
         """성장성 지표 계산
 
@@ -610,7 +610,7 @@ class FinancialFactors:
             # (KIS / DART / PyKrx) take over cleanly.
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
             financials = stock.financials
 
@@ -658,7 +658,7 @@ class FinancialFactors:
     # 통합 함수
     # ============================================================
     @staticmethod
-    @cached(ttl=TTL.FUNDAMENTAL, prefix="ff_all_v2")
+    @cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ff_all_v2")
     def calculate_all(ticker: str, market: str = "US") -> Dict[str, float]:
         """20개 재무 팩터 통합 계산
 
@@ -8,12 +8,12 @@ Finnhub API Integration Module
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from functools import lru_cache
 
 from mcp_server.tools.cache_manager import cache_manager, TTL
+from mcp_server.tools.http_client import http_get
 from mcp_server.tools.resilience import (
     CircuitBreaker, retry_with_backoff, Timeout, RetryConfig
 )
@@ -43,7 +43,7 @@ def _finnhub_request(endpoint: str, params: Dict = None) -> Dict:
         request_params = params or {}
         request_params["token"] = api_key
 
-        response = requests.get(url, params=request_params, timeout=Timeout.DEFAULT)
+        response = http_get(url, params=request_params, timeout=Timeout.DEFAULT)
         response.raise_for_status()
         return response.json()
 
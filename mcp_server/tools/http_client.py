@@ -0,0 +1,263 @@
+"""
+공유 HTTP 클라이언트 풀 - 외부 API 호출용 (httpx)
+
+Finnhub / Alpha Vantage / SEC EDGAR / DART / KIS / Gemini 호출이 요청마다 ``requests.get/post`` 로
+새 연결(TCP + TLS 핸드셰이크)을 열던 것을, 호스트별로 재사용되는 연결 풀로 바꾼다.
+
+- 호스트(scheme://host:port)마다 httpx.Client 하나 → 호스트별 연결 수 한도 (HTTP_MAX_CONNECTIONS_PER_HOST,
+  HTTP_HOST_LIMITS 로 호스트별 오버라이드), keep-alive 연결 재사용 (HTTP_KEEPALIVE_EXPIRY)
+- HTTP/2: h2 패키지가 설치되어 있으면 사용 (HTTP2_ENABLED=auto), 서버가 지원하지 않으면 HTTP/1.1
+- 동기: http_request / http_get / http_post / http_stream (스트리밍 응답, SSE)
+- 비동기: async_request / async_get / async_post / async_stream - 이벤트 루프별 httpx.AsyncClient
+  (스레드 풀 우회 없이 await, asyncio.run 등으로 루프가 끝날 때 남은 태스크 취소 단계에서 aclose)
+- 리다이렉트는 requests 와 같이 따라감
+
+재시도/서킷 브레이커는 이 계층 위에서 그대로 사용 (resilience.retry_with_backoff 는 httpx 예외도 재시도,
+CircuitBreaker.call / acall 로 감싸기).
+"""
+from __future__ import annotations
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+import asyncio
+import importlib.util
+import threading
+import logging
+
+import httpx
+
+from mcp_server.config import (
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_MAX_KEEPALIVE_PER_HOST,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_HOST_LIMITS,
+    HTTP2_ENABLED,
+)
+
+logger = logging.getLogger(__name__)
+
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None   # httpx HTTP/2 지원
+
+
+def _http2_enabled(setting: str = HTTP2_ENABLED) -> bool:
+    setting = (setting or "auto").lower()
+    if setting in ("0", "false", "no"):
+        return False
+    if setting in ("1", "true", "yes") and not H2_AVAILABLE:
+        logger.warning("HTTP2_ENABLED set but h2 package not installed, using HTTP/1.1")
+    return H2_AVAILABLE
+
+
+class HttpClientPool:
+    """호스트별 httpx 클라이언트 (동기 1개 + 이벤트 루프별 비동기 1개)"""
+
+    def __init__(
+        self,
+        max_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+        keepalive_per_host: int = HTTP_MAX_KEEPALIVE_PER_HOST,
+        keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY,
+        host_limits: Optional[Dict[str, int]] = None,
+        http2: Optional[bool] = None,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        if host_limits is None:
+            from mcp_server.tools.tool_executor import parse_limits
+            host_limits = parse_limits(HTTP_HOST_LIMITS)
+        self.max_per_host = max_per_host
+        self.keepalive_per_host = keepalive_per_host
+        self.keepalive_expiry = keepalive_expiry
+        self.host_limits = {h.lower(): n for h, n in host_limits.items()}
+        self.http2 = _http2_enabled() if http2 is None else http2
+        self._transport = transport            # 테스트용 (httpx.MockTransport 등)
+        self._async_transport = async_transport
+        self._sync: Dict[str, httpx.Client] = {}
+        self._async: Dict[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]] = {}
+        self._janitors: Dict[asyncio.AbstractEventLoop, asyncio.Task] = {}  # 루프 종료 시 클라이언트 정리
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "async_requests": 0, "clients": 0, "async_clients": 0, "async_closed": 0}
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+    def limits_for(self, host_key: str) -> httpx.Limits:
+        """호스트별 연결 한도 (HTTP_HOST_LIMITS 는 호스트 이름으로 지정)"""
+        name = urlsplit(host_key).hostname or host_key
+        limit = self.host_limits.get(name, self.max_per_host)
+        return httpx.Limits(
+            max_connections=limit,
+            max_keepalive_connections=min(limit, self.keepalive_per_host),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def _options(self, host_key: str) -> Dict[str, Any]:
+        return {"limits": self.limits_for(host_key), "http2": self.http2, "follow_redirects": True}
+
+    def client(self, url: str) -> httpx.Client:
+        """URL 호스트의 동기 클라이언트 (스레드 간 공유)"""
+        key = self.host_key(url)
+        client = self._sync.get(key)
+        if client is None:
+            with self._lock:
+                client = self._sync.get(key)
+                if client is None:
+                    client = httpx.Client(transport=self._transport, **self._options(key))
+                    self._sync[key] = client
+                    self.counters["clients"] += 1
+        return client
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        """URL 호스트의 비동기 클라이언트 (현재 실행 중인 이벤트 루프 전용)"""
+        loop = asyncio.get_running_loop()
+        key = self.host_key(url)
+        with self._lock:
+            clients = self._async.get(loop)
+            if clients is None:
+                self._drop_closed_loops()
+                clients = self._async[loop] = {}
+                janitor = loop.create_task(self._close_on_loop_exit(), name="http-client-janitor")
+                janitor._log_destroy_pending = False  # 백그라운드 스레드의 상주 루프는 종료 없이 프로세스와 함께 사라짐
+                self._janitors[loop] = janitor
+            client = clients.get(key)
+            if client is None:
+                client = httpx.AsyncClient(transport=self._async_transport, **self._options(key))
+                clients[key] = client
+                self.counters["async_clients"] += 1
+        return client
+
+    async def _close_on_loop_exit(self) -> None:
+        """루프가 끝날 때까지 대기 - asyncio.run 이 남은 태스크를 취소하면 이 루프의 클라이언트를 aclose"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.create_future()
+        finally:
+            clients = {}
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                # 루프가 끝나지 않은 채 수거됨 (프로세스 종료 / 취소 없이 닫힌 루프 - _drop_closed_loops 가 제거)
+                return
+            with self._lock:
+                if self._janitors.get(loop) is asyncio.current_task():  # aclose() 가 이미 정리했으면 건너뜀
+                    clients = self._async.pop(loop, {})
+                    del self._janitors[loop]
+            await self._aclose_all(clients.values())
+
+    async def _aclose_all(self, clients) -> None:
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"AsyncClient close failed: {e}")
+            self.counters["async_closed"] += 1
+
+    def _drop_closed_loops(self) -> None:
+        """취소 없이 닫힌 루프(run_until_complete 후 close 등)의 항목 제거 (호출자가 _lock 보유)"""
+        for loop in [lp for lp in self._async if lp.is_closed()]:
+            self._async.pop(loop, None)
+            self._janitors.pop(loop, None)
+            logger.debug("Dropped async HTTP clients of a closed event loop")
+
+    def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        self.counters["requests"] += 1
+        return self.client(url).request(method, url, **kwargs)
+
+    async def arequest(self, method: str, url: str, **kwargs) -> httpx.Response:
+        self.counters["async_requests"] += 1
+        return await self.async_client(url).request(method, url, **kwargs)
+
+    @contextmanager
+    def stream(self, method: str, url: str, **kwargs) -> Iterator[httpx.Response]:
+        """스트리밍 응답 (본문은 iter_lines / iter_bytes 로 소비, 블록을 나가면 연결 반환)"""
+        self.counters["requests"] += 1
+        with self.client(url).stream(method, url, **kwargs) as response:
+            yield response
+
+    @asynccontextmanager
+    async def astream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """비동기 스트리밍 응답 (aiter_lines / aiter_bytes 로 소비)"""
+        self.counters["async_requests"] += 1
+        async with self.async_client(url).stream(method, url, **kwargs) as response:
+            yield response
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 비동기 클라이언트 닫기"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async.pop(loop, {})
+            janitor = self._janitors.pop(loop, None)
+        if janitor is not None:
+            janitor.cancel()
+        await self._aclose_all(clients.values())
+
+    def close(self) -> None:
+        """동기 클라이언트 전부 닫기 (비동기 클라이언트는 루프 종료 시 정리)"""
+        with self._lock:
+            clients, self._sync = list(self._sync.values()), {}
+        for client in clients:
+            client.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hosts = sorted(self._sync)
+            async_hosts = sum(len(c) for c in self._async.values())
+        return {
+            **self.counters,
+            "hosts": hosts,
+            "open_async_clients": async_hosts,
+            "http2": self.http2,
+            "max_per_host": self.max_per_host,
+            "host_limits": dict(self.host_limits),
+        }
+
+
+_pool: Optional[HttpClientPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpClientPool:
+    """HttpClientPool 싱글톤"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HttpClientPool()
+    return _pool
+
+
+def http_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """공유 연결 풀로 동기 요청 (params / json / data / headers / timeout 은 requests 와 같은 의미)"""
+    return get_http_pool().request(method, url, **kwargs)
+
+
+def http_get(url: str, **kwargs) -> httpx.Response:
+    return http_request("GET", url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> httpx.Response:
+    return http_request("POST", url, **kwargs)
+
+
+def http_stream(method: str, url: str, **kwargs):
+    """스트리밍 요청 컨텍스트 매니저 (with http_stream("POST", url, json=...) as resp: ...)"""
+    return get_http_pool().stream(method, url, **kwargs)
+
+
+async def async_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """공유 연결 풀로 비동기 요청"""
+    return await get_http_pool().arequest(method, url, **kwargs)
+
+
+async def async_get(url: str, **kwargs) -> httpx.Response:
+    return await async_request("GET", url, **kwargs)
+
+
+async def async_post(url: str, **kwargs) -> httpx.Response:
+    return await async_request("POST", url, **kwargs)
+
+
+def async_stream(method: str, url: str, **kwargs):
+    """비동기 스트리밍 요청 컨텍스트 매니저 (async with async_stream("POST", url, json=...) as resp: ...)"""
+    return get_http_pool().astream(method, url, **kwargs)
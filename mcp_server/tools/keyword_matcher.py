@@ -0,0 +1,92 @@
+"""
+키워드 사전 매칭 - 공백 조각 메모 + 구 키워드 검사 (기존 `keyword in text` 와 같은 결과)
+
+NewsSentimentAnalyzer 는 텍스트마다 카테고리 × 키워드 전체를 `keyword in text_lower` 로 훑었다
+(키워드 ~170개 × 텍스트 길이, 뉴스 항목마다 3회).
+
+KeywordMatcher 는 같은 결과를 공백 단위 조각으로 구한다 (키워드 표는 import 시 한 번 구성).
+- 공백 없는 키워드 (대부분): 텍스트 안의 등장 위치는 반드시 공백으로 나눈 조각 하나 안에 있다
+  ("gain" ⊂ "again", "sec" ⊂ "unsecured,"). 텍스트를 str.split() 으로 조각 집합으로 나누고,
+  조각 → 그 조각에 들어 있는 키워드 표를 메모해 둔다 (뉴스 어휘는 반복이 많아 대부분 집합 연산으로 끝남)
+- 구 키워드 ("beat expectations" 등 소수): 첫 단어가 있는 텍스트에서만 부분 문자열 검사
+- 결과 의미는 기존과 동일: 부분 문자열 매칭, 겹치는 키워드도 각각, 같은 키워드가 여러 카테고리에
+  있으면 카테고리마다 한 번, 사전 정의 순서
+
+Aho-Corasick / 키워드 전체를 묶은 정규식은 순수 Python re 에서 문자 위치마다 비용이 들어 (~150ns/문자)
+`in` 루프보다 빠르지 않았다.
+"""
+from __future__ import annotations
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Set, Tuple
+
+_MEMO_MAX = 50_000   # 조각 메모 상한 (넘으면 새 조각은 저장하지 않고 매번 계산)
+
+
+class KeywordMatcher:
+    """(keyword, payload) 목록 → 텍스트에 들어 있는 키워드의 (keyword, payload) (목록 순서)"""
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]]):
+        self.entries: List[Tuple[str, Any]] = [(kw.lower(), payload) for kw, payload in entries]
+        atoms: Dict[str, int] = {}               # 공백 없는 문자열 (단어 키워드 + 구 키워드의 단어)
+        self._atom_entries: List[List[int]] = []
+        self._atom_phrases: List[List[Tuple[str, List[int]]]] = []
+        phrases: Dict[str, List[int]] = {}
+
+        def atom(text: str) -> int:
+            if text not in atoms:
+                atoms[text] = len(atoms)
+                self._atom_entries.append([])
+                self._atom_phrases.append([])
+            return atoms[text]
+
+        for i, (kw, _) in enumerate(self.entries):
+            if not kw.strip():
+                continue
+            if kw.split() == [kw]:
+                self._atom_entries[atom(kw)].append(i)
+            else:
+                phrases.setdefault(kw, []).append(i)
+        for kw, indices in phrases.items():
+            # 구 키워드는 첫 단어가 텍스트에 있을 때만 부분 문자열 검사
+            self._atom_phrases[atom(kw.split()[0])].append((kw, indices))
+        self._atoms = list(atoms.items())
+        self._hot: Dict[str, FrozenSet[int]] = {}   # 키워드가 들어 있는 조각 → atom
+        self._cold: Set[str] = set()                 # 키워드가 없는 조각
+
+    def _classify(self, chunks: Set[str]) -> Dict[str, FrozenSet[int]]:
+        """처음 보는 조각의 atom 계산 - 키워드가 있는 새 조각을 반환 (메모 상한 전까지는 저장)"""
+        hot = {}
+        for chunk in chunks.difference(self._hot, self._cold):
+            hits = frozenset(a for text, a in self._atoms if text in chunk)
+            if hits:
+                hot[chunk] = hits
+            elif len(self._cold) < _MEMO_MAX:
+                self._cold.add(chunk)
+        if len(self._hot) < _MEMO_MAX:
+            self._hot.update(hot)
+        return hot
+
+    def find(self, text_lower: str) -> List[Tuple[str, Any]]:
+        """소문자 텍스트에 들어 있는 (keyword, payload) - `keyword in text_lower` 인 엔트리 전부"""
+        return self.find_many([text_lower])[0]
+
+    def find_many(self, texts_lower: Sequence[str]) -> List[List[Tuple[str, Any]]]:
+        """여러 텍스트 일괄 - find() 를 각각 부른 것과 같은 결과 (처음 보는 조각은 한 번에 분류)"""
+        chunk_lists = [text.split() if text else [] for text in texts_lower]
+        fresh = self._classify(set().union(*chunk_lists))
+
+        results = []
+        for text, chunks in zip(texts_lower, chunk_lists):
+            present: Set[int] = set()
+            for chunk in self._hot.keys() & chunks:
+                present.update(self._hot[chunk])
+            if fresh:   # 메모 상한으로 저장되지 않았을 수 있는 새 조각
+                for chunk in fresh.keys() & chunks:
+                    present.update(fresh[chunk])
+            found: List[int] = []
+            for a in present:
+                found.extend(self._atom_entries[a])
+                for kw, indices in self._atom_phrases[a]:
+                    if kw in text:
+                        found.extend(indices)
+            results.append([self.entries[i] for i in sorted(set(found))])
+        return results
@@ -26,9 +26,10 @@ import os
 import threading
 from typing import Any
 
-import requests
+import httpx
 
 from mcp_server.tools.cache_manager import cache_manager
+from mcp_server.tools.http_client import http_post, http_request
 
 logger = logging.getLogger(__name__)
 
@@ -55,7 +56,7 @@ def is_configured() -> bool:
 def _fetch_token(app_key: str, app_secret: str) -> str | None:
     """Mint a fresh OAuth2 access token from KIS."""
     try:
-        resp = requests.post(
+        resp = http_post(
             f"{KIS_BASE_URL}/oauth2/tokenP",
             json={
                 "grant_type": "client_credentials",
@@ -133,7 +134,7 @@ def request(
     }
     url = f"{KIS_BASE_URL}{path}"
     try:
-        resp = requests.request(method, url, headers=headers, params=params, timeout=timeout)
+        resp = http_request(method, url, headers=headers, params=params, timeout=timeout)
         # KIS uses 200 for both success and "domain failure" — must check rt_cd
         resp.raise_for_status()
         data = resp.json()
@@ -143,7 +144,7 @@ def request(
             # Log at debug — caller decides whether the empty result is fatal.
             logger.debug("KIS %s rt_cd=%s msg=%s", tr_id, rt_cd, data.get("msg1"))
         return data
-    except requests.HTTPError as e:
+    except httpx.HTTPStatusError as e:
         # 401 means the cached token is stale (clock skew, manual revoke).
         # Drop it so the next call re-mints.
         if e.response is not None and e.response.status_code == 401:
@@ -146,6 +146,56 @@ class KoreanMarketAdapter:
             logger.error(f"Failed to get OHLCV for {ticker}: {e}")
             return pd.DataFrame()
 
+    def get_ohlcv_snapshot(
+        self,
+        tickers: List[str],
+        start: str,
+        end: str,
+    ) -> Dict[str, pd.DataFrame]:
+        """여러 종목의 일별 OHLCV를 일자별 전체 시장 스냅샷으로 조회
+
+        ``get_market_ohlcv(date, market="ALL")`` 한 번이 그날 전 종목을
+        돌려주므로, 종목 수보다 영업일 수가 적은 구간(예: 최근 며칠 tail
+        갱신)에서는 종목별 조회보다 요청 수가 훨씬 적다.
+
+        Returns:
+            {ticker: OHLCV DataFrame (Date 컬럼)} — 데이터가 없는 종목은 제외
+        """
+        if not self._pykrx_available or not tickers:
+            return {}
+
+        from pykrx import stock
+
+        codes = {t.replace(".KS", "").replace(".KQ", ""): t for t in tickers}
+        rows: Dict[str, List[Dict]] = {t: [] for t in tickers}
+        days = pd.bdate_range(self._normalize_date(start), self._normalize_date(end))
+
+        for day in days:
+            day_str = day.strftime("%Y%m%d")
+            try:
+                snap = stock.get_market_ohlcv(day_str, market="ALL")
+            except Exception as e:
+                logger.warning(f"Failed to get OHLCV snapshot for {day_str}: {e}")
+                continue
+            if snap is None or snap.empty:
+                continue
+            snap = snap[snap.index.isin(list(codes))]
+            for code, r in snap.iterrows():
+                # 휴장일에도 0 으로 채운 행이 올 수 있음
+                if not r.get("종가"):
+                    continue
+                rows[codes[code]].append({
+                    "Date": day,
+                    "Open": float(r.get("시가", 0)),
+                    "High": float(r.get("고가", 0)),
+                    "Low": float(r.get("저가", 0)),
+                    "Close": float(r.get("종가", 0)),
+                    "Volume": float(r.get("거래량", 0)),
+                })
+
+        logger.info(f"Retrieved OHLCV snapshot for {len(tickers)} tickers over {len(days)} days")
+        return {t: pd.DataFrame(r) for t, r in rows.items() if r}
+
     @cached(ttl=TTL.FUNDAMENTAL, prefix="kr_fundamental")
     def get_fundamental(self, ticker: str, date: Optional[str] = None) -> Dict:
         """펀더멘털 데이터 조회 (24시간 캐시)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 from typing import Iterator, List
-import os, logging, time, requests
+import os, json, logging, time
+import httpx
 
+from mcp_server.config import LLM_HEDGE_SYNC
+from mcp_server.tools.http_client import http_post, http_stream
 from mcp_server.tools.resilience import (
     retry_with_backoff, Timeout, RetryConfig, circuit_gemini, CircuitOpenError
 )
@@ -34,6 +37,41 @@ def _auth_headers() -> dict[str, str]:
 LLM_MAX_OUTPUT_TOKENS_DEFAULT = int(os.getenv("LLM_MAX_OUTPUT_TOKENS", "8192"))
 
 
+def _build_payload(system: str, user: str, temperature: float, max_output_tokens: int) -> dict:
+    """Request body shared by ``generateContent`` and ``streamGenerateContent``."""
+    return {
+        "systemInstruction": {"parts": [{"text": system}]},
+        "contents": [{"role": "user", "parts": [{"text": user}]}],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_output_tokens,
+        },
+    }
+
+
+def _parse_sse_event(raw: str) -> dict | None:
+    """One ``data: {...}`` line of the SSE stream → chunk dict (None for keep-alives / junk)."""
+    if not raw or not raw.startswith("data: "):
+        return None
+    blob = raw[len("data: "):].strip()
+    if blob in ("[DONE]", ""):
+        return None
+    try:
+        obj = json.loads(blob)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
+
+
+def _chunk_deltas(obj: dict) -> List[str]:
+    """Text deltas carried by one streamed chunk."""
+    candidates = obj.get("candidates") or []
+    if not candidates:
+        return []
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    return [p.get("text") or "" for p in parts if p.get("text")]
+
+
 def _call_gemma_no_retry(
     system: str,
     user: str,
@@ -54,17 +92,10 @@ def _call_gemma_no_retry(
     """
     use_model = model or GEMINI_MODEL
     url = f"{GEMINI_BASE_URL}/models/{use_model}:generateContent"
-    payload = {
-        "systemInstruction": {"parts": [{"text": system}]},
-        "contents": [{"role": "user", "parts": [{"text": user}]}],
-        "generationConfig": {
-            "temperature": temperature,
-            "maxOutputTokens": max_output_tokens or LLM_MAX_OUTPUT_TOKENS_DEFAULT,
-        },
-    }
+    payload = _build_payload(system, user, temperature, max_output_tokens or LLM_MAX_OUTPUT_TOKENS_DEFAULT)
 
     def _do_request():
-        resp = requests.post(
+        resp = http_post(
             url,
             json=payload,
             headers=_auth_headers(),
@@ -72,11 +103,9 @@ def _call_gemma_no_retry(
         )
         resp.raise_for_status()
         # Force UTF-8 — Gemini's Content-Type sometimes omits the
-        # charset, which makes ``requests`` fall back to ISO-8859-1
-        # via apparent_encoding. ``resp.json()`` then decodes Korean
-        # 3-byte sequences as Latin-1 chars and the answer comes out
-        # as ``ì¼ì±ì ì`` mojibake. Pinning encoding fixes the chat +
-        # analysis-report Korean output in a single line.
+        # charset; a Latin-1 fallback decodes Korean 3-byte sequences
+        # as ``ì¼ì±ì ì`` mojibake. Pinning encoding keeps the chat +
+        # analysis-report Korean output intact.
         resp.encoding = "utf-8"
         return resp.json()
 
@@ -151,8 +180,17 @@ _LLM_INNER_RETRIES = int(os.getenv("LLM_INNER_RETRIES", "3"))
 _LLM_RETRY_BACKOFF_SEC = float(os.getenv("LLM_RETRY_BACKOFF_SEC", "2.0"))
 
 
+def _model_chain(model: str | None, fallback_models: list[str] | None) -> list[str]:
+    """Primary model followed by the fallbacks (primary not repeated)."""
+    primary = model or GEMINI_MODEL
+    return [primary, *[m for m in (fallback_models or _LLM_FALLBACK_MODELS_DEFAULT)
+                       if m != primary]]
+
+
 def is_transient_upstream_error(exc: BaseException) -> bool:
     """True for HTTP 5xx/429, timeouts, and connection issues."""
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError)):
+        return True
     msg = str(exc).lower()
     if any(t in msg for t in ("503", "502", "504", "500", "429",
                               "service unavailable", "timeout", "timed out",
@@ -221,14 +259,49 @@ def call_llm_resilient(
     retry on HTTPError, so the *effective* attempts per model for 5xx is
     ``2 * (_LLM_INNER_RETRIES + 1)``. Keeping the inner loop low (default 3)
     is intentional — quota burns fast.
+
+    With ``LLM_HEDGE_SYNC`` on, the first round goes through the async
+    client (``llm_async.AsyncGeminiClient.generate_hedged``): the next
+    fallback model is fired once the current one has produced no token
+    within ``LLM_HEDGE_AFTER_SEC``, instead of only after it fails. If
+    every model in that round fails transiently, the serial retry loop
+    below picks up from there rather than starting over: models that
+    failed with 429 / 404 / open circuit are skipped, and for 5xx or
+    timeouts the hedged request counts as the first attempt.
     """
-    primary = model or GEMINI_MODEL
-    chain = [primary, *[m for m in (fallback_models or _LLM_FALLBACK_MODELS_DEFAULT)
-                        if m != primary]]
+    chain = _model_chain(model, fallback_models)
+    primary = chain[0]
     last_exc: BaseException | None = None
+    hedge_failures: dict[str, BaseException] = {}
+
+    if LLM_HEDGE_SYNC:
+        from mcp_server.tools.llm_async import run_sync, get_async_llm
+        try:
+            return run_sync(get_async_llm().generate_hedged(
+                system, user, model=primary, fallback_models=chain[1:],
+                temperature=temperature, max_output_tokens=max_output_tokens,
+                failures=hedge_failures,
+            ))
+        except Exception as e:  # noqa: BLE001
+            if not (is_transient_upstream_error(e) or is_model_not_found_error(e) or is_circuit_open_error(e)):
+                raise
+            if is_rate_limit_error(e) or is_circuit_open_error(e):
+                circuit_gemini.reset()
+            logger.warning("LLM hedged round failed (%s); falling back to serial retries", e)
+            last_exc = e
 
     for m_idx, m in enumerate(chain):
-        for attempt in range(_LLM_INNER_RETRIES + 1):
+        first_attempt = 0
+        prior = hedge_failures.get(m)
+        if prior is not None:
+            if (is_rate_limit_error(prior) or is_model_not_found_error(prior)
+                    or is_circuit_open_error(prior)):
+                logger.warning("LLM %s already failed in hedged round (%s) — skipping", m, prior)
+                continue
+            # 5xx / timeout: the hedged request was attempt 1, back off before attempt 2
+            first_attempt = 1
+            time.sleep(_LLM_RETRY_BACKOFF_SEC)
+        for attempt in range(first_attempt, _LLM_INNER_RETRIES + 1):
             try:
                 # Use the *no-retry* primitive so we don't double-burn quota
                 # via tenacity's inner retry loop on top of our outer one.
@@ -250,7 +323,7 @@ def call_llm_resilient(
                         m,
                     )
                     break
-                if not is_transient_upstream_error(e):
+                if not (is_transient_upstream_error(e) or is_circuit_open_error(e)):
                     raise
                 # 429 / circuit-open: don't retry the same model. Also
                 # proactively reset the circuit so the *next* model in the
@@ -292,8 +365,15 @@ def call_llm_json(
     output; callers parse via ``api.services.report_builder.parse_llm_blocks``
     which tolerates stray prose / code fences and degrades to a prose
     fallback so a single malformed response never breaks a report.
+
+    Responses are cached by prompt hash (``llm_cache``) so regenerating the
+    same report reuses the blocks instead of calling Gemini again.
     """
-    return call_llm_resilient(system, user, model=model, temperature=temperature)
+    from mcp_server.tools.llm_cache import cached_completion
+    return cached_completion(
+        model or GEMINI_MODEL, system, user, temperature,
+        lambda: call_llm_resilient(system, user, model=model, temperature=temperature),
+    )
 
 
 def _call_gemma_stream(system: str, user: str, temperature: float = 0.2, *, model: str | None = None):
@@ -313,51 +393,26 @@ def _call_gemma_stream(system: str, user: str, temperature: float = 0.2, *, mode
     """
     use_model = model or GEMINI_MODEL
     url = f"{GEMINI_BASE_URL}/models/{use_model}:streamGenerateContent?alt=sse"
-    payload = {
-        "systemInstruction": {"parts": [{"text": system}]},
-        "contents": [{"role": "user", "parts": [{"text": user}]}],
-        "generationConfig": {
-            "temperature": temperature,
-            "maxOutputTokens": 2048,
-        },
-    }
+    payload = _build_payload(system, user, temperature, 2048)
     try:
-        with requests.post(
+        with http_stream(
+            "POST",
             url,
             json=payload,
             headers=_auth_headers(),
             timeout=Timeout.GEMINI,
-            stream=True,
         ) as resp:
             resp.raise_for_status()
-            # Force UTF-8 before ``iter_lines(decode_unicode=True)`` —
-            # Gemini's SSE response Content-Type doesn't always declare a
-            # charset, so requests falls back to ISO-8859-1 and Korean
-            # 3-byte sequences come out as ``ì¼ì±ì ì`` mojibake. The chat
-            # streaming path is the high-traffic UI surface so this fix
-            # matters most here.
+            # Force UTF-8 before ``iter_lines()`` — Gemini's SSE response
+            # Content-Type doesn't always declare a charset, and a Latin-1
+            # fallback turns Korean 3-byte sequences into ``ì¼ì±ì ì``
+            # mojibake. The chat streaming path is the high-traffic UI
+            # surface so this fix matters most here.
             resp.encoding = "utf-8"
-            for raw in resp.iter_lines(decode_unicode=True):
-                if not raw:
-                    continue
-                if not raw.startswith("data: "):
-                    continue
-                blob = raw[len("data: "):].strip()
-                if blob in ("[DONE]", ""):
-                    continue
-                try:
-                    import json as _json
-                    obj = _json.loads(blob)
-                except Exception:  # noqa: BLE001
-                    continue
-                candidates = obj.get("candidates") or []
-                if not candidates:
-                    continue
-                parts = (candidates[0].get("content") or {}).get("parts") or []
-                for p in parts:
-                    delta = p.get("text") or ""
-                    if delta:
-                        yield delta
+            for raw in resp.iter_lines():
+                obj = _parse_sse_event(raw)
+                if obj is not None:
+                    yield from _chunk_deltas(obj)
     except Exception as e:  # noqa: BLE001
         logger.warning("stream call failed, falling back to non-streaming: %s", e)
         try:
@@ -375,6 +430,8 @@ def summarize_text(text: str, max_sentences: int = 6, model: str | None = None)
     Routes through ``call_llm_resilient`` (FR-P05) so transient 503s on
     preview models retry + fall back through ``GEMINI_FALLBACK_MODELS``
     instead of bubbling a one-shot failure to filings / theme reports.
+    The summary is cached by prompt hash (``llm_cache``): re-summarizing the
+    same headlines (weekly snapshot, theme report reruns) skips the call.
     """
     if not text or not text.strip():
         return ""
@@ -383,8 +440,13 @@ def summarize_text(text: str, max_sentences: int = 6, model: str | None = None)
         f"You are a concise financial analyst. Summarize in {max_sentences} sentences (bullet-ready). "
         "Focus on drivers, risks, guidance, and near-term catalysts."
     )
+    from mcp_server.tools.llm_cache import cached_completion
+    user = text[:8000]
     try:
-        return call_llm_resilient(system, text[:8000], model=model, temperature=0.2)
+        return cached_completion(
+            model or GEMINI_MODEL, system, user, 0.2,
+            lambda: call_llm_resilient(system, user, model=model, temperature=0.2),
+        )
     except CircuitOpenError:
         logger.warning("Gemini circuit open, skipping summarization")
         return ""
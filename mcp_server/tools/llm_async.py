@@ -0,0 +1,348 @@
+"""
+Async Gemini client — streaming deltas, bounded concurrency, hedged model fallback.
+
+``llm._call_gemma_no_retry`` blocks a worker thread for the whole generation
+(up to ``Timeout.GEMINI``) and ``call_llm_resilient`` only moves to the next
+``GEMINI_FALLBACK_MODELS`` entry after the current model has *failed*. A
+preview model that is merely slow (no 5xx, just a 30 s time-to-first-token)
+therefore stalls the caller for the full wait.
+
+``AsyncGeminiClient`` talks to ``:streamGenerateContent?alt=sse`` through the
+shared ``http_client`` pool (per-loop ``httpx.AsyncClient``):
+
+- ``stream()``: text deltas of one model as they arrive.
+- ``stream_hedged()`` / ``generate_hedged()``: start the primary model; if no
+  token arrives within ``LLM_HEDGE_AFTER_SEC`` (or it fails first), also start
+  the next fallback. The first model to deliver a token wins and the others
+  are cancelled. After the first token the winner is never switched (that
+  would duplicate text), so a mid-stream error is raised to the caller.
+- Every in-flight request (hedges included) takes a slot of a
+  ``LLM_MAX_CONCURRENT`` semaphore.
+- Per-model time-to-first-token / tokens-per-second / wins / hedges are
+  recorded in ``get_llm_stats()``.
+
+Sync callers (``call_llm_resilient``) run coroutines on one background event
+loop via ``run_sync`` so the semaphore and keep-alive connections are shared
+across worker threads.
+"""
+from __future__ import annotations
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
+import threading
+import time
+import weakref
+import logging
+
+from mcp_server.config import LLM_MAX_CONCURRENT, LLM_HEDGE_AFTER_SEC
+from mcp_server.tools import llm
+from mcp_server.tools.http_client import async_stream
+from mcp_server.tools.resilience import Timeout, circuit_gemini
+
+logger = logging.getLogger(__name__)
+
+
+# ===== 모델별 지표 =====
+
+@dataclass
+class ModelStats:
+    """모델 하나의 누적 지표"""
+    requests: int = 0
+    completed: int = 0
+    failures: int = 0
+    cancelled: int = 0
+    wins: int = 0          # 헤지 경쟁에서 첫 토큰을 낸 횟수
+    hedged: int = 0        # 헤지(지연 예산 초과 / 선행 모델 실패)로 시작된 요청 수
+    first_tokens: int = 0
+    ttft_total: float = 0.0
+    ttft_last: float = 0.0
+    output_tokens: int = 0
+    generation_sec: float = 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        out = asdict(self)
+        out["ttft_avg_sec"] = round(self.ttft_total / self.first_tokens, 3) if self.first_tokens else None
+        out["tokens_per_sec"] = round(self.output_tokens / self.generation_sec, 1) if self.generation_sec else None
+        return out
+
+
+class LLMStats:
+    """모델별 TTFT / tokens/sec / 헤지 지표 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, ModelStats] = {}
+
+    def _model(self, model: str) -> ModelStats:
+        stats = self._models.get(model)
+        if stats is None:
+            stats = self._models[model] = ModelStats()
+        return stats
+
+    def record(self, model: str, **increments) -> None:
+        with self._lock:
+            stats = self._model(model)
+            for name, value in increments.items():
+                setattr(stats, name, getattr(stats, name) + value)
+
+    def record_first_token(self, model: str, ttft: float) -> None:
+        with self._lock:
+            stats = self._model(model)
+            stats.first_tokens += 1
+            stats.ttft_total += ttft
+            stats.ttft_last = ttft
+
+    def get(self, model: str) -> Dict[str, float]:
+        with self._lock:
+            return self._model(model).as_dict()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {m: s.as_dict() for m, s in sorted(self._models.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+
+
+_stats = LLMStats()
+
+
+def get_llm_stats() -> LLMStats:
+    return _stats
+
+
+# ===== 비동기 클라이언트 =====
+
+class AsyncGeminiClient:
+    """Gemini 스트리밍 클라이언트 (동시 요청 한도 + 헤지 폴백)"""
+
+    def __init__(self, max_concurrent: int = LLM_MAX_CONCURRENT, hedge_after: float = LLM_HEDGE_AFTER_SEC,
+                 stats: Optional[LLMStats] = None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.hedge_after = hedge_after
+        self.stats = stats or _stats
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # asyncio.Semaphore 는 처음 기다린 루프에 묶이므로 루프별로 둔다
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+            weakref.WeakKeyDictionary()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+        return sem
+
+    async def stream(
+        self,
+        system: str,
+        user: str,
+        *,
+        model: Optional[str] = None,
+        temperature: float = 0.2,
+        max_output_tokens: Optional[int] = None,
+    ) -> AsyncIterator[str]:
+        """한 모델의 텍스트 델타를 도착하는 대로 yield"""
+        use_model = model or llm.GEMINI_MODEL
+        limit = max_output_tokens or llm.LLM_MAX_OUTPUT_TOKENS_DEFAULT
+        url = f"{llm.GEMINI_BASE_URL}/models/{use_model}:streamGenerateContent?alt=sse"
+        payload = llm._build_payload(system, user, temperature, limit)
+
+        async with self._semaphore():
+            circuit_gemini._before_call()
+            self.stats.record(use_model, requests=1)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            started = time.perf_counter()
+            first = None
+            chars = 0
+            usage_tokens = None
+            finish = ""
+            try:
+                async with async_stream("POST", url, json=payload, headers=llm._auth_headers(),
+                                        timeout=Timeout.GEMINI) as resp:
+                    if resp.status_code >= 400:
+                        await resp.aread()
+                        resp.raise_for_status()
+                    resp.encoding = "utf-8"   # _call_gemma_stream 과 같은 이유 (charset 누락 시 한글 깨짐)
+                    async for raw in resp.aiter_lines():
+                        obj = llm._parse_sse_event(raw)
+                        if obj is None:
+                            continue
+                        usage_tokens = (obj.get("usageMetadata") or {}).get("candidatesTokenCount", usage_tokens)
+                        finish = ((obj.get("candidates") or [{}])[0].get("finishReason")) or finish
+                        for delta in llm._chunk_deltas(obj):
+                            if first is None:
+                                first = time.perf_counter()
+                                self.stats.record_first_token(use_model, first - started)
+                            chars += len(delta)
+                            yield delta
+            except (asyncio.CancelledError, GeneratorExit):
+                self.stats.record(use_model, cancelled=1)
+                raise
+            except Exception:
+                circuit_gemini._on_failure()
+                self.stats.record(use_model, failures=1)
+                raise
+            finally:
+                self.in_flight -= 1
+            circuit_gemini._on_success()
+            # usageMetadata 가 없으면 문자 수로 추정 (~4자/토큰)
+            tokens = usage_tokens if usage_tokens is not None else max(1, chars // 4) if chars else 0
+            self.stats.record(use_model, completed=1, output_tokens=tokens,
+                              generation_sec=time.perf_counter() - started)
+            if finish == "MAX_TOKENS":
+                logger.warning(
+                    "LLM response truncated by maxOutputTokens (model=%s, limit=%d). "
+                    "Increase LLM_MAX_OUTPUT_TOKENS or pass a larger max_output_tokens.",
+                    use_model, limit,
+                )
+
+    async def stream_hedged(
+        self,
+        system: str,
+        user: str,
+        *,
+        model: Optional[str] = None,
+        fallback_models: Optional[List[str]] = None,
+        hedge_after: Optional[float] = None,
+        temperature: float = 0.2,
+        max_output_tokens: Optional[int] = None,
+        failures: Optional[Dict[str, BaseException]] = None,
+    ) -> AsyncIterator[str]:
+        """첫 토큰 지연 예산을 넘기면 다음 폴백 모델을 동시에 요청, 먼저 토큰을 낸 모델의 델타를 yield
+
+        failures 가 주어지면 실패한 모델별 예외를 기록 (call_llm_resilient 가 직렬 재시도에서 건너뛸 모델 판단)
+        """
+        chain = llm._model_chain(model, fallback_models)
+        budget = self.hedge_after if hedge_after is None else hedge_after
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+        tasks: List[asyncio.Task] = []
+        failed: set = set()
+
+        async def pump(idx: int, m: str) -> None:
+            try:
+                async for delta in self.stream(system, user, model=m, temperature=temperature,
+                                               max_output_tokens=max_output_tokens):
+                    await events.put((idx, "delta", delta))
+                await events.put((idx, "end", None))
+            except Exception as e:  # noqa: BLE001 - 컨트롤러가 분류
+                await events.put((idx, "error", e))
+
+        def launch() -> float:
+            idx = len(tasks)
+            if idx:
+                self.stats.record(chain[idx], hedged=1)
+            tasks.append(asyncio.create_task(pump(idx, chain[idx])))
+            return loop.time() + budget
+
+        winner = None
+        try:
+            hedge_at = launch()
+            while winner is None:
+                timeout = None
+                if len(tasks) < len(chain) and budget > 0:
+                    timeout = max(0.0, hedge_at - loop.time())
+                try:
+                    idx, kind, payload = await asyncio.wait_for(events.get(), timeout)
+                except asyncio.TimeoutError:
+                    logger.info("LLM %s: no token after %.1fs, hedging with %s",
+                                chain[len(tasks) - 1], budget, chain[len(tasks)])
+                    hedge_at = launch()
+                    continue
+
+                if kind != "error":
+                    winner = idx
+                    self.stats.record(chain[idx], wins=1)
+                    if idx:
+                        logger.info("LLM hedge won by %s (primary %s)", chain[idx], chain[0])
+                    break
+
+                failed.add(idx)
+                if failures is not None:
+                    failures[chain[idx]] = payload
+                if not (llm.is_transient_upstream_error(payload) or llm.is_model_not_found_error(payload)
+                        or llm.is_circuit_open_error(payload)):
+                    raise payload
+                if llm.is_rate_limit_error(payload) or llm.is_circuit_open_error(payload):
+                    # call_llm_resilient 와 같이: 429 / 열린 서킷이 다음 모델을 막지 않도록
+                    circuit_gemini.reset()
+                logger.warning("LLM %s failed (%s)", chain[idx], payload)
+                if len(tasks) < len(chain):
+                    hedge_at = launch()
+                elif len(failed) == len(tasks):
+                    raise payload
+
+            for t in tasks:
+                if t is not tasks[winner]:
+                    t.cancel()
+            while True:
+                if kind == "delta":
+                    yield payload
+                elif kind == "end":
+                    return
+                else:
+                    raise payload
+                idx, kind, payload = await events.get()
+                while idx != winner:
+                    idx, kind, payload = await events.get()
+        finally:
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def generate_hedged(self, system: str, user: str, **kwargs) -> str:
+        """stream_hedged 결과를 이어붙인 전체 응답"""
+        parts = [delta async for delta in self.stream_hedged(system, user, **kwargs)]
+        return "".join(parts).strip()
+
+
+_client: Optional[AsyncGeminiClient] = None
+
+
+def get_async_llm() -> AsyncGeminiClient:
+    """AsyncGeminiClient 싱글톤"""
+    global _client
+    if _client is None:
+        _client = AsyncGeminiClient()
+    return _client
+
+
+def astream_llm(system: str, user: str, **kwargs) -> AsyncIterator[str]:
+    """헤지 스트리밍 (async for delta in astream_llm(system, user): ...)"""
+    return get_async_llm().stream_hedged(system, user, **kwargs)
+
+
+async def acall_llm(system: str, user: str, **kwargs) -> str:
+    """헤지 호출로 전체 응답 문자열"""
+    return await get_async_llm().generate_hedged(system, user, **kwargs)
+
+
+# ===== 동기 호출자용 백그라운드 루프 =====
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-async", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def run_sync(coro, timeout: Optional[float] = None):
+    """코루틴을 공유 백그라운드 루프에서 실행하고 결과를 기다림 (워커 스레드의 동기 호출용)"""
+    future = asyncio.run_coroutine_threadsafe(coro, _background_loop())
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
@@ -0,0 +1,130 @@
+"""
+LLM 응답 캐시 - 프롬프트 내용 해시 키 (요약 / 뉴스 감성 / JSON 블록)
+
+summarize_items / summarize_text / call_llm_json / news_sentiment._call_gemma_sentiment 는 같은 헤드라인
+묶음을 다시 요약할 때도 매번 Gemini 를 호출했다 (run_theme_report, main.py 의 주간 스냅샷 재생성,
+analyze_theme 마다 도는 테마 감성).
+
+cached_completion(model, system, user, temperature, compute) 는
+sha256(model, system, 정규화된 user, temperature, max_output_tokens) 키로 응답 텍스트를 cache_manager 에 저장한다.
+
+- 정규화: 유니코드 NFC, 줄 끝 공백 제거, 연속 공백/빈 줄 축약 (의미 없는 공백 차이로 캐시가 갈리지 않도록)
+- TTL: LLM_CACHE_TTL_SEC, 크기 상한: cache_manager 의 L1 LRU (CACHE_L1_MAX_ITEMS/MB) + L2 size_limit 축출
+- 같은 프롬프트의 동시 호출은 cache_manager single-flight 로 한 번만 업스트림 호출
+- 빈 응답 / 예외는 캐시하지 않음
+- get_llm_cache_stats(): 조회 수, 적중률, 절약한 호출 수와 추정 토큰 수 (~4자/토큰)
+"""
+from __future__ import annotations
+from typing import Callable, Dict, Optional
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+import logging
+
+from mcp_server.config import LLM_CACHE_ENABLED, LLM_CACHE_TTL_SEC
+from mcp_server.tools.cache_manager import cached
+
+logger = logging.getLogger(__name__)
+
+_TRAILING_WS = re.compile(r"[ \t　]+(?=\n|$)")
+_INLINE_WS = re.compile(r"[ \t　]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_prompt(text: str) -> str:
+    """캐시 키용 프롬프트 정규화 (공백 차이만 제거, 내용/대소문자/순서는 유지)"""
+    text = unicodedata.normalize("NFC", text or "").replace("\r\n", "\n").replace("\r", "\n")
+    text = _TRAILING_WS.sub("", text)
+    text = _INLINE_WS.sub(" ", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def prompt_key(model: str, system: str, user: str, temperature: float,
+               max_output_tokens: Optional[int] = None) -> str:
+    """(model, system, 정규화된 user, temperature, max_output_tokens) 내용 주소 키"""
+    blob = json.dumps(
+        [model, normalize_prompt(system), normalize_prompt(user), round(float(temperature), 4), max_output_tokens],
+        ensure_ascii=False,
+    )
+    return f"llm:{hashlib.sha256(blob.encode('utf-8')).hexdigest()}"
+
+
+def estimate_tokens(*texts: str) -> int:
+    """토큰 수 추정 (~4자/토큰, 통계용)"""
+    return sum(len(t or "") for t in texts) // 4
+
+
+class LLMCacheStats:
+    """조회 / 업스트림 호출 / 절약 토큰 카운터"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.lookups = 0
+            self.upstream_calls = 0
+            self.saved_tokens = 0
+            self.bypassed = 0
+
+    def record(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            hits = self.lookups - self.upstream_calls
+            return {
+                "enabled": LLM_CACHE_ENABLED,
+                "ttl_sec": LLM_CACHE_TTL_SEC,
+                "lookups": self.lookups,
+                "hits": hits,
+                "upstream_calls": self.upstream_calls,
+                "hit_rate": round(hits / self.lookups * 100, 2) if self.lookups else 0.0,
+                "saved_tokens": self.saved_tokens,
+                "bypassed": self.bypassed,
+            }
+
+
+_stats = LLMCacheStats()
+_local = threading.local()   # 이 스레드가 방금 업스트림을 호출했는지 (절약 토큰 집계용)
+
+
+def get_llm_cache_stats() -> Dict[str, float]:
+    return _stats.snapshot()
+
+
+@cached(ttl=LLM_CACHE_TTL_SEC, prefix="llm", key_func=lambda key, compute: key)
+def _load(key: str, compute: Callable[[], str]) -> Optional[Dict[str, object]]:
+    """캐시 미스 (또는 같은 키의 첫 호출자) 에서만 실행 - 빈 응답은 None 으로 캐시 제외"""
+    _stats.record(upstream_calls=1)
+    _local.computed = True
+    text = compute()
+    return {"text": text} if text else None
+
+
+def cached_completion(
+    model: str,
+    system: str,
+    user: str,
+    temperature: float,
+    compute: Callable[[], str],
+    *,
+    max_output_tokens: Optional[int] = None,
+) -> str:
+    """compute() (실제 LLM 호출) 결과를 프롬프트 해시로 캐시 - 같은 프롬프트의 동시 호출은 합쳐짐"""
+    if not LLM_CACHE_ENABLED:
+        _stats.record(bypassed=1)
+        return compute()
+    key = prompt_key(model, system, user, temperature, max_output_tokens)
+    _stats.record(lookups=1)
+    _local.computed = False
+    entry = _load(key, compute)
+    text = entry["text"] if entry else ""
+    if entry and not _local.computed:
+        _stats.record(saved_tokens=estimate_tokens(system, user, text))
+    return text
@@ -0,0 +1,153 @@
+"""
+Market Context Module
+
+시장 공통 입력을 시간 버킷(MARKET_CONTEXT_BUCKET_SEC)당 한 번 계산해 공유.
+
+- VIX 최근 값
+- 벤치마크(SPY) 일봉 종가 (시장 상황/변동성 판단용)
+- 섹터 ETF 등락률 (1일/5일/20일) 과 breadth (50일 이동평균 위 섹터 비율, 당일 상승 섹터 비율)
+
+기존에는 SentimentFactors 가 종목마다 ^VIX 를, detect_market_condition / get_market_volatility 가
+각자 SPY 를 내려받았다. 이제 모두 get_market_context() 를 읽는다. 컨텍스트는 버킷 번호를 키로
+cache_manager 에 저장되므로 같은 버킷 안에서는 프로세스/워커 간에도 한 번만 계산된다 (single-flight).
+"""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import logging
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.config import MARKET_CONTEXT_BUCKET_SEC
+from mcp_server.tools.cache_manager import cached
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK = "SPY"
+HISTORY_PERIOD = "6mo"
+BREADTH_MA = 50
+
+# yfinance sector 이름 → SPDR 섹터 ETF
+SECTOR_ETFS: Dict[str, str] = {
+    "Technology": "XLK",
+    "Communication Services": "XLC",
+    "Consumer Cyclical": "XLY",
+    "Consumer Defensive": "XLP",
+    "Financial Services": "XLF",
+    "Healthcare": "XLV",
+    "Industrials": "XLI",
+    "Energy": "XLE",
+    "Basic Materials": "XLB",
+    "Real Estate": "XLRE",
+    "Utilities": "XLU",
+}
+MOVE_WINDOWS = {"1d": 1, "5d": 5, "20d": 20}
+
+
+@dataclass
+class MarketContext:
+    """시간 버킷 하나의 시장 공통 입력"""
+    bucket: int
+    vix: float = float("nan")
+    closes: Dict[str, pd.Series] = field(default_factory=dict)       # 벤치마크 + 섹터 ETF 종가
+    sector_moves: Dict[str, Dict[str, float]] = field(default_factory=dict)  # ETF → {"1d", "5d", "20d"}
+    breadth: float = float("nan")        # 50일 이동평균 위 섹터 ETF 비율 (0~1)
+    advance_ratio: float = float("nan")  # 최근 거래일 상승 섹터 ETF 비율 (0~1)
+    computed_at: float = 0.0
+
+    def close(self, ticker: str = BENCHMARK) -> Optional[pd.Series]:
+        """종가 시계열 (컨텍스트에 없으면 None)"""
+        series = self.closes.get(ticker)
+        return series if series is not None and len(series) else None
+
+    def summary(self) -> Dict:
+        """직렬화 가능한 요약 (툴 응답/로그용)"""
+        def clean(v: float) -> Optional[float]:
+            return None if v is None or math.isnan(v) else round(float(v), 4)
+
+        return {
+            "bucket_start": self.bucket * MARKET_CONTEXT_BUCKET_SEC,
+            "vix": clean(self.vix),
+            "breadth": clean(self.breadth),
+            "advance_ratio": clean(self.advance_ratio),
+            "sector_moves": {etf: {w: clean(v) for w, v in moves.items()} for etf, moves in self.sector_moves.items()},
+        }
+
+
+def _fetch_vix() -> float:
+    """VIX 최근 종가 (실패 시 NaN)"""
+    try:
+        import yfinance as yf
+        vix = yf.Ticker("^VIX").history(period="1d")
+        if not vix.empty:
+            return float(vix["Close"].iloc[-1])
+    except Exception as e:
+        logger.debug(f"VIX fetch failed: {e}")
+    return float("nan")
+
+
+def _fetch_closes(tickers: List[str]) -> Dict[str, pd.Series]:
+    """벤치마크/섹터 ETF 종가 - PriceStore 일괄 조회 1회"""
+    from mcp_server.tools.market_data import get_prices_bulk
+
+    close = get_prices_bulk(tickers, period=HISTORY_PERIOD, max_age_sec=MARKET_CONTEXT_BUCKET_SEC)["close"]
+    return {t: close[t].dropna() for t in close.columns if close[t].notna().any()}
+
+
+def build_market_context(bucket: int, vix: float, closes: Dict[str, pd.Series]) -> MarketContext:
+    """원시 입력 → 섹터 등락률/breadth 계산"""
+    moves: Dict[str, Dict[str, float]] = {}
+    above, advancing = [], []
+    for etf in SECTOR_ETFS.values():
+        c = closes.get(etf)
+        if c is None or len(c) < 2:
+            continue
+        values = c.to_numpy(dtype=float)
+        moves[etf] = {
+            name: float(values[-1] / values[-1 - k] - 1.0) if len(values) > k else float("nan")
+            for name, k in MOVE_WINDOWS.items()
+        }
+        advancing.append(values[-1] > values[-2])
+        if len(values) >= BREADTH_MA:
+            above.append(values[-1] > values[-BREADTH_MA:].mean())
+    return MarketContext(
+        bucket=bucket,
+        vix=vix,
+        closes=closes,
+        sector_moves=moves,
+        breadth=float(np.mean(above)) if above else float("nan"),
+        advance_ratio=float(np.mean(advancing)) if advancing else float("nan"),
+        computed_at=time.time(),
+    )
+
+
+@cached(ttl=MARKET_CONTEXT_BUCKET_SEC, prefix="market_context")
+def _load_market_context(bucket: int) -> Optional[MarketContext]:
+    """버킷 하나의 컨텍스트 계산 (모든 입력 조회 실패 시 None → 캐시하지 않음)"""
+    vix = _fetch_vix()
+    try:
+        closes = _fetch_closes([BENCHMARK] + list(SECTOR_ETFS.values()))
+    except Exception as e:
+        logger.warning(f"Market context price load failed: {e}")
+        closes = {}
+    if math.isnan(vix) and not closes:
+        return None
+    context = build_market_context(bucket, vix, closes)
+    logger.info(
+        f"Market context built (bucket={bucket}, vix={context.vix:.2f}, "
+        f"breadth={context.breadth:.2f}, {len(context.closes)} series)"
+    )
+    return context
+
+
+def current_bucket(now: Optional[float] = None) -> int:
+    return int((time.time() if now is None else now) // MARKET_CONTEXT_BUCKET_SEC)
+
+
+def get_market_context(now: Optional[float] = None) -> MarketContext:
+    """현재 시간 버킷의 시장 컨텍스트 (버킷당 1회 계산, 실패 시 빈 컨텍스트)"""
+    bucket = current_bucket(now)
+    return _load_market_context(bucket) or MarketContext(bucket=bucket, computed_at=time.time())
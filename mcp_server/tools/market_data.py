@@ -2,16 +2,18 @@ from __future__ import annotations
 import pandas as pd
 import yfinance as yf
 from datetime import datetime
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple
 import os
 import logging
 from mcp_server.config import PROCESSED_PATH
-from mcp_server.tools.cache_manager import cached, TTL, cache_manager
+from mcp_server.tools.cache_manager import cached, cached_many, TTL, cache_manager
 from mcp_server.tools.resilience import (
     retry_with_backoff, Timeout, RetryConfig,
     circuit_yfinance, CircuitOpenError
 )
 from mcp_server.tools.yf_utils import detect_market, normalize_yf_columns
+from mcp_server.tools.price_panel import momentum_from_close
+from mcp_server.tools.ticker_info import get_ticker_info
 
 logger = logging.getLogger(__name__)
 
@@ -44,24 +46,24 @@ def _download_prices(ticker: str, start: str, end: str, interval: str) -> pd.Dat
     return normalize_yf_columns(df)
 
 
-@cached(ttl=TTL.DAILY, prefix="prices")
-def get_prices(ticker: str, start: Optional[str] = None, end: Optional[str] = None, interval: str = "1d") -> pd.DataFrame:
-    """Download daily OHLCV prices (cached TTL.DAILY).
+def _fetch_prices_upstream(
+    ticker: str,
+    start: str,
+    end: str,
+    interval: str = "1d",
+    market: Optional[str] = None,
+) -> pd.DataFrame:
+    """Walk the PyKrx → KIS → yfinance chain for ``[start, end]`` (inclusive).
 
-    Dispatches to the KR path (``KoreanMarketAdapter`` via PyKrx) for
-    Korean 6-digit codes / ``.KS`` / ``.KQ`` suffixes, otherwise falls
-    back to yfinance. The cache key includes the raw ticker so both paths
-    coexist safely — no collision.
+    Raises when the final yfinance hop fails so the price store can tell
+    "upstream down" apart from "no bars in range" (empty frame).
     """
-    start = start or (datetime.now().replace(year=datetime.now().year - 1).strftime('%Y-%m-%d'))
-    end = end or datetime.now().strftime('%Y-%m-%d')
-
     # FR-K02: Korean tickers route through PyKrx first; if PyKrx returns
     # empty (KRX bot-blocks cloud-egress IPs like HF Spaces) we walk to
     # KIS Developers, which uses OAuth2 over plain HTTPS and indexes
     # every KRX security including special listings (REIT/ETN/A-prefix).
     # yfinance is the final fallback with .KS/.KQ suffix applied below.
-    if detect_market(ticker) == "KR":
+    if (market or "").upper() == "KR" or detect_market(ticker) == "KR":
         try:
             from mcp_server.tools.kr_market_data import get_kr_adapter
             df = get_kr_adapter().get_ohlcv(ticker, start=start, end=end)
@@ -82,12 +84,19 @@ def get_prices(ticker: str, start: Optional[str] = None, end: Optional[str] = No
         except Exception as e:  # noqa: BLE001
             logger.warning("KIS fetch failed for %s, falling back to yfinance: %s", ticker, e)
 
+    # KR ticker fall-through (PyKrx empty / failed): hit Yahoo with the
+    # ``.KS`` / ``.KQ`` suffixed form so we don't 404 on bare 6-digit
+    # codes. yfinance treats ``end`` as exclusive, hence the +1 day.
+    yf_end = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+    data = _download_prices(_yf_symbol(ticker), start, yf_end, interval)
+    return data.reset_index()
+
+
+@cached(ttl=TTL.DAILY, prefix="prices")
+def _get_prices_cached(ticker: str, start: str, end: str, interval: str, market: Optional[str] = None) -> pd.DataFrame:
+    """Intraday / weekly / monthly bars — not kept in the daily price store."""
     try:
-        # KR ticker fall-through (PyKrx empty / failed): hit Yahoo with
-        # the ``.KS`` / ``.KQ`` suffixed form so we don't 404 on bare
-        # 6-digit codes.
-        data = _download_prices(_yf_symbol(ticker), start, end, interval)
-        return data.reset_index()
+        return _fetch_prices_upstream(ticker, start, end, interval, market)
     except CircuitOpenError:
         logger.warning(f"yfinance circuit open for {ticker}, returning empty DataFrame")
         return pd.DataFrame()
@@ -96,6 +105,176 @@ def get_prices(ticker: str, start: Optional[str] = None, end: Optional[str] = No
         return pd.DataFrame()
 
 
+def get_prices(
+    ticker: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    interval: str = "1d",
+    market: Optional[str] = None,
+    period: Optional[str] = None,
+) -> pd.DataFrame:
+    """Download OHLCV prices (``Date`` column + Open/High/Low/Close/Volume).
+
+    Daily bars are served from the local columnar ``PriceStore``: only
+    the date ranges not yet on disk are fetched from the upstream chain
+    and appended, so overlapping windows share one copy per ticker.
+    Other intervals keep the diskcache path (TTL.DAILY).
+
+    Dispatches to the KR path (``KoreanMarketAdapter`` via PyKrx) for
+    Korean 6-digit codes / ``.KS`` / ``.KQ`` suffixes or ``market="KR"``,
+    otherwise falls back to yfinance. ``period`` (``6mo``/``2y``/...) is
+    an alternative to ``start``; ``end`` is inclusive.
+    """
+    from mcp_server.tools.price_store import get_price_store, period_to_start
+
+    if not start:
+        start = period_to_start(period or "1y")
+    end = end or datetime.now().strftime('%Y-%m-%d')
+
+    if interval != "1d":
+        return _get_prices_cached(ticker, start, end, interval, market)
+
+    def _fetch(t: str, s: str, e: str) -> pd.DataFrame:
+        return _fetch_prices_upstream(t, s, e, "1d", market)
+
+    try:
+        return get_price_store().get(ticker, start, end, fetcher=_fetch)
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Failed to load prices for {ticker}: {e}")
+        return pd.DataFrame()
+
+
+@retry_with_backoff(
+    attempts=RetryConfig.YFINANCE["attempts"],
+    min_wait=RetryConfig.YFINANCE["min_wait"],
+    max_wait=RetryConfig.YFINANCE["max_wait"]
+)
+def _download_prices_multi(symbols: List[str], start: str, end: str) -> pd.DataFrame:
+    """yfinance 멀티 심볼 다운로드 (한 번의 요청, 재시도 + 서킷 브레이커)"""
+    def _do_download():
+        return yf.download(
+            symbols, start=start, end=end, interval="1d", auto_adjust=True,
+            progress=False, group_by="ticker", threads=True,
+        )
+    return circuit_yfinance.call(_do_download)
+
+
+def _fetch_prices_upstream_bulk(
+    tickers: List[str],
+    start: str,
+    end: str,
+    market: Optional[str] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Grouped upstream fetch for ``[start, end]`` (inclusive).
+
+    KR names use one PyKrx date-wide snapshot per business day when
+    that is fewer requests than one call per ticker; everything else
+    goes through a single yfinance multi-symbol download. Tickers that
+    come back empty are simply omitted — the price store then retries
+    them through the per-ticker chain.
+    """
+    def _is_kr(t: str) -> bool:
+        return (market or "").upper() == "KR" or detect_market(t) == "KR"
+
+    kr = [t for t in tickers if _is_kr(t)]
+    us = [t for t in tickers if not _is_kr(t)]
+    out: Dict[str, pd.DataFrame] = {}
+
+    n_days = len(pd.bdate_range(start, end))
+    if len(kr) > 1 and n_days < len(kr):
+        try:
+            from mcp_server.tools.kr_market_data import get_kr_adapter
+            out.update(get_kr_adapter().get_ohlcv_snapshot(kr, start, end))
+        except Exception as e:  # noqa: BLE001
+            logger.warning("PyKrx snapshot failed for %d tickers: %s", len(kr), e)
+
+    if us:
+        yf_end = (pd.Timestamp(end) + pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+        data = _download_prices_multi(us, start, yf_end)
+        if data is not None and not data.empty:
+            if isinstance(data.columns, pd.MultiIndex):
+                present = set(data.columns.get_level_values(0))
+                for t in us:
+                    if t in present:
+                        sub = data[t].dropna(how="all")
+                        if not sub.empty:
+                            out[t] = sub.reset_index()
+            elif len(us) == 1:
+                out[us[0]] = normalize_yf_columns(data).dropna(how="all").reset_index()
+    return out
+
+
+def get_prices_bulk(
+    tickers: List[str],
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    period: Optional[str] = None,
+    market: Optional[str] = None,
+    max_age_sec: Optional[int] = None,
+) -> Dict[str, pd.DataFrame]:
+    """Batched daily prices as aligned wide panels.
+
+    Missing ranges are fetched with grouped upstream requests (one
+    yfinance multi-symbol download / PyKrx date-wide snapshots) and
+    appended to the local ``PriceStore``; cached ranges cost nothing.
+
+    Args:
+        tickers: 종목 리스트 (중복 제거, 순서 유지)
+        start / end / period: ``get_prices`` 와 동일 (end inclusive)
+        market: ``"KR"`` 강제 시 지정
+        max_age_sec: 최근 bar 허용 나이 (기본 TTL.DAILY, 현재가 용도면 TTL.REALTIME)
+
+    Returns:
+        ``{"open", "high", "low", "close", "volume": DataFrame}`` — Date
+        인덱스 × ticker 컬럼. 데이터가 없는 종목은 컬럼에서 빠진다.
+    """
+    from mcp_server.tools.price_store import get_price_store, period_to_start
+
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    if not start:
+        start = period_to_start(period or "1y")
+    end = end or datetime.now().strftime('%Y-%m-%d')
+
+    def _fetch(t: str, s: str, e: str) -> pd.DataFrame:
+        return _fetch_prices_upstream(t, s, e, "1d", market)
+
+    def _fetch_bulk(ts: List[str], s: str, e: str) -> Dict[str, pd.DataFrame]:
+        return _fetch_prices_upstream_bulk(ts, s, e, market)
+
+    try:
+        frames = get_price_store().get_many(
+            tickers, start, end, fetcher=_fetch, bulk_fetcher=_fetch_bulk, tail_refresh_sec=max_age_sec,
+        )
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"Failed to load bulk prices for {len(tickers)} tickers: {e}")
+        frames = {}
+
+    fields = ("Open", "High", "Low", "Close", "Volume")
+    columns: Dict[str, Dict[str, pd.Series]] = {f: {} for f in fields}
+    for t in tickers:
+        df = frames.get(t)
+        if df is None or df.empty:
+            continue
+        indexed = df.set_index("Date")
+        for f in fields:
+            if f in indexed.columns:
+                columns[f][t] = indexed[f]
+
+    return {f.lower(): pd.DataFrame(columns[f]).sort_index() for f in fields}
+
+
+def get_price_history(ticker: str, period: str = "1y", market: Optional[str] = None) -> pd.DataFrame:
+    """Daily OHLCV indexed by date — drop-in for ``yf.download(ticker, period=...)``.
+
+    Reads through the same ``PriceStore`` as ``get_prices`` so charts,
+    metrics, volatility and backtests share one local copy per ticker.
+    """
+    df = get_prices(ticker, period=period, market=market)
+    if df is None or df.empty or "Date" not in df.columns:
+        return pd.DataFrame()
+    return df.set_index("Date")
+
+
 def _safe_get(info: Dict[str, Any], key: str, default=None):
     try:
         v = info.get(key)
@@ -108,7 +287,7 @@ def _safe_get(info: Dict[str, Any], key: str, default=None):
         return default
 
 
-@cached(ttl=TTL.FUNDAMENTAL, prefix="fundamentals")
+@cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="fundamentals")
 def get_fundamentals_snapshot(ticker: str) -> dict:
     """펀더멘털 스냅샷 조회 (24시간 캐시, 서킷 브레이커 적용).
 
@@ -159,10 +338,10 @@ def get_fundamentals_snapshot(ticker: str) -> dict:
 
     try:
         def _fetch_info():
-            tk = yf.Ticker(yf_symbol)
-            info = {}
+            tk = yf.Ticker(yf_symbol)  # fast_info (가벼운 현재값) 전용
+            shared = get_ticker_info(yf_symbol)  # .info / 재무제표는 다른 모듈과 공유
             try:
-                info = tk.info if isinstance(getattr(tk, 'info', None), dict) else {}
+                info = shared.info
             except Exception:
                 info = {}
 
@@ -192,7 +371,7 @@ def get_fundamentals_snapshot(ticker: str) -> dict:
                 "roic": _safe_get(info, 'returnOnCapitalEmployed'),
             }
             try:
-                cf = getattr(tk, 'cashflow', None)
+                cf = shared.cashflow
                 if cf is not None and not cf.empty:
                     for label in ("Free Cash Flow", "FreeCashFlow"):
                         if label in cf.index:
@@ -221,20 +400,26 @@ def get_fundamentals_snapshot(ticker: str) -> dict:
                 **{k: v for k, v in kis_seed.items() if v is not None}}
 
 
-@cached(ttl=TTL.DAILY, prefix="momentum")
+@cached_many(ttl=TTL.FUNDAMENTAL_SWR, prefix="fundamentals")
+def get_fundamentals_many(tickers: List[str]) -> Dict[str, dict]:
+    """여러 종목 펀더멘털 스냅샷 (get_fundamentals_snapshot 과 캐시 항목 공유).
+
+    캐시는 한 번의 일괄 조회로 확인하고, 없는 종목만 스레드 풀로 받아 한 번에 저장한다.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    fetch = get_fundamentals_snapshot.__wrapped__
+    if len(tickers) <= 1:
+        return {t: fetch(t) for t in tickers}
+    with ThreadPoolExecutor(max_workers=min(8, len(tickers))) as pool:
+        return dict(zip(tickers, pool.map(fetch, tickers)))
+
+
+@cached(ttl=TTL.DAILY_SWR, prefix="momentum")
 def get_momentum_metrics(ticker: str) -> dict:
-    """안정적 모멘텀 계산 (4시간 캐시, 서킷 브레이커 적용): yfinance download 실패 시 Ticker().history로 폴백."""
+    """안정적 모멘텀 계산 (4시간 캐시, 서킷 브레이커 적용): 로컬 가격 저장소 조회 실패 시 Ticker().history로 폴백."""
     yf_sym = _yf_symbol(ticker)
-    hist = None
-    try:
-        def _download():
-            return yf.download(yf_sym, period="1y", interval="1d", progress=False, auto_adjust=True)
-        hist = normalize_yf_columns(circuit_yfinance.call(_download))
-    except CircuitOpenError:
-        logger.warning(f"yfinance circuit open for momentum: {ticker}")
-        hist = None
-    except Exception:
-        hist = None
+    hist = get_price_history(ticker, period="1y")
 
     if hist is None or hist.empty:
         try:
@@ -250,15 +435,7 @@ def get_momentum_metrics(ticker: str) -> dict:
 
     if hist is None or hist.empty or "Close" not in hist.columns:
         return {"mom1": None, "mom3": None, "mom6": None, "mom12": None}
-    close = hist["Close"].reset_index(drop=True)
-    def ret(n):
-        try:
-            if len(close) < n:
-                return None
-            return float((close.iloc[-1] / close.iloc[-n]) - 1.0)
-        except Exception:
-            return None
-    return {"mom1": ret(21), "mom3": ret(63), "mom6": ret(126), "mom12": ret(252)}
+    return momentum_from_close(hist["Close"])
 
 
 # -------- Token-saving helpers --------
@@ -271,7 +448,7 @@ def get_prices_paginated(ticker: str, start: Optional[str], end: Optional[str],
     return slice_, next_cursor
 
 
-@cached(ttl=TTL.DAILY, prefix="prices_summary")
+@cached(ttl=TTL.DAILY_SWR, prefix="prices_summary")
 def get_prices_summary(ticker: str, period: str = "1y", interval: str = "1d", agg: str = "W") -> dict:
     """가격 요약 조회 (4시간 캐시)"""
     hist = normalize_yf_columns(
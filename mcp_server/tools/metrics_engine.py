@@ -0,0 +1,213 @@
+"""
+Incremental Metrics Module
+
+collect.compute_basic_metrics 의 일봉 메트릭(모멘텀/변동성/최대낙폭/SPY 상관)을 종목별 롤링 상태로 갱신.
+
+기존에는 캐시 미스마다 2년치 종가 전체로 mom1~mom12, vol30/60, dd180, corr_spy 를 다시 계산하고
+종목마다 SPY 를 함께 조회했다. 이 모듈은 종목별로
+
+- 최근 HISTORY(253)개 종가와 날짜 (mom12 = 252 영업일 전 종가까지, vol/dd 윈도우 포함)
+- SPY 상관용 최근 CORR_WINDOW(90)개 수익률 쌍과 누적합 (Σa, Σb, Σa², Σb², Σab)
+
+을 MetricsState 로 보관하고 새 bar 만큼만 갱신한다 (O(새 bar), 윈도우 지표는 고정 크기 버퍼에서 계산).
+SPY 수익률은 배치당 한 번 계산해 모든 종목이 공유한다. 결과는 전체 재계산
+(collect._pct / _stdev / _max_drawdown / _corr) 과 같다.
+
+상태는 cache_manager 에 ``metrics_state:{ticker}:{period}:{interval}`` 로 저장 (TTL.LONG, 배치당 get_many/set_many 1회).
+기간별로 따로 두므로 "6mo" 로 만든 짧은 상태가 "2y" 요청에 쓰이지 않는다.
+저장된 마지막 종가가 새 시계열과 다르거나 (수정주가 소급 조정 등), 상태가 HISTORY 보다 짧은데 새 시계열에
+그 앞 종가가 있으면 전체 시계열로 다시 초기화한다.
+"""
+
+import math
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools.cache_manager import TTL, cache_manager
+
+logger = logging.getLogger(__name__)
+
+HISTORY = 253           # mom12 (pct_change(252)) 에 필요한 종가 수
+MOMENTUM = {"mom1": 21, "mom3": 63, "mom6": 126, "mom12": 252, "ret20": 20}
+VOL_WINDOWS = {"vol30": 30, "vol60": 60}
+DD_LOOKBACK = 180
+CORR_WINDOW = 90
+RESYNC_EVERY = 1024     # 누적합 부동소수 오차 방지용 재계산 주기 (추가된 쌍 수)
+
+
+@dataclass
+class MetricsState:
+    """종목별 롤링 상태"""
+    dates: np.ndarray                       # datetime64[ns], 최근 HISTORY 개
+    closes: np.ndarray                      # float64
+    pairs: Deque[Tuple[float, float]] = field(default_factory=deque)  # (종목 수익률, SPY 수익률)
+    sums: np.ndarray = field(default_factory=lambda: np.zeros(5))     # Σa, Σb, Σa², Σb², Σab
+    corr_last: Optional[np.datetime64] = None                          # 마지막으로 반영한 쌍의 날짜
+    pushed: int = 0
+
+    def push_pair(self, a: float, b: float) -> None:
+        self.pairs.append((a, b))
+        self.sums += (a, b, a * a, b * b, a * b)
+        if len(self.pairs) > CORR_WINDOW:
+            old_a, old_b = self.pairs.popleft()
+            self.sums -= (old_a, old_b, old_a * old_a, old_b * old_b, old_a * old_b)
+        self.pushed += 1
+        if self.pushed % RESYNC_EVERY == 0:
+            self.resync()
+
+    def resync(self) -> None:
+        if not self.pairs:
+            self.sums = np.zeros(5)
+            return
+        arr = np.asarray(self.pairs)
+        a, b = arr[:, 0], arr[:, 1]
+        self.sums = np.array([a.sum(), b.sum(), (a * a).sum(), (b * b).sum(), (a * b).sum()])
+
+
+def spy_returns(spy_close: Optional[pd.Series]) -> Optional[pd.Series]:
+    """SPY 일간 수익률 (배치당 1회)"""
+    if spy_close is None:
+        return None
+    return spy_close.dropna().pct_change().dropna()
+
+
+def _pairs(dates: np.ndarray, closes: np.ndarray, spy_ret: Optional[pd.Series],
+           after: Optional[np.datetime64]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """버퍼 종가의 수익률과 SPY 수익률을 날짜로 맞춘 쌍 (after 이후만) → (날짜, a, b)"""
+    empty = (dates[:0], closes[:0], closes[:0])
+    if spy_ret is None or not len(spy_ret) or len(closes) < 2:
+        return empty
+    start = 1 if after is None else max(1, int(np.searchsorted(dates, after, side="right")))
+    if start >= len(dates):
+        return empty
+    d = dates[start:]
+    a = closes[start:] / closes[start - 1:-1] - 1.0
+    spy_dates = spy_ret.index.values
+    pos = np.minimum(np.searchsorted(spy_dates, d), len(spy_dates) - 1)
+    hit = spy_dates[pos] == d
+    return d[hit], a[hit], spy_ret.to_numpy()[pos[hit]]
+
+
+def init_state(close: pd.Series, spy_ret: Optional[pd.Series]) -> MetricsState:
+    """전체 시계열로 상태 초기화"""
+    tail = close.tail(HISTORY)
+    state = MetricsState(dates=tail.index.values.astype("datetime64[ns]"), closes=tail.to_numpy(dtype=float))
+    if spy_ret is not None:
+        g = pd.concat([close.pct_change().rename("a"), spy_ret.rename("b")], axis=1, join="inner").dropna()
+        for a, b in g.tail(CORR_WINDOW).itertuples(index=False):
+            state.push_pair(float(a), float(b))
+        if len(g):
+            state.corr_last = g.index[-1].to_datetime64()
+    return state
+
+
+def update_state(state: Optional[MetricsState], close: pd.Series,
+                 spy_ret: Optional[pd.Series]) -> Tuple[MetricsState, bool]:
+    """새 bar 반영 → (상태, 증분 여부). 상태가 없거나 시계열과 맞지 않으면 전체 초기화"""
+    if state is None or not len(state.closes):
+        return init_state(close, spy_ret), False
+    index = close.index.values.astype("datetime64[ns]")
+    values = close.to_numpy(dtype=float)
+    pos = int(np.searchsorted(index, state.dates[-1]))
+    if pos >= len(index) or index[pos] != state.dates[-1] \
+            or not math.isclose(values[pos], float(state.closes[-1]), rel_tol=1e-9, abs_tol=1e-12):
+        return init_state(close, spy_ret), False
+    if len(state.closes) < HISTORY and index[0] < state.dates[0]:
+        return init_state(close, spy_ret), False  # 더 짧은 기간으로 만든 상태 (mom12 등 계산 불가)
+    if spy_ret is not None and len(spy_ret) and not state.pairs:
+        return init_state(close, spy_ret), False
+
+    dates = np.concatenate([state.dates, index[pos + 1:]])
+    closes = np.concatenate([state.closes, values[pos + 1:]])
+    if state.corr_last is not None and state.corr_last < dates[0]:
+        return init_state(close, spy_ret), False  # 반영 안 된 쌍이 버퍼 밖으로 밀려남
+
+    # SPY 가 늦게 들어온 날짜도 corr_last 이후 쌍으로 다음 갱신 때 반영
+    pair_dates, pair_a, pair_b = _pairs(dates, closes, spy_ret, state.corr_last)
+    for a, b in zip(pair_a.tolist(), pair_b.tolist()):
+        state.push_pair(a, b)
+    if len(pair_dates):
+        state.corr_last = pair_dates[-1]
+    state.dates, state.closes = dates[-HISTORY:], closes[-HISTORY:]
+    return state, True
+
+
+def compute(state: MetricsState) -> Dict[str, Optional[float]]:
+    """상태 → 메트릭 (collect 의 전체 재계산과 같은 정의, 기간 부족 시 NaN)"""
+    c = state.closes
+    n = len(c)
+    out: Dict[str, Optional[float]] = {}
+    for name, k in MOMENTUM.items():
+        out[name] = float(c[-1] / c[-1 - k] - 1.0) if n > k else float("nan")
+    for name, w in VOL_WINDOWS.items():
+        out[name] = float(np.std(c[-w:] / c[-w - 1:-1] - 1.0, ddof=1)) if n > w else float("nan")
+    window = c[-DD_LOOKBACK:]
+    peak = np.maximum.accumulate(window)
+    out["dd180"] = float(((window - peak) / peak).min())
+    out["corr_spy"] = _corr_from_sums(state)
+    return out
+
+
+def _corr_from_sums(state: MetricsState) -> Optional[float]:
+    n = len(state.pairs)
+    if n == 0:
+        return None
+    if n < 2:
+        return float("nan")
+    sa, sb, saa, sbb, sab = state.sums
+    cov = sab - sa * sb / n
+    var_a = saa - sa * sa / n
+    var_b = sbb - sb * sb / n
+    if var_a <= 0 or var_b <= 0:
+        return float("nan")
+    return float(max(-1.0, min(1.0, cov / math.sqrt(var_a * var_b))))
+
+
+class MetricsEngine:
+    """상태 저장/조회 + 배치 갱신"""
+
+    def __init__(self, cache=None, ttl: int = TTL.LONG):
+        self.cache = cache or cache_manager
+        self.ttl = ttl
+        self.counters = {"incremental": 0, "rebuilt": 0}
+
+    @staticmethod
+    def state_key(ticker: str, period: str = "2y", interval: str = "1d") -> str:
+        return f"metrics_state:{ticker}:{period}:{interval}"
+
+    def compute_many(self, closes: Dict[str, pd.Series], spy_close: Optional[pd.Series],
+                     period: str = "2y", interval: str = "1d") -> Dict[str, Dict]:
+        """종목별 종가 + SPY 종가 → {종목: 메트릭}. 상태는 일괄 조회/저장, SPY 수익률은 1회 계산"""
+        spy_ret = spy_returns(spy_close)
+        keys = {t: self.state_key(t, period, interval) for t, c in closes.items() if c is not None and len(c)}
+        states = self.cache.get_many(keys.values())
+
+        out: Dict[str, Dict] = {}
+        updated: Dict[str, MetricsState] = {}
+        for ticker, key in keys.items():
+            try:
+                state, incremental = update_state(states.get(key), closes[ticker], spy_ret)
+            except Exception as e:
+                logger.warning(f"Metrics state update failed for {ticker}: {e}, rebuilding")
+                state, incremental = init_state(closes[ticker], spy_ret), False
+            self.counters["incremental" if incremental else "rebuilt"] += 1
+            updated[key] = state
+            out[ticker] = compute(state)
+        self.cache.set_many(updated, self.ttl)
+        return out
+
+
+_engine: Optional[MetricsEngine] = None
+
+
+def get_metrics_engine() -> MetricsEngine:
+    """MetricsEngine 싱글톤"""
+    global _engine
+    if _engine is None:
+        _engine = MetricsEngine()
+    return _engine
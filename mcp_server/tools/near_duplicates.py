@@ -0,0 +1,136 @@
+"""
+근사 중복 탐지 - 문자 shingle MinHash + LSH 인덱스
+
+NewsDeduplicator 는 제목마다 지금까지 남긴 모든 제목과 difflib.SequenceMatcher 로 비교했다 (O(n²), 쌍마다 비싼 ratio).
+MinHashLSH 는 제목을 문자 3-gram 집합의 MinHash 서명으로 만들고, 서명을 band 로 나눠 같은 band 값을 가진
+문서만 후보로 돌려준다. 후보는 서명으로 추정한 Jaccard 가 min_jaccard 이상인 것만 남기므로, 비싼 정확 비교는
+실제 중복에 가까운 몇 건에만 일어난다.
+
+- 후보 확률: Jaccard s 인 쌍이 같은 band 를 가질 확률 1 - (1 - s^r)^b (기본 b=48, r=3)
+- 판정은 호출자가 후보에 대해 정확한 유사도로 (NewsDeduplicator 는 기존 SequenceMatcher ratio > 0.7 그대로)
+- 3-gram Jaccard 는 ratio 0.7 을 넘는 제목 쌍에서 ~0.35 이상 → DEFAULT_MIN_JACCARD=0.25 로 여유를 둔다
+- 서명 계산은 NumPy 로 일괄 (shingle 해시는 crc32 → 프로세스 간 동일)
+"""
+from __future__ import annotations
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List
+import re
+import zlib
+
+import numpy as np
+
+DEFAULT_NUM_PERM = 144
+DEFAULT_BANDS = 48
+DEFAULT_SHINGLE = 3
+DEFAULT_MIN_JACCARD = 0.25
+
+_WS = re.compile(r"\s+")
+_CHUNK = 2048   # 서명 일괄 계산 단위 (메모리 상한: num_perm × 청크 shingle 수)
+_EMPTY = np.iinfo(np.uint64).max
+
+
+def normalize_text(text: str) -> str:
+    return _WS.sub(" ", (text or "").lower()).strip()
+
+
+def shingles(text: str, k: int = DEFAULT_SHINGLE) -> set:
+    """문자 k-gram 집합 (k 보다 짧은 텍스트는 텍스트 자체 하나)"""
+    text = normalize_text(text)
+    if not text:
+        return set()
+    if len(text) <= k:
+        return {text}
+    return {text[i:i + k] for i in range(len(text) - k + 1)}
+
+
+class MinHashLSH:
+    """MinHash 서명 + band LSH 인덱스 (문서 추가 / 후보 조회)"""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+                 shingle_size: int = DEFAULT_SHINGLE, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # multiply-shift 해시: ((a * x + b) mod 2^64) >> 32, a 는 홀수
+        self._a = (rng.integers(1, 2 ** 62, size=(num_perm, 1), dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+        self._band_mult = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+        self._tables: List[Dict[int, List[Hashable]]] = [defaultdict(list) for _ in range(bands)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def signatures(self, texts: Iterable[str]) -> np.ndarray:
+        """(n, num_perm) MinHash 서명 - 빈 텍스트 행은 전부 최댓값 (어떤 문서와도 후보가 되지 않음)"""
+        sets = [np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles(t, self.shingle_size)), dtype=np.uint64)
+                for t in texts]
+        out = np.full((len(sets), self.num_perm), _EMPTY, dtype=np.uint64)
+        for start in range(0, len(sets), _CHUNK):
+            chunk = [(i, h) for i, h in enumerate(sets[start:start + _CHUNK], start) if h.size]
+            if not chunk:
+                continue
+            flat = np.concatenate([h for _, h in chunk])
+            offsets = np.cumsum([0] + [h.size for _, h in chunk[:-1]])
+            with np.errstate(over="ignore"):
+                hashed = (self._a * flat[None, :] + self._b) >> np.uint64(32)
+            out[[i for i, _ in chunk]] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        return out
+
+    def _band_keys(self, signature: np.ndarray) -> List[int]:
+        with np.errstate(over="ignore"):
+            return (signature.reshape(self.bands, self.rows) * self._band_mult).sum(axis=1).tolist()
+
+    def insert(self, key: Hashable, signature: np.ndarray) -> None:
+        if signature[0] == _EMPTY:
+            return
+        for table, band in zip(self._tables, self._band_keys(signature)):
+            table[band].append(key)
+        self._signatures[key] = signature
+
+    def candidates(self, signature: np.ndarray, min_jaccard: float = 0.0) -> List[Hashable]:
+        """band 하나 이상이 같은 문서 키 (추가 순서), 추정 Jaccard 가 min_jaccard 미만인 후보는 제외"""
+        if signature[0] == _EMPTY:
+            return []
+        found: Dict[Hashable, None] = {}
+        for table, band in zip(self._tables, self._band_keys(signature)):
+            for key in table.get(band, ()):
+                found[key] = None
+        keys = list(found)
+        if keys and min_jaccard > 0:
+            estimate = (np.stack([self._signatures[k] for k in keys]) == signature).mean(axis=1)
+            keys = [k for k, e in zip(keys, estimate) if e >= min_jaccard]
+        return keys
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @staticmethod
+    def jaccard(signature_a: np.ndarray, signature_b: np.ndarray) -> float:
+        """서명으로 추정한 Jaccard 유사도"""
+        return float(np.mean(signature_a == signature_b))
+
+
+def similar_groups(texts: List[str], is_similar: Callable[[int, int], bool],
+                   min_jaccard: float = DEFAULT_MIN_JACCARD) -> List[List[int]]:
+    """LSH 후보 중 is_similar(i, j) 인 쌍을 이어 묶은 그룹 (인덱스 목록, 첫 등장 순)"""
+    index = MinHashLSH()
+    parent = list(range(len(texts)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, sig in enumerate(index.signatures(texts)):
+        for j in index.candidates(sig, min_jaccard):
+            if find(i) != find(j) and is_similar(i, j):
+                parent[find(i)] = find(j)
+        index.insert(i, sig)
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(texts)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
@@ -18,9 +18,15 @@ from typing import Dict, List, Optional, Any, Tuple
 from difflib import SequenceMatcher
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
 
 from mcp_server.tools.cache_manager import cache_manager, TTL
+from mcp_server.tools.http_client import http_post
+from mcp_server.config import (
+    LLM_SENTIMENT_BATCH_TOKENS, LLM_SENTIMENT_BATCH_MAX_TICKERS, LLM_SENTIMENT_TOKENS_PER_TICKER,
+)
+from mcp_server.tools.llm_cache import cached_completion, estimate_tokens
+from mcp_server.tools.keyword_matcher import KeywordMatcher
+from mcp_server.tools.near_duplicates import DEFAULT_MIN_JACCARD, MinHashLSH, similar_groups
 from mcp_server.tools.resilience import retry_with_backoff, Timeout, RetryConfig, circuit_gemini, CircuitOpenError
 
 logger = logging.getLogger(__name__)
@@ -118,8 +124,17 @@ IMPACT_KEYWORDS = {
 }
 
 
+# import 시 한 번 구성 - 감성/영향도 사전을 한 매처로 (텍스트당 조각 나누기 한 번)
+_KEYWORD_MATCHER = KeywordMatcher(
+    [(keyword, ("sentiment", category, data["score"]))
+     for category, data in SENTIMENT_KEYWORDS.items() for keyword in data["keywords"]]
+    + [(keyword, ("impact", level, data["weight"]))
+       for level, data in IMPACT_KEYWORDS.items() for keyword in data["keywords"]]
+)
+
+
 class NewsSentimentAnalyzer:
-    """뉴스 감성 분석기"""
+    """뉴스 감성 분석기 (컴파일된 키워드 매처, 여러 텍스트 일괄 분석)"""
 
     def __init__(self):
         self.sentiment_cache = {}
@@ -134,23 +149,61 @@ class NewsSentimentAnalyzer:
         Returns:
             감성 분석 결과
         """
-        if not text:
-            return {"sentiment": "neutral", "score": 0.0, "confidence": 0.0}
-
-        text_lower = text.lower()
-        scores = []
-        matched_keywords = []
-
-        # 각 감성 카테고리에서 키워드 매칭
-        for category, data in SENTIMENT_KEYWORDS.items():
-            for keyword in data["keywords"]:
-                if keyword in text_lower:
-                    scores.append(data["score"])
-                    matched_keywords.append({
-                        "keyword": keyword,
-                        "category": category,
-                        "score": data["score"]
-                    })
+        return self._analyze([text])[0][0]
+
+    def analyze_impact(self, text: str) -> Dict[str, Any]:
+        """
+        뉴스 영향도 평가
+
+        Args:
+            text: 뉴스 텍스트
+
+        Returns:
+            영향도 평가 결과
+        """
+        return self._analyze([text])[0][1]
+
+    def analyze_many(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        여러 텍스트 감성 + 영향도 일괄 분석 (analyze_text / analyze_impact 와 같은 결과)
+
+        Args:
+            texts: 분석할 텍스트 리스트
+
+        Returns:
+            텍스트별 감성 결과 + impact / impact_score / impact_factors
+        """
+        return [
+            {**sentiment, "impact": impact["impact"], "impact_score": impact["score"],
+             "impact_factors": impact["factors"]}
+            for sentiment, impact in self._analyze(texts)
+        ]
+
+    def _analyze(self, texts: List[str]) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """텍스트별 (감성 결과, 영향도 결과)"""
+        results = []
+        for text, (sentiment_hits, impact_hits) in zip(texts, self._keyword_hits(texts)):
+            if not text:
+                results.append(({"sentiment": "neutral", "score": 0.0, "confidence": 0.0},
+                                {"impact": "low", "score": 0.0, "factors": []}))
+            else:
+                results.append((self._sentiment_result(sentiment_hits), self._impact_result(impact_hits)))
+        return results
+
+    @staticmethod
+    def _keyword_hits(texts: List[str]) -> List[Tuple[List[Tuple[str, str, float]], List[Tuple[str, str, float]]]]:
+        """텍스트별 (감성 키워드, 영향도 키워드) - (keyword, 카테고리/레벨, 점수/가중치), 사전 정의 순서"""
+        return [
+            ([(kw, label, value) for kw, (kind, label, value) in hits if kind == "sentiment"],
+             [(kw, label, value) for kw, (kind, label, value) in hits if kind == "impact"])
+            for hits in _KEYWORD_MATCHER.find_many([(t or "").lower() for t in texts])
+        ]
+
+    @staticmethod
+    def _sentiment_result(hits: List[Tuple[str, str, float]]) -> Dict[str, Any]:
+        scores = [score for _, _, score in hits]
+        matched_keywords = [{"keyword": keyword, "category": category, "score": score}
+                            for keyword, category, score in hits[:10]]
 
         # 점수 계산
         if scores:
@@ -177,35 +230,14 @@ class NewsSentimentAnalyzer:
             "sentiment": sentiment,
             "score": round(avg_score, 3),
             "confidence": round(confidence, 2),
-            "matched_keywords": matched_keywords[:10]  # 상위 10개만
+            "matched_keywords": matched_keywords  # 상위 10개만
         }
 
-    def analyze_impact(self, text: str) -> Dict[str, Any]:
-        """
-        뉴스 영향도 평가
-
-        Args:
-            text: 뉴스 텍스트
-
-        Returns:
-            영향도 평가 결과
-        """
-        if not text:
-            return {"impact": "low", "score": 0.0, "factors": []}
-
-        text_lower = text.lower()
-        impact_scores = []
-        factors = []
-
-        for level, data in IMPACT_KEYWORDS.items():
-            for keyword in data["keywords"]:
-                if keyword in text_lower:
-                    impact_scores.append(data["weight"])
-                    factors.append({
-                        "keyword": keyword,
-                        "level": level,
-                        "weight": data["weight"]
-                    })
+    @staticmethod
+    def _impact_result(hits: List[Tuple[str, str, float]]) -> Dict[str, Any]:
+        impact_scores = [weight for _, _, weight in hits]
+        factors = [{"keyword": keyword, "level": level, "weight": weight}
+                   for keyword, level, weight in hits[:5]]
 
         if impact_scores:
             max_score = max(impact_scores)
@@ -225,7 +257,7 @@ class NewsSentimentAnalyzer:
         return {
             "impact": impact_level,
             "score": round(final_score, 2),
-            "factors": factors[:5]
+            "factors": factors
         }
 
     def analyze_news_item(self, news: Dict) -> Dict[str, Any]:
@@ -238,36 +270,40 @@ class NewsSentimentAnalyzer:
         Returns:
             종합 분석 결과
         """
-        title = news.get("title", "")
-        snippet = news.get("snippet", "") or news.get("summary", "")
-        combined_text = f"{title} {snippet}"
-
-        # 감성 분석
-        sentiment = self.analyze_text(combined_text)
-
-        # 제목은 가중치 높게
-        title_sentiment = self.analyze_text(title)
-        if title_sentiment["confidence"] > 0:
-            # 제목 감성에 가중치 부여
-            combined_score = (sentiment["score"] + title_sentiment["score"] * 1.5) / 2.5
-            sentiment["score"] = round(combined_score, 3)
-
-        # 영향도 분석
-        impact = self.analyze_impact(combined_text)
-
-        # 종합 점수 (감성 * 영향도)
-        composite_score = sentiment["score"] * impact["score"]
-
-        return {
-            **news,
-            "sentiment": sentiment["sentiment"],
-            "sentiment_score": sentiment["score"],
-            "sentiment_confidence": sentiment["confidence"],
-            "impact": impact["impact"],
-            "impact_score": impact["score"],
-            "composite_score": round(composite_score, 3),
-            "keywords": sentiment.get("matched_keywords", [])[:5]
-        }
+        return self.analyze_news_items([news])[0]
+
+    def analyze_news_items(self, news_items: List[Dict]) -> List[Dict[str, Any]]:
+        """여러 뉴스 아이템 종합 분석 (analyze_news_item 반복과 같은 결과) - 본문/제목을 각각 한 번씩 스캔"""
+        titles = [news.get("title", "") for news in news_items]
+        combined = [f"{title} {news.get('snippet', '') or news.get('summary', '')}"
+                    for title, news in zip(titles, news_items)]
+
+        results = []
+        for news, title, (sentiment, impact), (title_hits, _) in zip(
+            news_items, titles, self._analyze(combined), self._keyword_hits(titles)
+        ):
+            # 제목은 가중치 높게 (제목 감성 점수 = analyze_text(title)["score"])
+            if title:
+                title_scores = [score for _, _, score in title_hits]
+                title_score = round(sum(title_scores) / len(title_scores), 3) if title_scores else 0.0
+                # 제목 감성에 가중치 부여
+                combined_score = (sentiment["score"] + title_score * 1.5) / 2.5
+                sentiment["score"] = round(combined_score, 3)
+
+            # 종합 점수 (감성 * 영향도)
+            composite_score = sentiment["score"] * impact["score"]
+
+            results.append({
+                **news,
+                "sentiment": sentiment["sentiment"],
+                "sentiment_score": sentiment["score"],
+                "sentiment_confidence": sentiment["confidence"],
+                "impact": impact["impact"],
+                "impact_score": impact["score"],
+                "composite_score": round(composite_score, 3),
+                "keywords": sentiment.get("matched_keywords", [])[:5]
+            })
+        return results
 
 
 # ============================================================
@@ -275,7 +311,7 @@ class NewsSentimentAnalyzer:
 # ============================================================
 
 class NewsDeduplicator:
-    """뉴스 중복 제거 및 클러스터링"""
+    """뉴스 중복 제거 및 클러스터링 (MinHash-LSH 후보 → SequenceMatcher 확인)"""
 
     def __init__(self, similarity_threshold: float = 0.7):
         self.threshold = similarity_threshold
@@ -286,10 +322,21 @@ class NewsDeduplicator:
             return 0.0
         return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
 
+    def _is_similar(self, matcher: SequenceMatcher, title: str) -> bool:
+        """matcher (seq2 = 남긴 제목) 와 title 의 ratio > threshold - 싼 상한부터 확인"""
+        matcher.set_seq1(title.lower())
+        return (matcher.real_quick_ratio() > self.threshold
+                and matcher.quick_ratio() > self.threshold
+                and matcher.ratio() > self.threshold)
+
     def deduplicate(self, news_items: List[Dict]) -> List[Dict]:
         """
         중복 뉴스 제거
 
+        남긴 제목 전체가 아니라 LSH 후보 (제목 3-gram MinHash 가 비슷한 것) 만 SequenceMatcher 로 비교한다.
+        판정 기준은 기존과 같은 ratio > threshold. LSH 는 확률적으로 후보를 놓칠 수 있어 결과는 기존 전체 비교와
+        거의 같다 (완전히 같음은 보장하지 않음).
+
         Args:
             news_items: 뉴스 리스트
 
@@ -299,28 +346,36 @@ class NewsDeduplicator:
         if not news_items:
             return []
 
+        titles = [item.get("title", "") or "" for item in news_items]
+        index = MinHashLSH()
+        matchers: Dict[int, SequenceMatcher] = {}   # 남긴 제목별 (seq2 전처리 재사용)
         unique = []
-        seen_titles = []
 
-        for item in news_items:
-            title = item.get("title", "")
-            is_duplicate = False
-
-            for seen_title in seen_titles:
-                if self.similarity(title, seen_title) > self.threshold:
-                    is_duplicate = True
-                    break
-
-            if not is_duplicate:
-                unique.append(item)
-                seen_titles.append(title)
+        for i, (item, signature) in enumerate(zip(news_items, index.signatures(titles))):
+            candidates = index.candidates(signature, DEFAULT_MIN_JACCARD)
+            if any(self._is_similar(matchers[j], titles[i]) for j in candidates):
+                continue
+            unique.append(item)
+            if titles[i]:
+                matcher = SequenceMatcher(None)
+                matcher.set_seq2(titles[i].lower())
+                matchers[i] = matcher
+                index.insert(i, signature)
 
         return unique
 
+    def story_groups(self, news_items: List[Dict]) -> List[List[Dict]]:
+        """같은 기사 (제목 유사도 > threshold) 끼리 묶은 그룹, 첫 등장 순"""
+        titles = [item.get("title", "") or "" for item in news_items]
+        groups = similar_groups(titles, lambda i, j: self.similarity(titles[i], titles[j]) > self.threshold)
+        return [[news_items[i] for i in group] for group in groups]
+
     def cluster_by_topic(self, news_items: List[Dict], num_clusters: int = 5) -> Dict[str, List[Dict]]:
         """
         뉴스를 주제별로 클러스터링 (간단한 키워드 기반)
 
+        같은 기사의 재게재 (story_groups) 는 제목/요약 키워드를 합쳐 한 번에 주제를 정한다.
+
         Args:
             news_items: 뉴스 리스트
             num_clusters: 최대 클러스터 수
@@ -340,8 +395,8 @@ class NewsDeduplicator:
 
         clusters = defaultdict(list)
 
-        for item in news_items:
-            text = f"{item.get('title', '')} {item.get('snippet', '')}".lower()
+        for group in self.story_groups(news_items):
+            text = " ".join(f"{item.get('title', '')} {item.get('snippet', '')}" for item in group).lower()
             best_topic = "Other"
             best_score = 0
 
@@ -351,7 +406,7 @@ class NewsDeduplicator:
                     best_score = score
                     best_topic = topic
 
-            clusters[best_topic].append(item)
+            clusters[best_topic].extend(group)
 
         # 빈 클러스터 제거 및 정렬
         result = {k: v for k, v in clusters.items() if v}
@@ -362,65 +417,113 @@ class NewsDeduplicator:
 # LLM 기반 고급 분석
 # ============================================================
 
+_SENTIMENT_SYSTEM = "You are a financial news analyst. Analyze sentiment and return JSON only."
+
+_SENTIMENT_SCHEMA = """{
+    "overall_sentiment": "bullish|bearish|neutral",
+    "sentiment_score": -1.0 to 1.0,
+    "key_themes": ["theme1", "theme2"],
+    "summary": "1-2 sentence market impact summary",
+    "confidence": 0.0 to 1.0
+}"""
+
+
+def _news_lines(news_items: List[Dict]) -> str:
+    """프롬프트용 뉴스 목록 (상위 10건, 스니펫 200자)"""
+    return "\n".join([
+        f"- {item.get('title', '')}: {item.get('snippet', '')[:200]}"
+        for item in news_items[:10]
+    ])
+
+
 @retry_with_backoff(
     attempts=RetryConfig.GEMINI["attempts"],
     min_wait=RetryConfig.GEMINI["min_wait"],
     max_wait=RetryConfig.GEMINI["max_wait"]
 )
-def _call_gemma_sentiment(news_items: List[Dict]) -> Dict:
-    """Google AI Studio (Gemma 4)를 사용한 고급 감성 분석"""
+def _call_gemma_json(prompt: str, max_output_tokens: int = 1024) -> Dict:
+    """Google AI Studio (Gemma 4) JSON 응답 호출 - 같은 프롬프트는 응답 캐시(llm_cache)에서 재사용"""
     api_key = os.getenv("GEMINI_API_KEY", "")
     model = os.getenv("GEMMA_MODEL", "gemma-4-26b-a4b-it")
     base_url = "https://generativelanguage.googleapis.com/v1beta"
 
-    news_text = "\n".join([
-        f"- {item.get('title', '')}: {item.get('snippet', '')[:200]}"
-        for item in news_items[:10]
-    ])
-
-    prompt = f"""Analyze the sentiment of these news headlines for stock market impact.
-
-News:
-{news_text}
-
-Return JSON with:
-{{
-    "overall_sentiment": "bullish|bearish|neutral",
-    "sentiment_score": -1.0 to 1.0,
-    "key_themes": ["theme1", "theme2"],
-    "summary": "1-2 sentence market impact summary",
-    "confidence": 0.0 to 1.0
-}}
-
-Return ONLY valid JSON."""
-
     payload = {
         "systemInstruction": {
-            "parts": [{"text": "You are a financial news analyst. Analyze sentiment and return JSON only."}]
+            "parts": [{"text": _SENTIMENT_SYSTEM}]
         },
         "contents": [
             {"role": "user", "parts": [{"text": prompt}]}
         ],
         "generationConfig": {
             "temperature": 0.1,
-            "maxOutputTokens": 1024,
+            "maxOutputTokens": max_output_tokens,
         },
     }
 
     def _do_request():
         url = f"{base_url}/models/{model}:generateContent?key={api_key}"
-        resp = requests.post(url, json=payload, timeout=Timeout.GEMINI)
+        resp = http_post(url, json=payload, timeout=Timeout.GEMINI)
         resp.raise_for_status()
         return resp.json()
 
-    result = circuit_gemini.call(_do_request)
-    candidates = result.get("candidates", [])
-    content = ""
-    if candidates:
-        parts = candidates[0].get("content", {}).get("parts", [])
-        if parts:
-            content = parts[0].get("text", "")
+    def _fetch_content() -> str:
+        result = circuit_gemini.call(_do_request)
+        candidates = result.get("candidates", [])
+        content = ""
+        if candidates:
+            parts = candidates[0].get("content", {}).get("parts", [])
+            if parts:
+                content = parts[0].get("text", "")
+        _parse_llm_json(content)  # 파싱 안 되는 응답은 캐시하지 않음
+        return content
+
+    # 같은 헤드라인 묶음은 프롬프트 해시 캐시에서 재사용 (analyze_theme 재실행 등)
+    content = cached_completion(model, _SENTIMENT_SYSTEM, prompt, 0.1, _fetch_content,
+                                max_output_tokens=max_output_tokens)
+    return _parse_llm_json(content)
+
+
+def _call_gemma_sentiment(news_items: List[Dict]) -> Dict:
+    """Google AI Studio (Gemma 4)를 사용한 고급 감성 분석"""
+    prompt = f"""Analyze the sentiment of these news headlines for stock market impact.
+
+News:
+{_news_lines(news_items)}
+
+Return JSON with:
+{_SENTIMENT_SCHEMA}
+
+Return ONLY valid JSON."""
+    return _call_gemma_json(prompt)
+
+
+def _call_gemma_sentiment_batch(news_by_ticker: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    """여러 종목 뉴스를 한 프롬프트로 분석 → {ticker: 감성 결과} (응답에 없는 종목은 빠짐)"""
+    blocks = "\n\n".join(f"### {ticker}\n{_news_lines(items)}" for ticker, items in news_by_ticker.items())
+    tickers = list(news_by_ticker)
+    prompt = f"""Analyze the sentiment of these news headlines for stock market impact, separately for each ticker.
 
+News by ticker:
+{blocks}
+
+Return one JSON object keyed by the ticker symbols exactly as given ({", ".join(tickers)}).
+Each value has:
+{_SENTIMENT_SCHEMA}
+
+Include every ticker. Return ONLY valid JSON."""
+    max_tokens = min(8192, 1024 + LLM_SENTIMENT_TOKENS_PER_TICKER * len(tickers))
+    parsed = _call_gemma_json(prompt, max_output_tokens=max_tokens)
+    by_upper = {str(k).strip().upper(): v for k, v in parsed.items()} if isinstance(parsed, dict) else {}
+    out = {}
+    for ticker in tickers:
+        value = by_upper.get(ticker.upper())
+        if isinstance(value, dict) and ("sentiment_score" in value or "overall_sentiment" in value):
+            out[ticker] = value
+    return out
+
+
+def _parse_llm_json(content: str) -> Dict:
+    """LLM 응답에서 JSON 객체 추출 (앞뒤 설명문/코드 펜스 허용)"""
     try:
         return json.loads(content)
     except json.JSONDecodeError:
@@ -431,6 +534,17 @@ Return ONLY valid JSON."""
         raise
 
 
+def _llm_unavailable(error: Exception) -> Dict[str, Any]:
+    return {
+        "overall_sentiment": "unknown",
+        "sentiment_score": 0.0,
+        "key_themes": [],
+        "summary": "LLM analysis unavailable",
+        "confidence": 0.0,
+        "error": str(error)
+    }
+
+
 def analyze_with_llm(news_items: List[Dict]) -> Dict[str, Any]:
     """
     LLM 기반 고급 감성 분석
@@ -445,14 +559,77 @@ def analyze_with_llm(news_items: List[Dict]) -> Dict[str, Any]:
         return _call_gemma_sentiment(news_items)
     except Exception as e:
         logger.warning(f"LLM sentiment analysis failed: {e}")
-        return {
-            "overall_sentiment": "unknown",
-            "sentiment_score": 0.0,
-            "key_themes": [],
-            "summary": "LLM analysis unavailable",
-            "confidence": 0.0,
-            "error": str(e)
-        }
+        return _llm_unavailable(e)
+
+
+def plan_sentiment_batches(
+    news_by_ticker: Dict[str, List[Dict]],
+    token_budget: int = LLM_SENTIMENT_BATCH_TOKENS,
+    max_tickers: int = LLM_SENTIMENT_BATCH_MAX_TICKERS,
+) -> List[List[str]]:
+    """종목을 입력 토큰 예산 / 종목 수 상한 안에서 순서대로 묶음 (예산을 넘는 종목은 단독 배치)"""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+    for ticker, items in news_by_ticker.items():
+        cost = estimate_tokens(ticker, _news_lines(items)) + 8
+        if current and (used + cost > token_budget or len(current) >= max_tickers):
+            batches.append(current)
+            current, used = [], 0
+        current.append(ticker)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def analyze_with_llm_many(
+    news_by_ticker: Dict[str, List[Dict]],
+    token_budget: int = LLM_SENTIMENT_BATCH_TOKENS,
+    max_tickers: int = LLM_SENTIMENT_BATCH_MAX_TICKERS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 종목 LLM 감성 분석 (배치)
+
+    종목별 뉴스를 토큰 예산 안에서 묶어 배치당 1회 호출하고 응답 JSON 을 종목별로 나눔.
+    응답 파싱 실패 / 누락된 종목은 종목별 analyze_with_llm 으로 대체.
+
+    Args:
+        news_by_ticker: {ticker: 뉴스 리스트}
+        token_budget: 배치당 입력 토큰 예산 (추정치)
+        max_tickers: 배치당 최대 종목 수
+
+    Returns:
+        {ticker: LLM 분석 결과} (입력 순서)
+    """
+    news_by_ticker = {t: items for t, items in news_by_ticker.items() if items}
+    if not news_by_ticker:
+        return {}
+    batches = plan_sentiment_batches(news_by_ticker, token_budget, max_tickers)
+
+    def run(batch: List[str]) -> Dict[str, Dict]:
+        if len(batch) == 1:
+            return {batch[0]: analyze_with_llm(news_by_ticker[batch[0]])}
+        try:
+            found = _call_gemma_sentiment_batch({t: news_by_ticker[t] for t in batch})
+        except Exception as e:
+            logger.warning(f"Batched LLM sentiment failed ({len(batch)} tickers), per-ticker fallback: {e}")
+            found = {}
+        missing = [t for t in batch if t not in found]
+        if found and missing:
+            logger.warning(f"Batched LLM sentiment missing {missing}, per-ticker fallback")
+        for t in batch:
+            if t in found:
+                found[t] = {**found[t], "batch_size": len(batch)}
+        for t in missing:
+            found[t] = analyze_with_llm(news_by_ticker[t])
+        return found
+
+    results: Dict[str, Dict] = {}
+    with ThreadPoolExecutor(max_workers=min(len(batches), 3)) as executor:
+        for found in executor.map(run, batches):
+            results.update(found)
+    return {t: results[t] for t in news_by_ticker}
 
 
 # ============================================================
@@ -546,11 +723,7 @@ def analyze_news_sentiment(
 
     # 개별 뉴스 분석
     analyzer = NewsSentimentAnalyzer()
-    analyzed_items = []
-
-    for item in news_items:
-        analyzed = analyzer.analyze_news_item(item)
-        analyzed_items.append(analyzed)
+    analyzed_items = analyzer.analyze_news_items(news_items)
 
     # 감성 분포 계산
     sentiment_counts = defaultdict(int)
@@ -599,9 +772,9 @@ def analyze_news_sentiment(
     if include_timeline:
         result["timeline"] = create_news_timeline(analyzed_items)
 
-    # LLM 분석
+    # LLM 분석 (영향도순 상위 뉴스 - analyze_tickers_news 배치 경로와 같은 순서라 프롬프트/응답 캐시 공유)
     if use_llm:
-        llm_result = analyze_with_llm(analyzed_items)
+        llm_result = analyze_with_llm(result["items"])
         result["llm_analysis"] = llm_result
 
     result["analyzed_at"] = datetime.now().isoformat()
@@ -609,27 +782,20 @@ def analyze_news_sentiment(
     return result
 
 
-def analyze_ticker_news(
-    ticker: str,
-    lookback_days: int = 7,
-    use_llm: bool = False
-) -> Dict[str, Any]:
-    """
-    특정 종목 뉴스 감성 분석
+def _news_cache_key(ticker: str, lookback_days: int) -> str:
+    return f"news_sentiment_{ticker}_{lookback_days}"
 
-    Args:
-        ticker: 종목 심볼
-        lookback_days: 검색 기간 (일)
-        use_llm: LLM 분석 사용 여부
 
-    Returns:
-        종목별 뉴스 감성 분석 결과
-    """
-    cache_key = f"news_sentiment_{ticker}_{lookback_days}"
-    cached = cache_manager.get(cache_key)
-    if cached:
+def _cached_ticker_result(ticker: str, lookback_days: int, use_llm: bool) -> Optional[Dict[str, Any]]:
+    """캐시된 종목 결과 (LLM 분석을 요청했는데 없는 결과는 다시 계산)"""
+    cached = cache_manager.get(_news_cache_key(ticker, lookback_days))
+    if cached and (not use_llm or "llm_analysis" in cached or not cached.get("total")):
         return cached
+    return None
 
+
+def _fetch_ticker_news(ticker: str, lookback_days: int) -> List[Dict]:
+    """종목 뉴스 수집 (KR: 한국어 RSS, US: Finnhub → 일반 뉴스 검색)"""
     # FR-K12: KR 티커는 Finnhub 을 건너뛰고 곧바로 한국어 RSS (Google News KR)
     # 로 수집한다. Finnhub 은 국내 상장사를 커버하지 않아 매번 빈 결과가 나오며
     # fallback 검색 쿼리는 영어 페이지만 뽑아 KR 센티먼트가 왜곡되기 쉽다.
@@ -667,40 +833,114 @@ def analyze_ticker_news(
             search_result = search_news([ticker], lookback_days=lookback_days, max_results=20)
             for block in search_result:
                 news_items.extend(block.get("hits", []))
+    return news_items
+
 
-    # 분석 실행
+def _investment_signal(score: float) -> str:
+    if score > 0.4:
+        return "Strong Positive - News sentiment supports bullish outlook"
+    elif score > 0.15:
+        return "Positive - Generally favorable news coverage"
+    elif score < -0.4:
+        return "Strong Negative - News sentiment indicates caution"
+    elif score < -0.15:
+        return "Negative - Some concerning news coverage"
+    return "Neutral - Mixed or neutral news sentiment"
+
+
+def _ticker_sentiment(ticker: str, lookback_days: int, use_llm: bool) -> Dict[str, Any]:
+    """종목 뉴스 수집 + 감성 분석 + 투자 신호 (캐시 없음)"""
     result = analyze_news_sentiment(
-        news_items,
+        _fetch_ticker_news(ticker, lookback_days),
         deduplicate=True,
         use_llm=use_llm,
         include_timeline=True
     )
-
     result["ticker"] = ticker.upper()
     result["period_days"] = lookback_days
+    result["investment_signal"] = _investment_signal(result.get("score", 0))
+    return result
 
-    # 투자 신호 생성
-    score = result.get("score", 0)
-    if score > 0.4:
-        signal = "Strong Positive - News sentiment supports bullish outlook"
-    elif score > 0.15:
-        signal = "Positive - Generally favorable news coverage"
-    elif score < -0.4:
-        signal = "Strong Negative - News sentiment indicates caution"
-    elif score < -0.15:
-        signal = "Negative - Some concerning news coverage"
-    else:
-        signal = "Neutral - Mixed or neutral news sentiment"
 
-    result["investment_signal"] = signal
+def analyze_ticker_news(
+    ticker: str,
+    lookback_days: int = 7,
+    use_llm: bool = False
+) -> Dict[str, Any]:
+    """
+    특정 종목 뉴스 감성 분석
 
-    cache_manager.set(cache_key, result, TTL.NEWS)
+    Args:
+        ticker: 종목 심볼
+        lookback_days: 검색 기간 (일)
+        use_llm: LLM 분석 사용 여부
+
+    Returns:
+        종목별 뉴스 감성 분석 결과
+    """
+    cached = _cached_ticker_result(ticker, lookback_days, use_llm)
+    if cached:
+        return cached
+
+    result = _ticker_sentiment(ticker, lookback_days, use_llm)
+    cache_manager.set(_news_cache_key(ticker, lookback_days), result, TTL.NEWS)
     return result
 
 
+def analyze_tickers_news(
+    tickers: List[str],
+    lookback_days: int = 7,
+    use_llm: bool = False
+) -> Dict[str, Dict[str, Any]]:
+    """
+    여러 종목 뉴스 감성 분석 (LLM 감성은 배치 호출)
+
+    뉴스 수집/키워드 분석은 종목별 병렬, LLM 감성은 analyze_with_llm_many 로 여러 종목을 묶어
+    배치당 1회 호출 (20종목 → 2~3회). 종목별 결과는 analyze_ticker_news 와 같은 형태/캐시 키.
+
+    Args:
+        tickers: 종목 심볼 리스트
+        lookback_days: 검색 기간 (일)
+        use_llm: LLM 분석 사용 여부
+
+    Returns:
+        {ticker: 종목별 뉴스 감성 분석 결과} (실패한 종목은 {"ticker", "error"})
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    todo = []
+    for ticker in dict.fromkeys(tickers):
+        cached = _cached_ticker_result(ticker, lookback_days, use_llm)
+        if cached:
+            results[ticker] = cached
+        else:
+            todo.append(ticker)
+
+    fresh: Dict[str, Dict[str, Any]] = {}
+    if todo:
+        with ThreadPoolExecutor(max_workers=min(len(todo), 5)) as executor:
+            futures = {executor.submit(_ticker_sentiment, t, lookback_days, False): t for t in todo}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    fresh[ticker] = future.result()
+                except Exception as e:
+                    results[ticker] = {"ticker": ticker.upper(), "error": str(e)}
+
+    if use_llm:
+        llm_results = analyze_with_llm_many({t: r["items"] for t, r in fresh.items() if r.get("items")})
+        for ticker, llm_result in llm_results.items():
+            fresh[ticker]["llm_analysis"] = llm_result
+
+    for ticker, result in fresh.items():
+        cache_manager.set(_news_cache_key(ticker, lookback_days), result, TTL.NEWS)
+        results[ticker] = result
+    return {t: results[t] for t in dict.fromkeys(tickers)}
+
+
 def compare_tickers_sentiment(
     tickers: List[str],
-    lookback_days: int = 7
+    lookback_days: int = 7,
+    use_llm: bool = False
 ) -> Dict[str, Any]:
     """
     여러 종목 뉴스 감성 비교
@@ -708,35 +948,32 @@ def compare_tickers_sentiment(
     Args:
         tickers: 종목 심볼 리스트
         lookback_days: 검색 기간
+        use_llm: LLM 감성 포함 (여러 종목을 묶은 배치 호출)
 
     Returns:
         종목별 감성 비교 결과
     """
     results = []
 
-    # 병렬 분석
-    with ThreadPoolExecutor(max_workers=min(len(tickers), 5)) as executor:
-        futures = {
-            executor.submit(analyze_ticker_news, ticker, lookback_days, False): ticker
-            for ticker in tickers
+    # 병렬 분석 (LLM 은 배치)
+    for ticker, data in analyze_tickers_news(tickers, lookback_days, use_llm).items():
+        if "error" in data:
+            results.append({
+                "ticker": ticker.upper(),
+                "error": data["error"]
+            })
+            continue
+        row = {
+            "ticker": ticker.upper(),
+            "overall": data.get("overall", "neutral"),
+            "score": data.get("score", 0),
+            "news_count": data.get("total", 0),
+            "signal": data.get("investment_signal", "")
         }
-
-        for future in as_completed(futures):
-            ticker = futures[future]
-            try:
-                data = future.result()
-                results.append({
-                    "ticker": ticker.upper(),
-                    "overall": data.get("overall", "neutral"),
-                    "score": data.get("score", 0),
-                    "news_count": data.get("total", 0),
-                    "signal": data.get("investment_signal", "")
-                })
-            except Exception as e:
-                results.append({
-                    "ticker": ticker.upper(),
-                    "error": str(e)
-                })
+        if "llm_analysis" in data:
+            row["llm_sentiment"] = data["llm_analysis"].get("overall_sentiment")
+            row["llm_score"] = data["llm_analysis"].get("sentiment_score")
+        results.append(row)
 
     # 점수순 정렬
     results.sort(key=lambda x: x.get("score", -999), reverse=True)
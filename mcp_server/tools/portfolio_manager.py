@@ -23,8 +23,8 @@ import yfinance as yf
 import pandas as pd
 
 from mcp_server.tools.cache_manager import cache_manager, TTL
-from mcp_server.tools.market_data import get_prices
-from mcp_server.tools.yf_utils import normalize_yf_columns
+from mcp_server.tools.market_data import get_prices, get_prices_bulk
+from mcp_server.tools.ticker_info import get_ticker_info
 
 logger = logging.getLogger(__name__)
 
@@ -148,6 +148,25 @@ def _get_current_price(ticker: str) -> Optional[float]:
         return None
 
 
+def _get_recent_closes(tickers: List[str]) -> Dict[str, Tuple[float, Optional[float]]]:
+    """여러 종목의 (현재가, 전일 종가)를 한 번의 배치 조회로 산출
+
+    현재가는 ``_get_current_price`` 와 같은 캐시 키에도 기록해 이후
+    알림/리밸런싱 등의 단건 조회가 재다운로드하지 않도록 한다.
+    """
+    closes = get_prices_bulk(tickers, period="10d", max_age_sec=TTL.REALTIME)["close"]
+    out: Dict[str, Tuple[float, Optional[float]]] = {}
+    for ticker in closes.columns:
+        series = closes[ticker].dropna()
+        if series.empty:
+            continue
+        current = float(series.iloc[-1])
+        prev = float(series.iloc[-2]) if len(series) >= 2 else None
+        out[ticker] = (current, prev)
+        cache_manager.set(f"current_price_{ticker}", current, TTL.REALTIME)
+    return out
+
+
 def _get_ticker_info(ticker: str) -> Dict:
     """종목 정보 조회 (섹터, 배당 등)"""
     cache_key = f"ticker_info_{ticker}"
@@ -156,8 +175,7 @@ def _get_ticker_info(ticker: str) -> Dict:
         return cached
 
     try:
-        t = yf.Ticker(ticker)
-        info = t.info
+        info = get_ticker_info(ticker).info
         result = {
             "sector": info.get("sector", "Unknown"),
             "industry": info.get("industry", "Unknown"),
@@ -189,21 +207,16 @@ def calculate_pnl(holdings: List[Holding]) -> List[Dict]:
     """
     results = []
 
-    # 병렬로 현재가 조회
+    # 현재가/전일 종가 배치 조회 (종목 수와 무관하게 한 번의 업스트림 요청)
     tickers = [h.ticker for h in holdings]
-    current_prices = {}
-
-    with ThreadPoolExecutor(max_workers=min(len(tickers), 10)) as executor:
-        futures = {executor.submit(_get_current_price, t): t for t in tickers}
-        for future in as_completed(futures):
-            ticker = futures[future]
-            try:
-                current_prices[ticker] = future.result()
-            except Exception:
-                current_prices[ticker] = None
+    try:
+        recent = _get_recent_closes(tickers)
+    except Exception as e:
+        logger.warning(f"Bulk price lookup failed: {e}")
+        recent = {}
 
     for holding in holdings:
-        current = current_prices.get(holding.ticker)
+        current, prev_close = recent.get(holding.ticker, (None, None))
         if current is None:
             results.append({
                 "ticker": holding.ticker,
@@ -219,13 +232,8 @@ def calculate_pnl(holdings: List[Holding]) -> List[Dict]:
 
         # 일일 손익 (간단 계산)
         daily_return = None
-        try:
-            hist = yf.Ticker(holding.ticker).history(period="2d")
-            if len(hist) >= 2:
-                prev_close = float(hist["Close"].iloc[-2])
-                daily_return = (current - prev_close) / prev_close * 100
-        except Exception:
-            pass
+        if prev_close:
+            daily_return = (current - prev_close) / prev_close * 100
 
         results.append({
             "ticker": holding.ticker,
@@ -578,23 +586,16 @@ def analyze_correlation(
     if cached:
         return cached
 
-    # 가격 데이터 수집
-    prices_dict = {}
-    for ticker in tickers:
-        try:
-            data = normalize_yf_columns(
-                yf.download(ticker, period=period, progress=False)
-            )
-            if not data.empty and "Close" in data.columns:
-                prices_dict[ticker] = data["Close"]
-        except Exception as e:
-            logger.warning(f"Failed to get data for {ticker}: {e}")
+    # 가격 데이터 수집 (배치 조회 → 종가 패널)
+    try:
+        df = get_prices_bulk(tickers, period=period)["close"]
+    except Exception as e:
+        logger.warning(f"Failed to get bulk prices for {tickers}: {e}")
+        df = pd.DataFrame()
 
-    if len(prices_dict) < 2:
+    if len(df.columns) < 2:
         return {"error": "상관관계 분석을 위해 최소 2개 종목이 필요합니다."}
 
-    # DataFrame 생성
-    df = pd.DataFrame(prices_dict)
     df = df.dropna()
 
     if len(df) < 30:
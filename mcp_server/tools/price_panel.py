@@ -0,0 +1,169 @@
+"""
+요청 단위 가격 패널 - 종목당 한 번 조회한 종가를 모멘텀/변동성/딥 계산이 공유
+
+랭킹 한 번에 같은 종목의 가격 이력이 get_momentum_metrics, _calculate_volatility,
+compute_dip_bonus_by_prices 에서 각각 조회되던 것을, 패널이 배치로 한 번 읽고
+모든 지표를 메모리의 종가 시리즈에서 계산한다.
+
+사용 예시:
+    panel = PricePanel(period="1y")
+    panel.load(["AAPL", "MSFT"])        # get_prices_bulk 1회
+    panel.momentum("AAPL")               # {"mom1": ..., "mom3": ..., ...}
+    panel.volatility("AAPL")
+    panel.dip_bonus("AAPL")
+    panel.stats()                        # {"panel_reuse": ..., "store_upstream_fetches": ..., ...}
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, Optional
+import threading
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ===== 종가 시리즈 기반 지표 (기존 함수들과 동일 공식) =====
+
+def momentum_from_close(close: pd.Series) -> Dict[str, Optional[float]]:
+    """1/3/6/12개월 모멘텀 (21/63/126/252 거래일 수익률)"""
+    close = close.reset_index(drop=True)
+
+    def ret(n):
+        try:
+            if len(close) < n:
+                return None
+            return float((close.iloc[-1] / close.iloc[-n]) - 1.0)
+        except Exception:
+            return None
+    return {"mom1": ret(21), "mom3": ret(63), "mom6": ret(126), "mom12": ret(252)}
+
+
+def volatility_from_close(close: pd.Series, lookback_days: int = 60) -> Optional[float]:
+    """최근 lookback_days 일 수익률의 연환산 변동성"""
+    if close.empty or len(close) < lookback_days:
+        return None
+    returns = close.pct_change().dropna().tail(lookback_days)
+    return float(returns.std() * np.sqrt(252))
+
+
+def dip_bonus_from_close(close: pd.Series, lookback_days: int = 180) -> float:
+    """낙폭 + 10일 반등 모멘텀 기반 딥 보너스 (0~1)"""
+    if close.empty:
+        return 0.0
+    window = close.tail(min(len(close), lookback_days))
+    recent_high = float(window.max())
+    last = float(close.iloc[-1])
+    ret10 = float(close.pct_change(10).iloc[-1])
+    if recent_high <= 0:
+        return 0.0
+    drawdown = max(0.0, (recent_high - last) / recent_high)
+    dd_score = min(drawdown / 0.30, 1.0)
+    mom_score = max(0.0, min((ret10 + 0.05) / 0.10, 1.0))
+    bonus = 0.5 * dd_score + 0.5 * (dd_score * mom_score)
+    return round(bonus, 4)
+
+
+# ===== 요청 단위 패널 =====
+
+class PricePanel:
+    """요청 하나 동안 종목별 종가를 한 번만 읽어 공유하는 컨텍스트
+
+    - load(): get_prices_bulk 한 번으로 여러 종목 선조회
+    - close(): 패널에 없는 종목은 get_price_history 로 개별 조회 후 보관
+    - stats(): 패널 읽기/적재 횟수와 그동안 가격 저장소가 실제로 보낸 업스트림 요청 수
+    """
+
+    def __init__(self, period: str = "1y", market: Optional[str] = None):
+        self.period = period
+        self.market = market
+        self._closes: Dict[str, pd.Series] = {}
+        self._lock = threading.Lock()
+        self._store_before = self._store_fetches()
+        self.counters = {"reads": 0, "loads": 0, "bulk_loads": 0, "fallbacks": 0}
+
+    @staticmethod
+    def _store_fetches() -> int:
+        try:
+            from .price_store import get_price_store
+            s = get_price_store().stats()
+            return int(s.get("upstream_fetches", 0)) + int(s.get("bulk_fetches", 0))
+        except Exception:
+            return 0
+
+    def load(self, tickers: Iterable[str]) -> "PricePanel":
+        """여러 종목 종가를 한 번의 배치 조회로 적재"""
+        from .market_data import get_prices_bulk
+
+        todo = [t for t in dict.fromkeys(tickers) if t not in self._closes]
+        if not todo:
+            return self
+        try:
+            close = get_prices_bulk(todo, period=self.period, market=self.market)["close"]
+        except Exception as e:
+            logger.warning(f"Price panel bulk load failed: {e}")
+            close = pd.DataFrame()
+        with self._lock:
+            self.counters["bulk_loads"] += 1
+            self.counters["loads"] += 1
+            for t in todo:
+                s = close[t].dropna() if t in close.columns else pd.Series(dtype=float)
+                self._closes[t] = s
+        return self
+
+    def close(self, ticker: str) -> pd.Series:
+        """종목 종가 시리즈 (패널 미적재 시 개별 조회)"""
+        with self._lock:
+            self.counters["reads"] += 1
+            cached = self._closes.get(ticker)
+        if cached is not None:
+            return cached
+
+        from .market_data import get_price_history
+        try:
+            hist = get_price_history(ticker, period=self.period, market=self.market)
+            s = hist["Close"].dropna() if not hist.empty and "Close" in hist.columns else pd.Series(dtype=float)
+        except Exception:
+            s = pd.Series(dtype=float)
+        with self._lock:
+            self.counters["loads"] += 1
+            self._closes[ticker] = s
+        return s
+
+    def momentum(self, ticker: str) -> Dict[str, Optional[float]]:
+        close = self.close(ticker)
+        if close.empty:
+            # 저장소에 데이터가 없으면 기존 경로(Ticker.history 폴백 포함) 사용
+            from .market_data import get_momentum_metrics
+            with self._lock:
+                self.counters["fallbacks"] += 1
+            return get_momentum_metrics(ticker)
+        return momentum_from_close(close)
+
+    def volatility(self, ticker: str, lookback_days: int = 60) -> Optional[float]:
+        try:
+            return volatility_from_close(self.close(ticker), lookback_days)
+        except Exception:
+            return None
+
+    def dip_bonus(self, ticker: str, lookback_days: int = 180) -> float:
+        try:
+            return dip_bonus_from_close(self.close(ticker), lookback_days)
+        except Exception:
+            return 0.0
+
+    def stats(self) -> Dict[str, int]:
+        """요청 단위 계측: 패널 읽기 수, 적재 수, 패널에서 재사용한 읽기 수, 저장소 업스트림 요청 수"""
+        with self._lock:
+            c = dict(self.counters)
+            tickers = len(self._closes)
+        return {
+            "tickers": tickers,
+            "panel_reads": c["reads"],
+            "price_loads": c["loads"],
+            "bulk_loads": c["bulk_loads"],
+            "momentum_fallbacks": c["fallbacks"],
+            "panel_reuse": max(0, c["reads"] - c["loads"] - c["fallbacks"]),
+            "store_upstream_fetches": max(0, self._store_fetches() - self._store_before),
+        }
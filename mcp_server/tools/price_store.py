@@ -0,0 +1,485 @@
+"""로컬 컬럼형 OHLCV 저장소 (per-ticker, memory-mapped NumPy).
+
+Why this exists
+---------------
+``market_data.get_prices`` used to pickle the whole DataFrame into
+diskcache under a ``(ticker, start, end, interval)`` key, so every new
+date window was a fresh download and overlapping windows were stored
+many times over. The store keeps exactly one daily series per ticker
+and only asks the upstream chain (PyKrx → KIS → yfinance) for the date
+ranges it has not seen yet.
+
+Layout
+------
+``{PRICE_STORE_PATH}/{TICKER}.npy``  — float64 array of shape (6, n):
+row 0 = day number since epoch, rows 1..5 = Open/High/Low/Close/Volume.
+Each field is a contiguous row, so a ``Close``-only read touches one
+page range of the memory map.
+
+``{PRICE_STORE_PATH}/{TICKER}.json`` — coverage sidecar
+(``start``/``end`` inclusive ISO dates that have been fetched,
+``checked_at`` epoch of the last tail refresh and ``provisional_from``,
+the first day the last tail fetch returned no bar for). Coverage is
+tracked separately from the bars so weekends, holidays and pre-IPO
+ranges are not re-requested forever.
+
+Upstream bars are split/dividend adjusted (``auto_adjust=True``), so a
+corporate action rewrites the whole history. Each tail refresh also
+re-fetches the last ``ADJUST_CHECK_DAYS`` of stored bars; if their
+closes changed, the full covered range is downloaded again instead of
+appending new-basis bars to old-basis history.
+
+Writes go to a temp file and ``os.replace`` onto the final path, so a
+reader in another process always sees a complete array.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.config import PRICE_STORE_PATH
+from mcp_server.tools.cache_manager import TTL
+
+logger = logging.getLogger(__name__)
+
+COLUMNS: Tuple[str, ...] = ("Open", "High", "Low", "Close", "Volume")
+
+# Bars dated on/after the day of the last tail fetch may still be
+# intraday-partial; they are re-fetched once this many seconds passed.
+TAIL_REFRESH_SEC = TTL.DAILY
+
+# Stored days re-fetched with each tail refresh to detect a changed
+# adjustment basis (split / dividend), and the relative close tolerance.
+ADJUST_CHECK_DAYS = 7
+ADJUST_RTOL = 1e-6
+
+_EPOCH = date(1970, 1, 1)
+
+# fetcher(ticker, start_iso, end_iso_inclusive) -> DataFrame with a
+# ``Date`` column (or DatetimeIndex) and OHLCV columns. Raising means
+# "upstream failed" — the range is left uncovered and retried later.
+# An empty frame covers a head range (holidays, pre-IPO). In the tail it
+# may also be a throttled yfinance response or a bar not published yet,
+# so those days stay provisional and are re-fetched on the next refresh.
+Fetcher = Callable[[str, str, str], pd.DataFrame]
+
+# bulk_fetcher(tickers, start_iso, end_iso_inclusive) -> {ticker: DataFrame}
+BulkFetcher = Callable[[List[str], str, str], Dict[str, pd.DataFrame]]
+
+
+def _to_date(value) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return pd.Timestamp(str(value)).date()
+
+
+def period_to_start(period: str, today: Optional[date] = None) -> str:
+    """Translate a yfinance-style ``period`` (``90d``/``6mo``/``2y``/``ytd``/``max``) to an ISO start date."""
+    from dateutil.relativedelta import relativedelta
+
+    today = today or date.today()
+    p = (period or "1y").strip().lower()
+    if p == "max":
+        return "1970-01-01"
+    if p == "ytd":
+        return date(today.year, 1, 1).isoformat()
+    m = re.fullmatch(r"(\d+)\s*(d|wk|mo|y)", p)
+    if not m:
+        raise ValueError(f"Unsupported period: {period}")
+    n, unit = int(m.group(1)), m.group(2)
+    delta = {
+        "d": relativedelta(days=n),
+        "wk": relativedelta(weeks=n),
+        "mo": relativedelta(months=n),
+        "y": relativedelta(years=n),
+    }[unit]
+    return (today - delta).isoformat()
+
+
+def _frame_to_block(df: pd.DataFrame) -> np.ndarray:
+    """Upstream DataFrame → (6, n) float64 block sorted by day."""
+    if df is None or df.empty:
+        return np.empty((len(COLUMNS) + 1, 0))
+    if "Date" in df.columns:
+        dates = pd.to_datetime(df["Date"])
+    elif "Datetime" in df.columns:
+        dates = pd.to_datetime(df["Datetime"])
+    else:
+        dates = pd.to_datetime(df.index)
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    days = (dates.normalize() - pd.Timestamp(_EPOCH)).days.to_numpy(dtype=np.float64)
+
+    block = np.full((len(COLUMNS) + 1, len(df)), np.nan)
+    block[0] = days
+    for i, col in enumerate(COLUMNS, start=1):
+        if col in df.columns:
+            block[i] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64)
+
+    block = block[:, ~np.isnan(block[0])]
+    order = np.argsort(block[0], kind="stable")
+    block = block[:, order]
+    # 같은 날짜가 여러 번 오면 마지막 값 유지
+    if block.shape[1] > 1:
+        keep = np.append(block[0, 1:] != block[0, :-1], True)
+        block = block[:, keep]
+    return block
+
+
+class PriceStore:
+    """Per-ticker daily OHLCV store with gap-only upstream fetching.
+
+    사용 예시:
+        store = get_price_store()
+        df = store.get("AAPL", "2023-01-01", "2024-12-31", fetcher=_fetch_prices_upstream)
+    """
+
+    def __init__(self, root: str = PRICE_STORE_PATH, tail_refresh_sec: int = TAIL_REFRESH_SEC):
+        self.root = root
+        self.tail_refresh_sec = tail_refresh_sec
+        os.makedirs(self.root, exist_ok=True)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        self._stats = {"reads": 0, "upstream_fetches": 0, "bulk_fetches": 0, "upstream_failures": 0,
+                       "bars_appended": 0, "rebased": 0}
+
+    # ----- paths / locking -----
+
+    @staticmethod
+    def _safe_name(ticker: str) -> str:
+        return re.sub(r"[^A-Za-z0-9._-]", "_", str(ticker).strip().upper())
+
+    def _data_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{self._safe_name(ticker)}.npy")
+
+    def _meta_path(self, ticker: str) -> str:
+        return os.path.join(self.root, f"{self._safe_name(ticker)}.json")
+
+    def _lock(self, ticker: str) -> threading.Lock:
+        key = self._safe_name(ticker)
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+    # ----- raw IO -----
+
+    def _load_block(self, ticker: str) -> np.ndarray:
+        path = self._data_path(ticker)
+        if not os.path.exists(path):
+            return np.empty((len(COLUMNS) + 1, 0))
+        try:
+            return np.load(path, mmap_mode="r")
+        except Exception as e:  # noqa: BLE001
+            logger.warning("Price store read failed for %s, discarding: %s", ticker, e)
+            return np.empty((len(COLUMNS) + 1, 0))
+
+    def _load_meta(self, ticker: str, block: np.ndarray) -> Dict:
+        try:
+            with open(self._meta_path(ticker), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+        if block.shape[1] == 0:
+            return {}
+        # 사이드카가 없으면 저장된 bar 범위를 커버리지로 간주
+        first = _EPOCH + timedelta(days=int(block[0, 0]))
+        last = _EPOCH + timedelta(days=int(block[0, -1]))
+        return {"start": first.isoformat(), "end": last.isoformat(), "checked_at": 0.0}
+
+    def _write(self, ticker: str, block: np.ndarray, meta: Dict) -> None:
+        data_path = self._data_path(ticker)
+        tmp = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, np.ascontiguousarray(block, dtype=np.float64))
+        os.replace(tmp, data_path)
+
+        meta_path = self._meta_path(ticker)
+        tmp_meta = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+    # ----- coverage -----
+
+    def _missing_ranges(
+        self,
+        meta: Dict,
+        start: date,
+        end: date,
+        now: float,
+        tail_refresh_sec: Optional[int] = None,
+    ) -> List[Tuple[date, date, bool]]:
+        """Return ``(from, to, is_tail)`` ranges that still need fetching."""
+        if not meta:
+            return [(start, end, True)]
+        cov_start = _to_date(meta["start"])
+        cov_end = _to_date(meta["end"])
+        checked_at = float(meta.get("checked_at") or 0.0)
+        refresh = self.tail_refresh_sec if tail_refresh_sec is None else tail_refresh_sec
+
+        gaps: List[Tuple[date, date, bool]] = []
+        if start < cov_start:
+            gaps.append((start, cov_start - timedelta(days=1), False))
+
+        final_through = min(cov_end, self._provisional_day(meta) - timedelta(days=1))
+        stale = now - checked_at > refresh
+        if end > cov_end:
+            tail_from = final_through + timedelta(days=1) if stale else cov_end + timedelta(days=1)
+            gaps.append((tail_from, end, True))
+        elif end > final_through and stale:
+            gaps.append((final_through + timedelta(days=1), end, True))
+        return gaps
+
+    @staticmethod
+    def _provisional_day(meta: Dict) -> date:
+        """First day whose bars are provisional: the last tail-check day, or the first day it returned nothing for"""
+        checked_at = float(meta.get("checked_at") or 0.0)
+        day = datetime.fromtimestamp(checked_at).date() if checked_at else _EPOCH
+        if meta.get("provisional_from"):
+            day = min(day, _to_date(meta["provisional_from"]))
+        return day
+
+    @staticmethod
+    def _fetch_from(meta: Dict, gap_from: date, is_tail: bool) -> date:
+        """Start of the upstream request for a gap (tail gaps overlap the stored bars for the basis check)."""
+        if is_tail and meta and _to_date(meta["start"]) < gap_from:
+            return max(_to_date(meta["start"]), gap_from - timedelta(days=ADJUST_CHECK_DAYS))
+        return gap_from
+
+    @staticmethod
+    def _basis_changed(block: np.ndarray, fresh: np.ndarray, lo: int) -> bool:
+        """True when re-fetched closes of final days before ``lo`` differ from the stored ones (new adjustment basis)."""
+        old = block[:, block[0] < lo]
+        new = fresh[:, fresh[0] < lo]
+        _, i, j = np.intersect1d(old[0], new[0], assume_unique=True, return_indices=True)
+        a, b = old[4, i], new[4, j]
+        ok = ~(np.isnan(a) | np.isnan(b))
+        return bool(ok.any() and not np.allclose(a[ok], b[ok], rtol=ADJUST_RTOL, atol=0.0))
+
+    # ----- public API -----
+
+    def get(
+        self,
+        ticker: str,
+        start: str,
+        end: str,
+        fetcher: Optional[Fetcher] = None,
+        tail_refresh_sec: Optional[int] = None,
+        prefetched: Optional[Dict[Tuple[date, date], pd.DataFrame]] = None,
+    ) -> pd.DataFrame:
+        """Return daily OHLCV in ``[start, end]`` (inclusive), fetching only uncovered ranges.
+
+        Returns a DataFrame with a ``Date`` column followed by
+        ``Open/High/Low/Close/Volume`` — the same shape ``get_prices``
+        has always returned. ``tail_refresh_sec`` overrides how old the
+        provisional last bars may be (e.g. ``TTL.REALTIME`` for P&L).
+        """
+        start_d = _to_date(start)
+        end_d = min(_to_date(end), date.today())
+        self._stats["reads"] += 1
+
+        if fetcher is not None and start_d <= end_d:
+            block = self._load_block(ticker)
+            meta = self._load_meta(ticker, block)
+            if self._missing_ranges(meta, start_d, end_d, time.time(), tail_refresh_sec):
+                with self._lock(ticker):
+                    self._fill(ticker, start_d, end_d, fetcher, tail_refresh_sec, prefetched or {})
+
+        return self._slice(self._load_block(ticker), start_d, end_d)
+
+    def get_many(
+        self,
+        tickers: List[str],
+        start: str,
+        end: str,
+        fetcher: Fetcher,
+        bulk_fetcher: Optional[BulkFetcher] = None,
+        tail_refresh_sec: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """``get`` for many tickers, grouping identical missing ranges into one bulk upstream call.
+
+        Tickers the bulk call returned nothing for fall back to the
+        per-ticker ``fetcher`` so a single bad symbol can't blank out
+        the rest of the batch.
+        """
+        start_d = _to_date(start)
+        end_d = min(_to_date(end), date.today())
+        prefetched: Dict[str, Dict[Tuple[date, date], pd.DataFrame]] = {}
+
+        if bulk_fetcher is not None and start_d <= end_d:
+            now = time.time()
+            groups: Dict[Tuple[date, date], List[str]] = {}
+            for t in tickers:
+                meta = self._load_meta(t, self._load_block(t))
+                for gap_from, gap_to, is_tail in self._missing_ranges(meta, start_d, end_d, now, tail_refresh_sec):
+                    if gap_from <= gap_to and np.busday_count(gap_from, gap_to + timedelta(days=1)) > 0:
+                        groups.setdefault((self._fetch_from(meta, gap_from, is_tail), gap_to), []).append(t)
+
+            for (gap_from, gap_to), group in groups.items():
+                if len(group) < 2:
+                    continue
+                self._stats["bulk_fetches"] += 1
+                try:
+                    frames = bulk_fetcher(group, gap_from.isoformat(), gap_to.isoformat())
+                except Exception as e:  # noqa: BLE001
+                    logger.warning("Price store bulk fetch failed [%s..%s] (%d tickers): %s",
+                                   gap_from, gap_to, len(group), e)
+                    continue
+                for t in group:
+                    frame = frames.get(t)
+                    if frame is not None and not frame.empty:
+                        prefetched.setdefault(t, {})[(gap_from, gap_to)] = frame
+
+        return {
+            t: self.get(t, start, end, fetcher, tail_refresh_sec, prefetched.get(t))
+            for t in tickers
+        }
+
+    def _fill(
+        self,
+        ticker: str,
+        start: date,
+        end: date,
+        fetcher: Fetcher,
+        tail_refresh_sec: Optional[int],
+        prefetched: Dict[Tuple[date, date], pd.DataFrame],
+    ) -> None:
+        block = np.array(self._load_block(ticker))
+        meta = dict(self._load_meta(ticker, block))
+        now = time.time()
+        gaps = self._missing_ranges(meta, start, end, now, tail_refresh_sec)
+        if not gaps:
+            return  # 다른 스레드가 먼저 채움
+
+        today = datetime.fromtimestamp(now).date()
+        final_lo = (self._provisional_day(meta) - _EPOCH).days if meta else 0
+        rebase = False
+        for gap_from, gap_to, is_tail in gaps:
+            if gap_from > gap_to:
+                continue
+            # 영업일이 하나도 없는 구간(주말 등)은 조회 없이 커버 처리
+            if np.busday_count(gap_from, gap_to + timedelta(days=1)) > 0:
+                fetch_from = self._fetch_from(meta, gap_from, is_tail)
+                frame = prefetched.get((fetch_from, gap_to))
+                try:
+                    if frame is None:
+                        self._stats["upstream_fetches"] += 1
+                        frame = fetcher(ticker, fetch_from.isoformat(), gap_to.isoformat())
+                    fresh = _frame_to_block(frame)
+                except Exception as e:  # noqa: BLE001
+                    self._stats["upstream_failures"] += 1
+                    logger.warning("Price store fetch failed for %s [%s..%s]: %s", ticker, gap_from, gap_to, e)
+                    continue
+                lo = (gap_from - _EPOCH).days
+                hi = (gap_to - _EPOCH).days
+                if fetch_from < gap_from and self._basis_changed(block, fresh, min(lo, final_lo)):
+                    rebase = True   # 분할/배당으로 수정주가 기준이 바뀜 → 아래에서 전체 구간 재조회
+                fresh = fresh[:, (fresh[0] >= lo) & (fresh[0] <= hi)]
+                kept = block[:, (block[0] < lo) | (block[0] > hi)]
+                block = np.concatenate([kept, fresh], axis=1)
+                block = block[:, np.argsort(block[0], kind="stable")]
+                self._stats["bars_appended"] += fresh.shape[1]
+                if is_tail:
+                    # 마지막 봉 다음 날부터는 임시 (휴장일 / 아직 없는 봉 / throttle 빈 응답) → 다음 갱신 때 재조회
+                    last = _EPOCH + timedelta(days=int(fresh[0, -1])) if fresh.shape[1] else gap_from - timedelta(days=1)
+                    meta["provisional_from"] = min(today, last + timedelta(days=1)).isoformat()
+
+            if meta.get("start"):
+                meta["start"] = min(_to_date(meta["start"]), gap_from).isoformat()
+                meta["end"] = max(_to_date(meta["end"]), gap_to).isoformat()
+            else:
+                meta.update(start=gap_from.isoformat(), end=gap_to.isoformat())
+            if is_tail:
+                meta["checked_at"] = now
+            meta.setdefault("checked_at", 0.0)
+
+        if rebase:
+            # 새 기준으로 전체를 다시 받아 교체 (실패 시 기준이 섞인 시계열은 저장하지 않고 다음 조회에서 재시도)
+            self._rebase(ticker, fetcher, meta)
+        elif meta:
+            self._write(ticker, block, meta)
+
+    def _rebase(self, ticker: str, fetcher: Fetcher, meta: Dict) -> bool:
+        """커버리지 전체를 새 수정주가 기준으로 다시 받아 교체 (성공 여부)"""
+        self._stats["upstream_fetches"] += 1
+        try:
+            fresh = _frame_to_block(fetcher(ticker, meta["start"], meta["end"]))
+        except Exception as e:  # noqa: BLE001
+            self._stats["upstream_failures"] += 1
+            logger.warning("Price store rebase failed for %s: %s", ticker, e)
+            return False
+        if fresh.shape[1] == 0:
+            return False
+        self._stats["rebased"] += 1
+        logger.info("Price store: adjustment basis changed for %s, reloaded %d bars", ticker, fresh.shape[1])
+        self._write(ticker, fresh, meta)
+        return True
+
+    @staticmethod
+    def _slice(block: np.ndarray, start: date, end: date) -> pd.DataFrame:
+        if block.shape[1] == 0:
+            return pd.DataFrame()
+        lo = (start - _EPOCH).days
+        hi = (end - _EPOCH).days
+        i = int(np.searchsorted(block[0], lo, side="left"))
+        j = int(np.searchsorted(block[0], hi, side="right"))
+        part = np.array(block[:, i:j])
+        if part.shape[1] == 0:
+            return pd.DataFrame()
+        out = {"Date": pd.Timestamp(_EPOCH) + pd.to_timedelta(part[0], unit="D")}
+        for k, col in enumerate(COLUMNS, start=1):
+            out[col] = part[k]
+        return pd.DataFrame(out)
+
+    def coverage(self, ticker: str) -> Dict:
+        """저장된 커버리지 및 bar 수 조회"""
+        block = self._load_block(ticker)
+        meta = self._load_meta(ticker, block)
+        return {"ticker": ticker, "bars": int(block.shape[1]), **meta}
+
+    def invalidate(self, ticker: str) -> bool:
+        """티커 저장분 삭제 (다음 조회 시 전체 재다운로드)"""
+        removed = False
+        with self._lock(ticker):
+            for path in (self._data_path(ticker), self._meta_path(ticker)):
+                if os.path.exists(path):
+                    os.remove(path)
+                    removed = True
+        return removed
+
+    def stats(self) -> Dict:
+        """저장소 통계"""
+        files = [f for f in os.listdir(self.root) if f.endswith(".npy")]
+        size = sum(os.path.getsize(os.path.join(self.root, f)) for f in files)
+        return {
+            "directory": self.root,
+            "tickers": len(files),
+            "size_mb": round(size / (1024 * 1024), 2),
+            **self._stats,
+        }
+
+
+# 싱글톤 인스턴스
+_price_store: Optional[PriceStore] = None
+
+
+def get_price_store() -> PriceStore:
+    """가격 저장소 싱글톤 인스턴스 반환"""
+    global _price_store
+    if _price_store is None:
+        _price_store = PriceStore()
+    return _price_store
@@ -7,13 +7,17 @@ Features:
 - Z-score 정규화 + 윈저화 (이상치 처리)
 - 시장 상황(강세/약세) 반영 가중치 조정
 - 섹터 내 상대 비교 옵션
+- NumPy 팩터 행렬(종목 × 팩터) 기반 벡터화 정규화/스코어링 (rank_matrix)
+- 야간 팩터 스냅샷(factor_snapshot)에 있는 종목은 원시 팩터를 스냅샷에서 읽음 (asof 조회)
+- 시장 상황/변동성은 market_context 의 벤치마크 종가를 공유 (시간 버킷당 1회 조회)
 """
 from __future__ import annotations
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Sequence
 from dataclasses import dataclass
 import logging
 import numpy as np
 from mcp_server.tools.yf_utils import normalize_yf_columns
+from mcp_server.tools.price_panel import PricePanel, volatility_from_close
 
 logger = logging.getLogger(__name__)
 
@@ -227,7 +231,97 @@ def zscore_normalize_by_group(
     return result
 
 
+# ===== 벡터화 팩터 행렬 =====
+FACTORS: Tuple[str, ...] = ("growth", "profitability", "valuation", "quality", "momentum", "volatility")
+# 팩터별 방향 (valuation, volatility 는 낮을수록 좋음)
+HIGHER_IS_BETTER = np.array([True, True, False, True, True, False])
+
+
+def zscore_normalize_matrix(
+    values: np.ndarray,
+    winsorize_percentile: float = 0.05,
+    higher_is_better: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """열(팩터) 단위 Z-score 정규화 + 윈저화 (zscore_normalize 의 벡터화 버전)
+
+    Args:
+        values: (종목 수, 팩터 수) 원시 값 행렬, 결측은 NaN
+        winsorize_percentile: 윈저화 백분위 (양쪽 끝 제거)
+        higher_is_better: 팩터별 방향 (기본: 모두 True)
+
+    Returns:
+        0~1 범위로 정규화된 점수 행렬 (결측/분산 0 팩터는 0.5)
+    """
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    n, k = x.shape
+    out = np.full((n, k), 0.5)
+    if n == 0:
+        return out
+
+    valid = ~np.isnan(x)
+    usable = valid.sum(axis=0) >= 2
+    if not usable.any():
+        return out
+
+    xs = x[:, usable]
+    with np.errstate(invalid="ignore"):
+        lower = np.nanpercentile(xs, winsorize_percentile * 100, axis=0)
+        upper = np.nanpercentile(xs, (1 - winsorize_percentile) * 100, axis=0)
+        clipped = np.clip(xs, lower, upper)
+        mean = np.nanmean(clipped, axis=0)
+        std = np.nanstd(clipped, axis=0)
+
+    spread = std >= 1e-10
+    z = (clipped - mean) / np.where(spread, std, 1.0)
+    # 표준정규분포 -3 ~ +3 범위를 0~1로 매핑
+    scores = np.clip((z + 3) / 6, 0.0, 1.0)
+    if higher_is_better is not None:
+        hib = np.broadcast_to(np.asarray(higher_is_better, dtype=bool), (k,))[usable]
+        scores = np.where(hib, scores, 1.0 - scores)
+    scores = np.where(valid[:, usable] & spread, np.round(scores, 4), 0.5)
+
+    out[:, usable] = scores
+    return out
+
+
+def zscore_normalize_matrix_by_group(
+    values: np.ndarray,
+    groups: Sequence[Optional[str]],
+    winsorize_percentile: float = 0.05,
+    higher_is_better: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """그룹(섹터)별 행렬 Z-score 정규화 - 그룹당 한 번의 벡터 연산"""
+    x = np.asarray(values, dtype=float)
+    if x.ndim == 1:
+        x = x[:, None]
+    out = np.full(x.shape, 0.5)
+    labels = np.array([g or "Unknown" for g in groups], dtype=object)
+    if len(labels) == 0:
+        return out
+    _, inverse = np.unique(labels.astype(str), return_inverse=True)
+    for gid in range(inverse.max() + 1):
+        rows = np.flatnonzero(inverse == gid)
+        out[rows] = zscore_normalize_matrix(x[rows], winsorize_percentile, higher_is_better)
+    return out
+
+
 # ===== 시장 상황 감지 =====
+def _benchmark_close(benchmark: str, period: str):
+    """벤치마크 일봉 종가 - 시장 컨텍스트(시간 버킷당 1회 조회)에 있으면 공유, 없으면 직접 조회"""
+    from mcp_server.tools.market_context import get_market_context
+
+    close = get_market_context().close(benchmark)
+    if close is not None:
+        return close
+    import yfinance as yf
+    hist = normalize_yf_columns(
+        yf.download(benchmark, period=period, interval="1d", progress=False, auto_adjust=True)
+    )
+    return None if hist.empty else hist["Close"].dropna()
+
+
 def detect_market_condition(benchmark: str = "SPY", lookback_days: int = 60) -> str:
     """시장 상황 감지 (강세/약세/횡보)
 
@@ -237,15 +331,11 @@ def detect_market_condition(benchmark: str = "SPY", lookback_days: int = 60) ->
     - 그 외: 횡보장
     """
     try:
-        import yfinance as yf
-
-        hist = normalize_yf_columns(
-            yf.download(benchmark, period="6mo", interval="1d", progress=False, auto_adjust=True)
-        )
-        if hist.empty or len(hist) < lookback_days:
+        close = _benchmark_close(benchmark, "6mo")
+        if close is None or len(close) < lookback_days:
             return "neutral"
 
-        close = hist["Close"].tail(lookback_days)
+        close = close.tail(lookback_days)
 
         first_val = float(close.iloc[0])
         last_val = float(close.iloc[-1])
@@ -269,15 +359,11 @@ def detect_market_condition(benchmark: str = "SPY", lookback_days: int = 60) ->
 def get_market_volatility(benchmark: str = "SPY", lookback_days: int = 30) -> float:
     """시장 변동성 계산 (연환산)"""
     try:
-        import yfinance as yf
-
-        hist = normalize_yf_columns(
-            yf.download(benchmark, period="3mo", interval="1d", progress=False, auto_adjust=True)
-        )
-        if hist.empty or len(hist) < lookback_days:
+        close = _benchmark_close(benchmark, "3mo")
+        if close is None or len(close) < lookback_days:
             return 0.2  # 기본값 20%
 
-        returns = hist["Close"].pct_change().dropna().tail(lookback_days)
+        returns = close.pct_change().dropna().tail(lookback_days)
         daily_vol = returns.std()
         annual_vol = daily_vol * np.sqrt(252)
 
@@ -301,14 +387,40 @@ class FactorScores:
     raw_metrics: Dict
 
 
+@dataclass
+class FactorMatrix:
+    """종목 × 팩터 원시 값 행렬 (결측은 NaN)"""
+    tickers: List[str]
+    sectors: List[Optional[str]]
+    values: np.ndarray
+    raw_metrics: Optional[List[Dict]] = None
+
+    @classmethod
+    def from_factors(cls, factors: Sequence[FactorScores]) -> "FactorMatrix":
+        values = np.array(
+            [[np.nan if getattr(f, name) is None else getattr(f, name) for name in FACTORS] for f in factors],
+            dtype=float,
+        ).reshape(len(factors), len(FACTORS))
+        return cls(
+            tickers=[f.ticker for f in factors],
+            sectors=[f.sector for f in factors],
+            values=values,
+            raw_metrics=[f.raw_metrics for f in factors],
+        )
+
+
 def calculate_factors(
     ticker: str,
     fundamentals: Dict,
     momentum_data: Dict,
     event_score: float = 0.5,
+    panel: Optional["PricePanel"] = None,
 ) -> FactorScores:
     """개별 종목의 6개 팩터 원시 값 계산
 
+    Args:
+        panel: 요청 단위 가격 패널 (주어지면 변동성을 패널 종가에서 계산)
+
     Returns:
         FactorScores: 정규화 전 원시 팩터 값
     """
@@ -368,7 +480,7 @@ def calculate_factors(
     momentum_value = mom1 * 0.4 + mom3 * 0.3 + mom6 * 0.2 + mom12 * 0.1
 
     # Volatility 팩터 (낮을수록 좋음)
-    volatility_value = _calculate_volatility(ticker)
+    volatility_value = panel.volatility(ticker) if panel is not None else _calculate_volatility(ticker)
 
     return FactorScores(
         ticker=ticker,
@@ -400,21 +512,14 @@ def calculate_factors(
 
 
 def _calculate_volatility(ticker: str, lookback_days: int = 60) -> Optional[float]:
-    """개별 종목 변동성 계산"""
+    """개별 종목 변동성 계산 (로컬 가격 저장소 기반)"""
     try:
-        import yfinance as yf
+        from .market_data import get_price_history
 
-        hist = normalize_yf_columns(
-            yf.download(ticker, period="6mo", interval="1d", progress=False, auto_adjust=True)
-        )
-        if hist.empty or len(hist) < lookback_days:
+        hist = get_price_history(ticker, period="6mo")
+        if hist.empty:
             return None
-
-        returns = hist["Close"].pct_change().dropna().tail(lookback_days)
-        daily_vol = returns.std()
-        annual_vol = daily_vol * np.sqrt(252)
-
-        return float(annual_vol)
+        return volatility_from_close(hist["Close"], lookback_days)
     except Exception:
         return None
 
@@ -437,14 +542,21 @@ class AdvancedRankingEngine:
     def __init__(self):
         self.market_condition: str = "neutral"
         self.market_volatility: float = 0.2
+        # 마지막 랭킹 요청의 가격 패널 계측 (업스트림 호출 절약 수 등)
+        self.last_panel_stats: Dict = {}
+        # 마지막 랭킹 요청의 팩터 스냅샷 사용 현황 (asof, 스냅샷 적중/실시간 계산 종목 수)
+        self.last_snapshot_stats: Dict = {}
 
     def detect_market(self) -> Dict:
-        """시장 상황 감지 및 저장"""
+        """시장 상황 감지 및 저장 (VIX/breadth/섹터 ETF 등락은 같은 시장 컨텍스트에서)"""
+        from mcp_server.tools.market_context import get_market_context
+
         self.market_condition = detect_market_condition()
         self.market_volatility = get_market_volatility()
         return {
             "condition": self.market_condition,
-            "volatility": round(self.market_volatility, 4)
+            "volatility": round(self.market_volatility, 4),
+            "market_context": get_market_context().summary()
         }
 
     def get_weights(
@@ -474,23 +586,98 @@ class AdvancedRankingEngine:
 
         return weights
 
-    def rank_sync(
+    def weight_matrix(
         self,
-        tickers: List[str],
+        sectors: Sequence[Optional[str]],
+        use_sector_weights: bool = True,
+        use_market_adjustment: bool = True,
+    ) -> np.ndarray:
+        """종목별 가중치 행렬 (섹터당 한 번만 get_weights 계산)"""
+        rows: Dict[Optional[str], np.ndarray] = {}
+        for sector in set(sectors):
+            w = self.get_weights(sector, use_sector_weights=use_sector_weights, use_market_adjustment=use_market_adjustment)
+            rows[sector] = np.array([w.get(name, DEFAULT_WEIGHTS[name]) for name in FACTORS])
+        if not len(sectors):
+            return np.empty((0, len(FACTORS)))
+        return np.vstack([rows[s] for s in sectors])
+
+    def rank_matrix(
+        self,
+        matrix: FactorMatrix,
         use_sector_weights: bool = True,
         use_market_adjustment: bool = True,
         sector_neutral: bool = False,
+        dip_bonus: Optional[Sequence[float]] = None,
         dip_weight: float = 0.12,
-        use_dip_bonus: bool = True,
-    ) -> List[Dict]:
-        """동기 버전 랭킹"""
-        from .market_data import get_fundamentals_snapshot, get_momentum_metrics
+        winsorize_percentile: float = 0.05,
+    ) -> Dict[str, np.ndarray]:
+        """팩터 행렬 한 번에 정규화 + 가중 스코어링 (동기/비동기 공용, I/O 없음)
+
+        Returns:
+            {"scores": (n, 6) 팩터 점수, "weights": (n, 6) 적용 가중치,
+             "base": 기본 점수, "dip": 딥 보너스, "final": 최종 점수}
+        """
+        if sector_neutral:
+            scores = zscore_normalize_matrix_by_group(
+                matrix.values, matrix.sectors, winsorize_percentile, HIGHER_IS_BETTER
+            )
+        else:
+            scores = zscore_normalize_matrix(matrix.values, winsorize_percentile, HIGHER_IS_BETTER)
+
+        weights = self.weight_matrix(matrix.sectors, use_sector_weights, use_market_adjustment)
+        base = (scores * weights).sum(axis=1)
+        if dip_bonus is None:
+            dip = np.zeros(len(matrix.tickers))
+        else:
+            dip = dip_weight * np.asarray(dip_bonus, dtype=float)
+        return {
+            "scores": scores,
+            "weights": weights,
+            "base": base,
+            "dip": dip,
+            "final": base + dip,
+        }
+
+    def _to_results(self, matrix: FactorMatrix, ranked: Dict[str, np.ndarray]) -> List[Dict]:
+        """rank_matrix 결과를 종목별 dict 리스트로 변환 (점수 내림차순)"""
+        scores = np.round(ranked["scores"], 4).tolist()
+        weights = ranked["weights"].tolist()
+        final = ranked["final"].tolist()
+        base = ranked["base"].tolist()
+        dip = ranked["dip"].tolist()
+        raw_metrics = matrix.raw_metrics or [{}] * len(matrix.tickers)
+
+        results = []
+        for i, ticker in enumerate(matrix.tickers):
+            results.append({
+                "ticker": ticker,
+                "sector": matrix.sectors[i],
+                "score": round(final[i], 4),
+                "base_score": round(base[i], 4),
+                "dip_bonus": round(dip[i], 4),
+                # 팩터 점수
+                **dict(zip(FACTORS, scores[i])),
+                # 적용된 가중치
+                "weights_applied": dict(zip(FACTORS, weights[i])),
+                # 원시 메트릭
+                **raw_metrics[i],
+            })
+
+        # 점수 내림차순 정렬
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results
+
+    def collect_factors(self, tickers: List[str]) -> Tuple[List[FactorScores], List[float]]:
+        """종목별 원시 팩터 + 딥 보너스 수집 (rank_sync 와 팩터 스냅샷 빌드 공용)"""
+        from .market_data import get_fundamentals_snapshot
         from .filings import keyword_event_score
-        from .analytics import compute_dip_bonus_by_prices
+
+        # 요청 단위 가격 패널 - 종목당 한 번 조회, 모멘텀/변동성/딥 계산이 공유
+        panel = PricePanel(period="1y").load(tickers)
 
         # 데이터 수집
         fundamentals = [get_fundamentals_snapshot(t) for t in tickers]
-        momentum = [get_momentum_metrics(t) for t in tickers]
+        momentum = [panel.momentum(t) for t in tickers]
 
         try:
             event_scores = [keyword_event_score(t) for t in tickers]
@@ -499,83 +686,83 @@ class AdvancedRankingEngine:
 
         # 팩터 계산
         factors = [
-            calculate_factors(t, f, m, e)
+            calculate_factors(t, f, m, e, panel=panel)
             for t, f, m, e in zip(tickers, fundamentals, momentum, event_scores)
         ]
 
-        # 팩터 값 추출
-        sectors = [f.sector for f in factors]
-        growth_raw = [f.growth for f in factors]
-        prof_raw = [f.profitability for f in factors]
-        val_raw = [f.valuation for f in factors]
-        qual_raw = [f.quality for f in factors]
-        mom_raw = [f.momentum for f in factors]
-        vol_raw = [f.volatility for f in factors]
-
-        # Z-score 정규화
-        if sector_neutral:
-            growth_scores = zscore_normalize_by_group(growth_raw, sectors, higher_is_better=True)
-            prof_scores = zscore_normalize_by_group(prof_raw, sectors, higher_is_better=True)
-            val_scores = zscore_normalize_by_group(val_raw, sectors, higher_is_better=False)
-            qual_scores = zscore_normalize_by_group(qual_raw, sectors, higher_is_better=True)
-            mom_scores = zscore_normalize_by_group(mom_raw, sectors, higher_is_better=True)
-            vol_scores = zscore_normalize_by_group(vol_raw, sectors, higher_is_better=False)
-        else:
-            growth_scores = zscore_normalize(growth_raw, higher_is_better=True)
-            prof_scores = zscore_normalize(prof_raw, higher_is_better=True)
-            val_scores = zscore_normalize(val_raw, higher_is_better=False)
-            qual_scores = zscore_normalize(qual_raw, higher_is_better=True)
-            mom_scores = zscore_normalize(mom_raw, higher_is_better=True)
-            vol_scores = zscore_normalize(vol_raw, higher_is_better=False)
-
-        # 최종 점수 계산
-        results = []
-        for i, ticker in enumerate(tickers):
-            weights = self.get_weights(
-                sectors[i],
-                use_sector_weights=use_sector_weights,
-                use_market_adjustment=use_market_adjustment
-            )
-
-            base_score = (
-                growth_scores[i] * weights.get("growth", 0.22) +
-                prof_scores[i] * weights.get("profitability", 0.22) +
-                val_scores[i] * weights.get("valuation", 0.20) +
-                qual_scores[i] * weights.get("quality", 0.18) +
-                mom_scores[i] * weights.get("momentum", 0.12) +
-                vol_scores[i] * weights.get("volatility", 0.06)
-            )
-
-            # Dip 보너스
-            dip_bonus = 0.0
-            if use_dip_bonus:
-                dip_bonus = dip_weight * compute_dip_bonus_by_prices(ticker)
-
-            final_score = base_score + dip_bonus
-
-            results.append({
-                "ticker": ticker,
-                "sector": sectors[i],
-                "score": round(final_score, 4),
-                "base_score": round(base_score, 4),
-                "dip_bonus": round(dip_bonus, 4),
-                # 팩터 점수
-                "growth": round(growth_scores[i], 4),
-                "profitability": round(prof_scores[i], 4),
-                "valuation": round(val_scores[i], 4),
-                "quality": round(qual_scores[i], 4),
-                "momentum": round(mom_scores[i], 4),
-                "volatility": round(vol_scores[i], 4),
-                # 적용된 가중치
-                "weights_applied": weights,
-                # 원시 메트릭
-                **factors[i].raw_metrics,
-            })
+        # 딥 보너스
+        dip_bonuses = [panel.dip_bonus(t) for t in tickers]
+        self.last_panel_stats = panel.stats()
+        logger.debug(f"collect_factors price panel: {self.last_panel_stats}")
+        return factors, dip_bonuses
+
+    def _from_snapshot(self, tickers: List[str], asof: Optional[str], use_snapshot: bool) -> Dict[str, Tuple[FactorScores, float]]:
+        """팩터 스냅샷에서 찾은 종목의 (원시 팩터, 딥 보너스) - 없는 종목은 호출자가 실시간 계산"""
+        if not use_snapshot:
+            self.last_snapshot_stats = {}
+            return {}
+        from .factor_snapshot import get_factor_snapshot
+
+        snapshot = get_factor_snapshot(asof)
+        rows = snapshot.ranking_factors(tickers) if snapshot is not None else {}
+        self.last_snapshot_stats = {
+            "asof": snapshot.asof if snapshot is not None else None,
+            "hits": len(rows),
+            "live": len(set(tickers)) - len(rows),
+        }
+        return rows
 
-        # 점수 내림차순 정렬
-        results.sort(key=lambda x: x["score"], reverse=True)
+    def _rank_collected(
+        self,
+        tickers: List[str],
+        cached: Dict[str, Tuple[FactorScores, float]],
+        live: Dict[str, Tuple[FactorScores, float]],
+        use_sector_weights: bool,
+        use_market_adjustment: bool,
+        sector_neutral: bool,
+        dip_weight: float,
+        use_dip_bonus: bool,
+    ) -> List[Dict]:
+        """스냅샷 + 실시간 팩터를 요청 순서로 합쳐 스코어링 (정규화는 요청 종목 단면 기준)"""
+        rows = [cached[t] if t in cached else live[t] for t in tickers]
+        matrix = FactorMatrix.from_factors([f for f, _ in rows])
+        ranked = self.rank_matrix(
+            matrix,
+            use_sector_weights=use_sector_weights,
+            use_market_adjustment=use_market_adjustment,
+            sector_neutral=sector_neutral,
+            dip_bonus=[d for _, d in rows] if use_dip_bonus else None,
+            dip_weight=dip_weight,
+        )
+        return self._to_results(matrix, ranked)
 
-        return results
+    def rank_sync(
+        self,
+        tickers: List[str],
+        use_sector_weights: bool = True,
+        use_market_adjustment: bool = True,
+        sector_neutral: bool = False,
+        dip_weight: float = 0.12,
+        use_dip_bonus: bool = True,
+        asof: Optional[str] = None,
+        use_snapshot: bool = True,
+    ) -> List[Dict]:
+        """동기 버전 랭킹
+
+        Args:
+            asof: 이 날짜(YYYY-MM-DD) 이전 가장 최근 팩터 스냅샷 사용 (None 이면 최신 스냅샷)
+            use_snapshot: False 면 스냅샷 없이 전 종목 실시간 계산
+        """
+        cached = self._from_snapshot(tickers, asof, use_snapshot)
+        missing = [t for t in dict.fromkeys(tickers) if t not in cached]
+        live: Dict[str, Tuple[FactorScores, float]] = {}
+        if missing:
+            factors, dips = self.collect_factors(missing)
+            live = {f.ticker: (f, d) for f, d in zip(factors, dips)}
+        return self._rank_collected(
+            tickers, cached, live, use_sector_weights, use_market_adjustment,
+            sector_neutral, dip_weight, use_dip_bonus,
+        )
 
     async def rank_async(
         self,
@@ -586,19 +773,32 @@ class AdvancedRankingEngine:
         dip_weight: float = 0.12,
         use_dip_bonus: bool = True,
         max_concurrent: int = 5,
+        asof: Optional[str] = None,
+        use_snapshot: bool = True,
     ) -> List[Dict]:
-        """비동기 버전 랭킹 (병렬 데이터 수집)"""
+        """비동기 버전 랭킹 (스냅샷에 없는 종목만 병렬 데이터 수집)"""
         import asyncio
-        from .async_utils import parallel_map
-        from .market_data import get_fundamentals_snapshot, get_momentum_metrics
+        from .async_utils import parallel_map, make_async
+        from .market_data import get_fundamentals_snapshot
         from .filings import keyword_event_score
-        from .analytics import compute_dip_bonus_by_prices
 
-        # 병렬 데이터 수집
-        fundamentals, momentum = await asyncio.gather(
+        cached = await make_async(self._from_snapshot)(tickers, asof, use_snapshot)
+        requested = tickers
+        tickers = [t for t in dict.fromkeys(requested) if t not in cached]
+        if not tickers:
+            return self._rank_collected(
+                requested, cached, {}, use_sector_weights, use_market_adjustment,
+                sector_neutral, dip_weight, use_dip_bonus,
+            )
+
+        # 요청 단위 가격 패널 (한 번의 그룹 요청) + 펀더멘털 병렬 수집
+        panel = PricePanel(period="1y")
+        fundamentals, _ = await asyncio.gather(
             parallel_map(get_fundamentals_snapshot, tickers, max_concurrent),
-            parallel_map(get_momentum_metrics, tickers, max_concurrent),
+            make_async(panel.load)(tickers),
         )
+        # 패널 히트는 즉시 계산, 저장소에 없는 종목만 기존 경로로 폴백
+        momentum = await parallel_map(panel.momentum, tickers, max_concurrent)
 
         try:
             event_scores = await parallel_map(keyword_event_score, tickers, max_concurrent=3)
@@ -607,85 +807,20 @@ class AdvancedRankingEngine:
 
         # 팩터 계산
         factors = [
-            calculate_factors(t, f, m, e)
+            calculate_factors(t, f, m, e, panel=panel)
             for t, f, m, e in zip(tickers, fundamentals, momentum, event_scores)
         ]
 
-        # 팩터 값 추출
-        sectors = [f.sector for f in factors]
-        growth_raw = [f.growth for f in factors]
-        prof_raw = [f.profitability for f in factors]
-        val_raw = [f.valuation for f in factors]
-        qual_raw = [f.quality for f in factors]
-        mom_raw = [f.momentum for f in factors]
-        vol_raw = [f.volatility for f in factors]
+        # Dip 보너스 (패널 종가에서 계산 - 추가 조회 없음)
+        dip_bonuses = [panel.dip_bonus(t) for t in tickers]
+        self.last_panel_stats = panel.stats()
+        logger.debug(f"rank_async price panel: {self.last_panel_stats}")
 
-        # Z-score 정규화
-        if sector_neutral:
-            growth_scores = zscore_normalize_by_group(growth_raw, sectors, higher_is_better=True)
-            prof_scores = zscore_normalize_by_group(prof_raw, sectors, higher_is_better=True)
-            val_scores = zscore_normalize_by_group(val_raw, sectors, higher_is_better=False)
-            qual_scores = zscore_normalize_by_group(qual_raw, sectors, higher_is_better=True)
-            mom_scores = zscore_normalize_by_group(mom_raw, sectors, higher_is_better=True)
-            vol_scores = zscore_normalize_by_group(vol_raw, sectors, higher_is_better=False)
-        else:
-            growth_scores = zscore_normalize(growth_raw, higher_is_better=True)
-            prof_scores = zscore_normalize(prof_raw, higher_is_better=True)
-            val_scores = zscore_normalize(val_raw, higher_is_better=False)
-            qual_scores = zscore_normalize(qual_raw, higher_is_better=True)
-            mom_scores = zscore_normalize(mom_raw, higher_is_better=True)
-            vol_scores = zscore_normalize(vol_raw, higher_is_better=False)
-
-        # Dip 보너스 병렬 계산
-        if use_dip_bonus:
-            dip_bonuses = await parallel_map(compute_dip_bonus_by_prices, tickers, max_concurrent)
-        else:
-            dip_bonuses = [0.0] * len(tickers)
-
-        # 최종 점수 계산
-        results = []
-        for i, ticker in enumerate(tickers):
-            weights = self.get_weights(
-                sectors[i],
-                use_sector_weights=use_sector_weights,
-                use_market_adjustment=use_market_adjustment
-            )
-
-            base_score = (
-                growth_scores[i] * weights.get("growth", 0.22) +
-                prof_scores[i] * weights.get("profitability", 0.22) +
-                val_scores[i] * weights.get("valuation", 0.20) +
-                qual_scores[i] * weights.get("quality", 0.18) +
-                mom_scores[i] * weights.get("momentum", 0.12) +
-                vol_scores[i] * weights.get("volatility", 0.06)
-            )
-
-            dip_bonus = dip_weight * dip_bonuses[i] if use_dip_bonus else 0.0
-            final_score = base_score + dip_bonus
-
-            results.append({
-                "ticker": ticker,
-                "sector": sectors[i],
-                "score": round(final_score, 4),
-                "base_score": round(base_score, 4),
-                "dip_bonus": round(dip_bonus, 4),
-                # 팩터 점수
-                "growth": round(growth_scores[i], 4),
-                "profitability": round(prof_scores[i], 4),
-                "valuation": round(val_scores[i], 4),
-                "quality": round(qual_scores[i], 4),
-                "momentum": round(mom_scores[i], 4),
-                "volatility": round(vol_scores[i], 4),
-                # 적용된 가중치
-                "weights_applied": weights,
-                # 원시 메트릭
-                **factors[i].raw_metrics,
-            })
-
-        # 점수 내림차순 정렬
-        results.sort(key=lambda x: x["score"], reverse=True)
-
-        return results
+        live = {f.ticker: (f, d) for f, d in zip(factors, dip_bonuses)}
+        return self._rank_collected(
+            requested, cached, live, use_sector_weights, use_market_adjustment,
+            sector_neutral, dip_weight, use_dip_bonus,
+        )
 
 
 # ===== 글로벌 인스턴스 =====
@@ -708,6 +843,7 @@ def rank_advanced(
     sector_neutral: bool = False,
     dip_weight: float = 0.12,
     use_dip_bonus: bool = True,
+    asof: Optional[str] = None,
 ) -> List[Dict]:
     """고급 랭킹 (동기 버전)"""
     engine = get_ranking_engine()
@@ -718,6 +854,7 @@ def rank_advanced(
         sector_neutral=sector_neutral,
         dip_weight=dip_weight,
         use_dip_bonus=use_dip_bonus,
+        asof=asof,
     )
 
 
@@ -729,6 +866,7 @@ async def rank_advanced_async(
     dip_weight: float = 0.12,
     use_dip_bonus: bool = True,
     max_concurrent: int = 5,
+    asof: Optional[str] = None,
 ) -> List[Dict]:
     """고급 랭킹 (비동기 버전)"""
     engine = get_ranking_engine()
@@ -740,4 +878,5 @@ async def rank_advanced_async(
         dip_weight=dip_weight,
         use_dip_bonus=use_dip_bonus,
         max_concurrent=max_concurrent,
+        asof=asof,
     )
@@ -5,8 +5,7 @@ import matplotlib
 from mcp_server.config import PRESENT_MPL_STYLE, IMAGE_OUTPUT_DIR
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import yfinance as yf
-from mcp_server.tools.yf_utils import normalize_yf_columns
+from mcp_server.tools.market_data import get_price_history, get_prices_bulk
 
 try:
     plt.style.use(PRESENT_MPL_STYLE)
@@ -50,9 +49,7 @@ def render_price_chart(
     grid_alpha: float = 0.3,
 ) -> str:
     os.makedirs(out_dir, exist_ok=True)
-    hist = normalize_yf_columns(
-        yf.download(ticker, period=f"{days}d", interval="1d", progress=False, auto_adjust=True)
-    )
+    hist = get_price_history(ticker, period=f"{days}d")
     fig, ax = plt.subplots(figsize=figsize)
     if not hist.empty:
         ax.plot(hist.index, hist["Close"], label=ticker, color=color or "#1f77b4")
@@ -83,15 +80,14 @@ def render_multi_price_chart(
     os.makedirs(out_dir, exist_ok=True)
     fig, ax = plt.subplots(figsize=figsize)
     cols = _ensure_colors(len(tickers), colors)
+    closes = get_prices_bulk(tickers, period=f"{days}d")["close"]
     for i, t in enumerate(tickers):
-        hist = normalize_yf_columns(
-            yf.download(t, period=f"{days}d", interval="1d", progress=False, auto_adjust=True)
-        )
         c = cols[i]
-        if not hist.empty:
-            ax.plot(hist.index, hist["Close"], label=t, color=c)
+        if t in closes.columns:
+            close = closes[t].dropna()
+            ax.plot(close.index, close, label=t, color=c)
             if ma_windows:
-                _plot_ma(ax, hist["Close"], ma_windows, c)
+                _plot_ma(ax, close, ma_windows, c)
     ax.set_title(f"{','.join(tickers)} - {days}D Close")
     ax.set_yscale(yscale if yscale in ("linear", "log") else "linear")
     ax.grid(True, alpha=grid_alpha)
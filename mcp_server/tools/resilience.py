@@ -7,12 +7,15 @@ Features:
 - API별 타임아웃 설정
 - 구조화된 로깅
 - 폴백 체인 지원
+- 동기/비동기 함수 모두 지원 (공유 HTTP 연결 풀 http_client 위에서 사용)
 """
 from __future__ import annotations
 from typing import Callable, TypeVar, Optional, Any, List
 from functools import wraps
+import inspect
 import time
 import logging
+import httpx
 import requests
 from tenacity import (
     retry,
@@ -27,6 +30,12 @@ logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+# 재시도 대상 HTTP 예외 (requests 직접 호출 + http_client 의 httpx 호출)
+RETRYABLE_HTTP_ERRORS = (
+    requests.Timeout, requests.ConnectionError, requests.HTTPError,
+    httpx.TimeoutException, httpx.TransportError, httpx.HTTPStatusError,
+)
+
 
 # ===== 타임아웃 설정 =====
 class Timeout:
@@ -131,8 +140,8 @@ class CircuitBreaker:
             self.state = "open"
             logger.warning(f"CircuitBreaker[{self.name}]: closed -> open (threshold reached: {self.failure_count})")
 
-    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
-        """서킷 브레이커를 통해 함수 호출"""
+    def _before_call(self) -> None:
+        """호출 허용 여부 확인 (열림/half-open 한도 초과 시 CircuitOpenError)"""
         self._check_state()
 
         if self.state == "open":
@@ -143,6 +152,9 @@ class CircuitBreaker:
             if self.half_open_calls > self.half_open_max_calls:
                 raise CircuitOpenError(f"Circuit[{self.name}] is half-open. Max calls exceeded.")
 
+    def call(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """서킷 브레이커를 통해 함수 호출"""
+        self._before_call()
         try:
             result = func(*args, **kwargs)
             self._on_success()
@@ -151,8 +163,25 @@ class CircuitBreaker:
             self._on_failure()
             raise
 
+    async def acall(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """서킷 브레이커를 통해 코루틴 함수 호출"""
+        self._before_call()
+        try:
+            result = await func(*args, **kwargs)
+            self._on_success()
+            return result
+        except Exception:
+            self._on_failure()
+            raise
+
     def __call__(self, func: Callable[..., T]) -> Callable[..., T]:
-        """데코레이터로 사용"""
+        """데코레이터로 사용 (코루틴 함수는 acall)"""
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.acall(func, *args, **kwargs)
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             return self.call(func, *args, **kwargs)
@@ -183,10 +212,10 @@ def retry_with_backoff(
     attempts: int = 3,
     min_wait: float = 1,
     max_wait: float = 10,
-    exceptions: tuple = (requests.Timeout, requests.ConnectionError, requests.HTTPError),
+    exceptions: tuple = RETRYABLE_HTTP_ERRORS,
     on_retry: Optional[Callable] = None
 ):
-    """지수 백오프를 사용한 재시도 데코레이터
+    """지수 백오프를 사용한 재시도 데코레이터 (코루틴 함수는 await 사이에 비동기 대기)
 
     Args:
         attempts: 최대 시도 횟수
@@ -201,13 +230,22 @@ def retry_with_backoff(
             return requests.get(url, timeout=10)
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @retry(
+        policy = retry(
             stop=stop_after_attempt(attempts),
             wait=wait_exponential(multiplier=1, min=min_wait, max=max_wait),
             retry=retry_if_exception_type(exceptions),
             before_sleep=before_sleep_log(logger, logging.WARNING),
             reraise=True
         )
+
+        if inspect.iscoroutinefunction(func):
+            @policy
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await func(*args, **kwargs)
+            return async_wrapper
+
+        @policy
         @wraps(func)
         def wrapper(*args, **kwargs) -> T:
             return func(*args, **kwargs)
@@ -304,16 +342,17 @@ class FallbackChain:
         return self.default_value
 
 
-# ===== 안전한 HTTP 요청 =====
+# ===== 안전한 HTTP 요청 (공유 연결 풀) =====
 @retry_with_backoff(attempts=2, min_wait=1, max_wait=5)
 def safe_get(
     url: str,
     timeout: int = Timeout.DEFAULT,
     headers: Optional[dict] = None,
     **kwargs
-) -> requests.Response:
+) -> httpx.Response:
     """안전한 GET 요청 (재시도 + 타임아웃)"""
-    response = requests.get(url, timeout=timeout, headers=headers, **kwargs)
+    from mcp_server.tools.http_client import http_get
+    response = http_get(url, timeout=timeout, headers=headers, **kwargs)
     response.raise_for_status()
     return response
 
@@ -325,9 +364,39 @@ def safe_post(
     headers: Optional[dict] = None,
     json: Optional[dict] = None,
     **kwargs
-) -> requests.Response:
+) -> httpx.Response:
     """안전한 POST 요청 (재시도 + 타임아웃)"""
-    response = requests.post(url, timeout=timeout, headers=headers, json=json, **kwargs)
+    from mcp_server.tools.http_client import http_post
+    response = http_post(url, timeout=timeout, headers=headers, json=json, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+@retry_with_backoff(attempts=2, min_wait=1, max_wait=5)
+async def async_safe_get(
+    url: str,
+    timeout: int = Timeout.DEFAULT,
+    headers: Optional[dict] = None,
+    **kwargs
+) -> httpx.Response:
+    """안전한 비동기 GET 요청 (재시도 + 타임아웃)"""
+    from mcp_server.tools.http_client import async_get
+    response = await async_get(url, timeout=timeout, headers=headers, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+@retry_with_backoff(attempts=2, min_wait=1, max_wait=5)
+async def async_safe_post(
+    url: str,
+    timeout: int = Timeout.DEFAULT,
+    headers: Optional[dict] = None,
+    json: Optional[dict] = None,
+    **kwargs
+) -> httpx.Response:
+    """안전한 비동기 POST 요청 (재시도 + 타임아웃)"""
+    from mcp_server.tools.http_client import async_post
+    response = await async_post(url, timeout=timeout, headers=headers, json=json, **kwargs)
     response.raise_for_status()
     return response
 
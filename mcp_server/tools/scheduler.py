@@ -14,6 +14,7 @@ Features:
 - 포트폴리오 리포트: 금요일 18:00
 - 캐시 정리: 매일 00:00
 - 메트릭 사전 계산: 평일 19:00
+- 팩터 스냅샷 빌드: 평일 19:30 (워치리스트 + 관심 테마 유니버스)
 """
 from __future__ import annotations
 from typing import List, Dict, Optional, Callable, Any
@@ -185,6 +186,15 @@ class PMScheduler:
             replace_existing=True
         )
 
+        # 7. 팩터 스냅샷 빌드 (평일 19:30, 메트릭 사전 계산 이후)
+        self.scheduler.add_job(
+            job_factor_snapshot,
+            CronTrigger(day_of_week='mon-fri', hour=19, minute=30),
+            id='factor_snapshot',
+            name='팩터 스냅샷 빌드',
+            replace_existing=True
+        )
+
     def start(self):
         """스케줄러 시작"""
         if not self.scheduler.running:
@@ -443,17 +453,18 @@ def job_metrics_precompute() -> Dict:
     """메트릭 사전 계산"""
     logger.info("Running job: metrics_precompute")
     try:
-        from mcp_server.tools.collect import compute_basic_metrics
+        from mcp_server.tools.collect import compute_basic_metrics_many
 
         watchlist = _get_watchlist()
 
+        # 메트릭 캐시는 일괄 조회 (신선한 종목은 계산 생략, 없는 종목만 계산)
         results = {"computed": [], "failed": []}
+        metrics = compute_basic_metrics_many(watchlist)
         for ticker in watchlist:
-            try:
-                compute_basic_metrics(ticker)
+            if set(metrics.get(ticker) or {}) - {"ticker"}:
                 results["computed"].append(ticker)
-            except Exception as e:
-                logger.warning(f"Metrics precompute failed for {ticker}: {e}")
+            else:
+                logger.warning(f"Metrics precompute failed for {ticker}")
                 results["failed"].append(ticker)
 
         logger.info(f"Metrics precompute completed: {len(results['computed'])} computed")
@@ -463,6 +474,24 @@ def job_metrics_precompute() -> Dict:
         raise
 
 
+def job_factor_snapshot() -> Dict:
+    """팩터 스냅샷 빌드 (랭킹 요청이 as-of 날짜로 조회하는 전 팩터 테이블)"""
+    logger.info("Running job: factor_snapshot")
+    try:
+        from mcp_server.config import FACTOR_SNAPSHOT_KEEP
+        from mcp_server.tools.factor_snapshot import build_factor_snapshot, get_factor_snapshot_store
+
+        universe = _get_snapshot_universe()
+        summary = build_factor_snapshot(universe)
+        summary["pruned"] = get_factor_snapshot_store().prune(FACTOR_SNAPSHOT_KEEP)
+
+        logger.info(f"Factor snapshot completed: {summary['tickers']} tickers, {len(summary['failed'])} failed")
+        return summary
+    except Exception as e:
+        logger.error(f"Factor snapshot failed: {e}")
+        raise
+
+
 # ===== 헬퍼 함수 =====
 
 def _get_watchlist() -> List[str]:
@@ -491,6 +520,21 @@ def _get_watch_themes() -> List[str]:
         return ["AI", "semiconductor", "renewable energy", "biotech"]
 
 
+def _get_snapshot_universe() -> List[str]:
+    """팩터 스냅샷 대상: 워치리스트 + 관심 테마별 후보 종목 (중복 제거, 순서 유지)"""
+    tickers = list(_get_watchlist())
+    try:
+        from mcp_server.tools.interaction import propose_tickers
+        for theme in _get_watch_themes():
+            try:
+                tickers.extend(propose_tickers(theme))
+            except Exception as e:
+                logger.warning(f"Theme universe failed for {theme}: {e}")
+    except Exception as e:
+        logger.warning(f"Theme universes unavailable: {e}")
+    return list(dict.fromkeys(t for t in tickers if t))
+
+
 def _is_recent_filing(filing: Dict, days: int = 1) -> bool:
     """최근 공시 여부 확인"""
     try:
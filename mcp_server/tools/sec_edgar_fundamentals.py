@@ -18,7 +18,7 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-import requests
+from mcp_server.tools.http_client import http_get
 
 logger = logging.getLogger(__name__)
 
@@ -270,7 +270,7 @@ def get_financials(ticker: str, *, timeout: float = 8.0) -> dict[str, Any]:
 
     url = f"{SEC_BASE_URL}/api/xbrl/companyfacts/CIK{cik}.json"
     try:
-        r = requests.get(url, headers=HTTP_HEADERS, timeout=timeout)
+        r = http_get(url, headers=HTTP_HEADERS, timeout=timeout)
         if r.status_code == 404:
             logger.debug("SEC companyfacts 404 for %s (cik=%s)", ticker, cik)
             return {}
@@ -402,7 +402,7 @@ def get_quarterly_financials(ticker: str, *, timeout: float = 8.0) -> dict[str,
 
     url = f"{SEC_BASE_URL}/api/xbrl/companyfacts/CIK{cik}.json"
     try:
-        r = requests.get(url, headers=HTTP_HEADERS, timeout=timeout)
+        r = http_get(url, headers=HTTP_HEADERS, timeout=timeout)
         if r.status_code == 404:
             return {}
         r.raise_for_status()
@@ -12,9 +12,10 @@ import numpy as np
 from typing import Dict, List, Optional
 import logging
 import feedparser
-import yfinance as yf
 from .yf_utils import normalize_ticker_multi_market, is_yfinance_supported
 
+from .ticker_info import get_ticker_info
+
 logger = logging.getLogger(__name__)
 
 # VADER Sentiment Analyzer (optional)
@@ -26,6 +27,22 @@ except ImportError:
     logger.warning("vaderSentiment not available, news sentiment will be disabled")
 
 
+def _put_call_ratio(normalized_ticker: str) -> float:
+    """가장 가까운 만기 옵션 체인의 Put/Call 거래량 비율 (옵션 없음/실패 시 NaN, 체인은 TickerInfo 캐시)"""
+    try:
+        stock = get_ticker_info(normalized_ticker)
+        options = stock.options
+        if not options:
+            return np.nan
+        opt_chain = stock.option_chain(options[0])
+        put_vol = opt_chain.puts['volume'].sum()
+        call_vol = opt_chain.calls['volume'].sum()
+        return float(put_vol / call_vol) if call_vol > 0 else np.nan
+    except Exception as e:
+        logger.debug(f"Put/Call ratio calculation failed: {e}")
+        return np.nan
+
+
 class SentimentFactors:
     """감성 분석 팩터 계산 클래스 (10개)"""
 
@@ -137,7 +154,7 @@ class SentimentFactors:
             normalized_ticker = normalize_ticker_multi_market(ticker, market)
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
 
             # 간단한 근사치: 회사 상태 지표로 감성 추정
@@ -164,9 +181,18 @@ class SentimentFactors:
     # 그룹 3: 시장 심리 지표 (3개)
     # ============================================================
     @staticmethod
-    def calculate_market_sentiment(ticker: str, market: str = "US") -> Dict[str, float]:
+    def fetch_market_vix() -> float:
+        """VIX 최근 값 (시장 공통 입력 - market_context 에서 시간 버킷당 1회 계산해 공유)"""
+        from mcp_server.tools.market_context import get_market_context
+        return get_market_context().vix
+
+    @staticmethod
+    def calculate_market_sentiment(ticker: str, market: str = "US", market_vix: Optional[float] = None) -> Dict[str, float]:
         """시장 심리 지표
 
+        Args:
+            market_vix: 미리 조회한 VIX (None 이면 시장 컨텍스트에서 조회)
+
         Returns:
             {
                 'Put_Call_Ratio': float,       # Put/Call 비율
@@ -178,38 +204,15 @@ class SentimentFactors:
             normalized_ticker = normalize_ticker_multi_market(ticker, market)
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
 
             # Put/Call Ratio (옵션 데이터)
-            try:
-                options = stock.options
-                if options and len(options) > 0:
-                    # 가장 가까운 만기일의 옵션 체인
-                    opt_chain = stock.option_chain(options[0])
-                    put_vol = opt_chain.puts['volume'].sum()
-                    call_vol = opt_chain.calls['volume'].sum()
-
-                    if call_vol > 0:
-                        put_call_ratio = put_vol / call_vol
-                    else:
-                        put_call_ratio = np.nan
-                else:
-                    put_call_ratio = np.nan
-            except Exception as e:
-                logger.debug(f"Put/Call ratio calculation failed: {e}")
-                put_call_ratio = np.nan
+            put_call_ratio = _put_call_ratio(normalized_ticker)
 
             # VIX Level (시장 공포 지수)
-            try:
-                vix = yf.Ticker("^VIX").history(period="1d")
-                if not vix.empty:
-                    market_vix = float(vix['Close'].iloc[-1])
-                else:
-                    market_vix = np.nan
-            except Exception as e:
-                logger.debug(f"VIX fetch failed: {e}")
-                market_vix = np.nan
+            if market_vix is None:
+                market_vix = SentimentFactors.fetch_market_vix()
 
             # Short Interest Ratio
             short_ratio = info.get('shortRatio', np.nan)
@@ -246,7 +249,7 @@ class SentimentFactors:
             normalized_ticker = normalize_ticker_multi_market(ticker, market)
             if not is_yfinance_supported(ticker, market):
                 return {}
-            stock = yf.Ticker(normalized_ticker)
+            stock = get_ticker_info(normalized_ticker)
             info = stock.info
 
             # Analyst Recommendation (1=Strong Buy, 5=Strong Sell)
@@ -280,13 +283,14 @@ class SentimentFactors:
     # 통합 함수
     # ============================================================
     @staticmethod
-    def calculate_all(ticker: str, market: str = "US", days: int = 7) -> Dict[str, float]:
+    def calculate_all(ticker: str, market: str = "US", days: int = 7, market_vix: Optional[float] = None) -> Dict[str, float]:
         """10개 감성 팩터 통합 계산
 
         Args:
             ticker: 종목 코드
             market: 시장 구분 ("US", "KR")
             days: 뉴스 분석 기간 (일)
+            market_vix: 미리 조회한 VIX (다종목 랭킹에서 공유, None 이면 직접 조회)
 
         Returns:
             감성 팩터 딕셔너리 (NaN 값 제거)
@@ -303,7 +307,7 @@ class SentimentFactors:
             factors.update(filings)
 
             # 3. 시장 심리 (3개)
-            market_sent = SentimentFactors.calculate_market_sentiment(ticker, market)
+            market_sent = SentimentFactors.calculate_market_sentiment(ticker, market, market_vix=market_vix)
             factors.update(market_sent)
 
             # 4. 전문가 의견 (2개)
@@ -71,7 +71,8 @@ class ThemeFactorIntegrator:
         market: str = "US",
         backtest_start: str = "2024-01-01",
         backtest_end: str = "2024-12-31",
-        factor_weights: Optional[Dict[str, float]] = None
+        factor_weights: Optional[Dict[str, float]] = None,
+        asof: Optional[str] = None
     ) -> Dict:
         """테마 기반 종합 분석 (Response Time Benchmarking 포함)
 
@@ -85,6 +86,7 @@ class ThemeFactorIntegrator:
             backtest_start: 백테스트 시작일
             backtest_end: 백테스트 종료일
             factor_weights: 팩터 가중치 (optional)
+            asof: 팩터 스냅샷 기준일 (YYYY-MM-DD, None 이면 최신 스냅샷)
 
         Returns:
             테마 분석 결과 (performance_metrics 포함)
@@ -113,10 +115,13 @@ class ThemeFactorIntegrator:
 
             # Step 2: 팩터 기반 랭킹
             step2_start = time.time()
+            factor_stages: Dict[str, float] = {}
             ranked_stocks = ThemeFactorIntegrator.rank_theme_stocks(
                 tickers=tickers,
                 market=market,
-                factor_weights=factor_weights
+                factor_weights=factor_weights,
+                asof=asof,
+                stage_timings=factor_stages
             )
             stage_timings['factor_ranking'] = round(time.time() - step2_start, 3)
 
@@ -195,7 +200,8 @@ class ThemeFactorIntegrator:
                 'analysis_timestamp': datetime.utcnow().isoformat(),
                 'performance_metrics': {
                     'total_time_seconds': total_time,
-                    'stage_timings': stage_timings
+                    'stage_timings': stage_timings,
+                    'factor_stages': factor_stages
                 }
             }
 
@@ -414,16 +420,22 @@ class ThemeFactorIntegrator:
         market: str = "US",
         factor_weights: Optional[Dict[str, float]] = None,
         max_retries: int = 3,
-        initial_delay: float = 1.0
+        initial_delay: float = 1.0,
+        asof: Optional[str] = None,
+        stage_timings: Optional[Dict[str, float]] = None
     ) -> List[Dict]:
         """테마 종목 랭킹 (팩터 기반, Retry with Exponential Backoff)
 
+        야간 팩터 스냅샷에 있는 종목은 스냅샷 팩터로, 나머지만 실시간으로 계산.
+
         Args:
             tickers: 종목 리스트
             market: 시장
             factor_weights: 팩터 가중치
             max_retries: 최대 재시도 횟수 (기본: 3)
             initial_delay: 초기 지연 시간 (초, 기본: 1.0)
+            asof: 팩터 스냅샷 기준일 (YYYY-MM-DD, None 이면 최신 스냅샷)
+            stage_timings: 주어지면 팩터 수집/스코어링 단계별 소요 시간 기록
 
         Returns:
             랭킹된 종목 리스트
@@ -441,7 +453,9 @@ class ThemeFactorIntegrator:
                     include_technical=True,
                     include_financial=True,
                     include_sentiment=True,
-                    factor_weights=factor_weights
+                    factor_weights=factor_weights,
+                    asof=asof,
+                    stage_timings=stage_timings
                 )
 
                 # Step 2: 에러 필터링
@@ -489,43 +503,52 @@ class ThemeFactorIntegrator:
         Returns:
             백테스트 정보가 추가된 종목 리스트
         """
+        # Step 1: 가격/벤치마크를 한 번에 조회하는 포트폴리오 백테스트
+        try:
+            portfolio = BacktestEngine.run_portfolio_backtest(
+                tickers=[stock['ticker'] for stock in stocks],
+                market=market,
+                start_date=start_date,
+                end_date=end_date,
+                rebalance_period=30,
+                buy_threshold=60.0,
+                sell_threshold=40.0,
+                initial_capital=10000.0,
+                weighting="score",
+                scores={stock['ticker']: stock.get('composite_score', 0.0) for stock in stocks}
+            )
+        except Exception as e:
+            logger.warning(f"Portfolio backtest failed: {e}")
+            portfolio = {'results': {}, 'failed': {stock['ticker']: str(e) for stock in stocks}}
+
         enriched = []
 
         for stock in stocks:
             ticker = stock['ticker']
+            backtest_result = portfolio['results'].get(ticker)
 
-            try:
-                # Step 1: 백테스트 실행
-                backtest_result = BacktestEngine.run_backtest(
-                    ticker=ticker,
-                    market=market,
-                    start_date=start_date,
-                    end_date=end_date,
-                    rebalance_period=30,
-                    buy_threshold=60.0,
-                    sell_threshold=40.0,
-                    initial_capital=10000.0
-                )
-
-                # Step 2: 주요 지표 추출
-                perf = backtest_result.get('performance', {})
+            if backtest_result is None:
+                error = portfolio['failed'].get(ticker, 'Backtest not available')
+                logger.warning(f"Backtest failed for {ticker}: {error}")
                 stock['backtest'] = {
-                    'total_return': backtest_result.get('total_return', 0.0),
-                    'cagr': perf.get('CAGR', 0.0),
-                    'max_drawdown': perf.get('Max_Drawdown', 0.0),
-                    'sharpe_ratio': perf.get('Sharpe_Ratio', 0.0),
-                    'win_rate': perf.get('Win_Rate', 0.0),
-                    'trade_count': backtest_result.get('trade_count', 0)
+                    'error': error,
+                    'total_return': None
                 }
+                enriched.append(stock)
+                continue
 
-                logger.info(f"Backtest completed for {ticker}: {stock['backtest']['total_return']:.2f}%")
+            # Step 2: 주요 지표 추출
+            perf = backtest_result.get('performance', {})
+            stock['backtest'] = {
+                'total_return': backtest_result.get('total_return', 0.0),
+                'cagr': perf.get('CAGR', 0.0),
+                'max_drawdown': perf.get('Max_Drawdown', 0.0),
+                'sharpe_ratio': perf.get('Sharpe_Ratio', 0.0),
+                'win_rate': perf.get('Win_Rate', 0.0),
+                'trade_count': backtest_result.get('trade_count', 0)
+            }
 
-            except Exception as e:
-                logger.warning(f"Backtest failed for {ticker}: {e}")
-                stock['backtest'] = {
-                    'error': str(e),
-                    'total_return': None
-                }
+            logger.info(f"Backtest completed for {ticker}: {stock['backtest']['total_return']:.2f}%")
 
             enriched.append(stock)
 
@@ -0,0 +1,125 @@
+"""
+Ticker Info Module
+
+yfinance ``Ticker`` 의 느린 스크레이핑 속성(.info / 재무제표 / 배당 / 옵션)을 종목당 한 번만 받아 공유.
+
+하나의 종합 분석 요청 안에서 FinancialFactors 의 하위 계산기 5개, SentimentFactors 3곳,
+portfolio_manager, get_fundamentals_snapshot 이 각각 ``yf.Ticker(t).info`` 를 다시 긁었다.
+get_ticker_info(symbol) 은 같은 속성 이름을 가진 TickerInfo 를 돌려주고, 각 속성은 처음 읽을 때
+(symbol, field) 키로 cache_manager 에 저장된다 (L1 + L2 + single-flight).
+
+- info / financials / balance_sheet / cashflow / dividends: TTL.FUNDAMENTAL_SWR
+- options / option_chain(expiry): TTL.REALTIME_SWR
+조회 실패는 캐시하지 않고 호출자에게 예외로 전달 (yf.Ticker 를 직접 쓰던 때와 같은 동작).
+빈 .info / 빈 재무제표는 yfinance 가 차단·rate limit 때 돌려주는 값이기도 해서 캐시하지 않는다
+(호출자에게는 {} / 빈 DataFrame, 다음 조회에서 재시도). 배당 없음(빈 dividends)은 정상 값이라 캐시.
+"""
+from __future__ import annotations
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from mcp_server.tools.cache_manager import TTL, cached
+
+logger = logging.getLogger(__name__)
+
+FUNDAMENTAL_FIELDS = ("info", "financials", "balance_sheet", "cashflow", "dividends")
+STATEMENT_FIELDS = ("financials", "balance_sheet", "cashflow")
+
+
+class OptionChain(NamedTuple):
+    """yfinance option_chain 결과 중 캐시하는 부분"""
+    calls: pd.DataFrame
+    puts: pd.DataFrame
+
+
+def _ticker(symbol: str):
+    import yfinance as yf
+    return yf.Ticker(symbol)
+
+
+@cached(ttl=TTL.FUNDAMENTAL_SWR, prefix="ticker_info")
+def _load_field(symbol: str, field: str) -> Any:
+    """펀더멘털 속성 하나 조회 - 빈 .info / 재무제표는 None (캐시하지 않음)"""
+    value = getattr(_ticker(symbol), field)
+    if field == "info":
+        return dict(value) if isinstance(value, dict) and value else None
+    if field in STATEMENT_FIELDS and (value is None or value.empty):
+        return None
+    return value
+
+
+def _empty(field: str) -> Any:
+    """캐시하지 않은 빈 응답 대신 돌려줄 값 (yf.Ticker 와 같은 타입)"""
+    return {} if field == "info" else pd.DataFrame()
+
+
+@cached(ttl=TTL.REALTIME_SWR, prefix="ticker_options")
+def _load_options(symbol: str) -> Tuple[str, ...]:
+    return tuple(_ticker(symbol).options or ())
+
+
+@cached(ttl=TTL.REALTIME_SWR, prefix="ticker_option_chain")
+def _load_option_chain(symbol: str, expiry: str) -> OptionChain:
+    chain = _ticker(symbol).option_chain(expiry)
+    return OptionChain(calls=chain.calls, puts=chain.puts)
+
+
+class TickerInfo:
+    """yf.Ticker 와 같은 속성 이름의 캐시 뷰 (객체 안에서도 한 번 읽은 속성은 다시 조회하지 않음)"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self._memo: Dict[Any, Any] = {}
+
+    def _field(self, field: str) -> Any:
+        if field not in self._memo:
+            value = _load_field(self.symbol, field)
+            self._memo[field] = _empty(field) if value is None else value
+        return self._memo[field]
+
+    @property
+    def info(self) -> Dict[str, Any]:
+        return self._field("info")
+
+    @property
+    def financials(self) -> pd.DataFrame:
+        return self._field("financials")
+
+    @property
+    def balance_sheet(self) -> pd.DataFrame:
+        return self._field("balance_sheet")
+
+    @property
+    def cashflow(self) -> pd.DataFrame:
+        return self._field("cashflow")
+
+    @property
+    def dividends(self) -> pd.Series:
+        return self._field("dividends")
+
+    @property
+    def options(self) -> Tuple[str, ...]:
+        if "options" not in self._memo:
+            self._memo["options"] = _load_options(self.symbol)
+        return self._memo["options"]
+
+    def option_chain(self, expiry: Optional[str] = None) -> OptionChain:
+        """만기일 옵션 체인 (None 이면 가장 가까운 만기)"""
+        if expiry is None:
+            if not self.options:
+                raise ValueError(f"No options listed for {self.symbol}")
+            expiry = self.options[0]
+        key = ("option_chain", expiry)
+        if key not in self._memo:
+            self._memo[key] = _load_option_chain(self.symbol, expiry)
+        return self._memo[key]
+
+    def __repr__(self) -> str:
+        return f"TickerInfo({self.symbol!r})"
+
+
+def get_ticker_info(symbol: str) -> TickerInfo:
+    """종목(yfinance 심볼)의 공유 TickerInfo"""
+    return TickerInfo(symbol)
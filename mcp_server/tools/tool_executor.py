@@ -0,0 +1,274 @@
+"""
+MCP 툴 실행 계층 - 블로킹 툴 본문을 워커 풀로 분리
+
+mcp_app.py 의 툴은 대부분 ``async def`` 로 선언되어 있지만 내부에서 yfinance,
+뉴스 검색, 백테스트 같은 동기 함수를 그대로 호출한다. 그대로 두면 느린 호출
+하나가 SSE 서버(mcp_app_http.py)의 이벤트 루프 전체를 멈춘다.
+
+Features:
+- 툴 본문을 제한된 ThreadPoolExecutor 에서 실행 (코루틴 툴은 워커 스레드의
+  자체 이벤트 루프에서 실행)
+- 툴별 동시 실행 수 제한 (Semaphore, 무거운 툴은 낮은 한도)
+- 툴별/풀 단위 대기열 깊이, 대기/실행 시간 메트릭
+
+사용 예시:
+    mcp = FastMCP("PM-MCP", ...)
+    offload_tools(mcp)          # 이후 등록되는 @mcp.tool() 은 워커 풀에서 실행
+
+    @mcp.tool()
+    async def market_get_prices(...): ...
+"""
+from __future__ import annotations
+from typing import Any, Callable, Dict, Iterable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import asyncio
+import threading
+import time
+import logging
+
+from mcp_server.config import TOOL_WORKERS, TOOL_MAX_CONCURRENT, TOOL_CONCURRENCY_LIMITS
+
+logger = logging.getLogger(__name__)
+
+# 무거운 툴 기본 동시 실행 한도 (TOOL_CONCURRENCY_LIMITS 로 덮어쓰기 가능)
+DEFAULT_TOOL_LIMITS: Dict[str, int] = {
+    "backtest_strategy": 2,
+    "backtest_portfolio": 2,
+    "theme_analyze_with_factors": 2,
+    "rank_stocks": 2,
+    "ranking_advanced": 2,
+    "comprehensive_analyze": 3,
+    "create_theme_report": 2,
+    "create_portfolio_phase_report": 2,
+    "present_theme_save": 2,
+    "present_portfolio_save": 2,
+    "analyze_dip_candidates_tool": 2,
+    "portfolio_comprehensive": 3,
+}
+
+# 블로킹 호출이 없는 가벼운 툴은 이벤트 루프에서 바로 실행
+INLINE_TOOLS = frozenset({
+    "help_commands",
+    "circuit_status",
+    "circuit_reset",
+    "executor_status",
+})
+
+
+def parse_limits(spec: str) -> Dict[str, int]:
+    """"tool=2,other=4" 형태의 문자열을 {툴: 한도} 로 변환 (잘못된 항목은 무시)"""
+    limits: Dict[str, int] = {}
+    for part in (spec or "").split(","):
+        if "=" not in part:
+            continue
+        name, _, value = part.partition("=")
+        try:
+            limits[name.strip()] = max(1, int(value))
+        except ValueError:
+            logger.warning(f"Invalid tool concurrency limit ignored: {part!r}")
+    return limits
+
+
+def _run_in_worker(fn: Callable, args: tuple, kwargs: dict) -> Any:
+    """워커 스레드 본문: 코루틴 함수는 스레드 전용 이벤트 루프에서 실행"""
+    if asyncio.iscoroutinefunction(fn):
+        return asyncio.run(fn(*args, **kwargs))
+    return fn(*args, **kwargs)
+
+
+class ToolExecutor:
+    """툴 호출을 제한된 워커 풀로 보내는 실행기
+
+    - 툴별 Semaphore 로 동시 실행 수를 제한하고, 한도를 넘는 호출은 이벤트
+      루프에서 대기한다 (스레드를 점유하지 않음).
+    - Semaphore 를 통과한 호출은 워커 풀에 제출되며, 풀이 가득 차면 풀 대기열에
+      쌓인다. 두 대기열의 깊이를 모두 stats() 로 노출한다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = TOOL_WORKERS,
+        default_limit: int = TOOL_MAX_CONCURRENT,
+        limits: Optional[Dict[str, int]] = None,
+        inline: Optional[Iterable[str]] = None,
+    ):
+        self.max_workers = max_workers
+        self.default_limit = default_limit
+        self._limits = {**DEFAULT_TOOL_LIMITS, **parse_limits(TOOL_CONCURRENCY_LIMITS), **(limits or {})}
+        self._inline = frozenset(INLINE_TOOLS if inline is None else inline)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._tools: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._pool_queued = 0
+        self._pool_busy = 0
+        self._max_pool_queued = 0
+
+    # ----- 설정 -----
+
+    def limit_for(self, name: str) -> int:
+        return self._limits.get(name, self.default_limit)
+
+    def is_inline(self, name: str) -> bool:
+        return name in self._inline
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        sem = self._semaphores.get(name)
+        if sem is None:
+            sem = self._semaphores[name] = asyncio.Semaphore(self.limit_for(name))
+        return sem
+
+    def _stat(self, name: str) -> Dict[str, float]:
+        st = self._tools.get(name)
+        if st is None:
+            st = self._tools[name] = {
+                "calls": 0, "running": 0, "waiting": 0, "max_waiting": 0,
+                "completed": 0, "failed": 0,
+                "wait_time": 0.0, "max_wait_time": 0.0,
+                "run_time": 0.0, "max_run_time": 0.0,
+            }
+        return st
+
+    # ----- 실행 -----
+
+    def _worker(self, fn: Callable, args: tuple, kwargs: dict) -> Any:
+        with self._lock:
+            self._pool_queued -= 1
+            self._pool_busy += 1
+        try:
+            return _run_in_worker(fn, args, kwargs)
+        finally:
+            with self._lock:
+                self._pool_busy -= 1
+
+    async def run(self, name: str, fn: Callable, *args, **kwargs) -> Any:
+        """툴 본문 실행 (동기/비동기 함수 모두 지원)"""
+        with self._lock:
+            st = self._stat(name)
+            st["calls"] += 1
+            st["waiting"] += 1
+            st["max_waiting"] = max(st["max_waiting"], st["waiting"])
+
+        queued_at = time.perf_counter()
+        acquired = False
+        try:
+            async with self._semaphore(name):
+                acquired = True
+                with self._lock:
+                    st["waiting"] -= 1
+                    st["running"] += 1
+                started = time.perf_counter()
+                try:
+                    if self.is_inline(name):
+                        result = fn(*args, **kwargs)
+                        if asyncio.iscoroutine(result):
+                            result = await result
+                    else:
+                        with self._lock:
+                            self._pool_queued += 1
+                            self._max_pool_queued = max(self._max_pool_queued, self._pool_queued)
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(self._pool, self._worker, fn, args, kwargs)
+                except BaseException:
+                    with self._lock:
+                        st["failed"] += 1
+                    raise
+                else:
+                    with self._lock:
+                        st["completed"] += 1
+                    return result
+                finally:
+                    finished = time.perf_counter()
+                    with self._lock:
+                        st["running"] -= 1
+                        waited = started - queued_at
+                        ran = finished - started
+                        st["wait_time"] += waited
+                        st["max_wait_time"] = max(st["max_wait_time"], waited)
+                        st["run_time"] += ran
+                        st["max_run_time"] = max(st["max_run_time"], ran)
+        finally:
+            if not acquired:
+                # Semaphore 대기 중 취소된 경우
+                with self._lock:
+                    st["waiting"] -= 1
+
+    def wrap(self, fn: Callable, name: Optional[str] = None) -> Callable:
+        """툴 함수를 실행기 경유 코루틴으로 래핑 (시그니처/docstring 유지)"""
+        tool_name = name or fn.__name__
+
+        @wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await self.run(tool_name, fn, *args, **kwargs)
+
+        return wrapper
+
+    # ----- 메트릭 -----
+
+    def stats(self) -> Dict[str, Any]:
+        """풀/툴별 대기열 깊이와 대기·실행 시간"""
+        with self._lock:
+            tools = {}
+            for name, st in self._tools.items():
+                finished = st["completed"] + st["failed"]
+                tools[name] = {
+                    "limit": self.limit_for(name),
+                    "inline": self.is_inline(name),
+                    "calls": int(st["calls"]),
+                    "running": int(st["running"]),
+                    "waiting": int(st["waiting"]),
+                    "max_waiting": int(st["max_waiting"]),
+                    "completed": int(st["completed"]),
+                    "failed": int(st["failed"]),
+                    "avg_wait_ms": round(st["wait_time"] / finished * 1000, 2) if finished else 0.0,
+                    "max_wait_ms": round(st["max_wait_time"] * 1000, 2),
+                    "avg_run_ms": round(st["run_time"] / finished * 1000, 2) if finished else 0.0,
+                    "max_run_ms": round(st["max_run_time"] * 1000, 2),
+                }
+            return {
+                "workers": self.max_workers,
+                "default_limit": self.default_limit,
+                "pool_busy": self._pool_busy,
+                "pool_queued": self._pool_queued,
+                "max_pool_queued": self._max_pool_queued,
+                "waiting": sum(t["waiting"] for t in tools.values()),
+                "running": sum(t["running"] for t in tools.values()),
+                "tools": tools,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait)
+
+
+# 싱글톤 인스턴스
+_tool_executor: Optional[ToolExecutor] = None
+
+
+def get_tool_executor() -> ToolExecutor:
+    global _tool_executor
+    if _tool_executor is None:
+        _tool_executor = ToolExecutor()
+    return _tool_executor
+
+
+def offload_tools(mcp, executor: Optional[ToolExecutor] = None):
+    """FastMCP 인스턴스의 tool() 데코레이터가 실행기를 경유하도록 교체
+
+    등록되는 툴의 이름/설명/파라미터 스키마는 원본 함수 기준으로 유지되며,
+    데코레이터는 원본 함수를 그대로 반환하므로 모듈 내 직접 호출도 가능하다.
+    """
+    executor = executor or get_tool_executor()
+    register = mcp.tool
+
+    def tool(name: Optional[str] = None, *args, **kwargs):
+        decorator = register(name, *args, **kwargs)
+
+        def apply(fn: Callable) -> Callable:
+            decorator(executor.wrap(fn, name or fn.__name__))
+            return fn
+
+        return apply
+
+    mcp.tool = tool
+    return mcp
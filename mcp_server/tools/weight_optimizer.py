@@ -0,0 +1,250 @@
+"""
+팩터 가중치 탐색 - 가격/팩터 패널을 한 번 만들고 후보마다 점수 합성 + 시뮬레이션만 반복
+
+기존 optimize_weights 는 후보마다 run_backtest 를 호출해 가격 조회, 기술 지표 재계산,
+벤치마크 조회를 매번 반복했다. 카테고리 점수(FactorPanel)는 가중치와 무관하므로 한 번만
+계산하고, 후보 평가는 composite_scores → 포지션 → 자본 체인의 배열 연산으로 끝낸다.
+
+탐색 방식:
+    - grid: 주어진 후보 전체 평가
+    - random: 후보 중 (또는 디리클레 분포에서) n_samples 개 무작위 추출
+    - halving: 짧은 구간(앞쪽 리밸런싱 일부)으로 전체를 평가한 뒤 상위 1/eta 만 남기며
+      구간을 늘려가는 successive halving
+
+grid/random 은 배치 단위로 평가하며 patience 배치 동안 최고 수익률이 개선되지 않으면 조기 종료.
+후보 평가는 후보당 수십 μs 의 배열 연산이라 인프로세스로 한다 (프로세스 풀은 기동 + 패널 pickle 비용이 더 컸다).
+
+사용 예시:
+    result = optimize(prices, "AAPL", "US", candidates, search="halving")
+    result["weights"], result["total_return"], result["search"]
+"""
+from __future__ import annotations
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools.cache_manager import TTL, cache_manager
+from mcp_server.tools.backtest_vectorized import (
+    FactorPanel,
+    build_factor_panel,
+    composite_scores,
+    positions_from_scores,
+)
+from mcp_server.tools.factor_aggregator import FactorAggregator
+
+logger = logging.getLogger(__name__)
+
+MIN_RUNG_REBALANCES = 8   # halving 첫 단계의 최소 리밸런싱 시점 수
+
+
+# ===== 후보 평가 =====
+
+def final_value(
+    panel: FactorPanel,
+    scores: np.ndarray,
+    final_price: float,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+) -> float:
+    """simulate() 와 같은 최종 가치 (거래 내역은 만들지 않음)"""
+    held = positions_from_scores(scores, buy_threshold, sell_threshold)
+    change = np.diff(np.concatenate([[0], held]))
+    buys = np.flatnonzero(change == 1)
+    if not len(buys):
+        return initial_capital
+    exit_px = panel.prices[np.flatnonzero(change == -1)]
+    if len(buys) > len(exit_px):
+        exit_px = np.append(exit_px, final_price)
+    return float(initial_capital * np.prod(exit_px / panel.prices[buys]))
+
+
+def truncate_panel(panel: FactorPanel, n: int) -> FactorPanel:
+    """앞쪽 n 개 리밸런싱 시점만 남긴 패널 (halving 저예산 단계용)"""
+    return FactorPanel(
+        ticker=panel.ticker,
+        dates=panel.dates[:n],
+        prices=panel.prices[:n],
+        category_scores={k: v[:n] for k, v in panel.category_scores.items()},
+        has_factors=panel.has_factors[:n],
+        fin_factors=panel.fin_factors,
+    )
+
+
+def evaluate_candidates(
+    panel: FactorPanel,
+    candidates: Sequence[Dict[str, float]],
+    final_price: float,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+) -> List[float]:
+    """후보별 총수익률(%) - 실패한 후보는 -inf"""
+    returns = []
+    for weights in candidates:
+        try:
+            scores = composite_scores(panel, weights)
+            value = final_value(panel, scores, final_price, buy_threshold, sell_threshold, initial_capital)
+            returns.append(((value - initial_capital) / initial_capital) * 100)
+        except Exception as e:
+            logger.warning(f"Optimization failed for weights {weights}: {e}")
+            returns.append(-float('inf'))
+    return returns
+
+
+# ===== 후보 생성 =====
+
+def random_weights(n: int, categories: Optional[Sequence[str]] = None, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """카테고리 가중치 n 개를 디리클레 분포에서 추출 (합 1, 소수 3자리)"""
+    categories = list(categories or FactorAggregator.DEFAULT_WEIGHTS.keys())
+    rng = np.random.default_rng(seed)
+    draws = np.round(rng.dirichlet(np.ones(len(categories)), size=n), 3)
+    return [dict(zip(categories, map(float, row))) for row in draws]
+
+
+# ===== 탐색 =====
+
+def _batched_search(panel, candidates, final_price, thresholds, batch_size, patience, min_delta):
+    """배치 단위 평가 + patience 배치 무개선 시 조기 종료"""
+    returns: List[float] = []
+    best, stale = -float('inf'), 0
+    for i in range(0, len(candidates), batch_size):
+        batch = evaluate_candidates(panel, candidates[i:i + batch_size], final_price, *thresholds)
+        returns.extend(batch)
+        batch_best = max(batch)
+        if batch_best > best + min_delta:
+            best, stale = batch_best, 0
+        else:
+            stale += 1
+            if patience and stale >= patience:
+                break
+    return returns
+
+
+def _halving_search(panel, candidates, final_price, thresholds, eta):
+    """successive halving: 짧은 구간에서 상위 1/eta 만 다음(더 긴) 구간으로"""
+    m = len(panel.dates)
+    # 단계 수: 후보 수 기준 log_eta(n) + 1, 단 첫 단계 구간이 MIN_RUNG_REBALANCES 보다 짧아지지 않게
+    n_rungs = int(math.log(max(len(candidates), 1), eta)) + 1
+    n_rungs = max(1, min(n_rungs, int(math.log(max(m / MIN_RUNG_REBALANCES, 1), eta)) + 1))
+    budgets = [max(MIN_RUNG_REBALANCES, int(m / eta ** (n_rungs - 1 - r))) for r in range(n_rungs)]
+
+    alive = list(range(len(candidates)))
+    evaluations = 0
+    rungs = []
+    for r, budget in enumerate(budgets):
+        full = r == n_rungs - 1 or budget >= m
+        rung_panel = panel if full else truncate_panel(panel, budget)
+        rung_price = final_price if full else float(panel.prices[budget - 1])
+        returns = evaluate_candidates(rung_panel, [candidates[i] for i in alive], rung_price, *thresholds)
+        evaluations += len(alive)
+        rungs.append({'rebalances': len(rung_panel.dates), 'candidates': len(alive)})
+        if full:
+            return alive, returns, evaluations, rungs
+        keep = max(1, math.ceil(len(alive) / eta))
+        order = np.argsort(-np.asarray(returns), kind='stable')[:keep]
+        alive = [alive[i] for i in sorted(order)]
+    return alive, returns, evaluations, rungs
+
+
+def optimize(
+    prices: pd.DataFrame,
+    ticker: str,
+    market: str = "US",
+    weight_candidates: Optional[List[Dict[str, float]]] = None,
+    rebalance_period: int = 30,
+    search: str = "grid",
+    n_samples: int = 100,
+    eta: int = 3,
+    patience: int = 0,
+    min_delta: float = 0.0,
+    batch_size: int = 50,
+    seed: Optional[int] = None,
+    buy_threshold: float = 60.0,
+    sell_threshold: float = 40.0,
+    initial_capital: float = 10000.0,
+    panel: Optional[FactorPanel] = None,
+) -> Dict:
+    """가격 데이터 기준 가중치 탐색
+
+    Args:
+        weight_candidates: 후보 목록 (None 이면 디리클레 분포에서 n_samples 개 생성)
+        search: "grid" / "random" / "halving"
+        n_samples: random 탐색 시 평가할 후보 수
+        eta: halving 단계별 생존 비율의 역수
+        patience: grid/random 조기 종료 기준 (개선 없는 배치 수, 0 이면 비활성)
+        min_delta: 개선으로 인정할 최소 수익률 증가 (%p)
+
+    Returns:
+        weights / total_return / final_value / search(탐색 통계) - 실패 시 error
+    """
+    start = time.perf_counter()
+    if weight_candidates is None:
+        weight_candidates = random_weights(n_samples, seed=seed)
+    candidates = list(weight_candidates)
+    if search == "random" and len(candidates) > n_samples:
+        rng = np.random.default_rng(seed)
+        candidates = [candidates[i] for i in sorted(rng.choice(len(candidates), n_samples, replace=False))]
+    if not candidates:
+        return {'error': 'No weight candidates'}
+
+    panel = panel or build_factor_panel(prices, ticker, market, rebalance_period)
+    if not len(panel.dates):
+        return {'error': 'Optimization failed'}
+    final_price = float(prices['Close'].iloc[-1])
+    thresholds = (buy_threshold, sell_threshold, initial_capital)
+
+    if search == "halving":
+        alive, returns, evaluations, rungs = _halving_search(panel, candidates, final_price, thresholds, eta)
+        scored = list(zip(alive, returns))
+        stopped_early = False
+    elif search in ("grid", "random"):
+        returns = _batched_search(panel, candidates, final_price, thresholds, batch_size, patience, min_delta)
+        scored = list(enumerate(returns))
+        evaluations, rungs = len(returns), []
+        stopped_early = len(returns) < len(candidates)
+    else:
+        raise ValueError(f"Unknown search: {search}")
+
+    # 동률이면 먼저 나온 후보 (기존 루프의 '>' 비교와 동일)
+    best_idx, best_return = max(scored, key=lambda x: (x[1], -x[0]))
+    if not np.isfinite(best_return):
+        return {'error': 'Optimization failed'}
+
+    return {
+        'weights': candidates[best_idx],
+        'total_return': best_return,
+        'final_value': initial_capital * (1 + best_return / 100),
+        'search': {
+            'method': search,
+            'candidates': len(candidates),
+            'evaluations': evaluations,
+            'stopped_early': stopped_early,
+            'rungs': rungs,
+            'elapsed_sec': round(time.perf_counter() - start, 3),
+        },
+    }
+
+
+@cache_manager.cached(ttl=TTL.DAILY, prefix="optimizer_panel")
+def _cached_panel(ticker: str, market: str, start_date: str, end_date: str,
+                  rebalance_period: int) -> Tuple[pd.DataFrame, FactorPanel]:
+    from mcp_server.tools.backtest_engine import BacktestEngine
+
+    prices = BacktestEngine._load_prices(ticker, start_date, end_date, market)
+    if prices.empty:
+        raise ValueError(f"No price data for {ticker}")
+    return prices, build_factor_panel(prices, ticker, market, rebalance_period)
+
+
+def load_panel(ticker: str, market: str, start_date: str, end_date: str, rebalance_period: int) -> Tuple[pd.DataFrame, FactorPanel]:
+    """가격 + 팩터 패널 (같은 종목/기간 재탐색 시 일봉 TTL 동안 재사용, 데이터 없으면 ValueError - 캐시되지 않음)
+
+    가격 DataFrame 은 호출자별 사본 (캐시 값이 수정되지 않도록)
+    """
+    prices, panel = _cached_panel(ticker, market, start_date, end_date, rebalance_period)
+    return prices.copy(), panel
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""벡터화 백테스트 테스트: 지표/신호/체결이 기존 루프와 동일한지 + 다년 일봉 벤치마크 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools.backtest_engine import BacktestEngine
+from mcp_server.tools.backtest_vectorized import (
+    SCORED_TECH_KEYS,
+    build_factor_panel,
+    run_vectorized_backtest,
+    window_indicators,
+)
+from mcp_server.tools.financial_factors import FinancialFactors
+from mcp_server.tools.technical_indicators import TechnicalFactors
+
+FIN_FACTORS = {'ROE': 0.18, 'Debt_to_Equity': 0.9, 'Current_Ratio': 1.6, 'Revenue_Growth': 0.12}
+
+
+def _synthetic_prices(years=8, seed=3):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2016-01-04", periods=252 * years)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(idx))))
+    spread = np.abs(rng.normal(0, 0.01, len(idx))) * close
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.003, len(idx))),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, len(idx)).astype(float),
+    }, index=idx)
+
+
+def _patch_financials():
+    original = FinancialFactors.calculate_all
+    FinancialFactors.calculate_all = staticmethod(lambda ticker, market="US": dict(FIN_FACTORS))
+    return original
+
+
+def test_window_indicators_match_ta():
+    """윈도우 행렬 지표 = TechnicalFactors.calculate_all (ta)"""
+    print("\n" + "=" * 60)
+    print("1. 윈도우 지표 동등성 테스트")
+    print("=" * 60)
+
+    prices = _synthetic_prices(years=2)
+    for end, length in ((300, 120), (80, 60), (499, 50)):
+        window = prices.iloc[end + 1 - length: end + 1]
+        expected = TechnicalFactors.calculate_all(window)
+        got = window_indicators(
+            window["High"].to_numpy()[None, :], window["Low"].to_numpy()[None, :], window["Close"].to_numpy()[None, :]
+        )
+        for key in SCORED_TECH_KEYS:
+            assert np.isclose(got[key][0], expected[key], rtol=1e-9, atol=1e-9), (key, got[key][0], expected[key])
+    print("✅ PASS: RSI/Stochastic/Williams/CCI/MA_Cross/ADX/BB_Width/ATR 일치")
+
+
+def test_signals_and_fills_match_loop():
+    """신호/체결/자산 곡선이 루프 버전과 동일"""
+    print("\n" + "=" * 60)
+    print("2. 루프 vs 벡터화 거래 동등성 테스트")
+    print("=" * 60)
+
+    original = _patch_financials()
+    try:
+        prices = _synthetic_prices(years=4)
+        for period, buy, sell, weights in ((20, 56.0, 52.0, None), (7, 58.0, 50.0, {"technical": 0.6, "profitability": 0.4})):
+            loop_trades, loop_final = BacktestEngine._run_loop(prices, "TEST", "US", weights, period, buy, sell, 10000.0)
+            vec = run_vectorized_backtest(prices, "TEST", "US", weights, period, buy, sell, 10000.0)
+            print(f"period={period}: loop {len(loop_trades)} trades, vectorized {len(vec['trades'])} trades")
+            assert len(loop_trades) > 2
+            assert [(t["date"], t["action"]) for t in loop_trades] == [(t["date"], t["action"]) for t in vec["trades"]]
+            for a, b in zip(loop_trades, vec["trades"]):
+                assert a["factor_score"] == b["factor_score"]
+                assert np.isclose(a["portfolio_value"], b["portfolio_value"], rtol=1e-9)
+            assert np.isclose(loop_final, vec["final_value"], rtol=1e-9)
+
+            loop_curve = BacktestEngine.generate_equity_curve(loop_trades, prices, 10000.0)
+            assert np.allclose(loop_curve.to_numpy(), vec["equity_curve"].to_numpy(), rtol=1e-9)
+    finally:
+        FinancialFactors.calculate_all = original
+    print("✅ PASS: 매수/매도 시점, 점수, 체결 가치 일치")
+
+
+def test_benchmark_multi_year():
+    """다년 일봉 벤치마크: 루프 vs 벡터화"""
+    print("\n" + "=" * 60)
+    print("3. 다년 일봉 벤치마크")
+    print("=" * 60)
+
+    original = _patch_financials()
+    try:
+        prices = _synthetic_prices(years=8)
+        start = time.perf_counter()
+        loop_trades, _ = BacktestEngine._run_loop(prices, "TEST", "US", None, 10, 56.0, 52.0, 10000.0)
+        loop_sec = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vec = run_vectorized_backtest(prices, "TEST", "US", None, 10, 56.0, 52.0, 10000.0)
+        vec_sec = time.perf_counter() - start
+
+        panel = build_factor_panel(prices, "TEST", "US", 10)
+        print(f"{len(prices)} bars, {len(panel.dates)} rebalances")
+        print(f"loop: {loop_sec:.2f}s, vectorized: {vec_sec:.3f}s ({loop_sec / vec_sec:.0f}x)")
+        assert len(loop_trades) == len(vec["trades"])
+        assert vec_sec < loop_sec
+    finally:
+        FinancialFactors.calculate_all = original
+    print("✅ PASS: 벤치마크 완료")
+
+
+def main():
+    for test in (test_window_indicators_match_ta, test_signals_and_fills_match_loop, test_benchmark_multi_year):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""캐시 백엔드 테스트: disk/redis(fakeredis)/memory 동일 동작, 파이프라인 일괄 연산, 워커 간 공유, CacheLayer 통합"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+
+from mcp_server.tools.cache_backends import DiskBackend, MemoryBackend, RedisBackend, create_backend
+from mcp_server.tools.cache_layer import CacheLayer
+from mcp_server.tools.cache_manager import SWR, CacheManager, L1Cache
+
+try:
+    import fakeredis
+    FAKEREDIS_AVAILABLE = True
+except ImportError:
+    FAKEREDIS_AVAILABLE = False
+
+
+def _backends():
+    backends = [DiskBackend(tempfile.mkdtemp()), MemoryBackend()]
+    if FAKEREDIS_AVAILABLE:
+        backends.append(RedisBackend(fakeredis.FakeRedis()))
+    return backends
+
+
+def test_backends_conform():
+    """모든 백엔드: get/set/만료시각/삭제/일괄/패턴 조회 동일"""
+    print("\n" + "=" * 60)
+    print("1. 백엔드 공통 동작 테스트")
+    print("=" * 60)
+
+    for backend in _backends():
+        assert backend.get("none") is None and backend.get("none", "d", expire_time=True) == ("d", None)
+        backend.set("factor:AAPL", {"roe": 0.2}, expire=60)
+        backend.set("factor:MSFT", [1, 2], expire=None)
+        backend.set("news:x", b"raw", expire=1)
+        value, expire_at = backend.get("factor:AAPL", expire_time=True)
+        assert value == {"roe": 0.2} and 55 < expire_at - time.time() <= 60
+        assert backend.get("factor:MSFT", expire_time=True) == ([1, 2], None)
+
+        assert backend.set_many({f"m:{i}": i for i in range(5)}, expire=60) == 5
+        many = backend.get_many(["m:0", "m:3", "missing", "factor:MSFT"])
+        assert {k: v for k, (v, _) in many.items()} == {"m:0": 0, "m:3": 3, "factor:MSFT": [1, 2]}
+        assert sorted(backend.scan("factor:*")) == ["factor:AAPL", "factor:MSFT"]
+
+        time.sleep(1.05)
+        assert backend.get("news:x") is None, "TTL 만료"
+        assert backend.delete("factor:AAPL") and backend.get("factor:AAPL") is None
+        backend.expire()
+        assert len(backend) == 6
+        backend.clear()
+        assert len(backend) == 0
+        print(f"   {backend.name}: OK")
+    print("✅ PASS: disk/memory/redis 동일 동작")
+
+
+def test_redis_pipelined():
+    """Redis get_many/set_many 는 키 수와 무관하게 파이프라인 1회 왕복"""
+    print("\n" + "=" * 60)
+    print("2. Redis 파이프라인 테스트")
+    print("=" * 60)
+
+    if not FAKEREDIS_AVAILABLE:
+        print("⚠️  fakeredis 미설치 - 스킵")
+        return
+
+    client = fakeredis.FakeRedis()
+    executes = []
+    original = client.pipeline
+
+    def counting_pipeline(*args, **kwargs):
+        pipe = original(*args, **kwargs)
+        run = pipe.execute
+        pipe.execute = lambda *a, **k: executes.append(len(pipe.command_stack)) or run(*a, **k)
+        return pipe
+
+    client.pipeline = counting_pipeline
+    backend = RedisBackend(client, namespace="t:")
+    backend.set_many({f"prices:{i}": {"close": i} for i in range(200)}, expire=60)
+    hits = backend.get_many([f"prices:{i}" for i in range(200)] + ["prices:none"])
+    print(f"pipeline executions: {len(executes)}, commands: {executes}")
+    assert len(executes) == 2 and len(hits) == 200 and hits["prices:7"][0] == {"close": 7}
+    assert all(k.startswith(b"t:") for k in client.keys("*")), "namespace 접두사로 격리"
+    print("✅ PASS: 200키 저장/조회에 왕복 2회")
+
+
+def test_workers_share_warm_cache():
+    """같은 Redis 를 보는 두 CacheManager(워커) 가 코덱/SWR 값을 공유"""
+    print("\n" + "=" * 60)
+    print("3. 워커 간 캐시 공유 테스트")
+    print("=" * 60)
+
+    if not FAKEREDIS_AVAILABLE:
+        print("⚠️  fakeredis 미설치 - 스킵")
+        return
+
+    server = fakeredis.FakeServer()
+    worker_a = CacheManager(backend=RedisBackend(fakeredis.FakeRedis(server=server)), l1=L1Cache())
+    worker_b = CacheManager(backend=RedisBackend(fakeredis.FakeRedis(server=server)), l1=L1Cache())
+    assert worker_a is not worker_b and worker_a is not CacheManager._instance
+
+    calls = []
+
+    @worker_a.cached(ttl=60, prefix="prices")
+    def prices_a(ticker):
+        calls.append(ticker)
+        return pd.DataFrame({"Close": [1.0, 2.0, 3.0]})
+
+    @worker_b.cached(ttl=60, prefix="prices")
+    def prices_b(ticker):
+        calls.append(ticker)
+        return pd.DataFrame({"Close": [9.0]})
+
+    assert prices_a("AAPL")["Close"].tolist() == [1.0, 2.0, 3.0]
+    assert prices_b("AAPL")["Close"].tolist() == [1.0, 2.0, 3.0] and calls == ["AAPL"]
+    worker_a.set("metrics:x", {"v": 1}, ttl=SWR(soft=0, hard=60))
+    assert worker_b.get_swr("metrics:x") == ({"v": 1}, True)
+
+    stats = worker_b.stats()
+    print(f"worker_b: backend={stats['backend']}, l2 hits={stats['l2']['hits']}, items={stats['item_count']}")
+    assert stats["backend"] == "redis" and stats["l2"]["hits"] == 2 and stats["item_count"] == 2
+    assert worker_b.delete_pattern("prices:*") == 1 and worker_a.cache.get("prices:none") is None
+    print("✅ PASS: 한 워커가 채운 값을 다른 워커가 재사용")
+
+
+def test_cache_layer_unified():
+    """CacheLayer 가 CacheManager 위에서 동작 (키 체계/패턴 삭제/통계), Redis 실패 시 disk 대체"""
+    print("\n" + "=" * 60)
+    print("4. CacheLayer 통합 테스트")
+    print("=" * 60)
+
+    manager = CacheManager(backend=MemoryBackend(), l1=L1Cache())
+    layer = CacheLayer(manager=manager)
+    calls = []
+
+    @layer.cached(prefix="financial_factors", ttl=60)
+    def factors(ticker, market="US"):
+        calls.append(ticker)
+        return {"ticker": ticker, "asof": pd.Timestamp("2024-01-02")}
+
+    assert factors("AAPL") == factors("AAPL") and calls == ["AAPL"]
+    assert factors("AAPL")["asof"] == pd.Timestamp("2024-01-02"), "JSON 변환 없이 원래 타입 유지"
+    assert factors.invalidate("AAPL") is True and factors.invalidate("AAPL") is False
+    assert factors("AAPL") and calls == ["AAPL", "AAPL"]
+    assert layer.delete("nope") is False
+    layer.set(layer.generate_key("factor", ticker="MSFT"), {"roe": 0.3}, ttl=60)
+    assert layer.get("factor:ticker=MSFT") == {"roe": 0.3}
+    assert layer.clear_pattern("financial_factors:*") == 1 and layer.get("financial_factors:AAPL") is None
+
+    stats = layer.get_stats()
+    print(f"stats: {stats}")
+    assert stats["status"] == "connected" and stats["backend"] == "memory" and stats["total_keys"] == 1
+
+    if FAKEREDIS_AVAILABLE:
+        assert CacheLayer(redis_url="fakeredis://").get_stats()["backend"] == "redis"
+    assert CacheLayer(redis_url="redis://127.0.0.1:1/0").enabled is False
+    assert create_backend("redis", tempfile.mkdtemp(), redis_url="redis://127.0.0.1:1/0").name == "disk"
+    assert CacheLayer(enabled=False).get_stats() == {"enabled": False, "status": "disabled"}
+    passthrough = CacheLayer(enabled=False).cached(prefix="p", ttl=60)(lambda x: x * 2)
+    assert passthrough(2) == 4 and passthrough.invalidate(2) is False
+    print("✅ PASS: 단일 캐시 추상화로 통합")
+
+
+def main():
+    for test in (test_backends_conform, test_redis_pipelined, test_workers_share_warm_cache, test_cache_layer_unified):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""일괄 캐시 테스트: get_many/set_many 왕복 1회, cached_many 는 미스만 계산, 랭킹 하이드레이션 왕복 수 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import market_data, price_store
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import SWR, CacheManager, L1Cache, cache_manager
+from mcp_server.tools.price_store import PriceStore
+
+
+def _manager():
+    """임시 디렉토리 CacheManager (싱글톤 우회)"""
+    saved = CacheManager._instance
+    CacheManager._instance = None
+    try:
+        return CacheManager(cache_dir=tempfile.mkdtemp(), l1=L1Cache())
+    finally:
+        CacheManager._instance = saved
+
+
+def test_get_set_many():
+    """set_many/get_many: 200키 L2 왕복 1회, L1 적중분은 L2 생략, SWR 표시"""
+    print("\n" + "=" * 60)
+    print("1. get_many / set_many 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    values = {f"fundamentals:T{i}": {"ticker": f"T{i}", "pe": float(i)} for i in range(200)}
+    assert cache.set_many(values, ttl=60)
+    cache.l1.clear()
+
+    reads = cache.stats()["l2"]["reads"]
+    start = time.perf_counter()
+    got = cache.get_many(list(values) + ["fundamentals:none"])
+    batch_ms = (time.perf_counter() - start) * 1000
+    stats = cache.stats()
+    assert got == values and stats["l2"]["reads"] - reads == 1
+    assert stats["l2"]["hits"] == 200 and stats["misses"] == 1
+
+    cache.l1.clear()
+    start = time.perf_counter()
+    for key in values:
+        cache.get(key)
+    single_ms = (time.perf_counter() - start) * 1000
+    print(f"200 keys cold L1: get_many {batch_ms:.1f}ms vs get x200 {single_ms:.1f}ms")
+
+    reads = cache.stats()["l2"]["reads"]
+    cache.delete("fundamentals:T0")
+    assert len(cache.get_many(values)) == 199 and cache.stats()["l2"]["reads"] - reads == 1, "L1 적중분 제외 1회"
+    assert cache.get_many(["fundamentals:T5"]) == {"fundamentals:T5": values["fundamentals:T5"]}
+
+    cache.set_many({"m:a": [1], "m:b": [2]}, ttl=SWR(soft=0, hard=60))
+    cache.l1.clear()
+    assert cache.get_many_swr(["m:a", "m:b"]) == {"m:a": ([1], True), "m:b": ([2], True)}
+    assert cache.get("m:a") == [1]
+    print("✅ PASS: 일괄 조회/저장 L2 왕복 1회")
+
+
+def test_cached_many():
+    """cached_many: 미스 항목만 배치 계산, 단건 cached 와 캐시 항목 공유, stale 은 묶어서 갱신"""
+    print("\n" + "=" * 60)
+    print("2. cached_many 데코레이터 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    batches = []
+
+    @cache.cached(ttl=60, prefix="fund")
+    def single(ticker):
+        return {"ticker": ticker, "src": "single"}
+
+    @cache.cached_many(ttl=SWR(soft=1, hard=60), prefix="fund")
+    def many(tickers):
+        batches.append(list(tickers))
+        return {t: {"ticker": t, "src": "batch"} for t in tickers if t != "BAD"}
+
+    assert single("AAPL")["src"] == "single"
+    result = many(["AAPL", "MSFT", "NVDA", "MSFT", "BAD"])
+    assert list(result) == ["AAPL", "MSFT", "NVDA"], "입력 순서, 중복 제거, 결과 없는 항목 제외"
+    assert result["AAPL"]["src"] == "single" and batches == [["MSFT", "NVDA", "BAD"]]
+    assert single("MSFT")["src"] == "batch", "배치가 채운 항목을 단건 함수가 재사용"
+    assert many(["AAPL", "MSFT", "NVDA"]) == result and len(batches) == 1
+
+    time.sleep(1.05)
+    assert many(["MSFT", "NVDA"])["MSFT"]["src"] == "batch"
+    deadline = time.time() + 3
+    while cache.refresh_stats()["completed"] < 1 and time.time() < deadline:
+        time.sleep(0.02)
+    print(f"batches: {batches}")
+    assert batches[-1] == ["MSFT", "NVDA"], "stale 항목은 한 번의 배치로 갱신"
+    many.invalidate("NVDA")
+    many(["NVDA", "MSFT"])
+    assert batches[-1] == ["NVDA"]
+    print("✅ PASS: 미스만 계산, 단건 캐시와 공유")
+
+
+def _close(ticker):
+    rng = np.random.default_rng(abs(hash(ticker)) % 1000)
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=300)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(idx))))
+    return pd.DataFrame({"Date": idx, "Open": close, "High": close, "Low": close, "Close": close, "Volume": 1e6})
+
+
+def test_rank_hydration_round_trips():
+    """웜 캐시에서 200종목 랭킹: 펀더멘털/공시 캐시를 종목별 400회 대신 일괄 2회로 조회"""
+    print("\n" + "=" * 60)
+    print("3. 랭킹 하이드레이션 테스트")
+    print("=" * 60)
+
+    from mcp_server.tools.analytics import rank_tickers_with_fundamentals
+
+    tickers = [f"T{i:03d}" for i in range(200)]
+    saved = (cache_manager.cache, cache_manager.l1, price_store._price_store,
+             market_data._fetch_prices_upstream_bulk, market_data._fetch_prices_upstream)
+    cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+    price_store._price_store = PriceStore(root=tempfile.mkdtemp())
+    market_data._fetch_prices_upstream_bulk = lambda ts, s, e, market=None: {t: _close(t) for t in ts}
+    market_data._fetch_prices_upstream = lambda t, s, e, interval="1d", market=None: _close(t)
+    try:
+        cache_manager.set_many({
+            cache_manager._make_key("fundamentals", t): {"ticker": t, "pe": 10.0 + i, "sector": "Tech"}
+            for i, t in enumerate(tickers)
+        }, ttl=600)
+        cache_manager.set_many({
+            f"filings:{t}:10-K,10-Q,8-K:10": [{"title": "Guidance update"}] for t in tickers
+        }, ttl=600)
+        cache_manager.l1.clear()
+
+        before = cache_manager.stats()
+        ranked = rank_tickers_with_fundamentals(tickers)
+        after = cache_manager.stats()
+        reads = after["l2"]["reads"] - before["l2"]["reads"]
+        print(f"ranked {len(ranked)} tickers, L2 reads: {reads}, misses: {after['misses'] - before['misses']}")
+        assert len(ranked) == 200 and reads == 2 and after["misses"] == before["misses"]
+        assert {r["pe"] for r in ranked} == {10.0 + i for i in range(200)}
+        assert all(r["eventScore"] == 1.0 for r in ranked)
+    finally:
+        (cache_manager.cache, cache_manager.l1, price_store._price_store,
+         market_data._fetch_prices_upstream_bulk, market_data._fetch_prices_upstream) = saved
+    print("✅ PASS: 웜 캐시 랭킹 L2 왕복 2회")
+
+
+def main():
+    for test in (test_get_set_many, test_cached_many, test_rank_hydration_round_trips):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
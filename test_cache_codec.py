@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""캐시 코덱 테스트: DataFrame/dict 왕복 동일성, pickle 대비 크기, 접두사별 통계, 기존 pickle 값 호환"""
+
+import io
+import sys
+import os
+import time
+import pickle
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools.cache_codec import ARROW_AVAILABLE, CacheCodec, Codec, MAGIC, ORJSON_AVAILABLE
+from mcp_server.tools.cache_manager import SWR, CacheManager, L1Cache
+
+
+def _manager():
+    """임시 디렉토리 CacheManager (싱글톤 우회)"""
+    saved = CacheManager._instance
+    CacheManager._instance = None
+    try:
+        return CacheManager(cache_dir=tempfile.mkdtemp(), l1=L1Cache())
+    finally:
+        CacheManager._instance = saved
+
+
+def _prices(n=2520):
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, n)))
+    return pd.DataFrame({
+        "Date": pd.bdate_range("2015-01-01", periods=n), "Open": close, "High": close * 1.01,
+        "Low": close * 0.99, "Close": close, "Volume": rng.integers(1e6, 5e6, n).astype(float),
+    })
+
+
+def test_round_trip():
+    """DataFrame/Series/dict 왕복 동일 + JSON 불가 값은 pickle 로 폴백"""
+    print("\n" + "=" * 60)
+    print("1. 코덱 왕복 테스트")
+    print("=" * 60)
+
+    codec = CacheCodec()
+    df = _prices()
+    values = [
+        df, df.set_index("Date"), df["Close"], df.iloc[:0],
+        {"ticker": "AAPL", "metrics": {"ret": 0.12, "vol": None}, "tags": ["a", "b"]},
+        {"roe": float("nan")}, {2023: 1.0}, [("t", 1)], df.assign(name="x"), {"prices": df},
+    ]
+    for value in values:
+        encoded = codec.encode("k:1", value)
+        assert isinstance(encoded, bytes) and encoded.startswith(MAGIC)
+        decoded = codec.decode("k:1", encoded)
+        if hasattr(value, "equals"):
+            assert decoded.equals(value) and decoded.index.equals(value.index)
+        elif isinstance(value, dict) and "prices" in value:
+            assert decoded["prices"].equals(df)
+        else:
+            assert repr(decoded) == repr(value)
+
+    frame = codec.decode("k:1", codec.encode("k:1", df))
+    frame.loc[0, "Close"] = 1.0  # 디코딩 결과는 쓰기 가능
+    assert codec.encode("k:1", 42) == 42 and codec.decode("k:1", b"raw") == b"raw"
+    used = codec.stats()["prefixes"]["k"]["codecs"]
+    print(f"codecs used: {used}")
+    assert used["npframe"] == 5 and used["pickle"] + used.get("arrow", 0) == 5
+    assert not ORJSON_AVAILABLE or used["orjson"] == 1
+    print("✅ PASS: 값 유형별 코덱 왕복 동일")
+
+
+def test_smaller_than_pickle():
+    """가격 DataFrame: pickle 대비 저장 크기 감소, 접두사별 크기/시간 집계"""
+    print("\n" + "=" * 60)
+    print("2. 저장 크기 / 접두사 통계 테스트")
+    print("=" * 60)
+
+    codec = CacheCodec(compression="zlib")
+    df = _prices()
+    pickled = len(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+    encoded = codec.encode("prices:abc", df)
+
+    start = time.perf_counter()
+    for _ in range(50):
+        pickle.loads(pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL))
+    pickle_ms = (time.perf_counter() - start) * 1000 / 50
+    start = time.perf_counter()
+    for _ in range(50):
+        codec.decode("prices:abc", codec.encode("prices:abc", df))
+    codec_ms = (time.perf_counter() - start) * 1000 / 50
+    print(f"size: pickle {pickled:,}B → codec {len(encoded):,}B, round trip: pickle {pickle_ms:.2f}ms, codec {codec_ms:.2f}ms")
+    assert len(encoded) < pickled
+
+    codec.encode("metrics:1", {"ticker": "A", "values": list(range(1000))})
+    stats = codec.stats()
+    prices = stats["prefixes"]["prices"]
+    assert stats["compression"] == "zlib"
+    assert prices["encoded"] == 51 and prices["decoded"] == 50 and prices["codecs"] == {"npframe": 51}
+    assert prices["stored_bytes"] == 51 * len(encoded) and prices["encode_ms"] > 0
+    assert prices["compression_ratio"] >= 1.0 and "metrics" in stats["prefixes"]
+    print("✅ PASS: pickle 보다 작게 저장, 접두사별 통계 집계")
+
+
+def test_cache_manager_integration():
+    """CacheManager: L2 는 인코딩 바이트, L1/조회는 원래 객체, SWR/기존 pickle 값 호환"""
+    print("\n" + "=" * 60)
+    print("3. CacheManager 연동 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    df = _prices(300)
+    cache.set("prices:aapl", df, ttl=60)
+    assert isinstance(cache.cache.get("prices:aapl"), bytes)
+    cache.l1.clear()
+    assert cache.get("prices:aapl").equals(df)
+
+    cache.set("metrics:aapl", {"ret": 0.1}, ttl=SWR(soft=0, hard=60))
+    cache.l1.clear()
+    assert cache.get_swr("metrics:aapl") == ({"ret": 0.1}, True)
+
+    cache.cache.set("legacy", {"old": df}, expire=60)  # 코덱 도입 전 pickle 값
+    assert cache.get("legacy")["old"].equals(df)
+
+    stats = cache.stats()["codec"]["prefixes"]
+    print(f"codec stats: { {p: (s['encoded'], s['decoded']) for p, s in stats.items()} }")
+    assert stats["prices"]["decoded"] == 1 and "legacy" not in stats
+    print("✅ PASS: 코덱이 L2 에만 적용되고 기존 값도 읽힘")
+
+
+class _CsvCodec(Codec):
+    """dtype/인덱스 종류를 잃는 코덱 (arrow 같은 비검증 코덱 대역)"""
+    name = "csv"
+    id = 9
+    exact = False
+
+    def accepts(self, value):
+        return isinstance(value, pd.DataFrame)
+
+    def encode(self, value):
+        return value.to_csv().encode()
+
+    def decode(self, data):
+        return pd.read_csv(io.BytesIO(data), index_col=0)
+
+
+def test_inexact_codec_falls_back():
+    """exact=False 코덱은 왕복이 원본과 같을 때만 사용, 기본 순서는 npframe 이 arrow 보다 먼저"""
+    print("\n" + "=" * 60)
+    print("4. 비검증 코덱 폴백 테스트")
+    print("=" * 60)
+
+    codec = CacheCodec()
+    names = [c.name for c in codec.codecs]
+    assert names.index("npframe") < names.index("arrow")
+    if ARROW_AVAILABLE:
+        mixed = _prices(50).assign(name="x", flag=pd.array([True, None] * 25, dtype="boolean"))
+        pd.testing.assert_frame_equal(codec.decode("arrow:1", codec.encode("arrow:1", mixed)), mixed)
+
+    codec.register(_CsvCodec())
+    plain = pd.DataFrame({"ticker": ["A", "B"], "score": [1.5, 2.5]})
+    dated = _prices(5).assign(name="x").set_index("Date")   # csv 왕복 시 DatetimeIndex → 문자열
+    for value in (plain, dated):
+        decoded = codec.decode("k:1", codec.encode("k:1", value))
+        pd.testing.assert_frame_equal(decoded, value, check_exact=True)
+    used = codec.stats()["prefixes"]["k"]["codecs"]
+    print(f"codecs used: {used}")
+    assert used["csv"] == 1 and used["pickle"] + used.get("arrow", 0) == 1
+    print("✅ PASS: 왕복이 다르면 다음 코덱으로 폴백")
+
+
+def main():
+    for test in (test_round_trip, test_smaller_than_pickle, test_cache_manager_integration,
+                 test_inexact_codec_falls_back):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
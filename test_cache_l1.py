@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""2단 캐시 테스트: 프로세스 내 L1 LRU + diskcache L2 (적중률 분리, 만료/축출, 무효화 일관성)"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools.cache_manager import CacheManager, L1Cache
+
+
+def _manager(l1):
+    """임시 디렉토리 CacheManager (싱글톤 우회)"""
+    saved = CacheManager._instance
+    CacheManager._instance = None
+    try:
+        return CacheManager(cache_dir=tempfile.mkdtemp(), l1=l1)
+    finally:
+        CacheManager._instance = saved
+
+
+def test_l1_serves_hot_keys():
+    """L2 적중 후 L1 적재, 적중률 분리 집계, 반환값 수정 격리"""
+    print("\n" + "=" * 60)
+    print("1. L1 적중 / 적중률 테스트")
+    print("=" * 60)
+
+    cache = _manager(L1Cache())
+    cache.cache.set("index", {f"name{i}": f"{i:06d}" for i in range(2600)}, expire=60)  # 다른 프로세스가 기록
+
+    first = cache.get("index")
+    for _ in range(9):
+        value = cache.get("index")
+    value["name0"] = "mutated"
+    assert cache.get("index")["name0"] == "000000"
+    assert cache.get("missing") is None
+
+    stats = cache.stats()
+    print(f"stats: lookups={stats['lookups']}, l1={stats['l1']['hit_rate']}%, l2={stats['l2']['hit_rate']}%")
+    assert len(first) == 2600
+    assert stats["l2"]["hits"] == 1 and stats["l1"]["hits"] == 10 and stats["misses"] == 1
+    assert stats["l1"]["items"] == 1
+
+    reads = stats["l2"]["reads"]
+    for _ in range(200):
+        cache.get("index")
+    stats = cache.stats()
+    print(f"200 reads: l1 hits={stats['l1']['hits']}, l2 reads={stats['l2']['reads']}")
+    assert stats["l1"]["hits"] == 210 and stats["l2"]["reads"] == reads, "핫 키 재조회는 L2 를 읽지 않음"
+    print("✅ PASS: 핫 키는 SQLite/unpickle 없이 L1 에서 응답")
+
+
+def test_eviction_and_ttl():
+    """항목 수/바이트 상한 LRU 축출 + L2 남은 TTL 반영 만료"""
+    print("\n" + "=" * 60)
+    print("2. L1 축출 / 만료 테스트")
+    print("=" * 60)
+
+    l1 = L1Cache(max_items=3, max_bytes=10_000, max_ttl=60)
+    for k in "abc":
+        l1.set(k, k)
+    l1.get("a")                       # a 를 최근 사용으로
+    l1.set("d", "d")                  # b 축출
+    assert l1.get("b") is L1Cache._MISS and l1.get("a") == "a"
+    l1.set("big", "x" * 20_000)       # 상한 초과 값은 L1 에 넣지 않음
+    assert l1.get("big") is L1Cache._MISS
+    l1.set("list", ["y" * 3000, "z" * 3000])
+    assert l1.stats()["size_bytes"] <= 10_000 and l1.stats()["evictions"] >= 2
+
+    cache = _manager(L1Cache(max_ttl=60))
+    cache.set("short", 1, ttl=1)
+    assert cache.get("short") == 1
+    time.sleep(1.1)
+    assert cache.get("short") is None, "L2 TTL 이 지나면 L1 도 만료"
+    print("✅ PASS: LRU 축출 및 TTL 만료")
+
+
+def test_invalidation_coherent():
+    """cached(...).invalidate / delete / clear 가 L1 까지 반영, 외부 L2 갱신은 max_ttl 내 반영"""
+    print("\n" + "=" * 60)
+    print("3. 무효화 일관성 테스트")
+    print("=" * 60)
+
+    cache = _manager(L1Cache(max_ttl=0.3))
+    calls = []
+
+    @cache.cached(ttl=60, prefix="tok")
+    def token(name):
+        calls.append(name)
+        return {"token": f"{name}-{len(calls)}"}
+
+    assert token("kis") == {"token": "kis-1"}
+    assert token("kis") == {"token": "kis-1"} and len(calls) == 1
+    token.invalidate("kis")
+    assert token("kis") == {"token": "kis-2"}
+
+    cache.set("k", "v1", ttl=60)
+    cache.cache.set("k", "v2", expire=60)   # 다른 프로세스의 갱신
+    assert cache.get("k") == "v1"
+    time.sleep(0.35)
+    assert cache.get("k") == "v2"
+
+    cache.delete("k")
+    assert cache.get("k") is None
+    cache.set("k", "v3", ttl=60)
+    cache.clear()
+    assert cache.get("k") is None and cache.l1.stats()["items"] == 0
+
+    disabled = _manager(None)
+    disabled.l1 = None
+    disabled.set("k", 1, ttl=60)
+    assert disabled.get("k") == 1 and disabled.stats()["l1"]["enabled"] is False
+    print("✅ PASS: 무효화가 L1/L2 모두 반영")
+
+
+def test_nested_values_isolated():
+    """중첩 컨테이너 수정이 L1 항목이나 single-flight 후행 호출자에게 새지 않음"""
+    print("\n" + "=" * 60)
+    print("4. 중첩 값 격리 테스트")
+    print("=" * 60)
+
+    cache = _manager(L1Cache())
+    cache.set("nested", {"rows": [{"ticker": "AAPL", "tags": ["tech"]}]}, ttl=60)
+    got = cache.get("nested")
+    got["rows"][0]["tags"].append("mutated")
+    got["rows"].append({})
+    assert cache.get("nested") == {"rows": [{"ticker": "AAPL", "tags": ["tech"]}]}
+
+    release = threading.Event()
+
+    @cache.cached(ttl=60, prefix="slow")
+    def slow(name):
+        release.wait(5)
+        return {"name": name, "items": [1, 2]}
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(slow, "x") for _ in range(3)]
+        time.sleep(0.2)
+        release.set()
+        results = [f.result() for f in futures]
+    assert cache.stats()["single_flight"]["coalesced"] == 2
+    for r in results:
+        r["items"].append(3)
+    assert all(r["items"] == [1, 2, 3] for r in results), "호출자끼리 같은 리스트를 공유하지 않음"
+    assert slow("x")["items"] == [1, 2]
+    print("✅ PASS: 중첩 컨테이너도 호출자별 사본")
+
+
+def main():
+    for test in (test_l1_serves_hot_keys, test_eviction_and_ttl, test_invalidation_coherent,
+                 test_nested_values_isolated):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""single-flight 테스트: 같은 키의 동시 미스는 한 번만 계산 (스레드/asyncio) + 합류 카운터"""
+
+import sys
+import os
+import time
+import asyncio
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools.cache_manager import CacheManager, L1Cache
+
+
+def _manager():
+    """임시 디렉토리 CacheManager (싱글톤 우회)"""
+    saved = CacheManager._instance
+    CacheManager._instance = None
+    try:
+        return CacheManager(cache_dir=tempfile.mkdtemp(), l1=L1Cache())
+    finally:
+        CacheManager._instance = saved
+
+
+def test_threads_coalesce():
+    """스레드 10개 동시 미스 → 업스트림 1회"""
+    print("\n" + "=" * 60)
+    print("1. 스레드 single-flight 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    calls = []
+    barrier = threading.Barrier(10)
+
+    @cache.cached(ttl=60, prefix="prices")
+    def get_prices(ticker):
+        calls.append(ticker)
+        time.sleep(0.2)
+        return {"ticker": ticker, "close": [1.0, 2.0]}
+
+    def client(_):
+        barrier.wait()
+        return get_prices("AAPL")
+
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        results = list(pool.map(client, range(10)))
+
+    stats = cache.stats()["single_flight"]
+    print(f"upstream calls: {len(calls)}, single_flight: {stats}")
+    assert calls == ["AAPL"]
+    assert all(r == {"ticker": "AAPL", "close": [1.0, 2.0]} for r in results)
+    assert stats["flights"] == 1 and stats["coalesced"] == 9 and stats["in_flight"] == 0
+    results[0]["ticker"] = "mutated"
+    assert results[1]["ticker"] == "AAPL", "대기자마다 별도 사본"
+    print("✅ PASS: 동시 미스 10건 → 계산 1회")
+
+
+def test_errors_propagate_and_retry():
+    """리더 예외는 대기자에게 전달되고 캐시되지 않음, 옵트아웃 시 합류 없음"""
+    print("\n" + "=" * 60)
+    print("2. 예외 전파 / 옵트아웃 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    calls = []
+    barrier = threading.Barrier(4)
+
+    @cache.cached(ttl=60, prefix="flaky")
+    def flaky(ticker):
+        calls.append(ticker)
+        time.sleep(0.2)
+        if len(calls) == 1:
+            raise ConnectionError("upstream down")
+        return ticker
+
+    def client(_):
+        barrier.wait()
+        try:
+            return flaky("MSFT")
+        except ConnectionError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(client, range(4)))
+    assert len(calls) == 1 and all(isinstance(r, ConnectionError) for r in results)
+    assert flaky("MSFT") == "MSFT" and len(calls) == 2
+
+    plain_calls = []
+
+    @cache.cached(ttl=60, prefix="plain", single_flight=False)
+    def plain(ticker):
+        plain_calls.append(ticker)
+        time.sleep(0.1)
+        return ticker
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        list(pool.map(lambda _: plain("X"), range(3)))
+    assert len(plain_calls) == 3
+    print("✅ PASS: 예외 전파 후 재시도 시 재계산")
+
+
+def test_asyncio_coalesce():
+    """asyncio 태스크 + 다른 스레드의 이벤트 루프가 같은 계산에 합류"""
+    print("\n" + "=" * 60)
+    print("3. asyncio single-flight 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    calls = []
+
+    @cache.cached(ttl=60, prefix="fundamentals")
+    async def fundamentals(ticker):
+        calls.append(ticker)
+        await asyncio.sleep(0.2)
+        return {"ticker": ticker, "roe": 0.2}
+
+    async def burst(n):
+        return await asyncio.gather(*(fundamentals("NVDA") for _ in range(n)))
+
+    other = {}
+    thread = threading.Thread(target=lambda: other.setdefault("r", asyncio.run(burst(3))))
+    thread.start()
+    results = asyncio.run(burst(5))
+    thread.join()
+
+    stats = cache.stats()["single_flight"]
+    print(f"upstream calls: {len(calls)}, single_flight: {stats}")
+    assert calls == ["NVDA"]
+    assert all(r == {"ticker": "NVDA", "roe": 0.2} for r in results + other["r"])
+    assert stats["coalesced"] == 7 and stats["in_flight"] == 0
+    assert asyncio.run(fundamentals("NVDA")) == {"ticker": "NVDA", "roe": 0.2} and len(calls) == 1
+    print("✅ PASS: 루프/스레드 간 계산 1회")
+
+
+def main():
+    for test in (test_threads_coalesce, test_errors_propagate_and_retry, test_asyncio_coalesce):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""stale-while-revalidate 테스트: soft TTL 이후 stale 즉시 반환 + 백그라운드 갱신, hard TTL 이후 차단 조회"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools import cache_manager as cm
+from mcp_server.tools.cache_manager import SWR, TTL, CacheManager, L1Cache
+
+
+def _manager():
+    """임시 디렉토리 CacheManager (싱글톤 우회)"""
+    saved = CacheManager._instance
+    CacheManager._instance = None
+    try:
+        return CacheManager(cache_dir=tempfile.mkdtemp(), l1=L1Cache())
+    finally:
+        CacheManager._instance = saved
+
+
+def _wait_idle(cache, timeout=3.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        r = cache.refresh_stats()
+        if r["queued"] == 0 and r["running"] == 0:
+            return
+        time.sleep(0.02)
+    raise AssertionError("refresh did not finish")
+
+
+def test_stale_served_then_refreshed():
+    """soft 이후: 즉시 stale 반환, 갱신 1회, 이후 신선한 값"""
+    print("\n" + "=" * 60)
+    print("1. stale 즉시 반환 + 백그라운드 갱신 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    calls = []
+
+    @cache.cached(ttl=SWR(soft=1, hard=60), prefix="metrics")
+    def metrics(ticker):
+        calls.append(ticker)
+        time.sleep(0.3)
+        return {"ticker": ticker, "version": len(calls)}
+
+    assert metrics("AAPL")["version"] == 1
+    assert cache.get_swr(cache._make_key("metrics", "AAPL")) == ({"ticker": "AAPL", "version": 1}, False)
+    time.sleep(1.05)
+
+    start = time.perf_counter()
+    results = [metrics("AAPL") for _ in range(5)]
+    elapsed = time.perf_counter() - start
+    print(f"stale 5회 응답: {elapsed * 1000:.1f}ms, refresh: {cache.refresh_stats()}")
+    assert all(r["version"] == 1 for r in results)
+    assert elapsed < 0.2, "stale 값은 업스트림 지연 없이 반환"
+    _wait_idle(cache)
+
+    stats = cache.refresh_stats()
+    assert len(calls) == 2, "키당 갱신 1회"
+    assert stats["completed"] == 1 and stats["stale_served"] == 5
+    assert metrics("AAPL")["version"] == 2
+    assert cache.stats()["refresh"]["queued"] == 0
+    print("✅ PASS: stale 반환 후 1회 갱신")
+
+
+def test_hard_ttl_blocks():
+    """hard 이후: 값이 없으므로 호출자가 직접 계산"""
+    print("\n" + "=" * 60)
+    print("2. hard TTL 만료 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    calls = []
+
+    @cache.cached(ttl=SWR(soft=0, hard=1), prefix="quote")
+    def quote(ticker):
+        calls.append(ticker)
+        return len(calls)
+
+    assert quote("X") == 1
+    time.sleep(1.1)
+    assert quote("X") == 2 and cache.refresh_stats()["stale_served"] == 0
+
+    cache.set("plain", {"a": 1}, ttl=60)
+    assert cache.get_swr("plain") == ({"a": 1}, False)
+    cache.set("swr", [1, 2], ttl=SWR(soft=0, hard=60))
+    assert cache.get("swr") == [1, 2] and cache.get_swr("swr") == ([1, 2], True)
+    assert isinstance(TTL.METRICS_SWR, SWR) and TTL.METRICS_SWR.soft == TTL.METRICS
+    print("✅ PASS: hard 만료 시 차단 조회, get 은 값만 반환")
+
+
+def test_refresh_queue_bounded():
+    """대기열 상한 초과 시 갱신 생략 (stale 은 계속 반환)"""
+    print("\n" + "=" * 60)
+    print("3. 갱신 대기열 상한 테스트")
+    print("=" * 60)
+
+    cache = _manager()
+    gate = threading.Event()
+    saved = (cm.CACHE_REFRESH_WORKERS, cm.CACHE_REFRESH_MAX_QUEUE)
+    cm.CACHE_REFRESH_WORKERS, cm.CACHE_REFRESH_MAX_QUEUE = 1, 2
+    try:
+        scheduled = [cache.refresh_in_background(f"k{i}", gate.wait) for i in range(5)]
+        time.sleep(0.1)
+        stats = cache.refresh_stats()
+        print(f"scheduled: {scheduled}, refresh: {stats}")
+        assert scheduled == [True, True, True, False, False]
+        assert stats["running"] == 1 and stats["queued"] == 2 and stats["dropped"] == 2
+        assert cache.refresh_in_background("k0", gate.wait) is False, "같은 키 중복 예약 안 함"
+        gate.set()
+        _wait_idle(cache)
+        assert cache.refresh_stats()["completed"] == 3
+    finally:
+        cm.CACHE_REFRESH_WORKERS, cm.CACHE_REFRESH_MAX_QUEUE = saved
+    print("✅ PASS: 대기열 깊이 노출 및 상한 적용")
+
+
+def main():
+    for test in (test_stale_served_then_refreshed, test_hard_ttl_blocks, test_refresh_queue_bounded):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""FactorAggregator 병렬 팩터 파이프라인 테스트: VIX 1회, 그룹별 동시 실행 한도, 순차 결과와 동일 (네트워크 불필요)"""
+
+import sys
+import os
+import json
+import math
+import time
+import threading
+sys.path.insert(0, os.path.dirname(__file__))
+
+import pandas as pd
+
+from mcp_server.tools.factor_aggregator import FactorAggregator
+from mcp_server.tools.sentiment_analysis import SentimentFactors
+
+TICKERS = [f"P{i:02d}" for i in range(12)]
+LIMITS = {"financial": 3, "technical": 2, "sentiment": 2}
+DELAY = 0.02
+
+
+class _FakeUpstream:
+    """그룹별 지연 + 동시 실행 수/VIX 조회 횟수 기록"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {f: 0 for f in FactorAggregator.FACTOR_FAMILIES}
+        self.peak = dict(self.active)
+        self.vix_calls = 0
+        self.vix_seen = set()
+        self.prefetched = []
+
+    def fetch_family(self, family, ticker, market="US", market_vix=None):
+        with self.lock:
+            self.active[family] += 1
+            self.peak[family] = max(self.peak[family], self.active[family])
+            if family == "sentiment":
+                self.vix_seen.add(market_vix)
+        try:
+            time.sleep(DELAY)
+            i = int(ticker[1:])
+            if family == "sentiment" and ticker == "P07":
+                raise ConnectionError("news upstream down")
+            if family == "technical" and i % 5 == 0:
+                return None   # 가격 이력 없음
+            if family == "technical" and ticker == "P03":
+                raise ValueError("bad bars")   # 기술적 실패는 생략
+            if family == "financial":
+                return {"ROE": 0.01 * i, "Debt_to_Equity": 0.5 + i % 3}
+            if family == "technical":
+                return {"RSI": 40.0 + i, "ADX": 15.0 + 2 * i}
+            return {"News_Sentiment": math.cos(i), "VIX_Level": market_vix}
+        finally:
+            with self.lock:
+                self.active[family] -= 1
+
+    def fetch_market_vix(self):
+        with self.lock:
+            self.vix_calls += 1
+        time.sleep(DELAY)
+        return 18.5
+
+    def prefetch_prices(self, tickers, market="US"):
+        self.prefetched.append(list(tickers))
+
+    def __enter__(self):
+        self.saved = (FactorAggregator.fetch_family, SentimentFactors.fetch_market_vix, FactorAggregator.prefetch_prices)
+        FactorAggregator.fetch_family = staticmethod(self.fetch_family)
+        SentimentFactors.fetch_market_vix = staticmethod(self.fetch_market_vix)
+        FactorAggregator.prefetch_prices = staticmethod(self.prefetch_prices)
+        return self
+
+    def __exit__(self, *exc):
+        FactorAggregator.fetch_family = staticmethod(self.saved[0])
+        SentimentFactors.fetch_market_vix = staticmethod(self.saved[1])
+        FactorAggregator.prefetch_prices = staticmethod(self.saved[2])
+        return False
+
+
+def test_staged_collection():
+    """VIX 1회 조회, 그룹별 동시 실행 한도, 실패 처리, 단계별 소요 시간"""
+    print("\n" + "=" * 60)
+    print("1. 단계별 병렬 팩터 수집 테스트")
+    print("=" * 60)
+
+    with _FakeUpstream() as up:
+        timings = {}
+        groups, errors = FactorAggregator.collect_factor_groups_many(TICKERS, limits=LIMITS, stage_timings=timings)
+        print(f"peak concurrency: {up.peak}, timings: {timings}")
+
+        assert up.vix_calls == 1 and up.vix_seen == {18.5}, "VIX 는 요청당 1회, 모든 감성 작업이 공유"
+        assert up.peak == LIMITS, "그룹별 동시 실행 한도"
+        assert list(errors) == ["P07"] and "P07" not in groups, "감성 실패는 종목 에러"
+        assert "technical" not in groups["P03"] and "technical" not in groups["P05"], "기술적 실패/결측은 생략"
+        assert groups["P04"]["sentiment"]["VIX_Level"] == 18.5
+        assert {"market", "prices", "financial", "technical", "sentiment", "fetch"} <= set(timings)
+        assert up.prefetched == [TICKERS], "기술적 지표 가격은 일괄 조회 1회"
+
+        single = FactorAggregator.collect_factor_groups("P04")
+        assert single == groups["P04"]
+        try:
+            FactorAggregator.collect_factor_groups("P07")
+            raise AssertionError("P07 should raise")
+        except ConnectionError:
+            pass
+
+        up.vix_calls = 0
+        FactorAggregator.collect_factor_groups_many(TICKERS, include_sentiment=False)
+        assert up.vix_calls == 0, "감성 팩터를 빼면 VIX 조회 없음"
+        FactorAggregator.collect_factor_groups_many(TICKERS, include_technical=False)
+        assert len(up.prefetched) == 2, "기술적 지표를 빼면 가격 일괄 조회 없음"
+    print("✅ PASS: 시장 입력 1회 + 그룹별 한도")
+
+
+def test_parallel_matches_sequential():
+    """병렬 랭킹 결과 = 그룹별 동시 실행 1 (순차) 결과, 병렬이 더 빠름"""
+    print("\n" + "=" * 60)
+    print("2. 병렬 랭킹 = 순차 랭킹 테스트")
+    print("=" * 60)
+
+    with _FakeUpstream():
+        from mcp_server.config import FACTOR_FETCH_LIMITS
+        from mcp_server.tools import factor_aggregator as fa
+
+        timings = {}
+        t0 = time.perf_counter()
+        parallel = FactorAggregator.rank_stocks(TICKERS, use_snapshot=False, stage_timings=timings)
+        parallel_sec = time.perf_counter() - t0
+
+        original = fa.FactorAggregator.collect_factor_groups_many
+        sequential_limits = {f: 1 for f in FactorAggregator.FACTOR_FAMILIES}
+
+        def sequential(*args, **kwargs):
+            kwargs["limits"] = sequential_limits
+            return original(*args, **kwargs)
+
+        FactorAggregator.collect_factor_groups_many = staticmethod(sequential)
+        try:
+            t0 = time.perf_counter()
+            serial = FactorAggregator.rank_stocks(TICKERS, use_snapshot=False)
+            serial_sec = time.perf_counter() - t0
+        finally:
+            FactorAggregator.collect_factor_groups_many = staticmethod(original)
+
+    print(f"limits: {FACTOR_FETCH_LIMITS}, parallel: {parallel_sec:.3f}s, sequential: {serial_sec:.3f}s")
+    print(f"stage timings: {timings}")
+    assert json.dumps(parallel, sort_keys=True) == json.dumps(serial, sort_keys=True)
+    assert [r["ticker"] for r in parallel if "error" in r] == ["P07"]
+    assert {"snapshot", "market", "fetch", "scoring", "total"} <= set(timings)
+    assert parallel_sec < serial_sec
+    print("✅ PASS: 결과 동일 + 병렬 수집")
+
+
+def test_technical_reads_price_store():
+    """기술적 그룹은 yfinance 직접 호출 대신 get_price_history (PriceStore) 경유"""
+    print("\n" + "=" * 60)
+    print("3. 기술적 지표 가격 경로 테스트")
+    print("=" * 60)
+
+    from mcp_server.tools import market_data
+    calls = []
+
+    def history(ticker, period="1y", market=None):
+        calls.append((ticker, period, market))
+        return pd.DataFrame()
+
+    saved = market_data.get_price_history
+    market_data.get_price_history = history
+    try:
+        assert FactorAggregator.fetch_family("technical", "AAPL") is None, "가격 이력이 없으면 None"
+        FactorAggregator.fetch_family("technical", "005930", market="KR")
+    finally:
+        market_data.get_price_history = saved
+    print(f"calls: {calls}")
+    assert calls == [("AAPL", "6mo", None), ("005930", "6mo", "KR")]
+    print("✅ PASS: 기술적 지표가 공유 가격 저장소를 사용")
+
+
+def main():
+    for test in (test_staged_collection, test_parallel_matches_sequential, test_technical_reads_price_store):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""팩터 스냅샷 테스트: 컬럼형 저장/as-of 조회/원자적 교체, 스냅샷 랭킹 = 실시간 랭킹 (네트워크 불필요)"""
+
+import sys
+import os
+import json
+import math
+import asyncio
+import tempfile
+import threading
+from datetime import date, timedelta
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from mcp_server.tools import factor_snapshot as fs
+from mcp_server.tools import ranking_engine as re_
+from mcp_server.tools.factor_aggregator import FactorAggregator
+from mcp_server.tools.sentiment_analysis import SentimentFactors
+from mcp_server.tools.ranking_engine import FACTORS, AdvancedRankingEngine, FactorScores
+
+TICKERS = [f"T{i:02d}" for i in range(12)]
+SECTORS = ["Technology", "Energy", "Utilities", None]
+
+
+def _fake_factors(tickers):
+    """종목 이름으로 결정되는 원시 팩터 (일부 결측 포함)"""
+    factors, dips = [], []
+    for t in tickers:
+        i = int(t[1:])
+        rng = np.random.default_rng(i)
+        vals = {name: float(rng.normal(0, 1)) for name in FACTORS}
+        if i % 5 == 0:
+            vals["valuation"] = None
+        raw = {m: (None if m == "roic" else float(rng.normal())) for m in fs.RAW_METRICS}
+        factors.append(FactorScores(ticker=t, sector=SECTORS[i % 4], raw_metrics=raw, **vals))
+        dips.append(float(rng.random()))
+    return factors, dips
+
+
+def _fake_groups(ticker, market="US", include_technical=True, include_financial=True, include_sentiment=True):
+    i = int(ticker[1:])
+    if ticker == "T11":
+        raise ConnectionError("sentiment upstream down")
+    groups = {}
+    if include_financial:
+        groups["financial"] = {"ROE": 0.02 * i, "Debt_to_Equity": float("nan") if i % 3 == 0 else 0.1 * i}
+    if include_technical and i % 4 != 0:   # 가격 없음 → 기술적 그룹 없음
+        groups["technical"] = {"RSI": 30.0 + 3 * i, "ADX": 10.0 + i}
+    if include_sentiment:
+        groups["sentiment"] = {"News_Sentiment": math.sin(i), "News_Volume": 5.0 * i}
+    return groups
+
+
+def _fake_family(family, ticker, market="US", market_vix=None):
+    if ticker == "T11" and family == "sentiment":
+        raise ConnectionError("sentiment upstream down")
+    return _fake_groups(ticker).get(family)
+
+
+class _Patched:
+    """수집 함수/싱글톤을 가짜로 교체 (그룹 수집 호출 종목 기록)"""
+
+    def __enter__(self):
+        self.calls = {"ranking": [], "groups": []}
+        self.saved = (re_._engine, fs._snapshot_store, FactorAggregator.fetch_family, SentimentFactors.fetch_market_vix,
+                      FactorAggregator.prefetch_prices)
+        engine = AdvancedRankingEngine()
+        lock = threading.Lock()
+
+        def collect(tickers):
+            self.calls["ranking"].append(list(tickers))
+            return _fake_factors(tickers)
+
+        def family(name, ticker, *args, **kwargs):
+            with lock:
+                self.calls["groups"].append(ticker)
+            return _fake_family(name, ticker, *args, **kwargs)
+
+        engine.collect_factors = collect
+        re_._engine = engine
+        FactorAggregator.fetch_family = staticmethod(family)
+        SentimentFactors.fetch_market_vix = staticmethod(lambda: 20.0)
+        FactorAggregator.prefetch_prices = staticmethod(lambda tickers, market="US": None)
+        self.store = fs._snapshot_store = fs.FactorSnapshotStore(root=tempfile.mkdtemp())
+        return self
+
+    def __exit__(self, *exc):
+        re_._engine, fs._snapshot_store = self.saved[:2]
+        FactorAggregator.fetch_family = staticmethod(self.saved[2])
+        SentimentFactors.fetch_market_vix = staticmethod(self.saved[3])
+        FactorAggregator.prefetch_prices = staticmethod(self.saved[4])
+        return False
+
+
+def test_build_and_asof_lookup():
+    """컬럼형 저장 + memory map 로드 + as-of 선택 + 같은 날짜 재빌드 교체 + 보관 개수"""
+    print("\n" + "=" * 60)
+    print("1. 스냅샷 빌드 / as-of 조회 테스트")
+    print("=" * 60)
+
+    with _Patched() as p:
+        summary = fs.build_factor_snapshot(TICKERS, asof="2026-03-02")
+        print(f"build: {summary}")
+        assert summary["tickers"] == 12 and summary["ranking_ok"] == 12 and summary["aggregator_ok"] == 11
+        assert list(summary["failed"]) == ["T11"]
+        assert len(p.calls["ranking"]) == 1, "랭킹 팩터는 배치 1회 수집"
+
+        snap = p.store.load("2026-03-02")
+        assert isinstance(snap.values, np.memmap) and snap.values.shape == (summary["columns"], 12)
+        df = snap.frame(["rank.growth", "financial.ROE", "technical.RSI"])
+        assert df.loc["T03", "financial.ROE"] == 0.06 and np.isnan(df.loc["T04", "technical.RSI"])
+        assert np.isnan(snap.column("financial.Debt_to_Equity")[3])
+
+        fs.build_factor_snapshot(TICKERS[:4], asof="2026-03-04", include_aggregator=False)
+        assert p.store.dates() == ["2026-03-02", "2026-03-04"]
+        assert p.store.load("2026-03-03").asof == "2026-03-02"
+        assert p.store.load("2026-03-05").asof == "2026-03-04"
+        assert p.store.load("2026-03-01") is None
+        assert p.store.load("2026-03-20", max_age_days=4) is None
+        assert p.store.load("2026-03-02", market="KR") is None
+
+        # 같은 날짜 재빌드는 교체 (열린 스냅샷은 그대로 읽힘)
+        old = p.store.load("2026-03-04")
+        fs.build_factor_snapshot(TICKERS[:6], asof="2026-03-04", include_aggregator=False)
+        assert len(p.store.load("2026-03-04")) == 6 and len(old) == 4
+        assert float(old.column("rank.dip_bonus")[0]) == _fake_factors(["T00"])[1][0]
+        assert not [n for n in os.listdir(p.store.root) if n.startswith(".")], "임시 디렉토리 정리"
+
+        assert p.store.prune(1) == 1 and p.store.dates() == ["2026-03-04"]
+    print("✅ PASS: 날짜별 버전 + as-of 조회")
+
+
+def test_rankers_serve_from_snapshot():
+    """스냅샷 랭킹 = 실시간 랭킹, 스냅샷에 없는 종목만 실시간 수집"""
+    print("\n" + "=" * 60)
+    print("2. 랭커 스냅샷 서빙 테스트")
+    print("=" * 60)
+
+    today = date.today().isoformat()
+    request = TICKERS[2:] + ["T40", "T41"]
+    with _Patched() as p:
+        fs.build_factor_snapshot(TICKERS, asof=today)
+        engine = re_.get_ranking_engine()
+
+        p.calls["ranking"].clear()
+        served = engine.rank_sync(request)
+        assert p.calls["ranking"] == [["T40", "T41"]], "스냅샷 밖 종목만 수집"
+        assert engine.last_snapshot_stats == {"asof": today, "hits": 10, "live": 2}
+        live = engine.rank_sync(request, use_snapshot=False)
+        assert served == live
+        assert asyncio.run(engine.rank_async(TICKERS[:5])) == engine.rank_sync(TICKERS[:5], use_snapshot=False)
+        assert engine.last_snapshot_stats == {}
+
+        # 과거 기준일: 그 이전 스냅샷이 없으면 전 종목 실시간
+        p.calls["ranking"].clear()
+        engine.rank_sync(TICKERS[:3], asof=(date.today() - timedelta(days=30)).isoformat())
+        assert p.calls["ranking"] == [TICKERS[:3]]
+
+        p.calls["groups"].clear()
+        for flags in ({}, {"include_technical": False}, {"include_sentiment": False, "include_financial": False}):
+            served = FactorAggregator.rank_stocks(request, **flags)
+            live = FactorAggregator.rank_stocks(request, use_snapshot=False, **flags)
+            assert json.dumps(served, sort_keys=True) == json.dumps(live, sort_keys=True), flags
+        print(f"aggregator live calls with snapshot: {sorted(set(p.calls['groups'][:9]))} ...")
+        assert sorted(set(p.calls["groups"][:9])) == ["T11", "T40", "T41"], "실패 종목 T11 은 실시간 재시도"
+        assert FactorAggregator.rank_stocks(["T03"], market="KR", use_snapshot=True) and p.calls["groups"][-1] == "T03"
+
+        from mcp_server.tools.theme_factor_integrator import ThemeFactorIntegrator
+        p.calls["groups"].clear()
+        ranked = ThemeFactorIntegrator.rank_theme_stocks(TICKERS[:4], asof=today)
+        assert len(ranked) == 4 and p.calls["groups"] == []
+    print("✅ PASS: 스냅샷 결과 = 실시간 결과")
+
+
+def main():
+    for test in (test_build_and_asof_lookup, test_rankers_serve_from_snapshot):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
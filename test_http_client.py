@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""공유 HTTP 클라이언트 풀 테스트: keep-alive 연결 재사용, 호스트별 연결 한도, 비동기 face, 재시도/서킷 브레이커 (로컬 서버)"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+import requests
+
+from mcp_server.tools import http_client as hc
+from mcp_server.tools.resilience import CircuitBreaker, CircuitOpenError, retry_with_backoff
+
+
+class _Server:
+    """HTTP/1.1 keep-alive 로컬 서버 - 연결 수 / 동시 처리 수 / 경로별 응답 기록"""
+
+    def __init__(self, delay=0.0):
+        state = self
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.active = 0
+        self.peak = 0
+        self.hits = {}
+        self.fail_first = set()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with state.lock:
+                    state.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body_in = self.rfile.read(length) if length else b""
+                with state.lock:
+                    state.active += 1
+                    state.peak = max(state.peak, state.active)
+                    n = state.hits[self.path] = state.hits.get(self.path, 0) + 1
+                time.sleep(state.delay)
+                with state.lock:
+                    state.active -= 1
+                status = 503 if self.path in state.fail_first and n == 1 else 200
+                body = json.dumps({"path": self.path, "n": n, "echo": body_in.decode()}).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = _reply
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.saved = hc._pool
+        hc._pool = hc.HttpClientPool(max_per_host=8, host_limits={"127.0.0.1": 3})
+        return self
+
+    def __exit__(self, *exc):
+        hc._pool.close()
+        hc._pool = self.saved
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        return False
+
+
+def test_keepalive_reuse():
+    """순차 요청은 연결 1개 재사용 (requests.get 은 요청마다 새 연결)"""
+    print("\n" + "=" * 60)
+    print("1. keep-alive 연결 재사용 테스트")
+    print("=" * 60)
+
+    with _Server() as srv:
+        for i in range(20):
+            r = hc.http_get(f"{srv.url}/quote", params={"i": i}, timeout=5)
+            r.raise_for_status()
+        pooled = srv.connections
+        r = hc.http_post(f"{srv.url}/post", json={"a": 1}, timeout=5)
+        assert json.loads(r.json()["echo"]) == {"a": 1}
+
+        before = srv.connections
+        for i in range(20):
+            requests.get(f"{srv.url}/quote", timeout=5)
+        unpooled = srv.connections - before
+        print(f"connections for 20 requests: pooled={pooled}, requests.get={unpooled}")
+        assert pooled == 1 and unpooled == 20
+
+        with hc.http_stream("GET", f"{srv.url}/stream", timeout=5) as resp:
+            lines = list(resp.iter_lines())
+        assert json.loads(lines[0])["path"] == "/stream"
+        stats = hc.get_http_pool().stats()
+        assert stats["hosts"] == [srv.url] and stats["requests"] == 22
+    print("✅ PASS: 연결 재사용")
+
+
+def test_per_host_limit_sync_and_async():
+    """호스트별 연결 한도 (동기 스레드 / 비동기 gather 모두)"""
+    print("\n" + "=" * 60)
+    print("2. 호스트별 연결 한도 테스트")
+    print("=" * 60)
+
+    with _Server(delay=0.05) as srv:
+        with ThreadPoolExecutor(max_workers=12) as pool:
+            results = list(pool.map(lambda i: hc.http_get(f"{srv.url}/s{i}", timeout=10).status_code, range(24)))
+        assert results == [200] * 24
+        print(f"sync: peak={srv.peak}, connections={srv.connections}")
+        assert srv.peak <= 3 and srv.connections <= 3
+
+        srv.peak = 0
+
+        async def run():
+            responses = await asyncio.gather(*(hc.async_get(f"{srv.url}/a{i}", timeout=10) for i in range(24)))
+            await hc.get_http_pool().aclose()
+            return [r.json()["path"] for r in responses]
+
+        t0 = time.perf_counter()
+        paths = asyncio.run(run())
+        elapsed = time.perf_counter() - t0
+        print(f"async: peak={srv.peak}, elapsed={elapsed:.2f}s")
+        assert paths == [f"/a{i}" for i in range(24)]
+        assert srv.peak <= 3 and elapsed < 24 * 0.05, "동시 실행 (한도 내)"
+        assert hc.get_http_pool().stats()["open_async_clients"] == 0
+    print("✅ PASS: 호스트별 한도")
+
+
+def test_resilience_on_top():
+    """retry_with_backoff / CircuitBreaker 가 풀 위에서 동기·비동기로 동작"""
+    print("\n" + "=" * 60)
+    print("3. 재시도 / 서킷 브레이커 테스트")
+    print("=" * 60)
+
+    with _Server() as srv:
+        srv.fail_first = {"/flaky", "/aflaky"}
+
+        @retry_with_backoff(attempts=2, min_wait=0, max_wait=0)
+        def fetch(path):
+            r = hc.http_get(srv.url + path, timeout=5)
+            r.raise_for_status()
+            return r.json()
+
+        @retry_with_backoff(attempts=2, min_wait=0, max_wait=0)
+        async def afetch(path):
+            r = await hc.async_get(srv.url + path, timeout=5)
+            r.raise_for_status()
+            return r.json()
+
+        assert fetch("/flaky")["n"] == 2
+        assert asyncio.run(afetch("/aflaky"))["n"] == 2
+
+        breaker = CircuitBreaker(name="test-http", failure_threshold=2, reset_timeout=60)
+
+        @breaker
+        async def down():
+            r = await hc.async_get("http://127.0.0.1:1/unreachable", timeout=1)
+            return r.status_code
+
+        for _ in range(2):
+            try:
+                asyncio.run(down())
+                raise AssertionError("should fail")
+            except httpx.TransportError:
+                pass
+        try:
+            asyncio.run(down())
+            raise AssertionError("circuit should be open")
+        except CircuitOpenError:
+            pass
+        assert breaker.get_status()["state"] == "open"
+    print("✅ PASS: 재시도 + 서킷 브레이커")
+
+
+def test_async_clients_closed_with_loop():
+    """호출마다 새 루프(asyncio.run / 툴 워커)를 써도 루프 종료 시 AsyncClient 를 닫아 누적되지 않음"""
+    print("\n" + "=" * 60)
+    print("4. 루프별 비동기 클라이언트 정리 테스트")
+    print("=" * 60)
+
+    from mcp_server.tools.tool_executor import _run_in_worker
+
+    with _Server() as srv:
+        async def quote(i):
+            r = await hc.async_get(f"{srv.url}/q{i}", timeout=5)
+            return r.status_code
+
+        statuses = [asyncio.run(quote(i)) for i in range(5)]
+        statuses += [_run_in_worker(quote, (i,), {}) for i in range(5, 10)]
+        pool = hc.get_http_pool()
+        stats = pool.stats()
+        print(f"stats: {stats}")
+        assert statuses == [200] * 10
+        assert stats["async_clients"] == stats["async_closed"] == 10
+        assert stats["open_async_clients"] == 0 and not pool._async and not pool._janitors
+    print("✅ PASS: 루프가 끝나면 비동기 클라이언트도 닫힘")
+
+
+def main():
+    for test in (test_keepalive_reuse, test_per_host_limit_sync_and_async, test_resilience_on_top,
+                 test_async_clients_closed_with_loop):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
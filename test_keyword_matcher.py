@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""컴파일된 키워드 매처 테스트: 기존 `keyword in text` 루프와 같은 점수/매칭 키워드, 일괄 분석, 처리량 출력 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import random
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools import keyword_matcher as km
+from mcp_server.tools.keyword_matcher import KeywordMatcher
+from mcp_server.tools.news_sentiment import (
+    IMPACT_KEYWORDS, SENTIMENT_KEYWORDS, NewsSentimentAnalyzer, analyze_news_sentiment,
+)
+
+_KEYWORDS = sorted({kw for table in (SENTIMENT_KEYWORDS, IMPACT_KEYWORDS)
+                    for data in table.values() for kw in data["keywords"]})
+_FILLER = ["the", "company", "again", "shares", "quarter", "Nvidia", "unsecured", "overall", "said", "—", "주가"]
+
+
+def _text(r, words=(8, 60)):
+    """키워드 (대문자 섞기, 단어 중간에 붙이기) + 잡음 단어"""
+    out = []
+    for _ in range(r.randint(*words)):
+        word = r.choice(_KEYWORDS) if r.random() < 0.3 else r.choice(_FILLER)
+        if r.random() < 0.2:
+            word = word.upper()
+        out.append(word + r.choice(["", "", "s", "ing"]) if r.random() < 0.9 else "x" + word)
+    return " ".join(out)
+
+
+def _reference_sentiment(text):
+    """기존 구현 (카테고리 × 키워드 루프)"""
+    if not text:
+        return {"sentiment": "neutral", "score": 0.0, "confidence": 0.0}
+    text_lower = text.lower()
+    matched = [{"keyword": kw, "category": c, "score": d["score"]}
+               for c, d in SENTIMENT_KEYWORDS.items() for kw in d["keywords"] if kw in text_lower]
+    scores = [m["score"] for m in matched]
+    avg = sum(scores) / len(scores) if scores else 0.0
+    confidence = min(1.0, len(scores) / 5) if scores else 0.2
+    label = ("positive" if avg > 0.5 else "somewhat_positive" if avg > 0.1 else "negative" if avg < -0.5
+             else "somewhat_negative" if avg < -0.1 else "neutral")
+    return {"sentiment": label, "score": round(avg, 3), "confidence": round(confidence, 2),
+            "matched_keywords": matched[:10]}
+
+
+def _reference_impact(text):
+    if not text:
+        return {"impact": "low", "score": 0.0, "factors": []}
+    text_lower = text.lower()
+    factors = [{"keyword": kw, "level": lv, "weight": d["weight"]}
+               for lv, d in IMPACT_KEYWORDS.items() for kw in d["keywords"] if kw in text_lower]
+    weights = [f["weight"] for f in factors]
+    score = (max(weights) + sum(weights) / len(weights)) / 2 if weights else 0.3
+    level = "high" if score >= 0.8 else "medium" if score >= 0.5 else "low"
+    return {"impact": level, "score": round(score, 2), "factors": factors[:5]}
+
+
+def test_same_as_substring_loop():
+    """무작위 텍스트 2000개에서 기존 루프와 결과 완전히 동일 (겹치는/접두 키워드, 단어 내부 매칭 포함)"""
+    print("\n" + "=" * 60)
+    print("1. 기존 루프와 결과 일치 테스트")
+    print("=" * 60)
+
+    r = random.Random(3)
+    texts = [_text(r) for _ in range(2000)] + ["", None, "Beat Expectations again", "SEC probe; unsecured gains"]
+    analyzer = NewsSentimentAnalyzer()
+    for text in texts:
+        assert analyzer.analyze_text(text) == _reference_sentiment(text), text
+        assert analyzer.analyze_impact(text) == _reference_impact(text), text
+
+    batch = analyzer.analyze_many(texts)
+    for text, result in zip(texts, batch):
+        impact = _reference_impact(text)
+        assert result == {**_reference_sentiment(text), "impact": impact["impact"],
+                          "impact_score": impact["score"], "impact_factors": impact["factors"]}
+
+    hit = [m["keyword"] for m in analyzer.analyze_text("Beat Expectations again")["matched_keywords"]]
+    assert hit == ["beat expectations", "gain", "beat"], hit
+
+    matcher = KeywordMatcher([("ab", 1), ("abc", 2), ("b", 3), ("ab", 4), ("a.c", 5)])
+    assert matcher.find("xabcx") == [("ab", 1), ("abc", 2), ("b", 3), ("ab", 4)]
+    assert matcher.find_many(["a.c", "", "ab"]) == [[("a.c", 5)], [], [("ab", 1), ("b", 3), ("ab", 4)]]
+    assert KeywordMatcher([]).find("anything") == []
+
+    lowered = [(t or "").lower() for t in texts[:300]]
+    expected = KeywordMatcher(matcher.entries + [("beat", 6), ("gain", 7)]).find_many(lowered)
+    saved, km._MEMO_MAX = km._MEMO_MAX, 0
+    try:
+        capped = KeywordMatcher(matcher.entries + [("beat", 6), ("gain", 7)])
+        assert capped.find_many(lowered) == expected, "메모 상한 초과 시에도 동일"
+        assert not capped._hot and not capped._cold
+    finally:
+        km._MEMO_MAX = saved
+    print("✅ PASS: 기존 루프와 결과 일치")
+
+
+def test_news_items_batch_and_throughput():
+    """analyze_news_items == analyze_news_item 반복 (기존 루프 대비 처리량은 출력만)"""
+    print("\n" + "=" * 60)
+    print("2. 뉴스 일괄 분석 / 처리량 테스트")
+    print("=" * 60)
+
+    r = random.Random(4)
+    news = [{"title": _text(r, (5, 12)), "snippet": _text(r, (20, 60)), "id": i} for i in range(3000)]
+    news += [{"title": "", "snippet": ""}, {"summary": "Profit warning"}, {"title": None}]
+    analyzer = NewsSentimentAnalyzer()
+
+    t0 = time.perf_counter()
+    batch = analyzer.analyze_news_items(news)
+    t_batch = time.perf_counter() - t0
+    assert batch == [analyzer.analyze_news_item(n) for n in news]
+
+    t0 = time.perf_counter()
+    for n in news:
+        text = f"{n.get('title', '')} {n.get('snippet', '') or n.get('summary', '')}"
+        _reference_sentiment(text), _reference_sentiment(n.get("title", "")), _reference_impact(text)
+    t_loop = time.perf_counter() - t0
+
+    print(f"{len(news)} articles: loop {len(news) / t_loop:,.0f}/s, compiled {len(news) / t_batch:,.0f}/s "
+          f"({t_loop / t_batch:.1f}x)")
+
+    summary = analyze_news_sentiment(news[:50], deduplicate=False)
+    assert summary["total"] == 50 and summary["items"]
+    print("✅ PASS: 뉴스 일괄 분석")
+
+
+def main():
+    for test in (test_same_as_substring_loop, test_news_items_batch_and_throughput):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
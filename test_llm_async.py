@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""비동기 Gemini 클라이언트 테스트: 스트리밍 델타, 동시 요청 한도, 지연 예산 헤지, 모델별 TTFT/tokens/sec (네트워크 불필요)"""
+
+import sys
+import os
+import json
+import time
+import asyncio
+sys.path.insert(0, os.path.dirname(__file__))
+
+import httpx
+
+from mcp_server.tools import http_client as hc
+from mcp_server.tools import llm
+from mcp_server.tools import llm_async as la
+from mcp_server.tools.resilience import circuit_gemini
+
+
+class _FakeGemini:
+    """streamGenerateContent SSE 대역 - 모델별 첫 토큰 지연 / 상태 코드, 동시 요청 수 기록"""
+
+    def __init__(self, models):
+        self.models = models          # {model: (ttft_sec, status, chunks)}
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        model = request.url.path.rsplit("/", 1)[-1].split(":")[0]
+        ttft, status, chunks = self.models[model]
+        self.calls.append(model)
+        body = json.loads(request.content)
+        assert body["contents"][0]["parts"][0]["text"] and request.url.params["alt"] == "sse"
+        if status != 200:
+            return httpx.Response(status, json={"error": {"code": status}})
+        fake = self
+
+        async def sse():
+            fake.active += 1
+            fake.peak = max(fake.peak, fake.active)
+            try:
+                await asyncio.sleep(ttft)
+                for i, text in enumerate(chunks):
+                    obj = {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+                    if i == len(chunks) - 1:
+                        obj["usageMetadata"] = {"candidatesTokenCount": 10 * len(chunks)}
+                    yield f"data: {json.dumps(obj)}\r\n\r\n".encode()
+                    await asyncio.sleep(0.01)
+            finally:
+                fake.active -= 1
+
+        return httpx.Response(200, headers={"Content-Type": "text/event-stream"}, content=sse())
+
+    def __enter__(self):
+        self.saved = (hc._pool, la._stats, la._client)
+        hc._pool = hc.HttpClientPool(async_transport=httpx.MockTransport(self.handler))
+        la._stats = la.LLMStats()
+        la._client = la.AsyncGeminiClient(max_concurrent=2, hedge_after=0.2, stats=la._stats)
+        circuit_gemini.reset()
+        return self
+
+    def __exit__(self, *exc):
+        hc._pool, la._stats, la._client = self.saved
+        circuit_gemini.reset()
+        return False
+
+
+def test_stream_and_stats():
+    """델타 순서대로 yield, TTFT / tokens/sec 기록"""
+    print("\n" + "=" * 60)
+    print("1. 스트리밍 + 모델별 지표 테스트")
+    print("=" * 60)
+
+    with _FakeGemini({"fast": (0.05, 200, ["안녕", "하세요", "."])}):
+        async def run():
+            client = la.get_async_llm()
+            arrivals = []
+            t0 = time.perf_counter()
+            async for delta in client.stream("sys", "hi", model="fast"):
+                arrivals.append((delta, time.perf_counter() - t0))
+            return arrivals
+
+        arrivals = asyncio.run(run())
+        assert [d for d, _ in arrivals] == ["안녕", "하세요", "."]
+        assert arrivals[0][1] < arrivals[-1][1], "델타가 도착하는 대로 전달"
+
+        stats = la.get_llm_stats().get("fast")
+        print(f"fast: {stats}")
+        assert stats["requests"] == 1 and stats["completed"] == 1 and stats["output_tokens"] == 30
+        assert stats["first_tokens"] == 1 and stats["ttft_avg_sec"] > 0
+        assert stats["tokens_per_sec"] > 0
+    print("✅ PASS: 스트리밍 + 지표")
+
+
+def test_hedge_after_budget():
+    """느린 primary 는 지연 예산 뒤 폴백과 경쟁, 먼저 토큰을 낸 모델이 승리하고 나머지는 취소"""
+    print("\n" + "=" * 60)
+    print("2. 지연 예산 헤지 테스트")
+    print("=" * 60)
+
+    models = {
+        "slow": (2.0, 200, ["slow answer"]),
+        "quick": (0.05, 200, ["quick ", "answer"]),
+        "unused": (0.05, 200, ["never"]),
+    }
+    with _FakeGemini(models) as fake:
+        text = asyncio.run(la.acall_llm("sys", "q", model="slow", fallback_models=["quick", "unused"]))
+        print(f"text={text!r}, calls={fake.calls}")
+        assert text == "quick answer"
+        assert fake.calls == ["slow", "quick"], "두 번째 폴백은 시작하지 않음"
+
+        stats = la.get_llm_stats().snapshot()
+        assert stats["quick"]["wins"] == 1 and stats["quick"]["hedged"] == 1
+        assert stats["slow"]["cancelled"] == 1 and stats["slow"]["wins"] == 0
+
+        # 빠른 primary 는 헤지 없이 단독 완료
+        fake.calls.clear()
+        assert asyncio.run(la.acall_llm("sys", "q", model="quick", fallback_models=["slow"])) == "quick answer"
+        assert fake.calls == ["quick"]
+    print("✅ PASS: 지연 예산 헤지")
+
+
+def test_failure_fallback_and_semaphore():
+    """실패는 예산을 기다리지 않고 즉시 다음 모델, 동시 요청은 semaphore 한도 이내"""
+    print("\n" + "=" * 60)
+    print("3. 실패 폴백 / 동시 요청 한도 테스트")
+    print("=" * 60)
+
+    models = {
+        "overloaded": (0, 503, []),
+        "missing": (0, 404, []),
+        "ok": (0.1, 200, ["fine"]),
+        "bad": (0, 400, []),
+    }
+    with _FakeGemini(models) as fake:
+        # hedge_after=0: 지연 예산 헤지 없음 → 폴백은 실패로만 시작
+        text = asyncio.run(la.acall_llm("sys", "q", model="overloaded", fallback_models=["missing", "ok"],
+                                        hedge_after=0))
+        assert text == "fine" and fake.calls == ["overloaded", "missing", "ok"]
+        stats = la.get_llm_stats().snapshot()
+        assert stats["overloaded"]["failures"] == 1 and stats["missing"]["failures"] == 1
+        assert stats["ok"]["hedged"] == 1 and stats["ok"]["wins"] == 1
+
+        try:
+            asyncio.run(la.acall_llm("sys", "q", model="bad", fallback_models=["ok"]))
+            raise AssertionError("non-transient error should raise")
+        except httpx.HTTPStatusError as e:
+            assert e.response.status_code == 400
+
+        fake.calls.clear()
+
+        async def many():
+            return await asyncio.gather(*(la.acall_llm("s", f"q{i}", model="ok", fallback_models=[])
+                                          for i in range(6)))
+
+        assert asyncio.run(many()) == ["fine"] * 6
+        print(f"6 requests, limit 2: peak={fake.peak}")
+        assert fake.peak == 2 and la.get_async_llm().peak_in_flight == 2
+        assert len(fake.calls) == 6 and la.get_llm_stats().get("ok")["completed"] == 7
+    print("✅ PASS: 실패 폴백 + 동시 요청 한도")
+
+
+def test_sync_resilient_uses_hedge():
+    """call_llm_resilient 첫 라운드가 백그라운드 루프의 헤지 경로로 실행"""
+    print("\n" + "=" * 60)
+    print("4. 동기 call_llm_resilient 헤지 테스트")
+    print("=" * 60)
+
+    with _FakeGemini({"slow": (2.0, 200, ["slow"]), "quick": (0.05, 200, ["quick"])}) as fake:
+        text = llm.call_llm_resilient("sys", "q", model="slow", fallback_models=["quick"])
+        assert text == "quick" and fake.calls == ["slow", "quick"]
+        stats = la.get_llm_stats().snapshot()
+        assert stats["quick"]["wins"] == 1 and stats["slow"]["cancelled"] == 1
+    print("✅ PASS: 동기 호출 헤지")
+
+
+def _open_circuit():
+    for _ in range(circuit_gemini.failure_threshold):
+        circuit_gemini._on_failure()
+    assert circuit_gemini.state == "open"
+
+
+def test_circuit_open_falls_back():
+    """열린 서킷 (CircuitOpenError) 은 429 처럼: 서킷 리셋 후 다음 모델, 동기 경로는 직렬 재시도로"""
+    print("\n" + "=" * 60)
+    print("5. 서킷 열림 폴백 테스트")
+    print("=" * 60)
+
+    with _FakeGemini({"primary": (0, 200, ["never"]), "quick": (0.05, 200, ["quick"])}) as fake:
+        _open_circuit()
+        assert asyncio.run(la.acall_llm("sys", "q", model="primary", fallback_models=["quick"])) == "quick"
+        assert fake.calls == ["quick"] and circuit_gemini.state == "closed"
+        stats = la.get_llm_stats().snapshot()
+        assert "primary" not in stats and stats["quick"]["hedged"] == 1 and stats["quick"]["wins"] == 1
+
+        # 헤지 라운드가 CircuitOpenError 로 끝나도 예외 대신 직렬 재시도
+        client, serial = la.get_async_llm(), []
+
+        async def open_round(*args, **kwargs):
+            _open_circuit()
+            circuit_gemini._before_call()
+
+        saved = (client.generate_hedged, llm._call_gemma_no_retry)
+        client.generate_hedged = open_round
+        llm._call_gemma_no_retry = lambda system, user, **kw: serial.append(kw["model"]) or "serial"
+        try:
+            assert llm.call_llm_resilient("sys", "q", model="primary", fallback_models=["quick"]) == "serial"
+        finally:
+            client.generate_hedged, llm._call_gemma_no_retry = saved
+        assert serial == ["primary"] and circuit_gemini.state == "closed"
+    print("✅ PASS: 서킷 열림 폴백")
+
+
+def test_serial_skips_hedged_failures():
+    """헤지 라운드 실패 후 직렬 루프가 같은 모델을 처음부터 다시 부르지 않음 (업스트림 호출 수)"""
+    print("\n" + "=" * 60)
+    print("6. 헤지 실패 후 직렬 재시도 호출 수 테스트")
+    print("=" * 60)
+
+    models = {"limited": (0, 429, []), "missing": (0, 404, []), "overloaded": (0, 503, [])}
+    with _FakeGemini(models) as fake:
+        serial = []
+
+        def no_retry(system, user, **kw):
+            serial.append(kw["model"])
+            raise httpx.HTTPStatusError("503", request=httpx.Request("POST", "http://x"),
+                                        response=httpx.Response(503))
+
+        saved = (llm._call_gemma_no_retry, llm._LLM_RETRY_BACKOFF_SEC)
+        llm._call_gemma_no_retry, llm._LLM_RETRY_BACKOFF_SEC = no_retry, 0
+        try:
+            llm.call_llm_resilient("sys", "q", model="limited", fallback_models=["missing", "overloaded"])
+            raise AssertionError("every model fails")
+        except httpx.HTTPStatusError:
+            pass
+        finally:
+            llm._call_gemma_no_retry, llm._LLM_RETRY_BACKOFF_SEC = saved
+        print(f"hedged: {fake.calls}, serial: {serial}")
+        assert fake.calls == ["limited", "missing", "overloaded"]
+        assert serial == ["overloaded"] * llm._LLM_INNER_RETRIES, "429/404 는 건너뛰고 5xx 는 헤지 요청을 1회로 계산"
+        assert len(fake.calls) + len(serial) == 3 + llm._LLM_INNER_RETRIES
+    print("✅ PASS: 헤지 라운드 실패 모델 중복 호출 없음")
+
+
+def main():
+    for test in (test_stream_and_stats, test_hedge_after_budget, test_failure_fallback_and_semaphore,
+                 test_sync_resilient_uses_hedge, test_circuit_open_falls_back, test_serial_skips_hedged_failures):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""LLM 응답 캐시 테스트: 프롬프트 해시 키, 공백 정규화, 동시 호출 합치기, 실패 미캐시, 절약 토큰 통계 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools import llm
+from mcp_server.tools import llm_cache as lc
+from mcp_server.tools import news_sentiment as ns
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, cache_manager
+
+HEADLINES = ["NVDA beats estimates", "AMD guides higher", "Chip stocks rally"]
+
+
+class _FakeLLM:
+    """call_llm_resilient / 뉴스 감성 HTTP 호출 대역 - 호출 횟수 기록"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.fail = 0
+        self.reply = "요약: 반도체 강세."
+
+    def resilient(self, system, user, *, model=None, temperature=0.2, **kwargs):
+        with self.lock:
+            self.calls.append((model, user, temperature))
+        time.sleep(0.05)
+        if self.fail:
+            self.fail -= 1
+            raise ConnectionError("503 Service Unavailable")
+        return self.reply
+
+    def post(self, url, json=None, timeout=None):
+        self.resilient(json["systemInstruction"]["parts"][0]["text"], json["contents"][0]["parts"][0]["text"])
+        text = '```json\n{"overall_sentiment": "bullish", "sentiment_score": 0.6}\n```'
+
+        class Resp:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        return Resp()
+
+    def __enter__(self):
+        self.saved = (llm.call_llm_resilient, ns.http_post, lc._stats, cache_manager.cache, cache_manager.l1)
+        llm.call_llm_resilient, ns.http_post = self.resilient, self.post
+        lc._stats = lc.LLMCacheStats()
+        cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+        return self
+
+    def __exit__(self, *exc):
+        llm.call_llm_resilient, ns.http_post, lc._stats, cache_manager.cache, cache_manager.l1 = self.saved
+        return False
+
+
+def test_same_prompt_hits_cache():
+    """같은 헤드라인 요약은 한 번만 호출, 공백 차이는 같은 키, 모델/온도가 다르면 다른 키"""
+    print("\n" + "=" * 60)
+    print("1. 프롬프트 해시 캐시 테스트")
+    print("=" * 60)
+
+    with _FakeLLM() as fake:
+        first = llm.summarize_items(HEADLINES)
+        again = llm.summarize_items(HEADLINES)
+        spaced = llm.summarize_text("\n".join(f"-  {h}   " for h in HEADLINES) + "\n\n\n")
+        assert first == again == spaced == fake.reply
+        assert len(fake.calls) == 1, fake.calls
+
+        llm.summarize_items(HEADLINES, max_sentences=3)       # system 프롬프트가 다름
+        llm.summarize_text("\n".join(f"- {h}" for h in HEADLINES), model="gemini-2.0-flash")
+        llm.call_llm_json("sys", "blocks")
+        llm.call_llm_json("sys", "blocks", temperature=0.3)
+        llm.call_llm_json("sys", "blocks")
+        assert len(fake.calls) == 5
+
+        assert lc.normalize_prompt("a  b \r\nc\t\n\n\n\nd ") == "a b\nc\n\nd"
+        assert lc.prompt_key("m", "s", "Hello", 0.2) != lc.prompt_key("m", "s", "hello", 0.2), "대소문자는 유지"
+
+        stats = lc.get_llm_cache_stats()
+        print(f"stats: {stats}")
+        assert stats["lookups"] == 8 and stats["hits"] == 3 and stats["upstream_calls"] == 5
+        assert stats["hit_rate"] == 37.5 and stats["saved_tokens"] > 0
+    print("✅ PASS: 프롬프트 해시 캐시")
+
+
+def test_concurrent_and_failures():
+    """같은 프롬프트의 동시 호출은 1회로 합치고, 실패/빈 응답은 캐시하지 않음"""
+    print("\n" + "=" * 60)
+    print("2. 동시 호출 합치기 / 실패 처리 테스트")
+    print("=" * 60)
+
+    with _FakeLLM() as fake:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: llm.summarize_items(HEADLINES), range(16)))
+        assert results == [fake.reply] * 16 and len(fake.calls) == 1
+
+        fake.fail = 1
+        assert llm.summarize_text("other text") == "", "summarize_text 는 실패 시 빈 문자열"
+        assert llm.summarize_text("other text") == fake.reply, "실패는 캐시하지 않음"
+        assert len(fake.calls) == 3
+
+        fake.reply = ""
+        llm.summarize_text("empty reply")
+        llm.summarize_text("empty reply")
+        assert len(fake.calls) == 5, "빈 응답은 캐시하지 않음"
+    print("✅ PASS: single-flight + 실패 미캐시")
+
+
+def test_news_sentiment_cached():
+    """뉴스 LLM 감성은 같은 헤드라인 묶음이면 캐시된 응답을 파싱"""
+    print("\n" + "=" * 60)
+    print("3. 뉴스 LLM 감성 캐시 테스트")
+    print("=" * 60)
+
+    items = [{"title": h, "snippet": "..."} for h in HEADLINES]
+    with _FakeLLM() as fake:
+        first = ns.analyze_with_llm(items)
+        second = ns.analyze_with_llm([dict(i) for i in items])
+        assert first == second == {"overall_sentiment": "bullish", "sentiment_score": 0.6}
+        assert len(fake.calls) == 1
+
+        ns.analyze_with_llm(items[:2])
+        assert len(fake.calls) == 2
+        assert lc.get_llm_cache_stats()["hits"] == 1
+    print("✅ PASS: 뉴스 감성 캐시")
+
+
+def main():
+    for test in (test_same_prompt_hits_cache, test_concurrent_and_failures, test_news_sentiment_cached):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
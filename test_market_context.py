@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""시장 컨텍스트 테스트: 시간 버킷당 1회 계산, 동시 요청 합치기, 감성/시장 상황/변동성이 공유 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import market_context as mc
+from mcp_server.tools import ranking_engine as re_
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, cache_manager
+from mcp_server.tools.sentiment_analysis import SentimentFactors
+
+BUCKET = mc.MARKET_CONTEXT_BUCKET_SEC
+
+
+def _closes(trend=0.002, n=130):
+    idx = pd.bdate_range("2026-01-02", periods=n)
+    out = {"SPY": pd.Series(400 * np.exp(trend * np.arange(n)), index=idx)}
+    for i, etf in enumerate(mc.SECTOR_ETFS.values()):
+        drift = 0.003 if i % 3 else -0.003   # 1/3 은 하락 추세
+        out[etf] = pd.Series(50 * np.exp(drift * np.arange(n)), index=idx)
+    return out
+
+
+class _FakeUpstream:
+    """VIX/종가 조회를 가짜로 교체 + 호출 횟수 기록, yf.download 직접 호출은 실패 처리"""
+
+    def __init__(self, trend=0.002):
+        self.trend = trend
+        self.calls = {"vix": 0, "closes": 0}
+        self.lock = threading.Lock()
+
+    def vix(self):
+        with self.lock:
+            self.calls["vix"] += 1
+        time.sleep(0.05)
+        return 22.5
+
+    def closes(self, tickers):
+        with self.lock:
+            self.calls["closes"] += 1
+        assert tickers[0] == "SPY" and len(tickers) == 1 + len(mc.SECTOR_ETFS), "벤치마크 + 섹터 ETF 일괄 조회"
+        return _closes(self.trend)
+
+    def __enter__(self):
+        import yfinance as yf
+
+        def no_download(*args, **kwargs):
+            raise AssertionError("benchmark should come from market context")
+
+        self.saved = (mc._fetch_vix, mc._fetch_closes, yf.download, cache_manager.cache, cache_manager.l1)
+        mc._fetch_vix, mc._fetch_closes, yf.download = self.vix, self.closes, no_download
+        cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+        return self
+
+    def __exit__(self, *exc):
+        import yfinance as yf
+        mc._fetch_vix, mc._fetch_closes, yf.download, cache_manager.cache, cache_manager.l1 = self.saved
+        return False
+
+
+def test_once_per_bucket():
+    """같은 버킷은 한 번만 계산 (동시 요청 포함), 다음 버킷은 재계산"""
+    print("\n" + "=" * 60)
+    print("1. 버킷당 1회 계산 테스트")
+    print("=" * 60)
+
+    now = 1_800_000_000.0
+    with _FakeUpstream() as up:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            contexts = list(pool.map(lambda _: mc.get_market_context(now), range(16)))
+        assert up.calls == {"vix": 1, "closes": 1}, up.calls
+        assert {c.bucket for c in contexts} == {mc.current_bucket(now)}
+
+        ctx = mc.get_market_context(now + 1)
+        assert up.calls["vix"] == 1
+        print(f"summary: {ctx.summary()}")
+        assert ctx.vix == 22.5
+        assert np.isclose(ctx.breadth, 7 / 11) and np.isclose(ctx.advance_ratio, 7 / 11)
+        assert np.isclose(ctx.sector_moves["XLK"]["5d"], np.exp(-0.015) - 1)   # XLK: 하락 추세
+        assert set(ctx.summary()["sector_moves"]) == set(mc.SECTOR_ETFS.values())
+        assert ctx.summary()["breadth"] == ctx.summary()["advance_ratio"] == round(7 / 11, 4)
+        assert ctx.close("QQQ") is None and len(ctx.close()) == 130
+
+        mc.get_market_context(now + BUCKET)
+        assert up.calls == {"vix": 2, "closes": 2}, "다음 버킷은 재계산"
+    print("✅ PASS: 버킷당 1회")
+
+
+def test_consumers_share_context():
+    """감성 VIX / 시장 상황 / 시장 변동성이 같은 컨텍스트를 읽음 (SPY 직접 다운로드 없음)"""
+    print("\n" + "=" * 60)
+    print("2. 컨텍스트 공유 테스트")
+    print("=" * 60)
+
+    with _FakeUpstream(trend=0.003) as up:
+        assert SentimentFactors.fetch_market_vix() == 22.5
+        assert re_.detect_market_condition() == "bull"       # 60일 +19.7%
+        vol = re_.get_market_volatility()
+        assert 0 <= vol < 1e-6, "일정 추세 → 변동성 0"
+        info = re_.AdvancedRankingEngine().detect_market()
+        assert info["condition"] == "bull" and info["market_context"]["vix"] == 22.5
+        assert up.calls == {"vix": 1, "closes": 1}, up.calls
+
+    with _FakeUpstream(trend=-0.003):
+        assert re_.detect_market_condition() == "bear"
+    print("✅ PASS: 시장 공통 입력 공유")
+
+
+def test_failed_load_not_cached():
+    """모든 입력 조회 실패 시 빈 컨텍스트 (캐시하지 않고 다음 호출에서 재시도)"""
+    print("\n" + "=" * 60)
+    print("3. 조회 실패 처리 테스트")
+    print("=" * 60)
+
+    with _FakeUpstream() as up:
+        mc._fetch_vix = lambda: float("nan")
+
+        def fail(tickers):
+            up.calls["closes"] += 1
+            raise ConnectionError("offline")
+
+        mc._fetch_closes = fail
+        ctx = mc.get_market_context()
+        assert np.isnan(ctx.vix) and ctx.close() is None and ctx.summary()["vix"] is None
+        assert up.calls["closes"] == 1
+        mc.get_market_context()
+        assert up.calls["closes"] == 2
+    print("✅ PASS: 실패는 캐시하지 않음")
+
+
+def main():
+    for test in (test_once_per_bucket, test_consumers_share_context, test_failed_load_not_cached):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""증분 메트릭 엔진 테스트: 전체 재계산과 동일, 새 bar 만 반영, 소급 조정 시 재초기화, SPY 배치당 1회 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import collect
+from mcp_server.tools import metrics_engine as me
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, cache_manager
+
+KEYS = ["mom1", "mom3", "mom6", "mom12", "ret20", "vol30", "vol60", "dd180", "corr_spy"]
+
+
+def _series(seed, n=520, drop=()):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2022-01-03", periods=n)
+    s = pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, n))), index=idx)
+    return s.drop(s.index[list(drop)])
+
+
+def _assert_same(got, close, spy):
+    expected = collect._full_metrics(close, spy)
+    for k in KEYS:
+        a, b = got[k], expected[k]
+        if b is None or a is None:
+            assert a is None and b is None, k
+        else:
+            assert np.isclose(a, b, rtol=1e-9, atol=1e-12, equal_nan=True), (k, a, b)
+
+
+def test_matches_full_recompute():
+    """초기화/하루씩 갱신/여러 날 갱신/SPY 지연 모두 전체 재계산과 동일"""
+    print("\n" + "=" * 60)
+    print("1. 전체 재계산 동등성 테스트")
+    print("=" * 60)
+
+    spy_full = _series(0)
+    close_full = _series(1, drop=(100, 101, 400))   # 종목만 빠진 날짜 (거래정지 등)
+
+    state, inc = me.update_state(None, close_full.iloc[:300], me.spy_returns(spy_full.iloc[:300]))
+    assert not inc
+    _assert_same(me.compute(state), close_full.iloc[:300], spy_full.iloc[:300])
+
+    end = 300
+    for step in [1] * 40 + [5, 17, 1, 60]:
+        end += step
+        close, spy = close_full.iloc[:end], spy_full[spy_full.index <= close_full.index[end - 1]]
+        state, inc = me.update_state(state, close, me.spy_returns(spy))
+        assert inc
+        _assert_same(me.compute(state), close, spy)
+
+    # SPY 가 하루 늦게 들어온 경우: 그날 쌍은 다음 갱신에서 반영
+    end += 1
+    close = close_full.iloc[:end]
+    lagged = spy_full[spy_full.index < close.index[-1]]
+    state, _ = me.update_state(state, close, me.spy_returns(lagged))
+    _assert_same(me.compute(state), close, lagged)
+    spy = spy_full[spy_full.index <= close.index[-1]]
+    state, inc = me.update_state(state, close, me.spy_returns(spy))
+    assert inc
+    _assert_same(me.compute(state), close, spy)
+
+    short, _ = me.update_state(None, close_full.iloc[:40], None)
+    got = me.compute(short)
+    assert np.isnan(got["mom3"]) and np.isnan(got["vol60"]) and got["corr_spy"] is None
+    _assert_same(got, close_full.iloc[:40], None)
+    assert len(state.closes) == me.HISTORY and len(state.pairs) == me.CORR_WINDOW
+    print("✅ PASS: 증분 결과 = 전체 재계산")
+
+
+def test_rebuild_on_revised_history():
+    """저장된 마지막 종가가 바뀌면 (수정주가 소급 조정) 전체 재초기화"""
+    print("\n" + "=" * 60)
+    print("2. 소급 조정 재초기화 테스트")
+    print("=" * 60)
+
+    spy, close = _series(0), _series(2)
+    state, _ = me.update_state(None, close.iloc[:400], me.spy_returns(spy))
+    adjusted = close.iloc[:401] * 0.97
+    state, inc = me.update_state(state, adjusted, me.spy_returns(spy))
+    assert not inc
+    _assert_same(me.compute(state), adjusted, spy[spy.index <= adjusted.index[-1]])
+    state, inc = me.update_state(state, close.iloc[:350], me.spy_returns(spy))
+    assert not inc, "마지막 날짜가 없는 짧은 시계열"
+
+    # 짧은 기간 (6mo) 으로 만든 상태에 긴 시계열 (2y) 이 오면 재초기화 → mom12 계산
+    short, _ = me.update_state(None, close.iloc[374:500], me.spy_returns(spy))
+    assert np.isnan(me.compute(short)["mom12"])
+    state, inc = me.update_state(short, close.iloc[:500], me.spy_returns(spy))
+    assert not inc and len(state.closes) == me.HISTORY
+    _assert_same(me.compute(state), close.iloc[:500], spy.iloc[:500])
+    print("✅ PASS: 시계열 불일치 시 재초기화")
+
+
+def test_batch_loads_spy_once():
+    """compute_basic_metrics_many: 가격+SPY 배치 조회 1회, 상태 일괄 조회/저장, 두 번째 배치는 증분"""
+    print("\n" + "=" * 60)
+    print("3. 배치 SPY 1회 / 증분 갱신 테스트")
+    print("=" * 60)
+
+    tickers = [f"T{i:03d}" for i in range(200)]
+    panel = {t: _series(i + 10) for i, t in enumerate(tickers)}
+    panel["SPY"] = _series(0)
+    calls = []
+    cutoff = {"n": 500}
+
+    def fake_bulk(ts, period=None, **kwargs):
+        calls.append(list(ts))
+        return {"close": pd.DataFrame({t: panel[t].iloc[:cutoff["n"]] for t in ts if t in panel})}
+
+    saved = (collect.get_prices_bulk, collect.CACHE_DIR, cache_manager.cache, cache_manager.l1, me._engine)
+    collect.get_prices_bulk = fake_bulk
+    collect.CACHE_DIR = tempfile.mkdtemp()
+    cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+    me._engine = None
+    try:
+        start = time.perf_counter()
+        first = collect.compute_basic_metrics_many(tickers)
+        first_sec = time.perf_counter() - start
+        assert len(calls) == 1 and calls[0].count("SPY") == 1 and len(calls[0]) == 201
+        assert list(first) == tickers
+        _assert_same(first["T007"], panel["T007"].iloc[:500], panel["SPY"].iloc[:500])
+
+        cutoff["n"] = 505
+        start = time.perf_counter()
+        second = collect.compute_basic_metrics_many(tickers, use_cache=False)
+        second_sec = time.perf_counter() - start
+        engine = me.get_metrics_engine()
+        print(f"200 tickers: init {first_sec * 1000:.0f}ms, +5 bars {second_sec * 1000:.0f}ms, counters={engine.counters}")
+        assert engine.counters == {"incremental": 200, "rebuilt": 200}
+        assert second_sec < first_sec, "새 bar 만 반영하는 갱신이 초기화보다 빠름"
+        _assert_same(second["T042"], panel["T042"].iloc[:505], panel["SPY"].iloc[:505])
+
+        reads = cache_manager.stats()["l2"]["reads"]
+        cache_manager.l1.clear()
+        assert collect.compute_basic_metrics_many(tickers) == first, "use_cache=False 결과는 캐시에 기록 안 함"
+        assert len(calls) == 2 and cache_manager.stats()["l2"]["reads"] - reads == 1
+        assert collect.compute_basic_metrics("NONE") == {"ticker": "NONE"}
+
+        # 상태 키는 기간별: 6mo 상태가 2y 요청에 재사용되지 않음
+        cutoff["n"] = 126
+        short = collect.compute_basic_metrics_many(tickers[:3], period="6mo", use_cache=False)
+        cutoff["n"] = 505
+        full = collect.compute_basic_metrics_many(tickers[:3], period="2y", use_cache=False)
+        assert np.isnan(short["T001"]["mom12"]) and not np.isnan(full["T001"]["mom12"])
+        assert me.MetricsEngine.state_key("T001", "6mo") != me.MetricsEngine.state_key("T001", "2y")
+        _assert_same(full["T001"], panel["T001"].iloc[:505], panel["SPY"].iloc[:505])
+    finally:
+        collect.get_prices_bulk, collect.CACHE_DIR, cache_manager.cache, cache_manager.l1, me._engine = saved
+    print("✅ PASS: SPY 배치당 1회, 두 번째 배치는 새 bar 만 반영")
+
+
+def main():
+    for test in (test_matches_full_recompute, test_rebuild_on_revised_history, test_batch_loads_spy_once):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""뉴스 중복 제거 테스트: MinHash-LSH 후보 + SequenceMatcher 확인이 기존 O(n²) 결과와 거의 동일, 1만 건 처리량, 기사 묶음 주제 분류 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import random
+import itertools
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools import near_duplicates as nd
+from mcp_server.tools.news_sentiment import NewsDeduplicator
+
+_SYL = ["ka", "lo", "mi", "ten", "ra", "vex", "zon", "tri", "na", "qua", "dex", "sol", "per", "gen", "ix", "mo"]
+_VOCAB = ["".join(p) for p in itertools.product(
+    "bcdfghklmnprstvw", ["a", "e", "i", "o", "u", "ea", "ou"], ["n", "r", "t", "ck", "ll", "st", "mp", "de"],
+    ["", "s", "er", "ing", "ed"])][::3]
+_SOURCES = [" - Reuters", " - Bloomberg", " | CNBC", " - MarketWatch"]
+
+
+def _headline(r):
+    company = "".join(r.choice(_SYL) for _ in range(r.randint(2, 3))).capitalize()
+    return f"{company} {' '.join(r.choice(_VOCAB) for _ in range(r.randint(5, 9)))} {r.randint(1, 99)}%"
+
+
+def _variant(r, title):
+    """재게재 흉내: 출처 접미사, 대문자, 단어 1~3개 교체/삭제"""
+    words = title.split()
+    kind = r.randint(0, 4)
+    if kind == 0:
+        return title + r.choice(_SOURCES)
+    if kind == 1:
+        return title.upper()
+    if kind == 2:
+        del words[r.randrange(len(words))]
+    else:
+        for _ in range(r.randint(1, 3)):
+            words[r.randrange(len(words))] = r.choice(_VOCAB)
+    return " ".join(words)
+
+
+def _titles(n, seed=1, dup_rate=0.3):
+    r = random.Random(seed)
+    out = []
+    while len(out) < n:
+        out.append(_variant(r, r.choice(out[-200:])) if out and r.random() < dup_rate else _headline(r))
+    return out
+
+
+def _pairwise(dedup, items):
+    """기존 구현 (남긴 제목 전부와 비교)"""
+    unique, seen = [], []
+    for item in items:
+        if not any(dedup.similarity(item.get("title", ""), s) > dedup.threshold for s in seen):
+            unique.append(item)
+            seen.append(item.get("title", ""))
+    return unique
+
+
+def test_near_identical_to_pairwise():
+    """LSH 결과가 기존 O(n²) 결과와 거의 같음 (놓친 쌍 극소수), 빈 제목은 항상 유지"""
+    print("\n" + "=" * 60)
+    print("1. 기존 결과와 거의 동일 테스트")
+    print("=" * 60)
+
+    dedup = NewsDeduplicator()
+    items = [{"title": t} for t in _titles(300)] + [{"title": ""}, {}, {"title": ""}]
+    t0 = time.perf_counter()
+    expected = _pairwise(dedup, items)
+    t_pairwise = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    got = dedup.deduplicate(items)
+    t_lsh = time.perf_counter() - t0
+
+    diff = {id(i) for i in expected} ^ {id(i) for i in got}
+    print(f"300 titles: pairwise kept {len(expected)} in {t_pairwise:.2f}s, "
+          f"lsh kept {len(got)} in {t_lsh:.3f}s, diff={len(diff)}")
+    assert len(diff) <= 2, "LSH 가 놓친 쌍은 극소수"
+    assert sum(1 for i in got if not i.get("title")) == 3
+    assert [i["title"] for i in got[:3]] == [i["title"] for i in expected[:3]], "첫 등장 순서 유지"
+
+    same = ["Nvidia beats estimates", "NVIDIA BEATS ESTIMATES - Reuters", "Nvidia beats estimate"]
+    assert len(dedup.deduplicate([{"title": t} for t in same])) == 1
+    print("✅ PASS: 기존 결과와 거의 동일")
+
+
+def test_benchmark_10k():
+    """1만 건 헤드라인 중복 제거 (소요 시간은 출력만, 기존 방식은 수천만 회 ratio 비교)"""
+    print("\n" + "=" * 60)
+    print("2. 1만 건 벤치마크")
+    print("=" * 60)
+
+    items = [{"title": t} for t in _titles(10_000, seed=2)]
+    t0 = time.perf_counter()
+    unique = NewsDeduplicator().deduplicate(items)
+    elapsed = time.perf_counter() - t0
+    print(f"10,000 headlines -> {len(unique)} unique in {elapsed:.2f}s")
+    assert 6_000 < len(unique) < 9_000
+    print("✅ PASS: 1만 건 벤치마크")
+
+
+def test_story_groups_and_topics():
+    """재게재 기사는 한 그룹으로 묶여 같은 주제에 배정"""
+    print("\n" + "=" * 60)
+    print("3. 기사 묶음 / 주제 분류 테스트")
+    print("=" * 60)
+
+    dedup = NewsDeduplicator()
+    news = [
+        {"title": "Acme quarterly revenue tops forecasts", "snippet": "earnings guidance raised"},
+        {"title": "Bolt files lawsuit against regulator", "snippet": ""},
+        {"title": "ACME QUARTERLY REVENUE TOPS FORECASTS - Reuters", "snippet": "shares jump"},
+        {"title": "Acme quarterly revenue tops forecast", "snippet": ""},
+        {"title": "", "snippet": "no title"},
+    ]
+    groups = dedup.story_groups(news)
+    assert [[news.index(i) for i in g] for g in groups] == [[0, 2, 3], [1], [4]]
+
+    clusters = dedup.cluster_by_topic(news)
+    print({k: len(v) for k, v in clusters.items()})
+    assert len(clusters["Earnings & Financials"]) == 3, "재게재 기사는 원문 키워드로 같은 주제"
+    assert clusters["Regulatory & Legal"] == [news[1]]
+
+    texts = ["alpha beta gamma", "alpha beta gamma!", "zeta eta theta", ""]
+    assert nd.similar_groups(texts, lambda i, j: True) == [[0, 1], [2], [3]]
+    print("✅ PASS: 기사 묶음 / 주제 분류")
+
+
+def main():
+    for test in (test_near_identical_to_pairwise, test_benchmark_10k, test_story_groups_and_topics):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""포트폴리오 백테스트 테스트: 가격/벤치마크 1회 조회 + 종목별 결과 동일 + 바스켓 집계 (네트워크 불필요)"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import market_data, price_store
+from mcp_server.tools.backtest_engine import BacktestEngine
+from mcp_server.tools.financial_factors import FinancialFactors
+from mcp_server.tools.price_store import PriceStore
+
+SEEDS = {"AAA": 1, "BBB": 2, "CCC": 3, "DDD": 4, "EEE": 5, "SPY": 9}
+FIN_FACTORS = {'ROE': 0.18, 'Debt_to_Equity': 0.9, 'Current_Ratio': 1.6}
+
+
+def _series(ticker):
+    rng = np.random.default_rng(SEEDS[ticker])
+    idx = pd.bdate_range("2019-01-01", "2022-12-31")
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0004, 0.02, len(idx))))
+    spread = np.abs(rng.normal(0, 0.01, len(idx))) * close
+    return pd.DataFrame({
+        "Date": idx, "Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, len(idx)).astype(float),
+    })
+
+
+class _Upstream:
+    """가짜 업스트림 (단일/배치 호출 기록)"""
+
+    def __init__(self):
+        self.single, self.bulk = [], []
+
+    def fetch(self, ticker, start, end, interval="1d", market=None):
+        self.single.append(ticker)
+        if ticker not in SEEDS:
+            return pd.DataFrame()
+        df = _series(ticker)
+        return df[(df["Date"] >= start) & (df["Date"] <= end)].reset_index(drop=True)
+
+    def fetch_bulk(self, tickers, start, end, market=None):
+        self.bulk.append(tuple(tickers))
+        out = {}
+        for t in tickers:
+            if t in SEEDS:
+                df = _series(t)
+                out[t] = df[(df["Date"] >= start) & (df["Date"] <= end)].reset_index(drop=True)
+        return out
+
+
+def _patched(test):
+    def run():
+        upstream = _Upstream()
+        saved = (price_store._price_store, market_data._fetch_prices_upstream,
+                 market_data._fetch_prices_upstream_bulk, FinancialFactors.calculate_all)
+        price_store._price_store = PriceStore(root=tempfile.mkdtemp())
+        market_data._fetch_prices_upstream = upstream.fetch
+        market_data._fetch_prices_upstream_bulk = upstream.fetch_bulk
+        FinancialFactors.calculate_all = staticmethod(lambda ticker, market="US": dict(FIN_FACTORS))
+        try:
+            test(upstream)
+        finally:
+            (price_store._price_store, market_data._fetch_prices_upstream,
+             market_data._fetch_prices_upstream_bulk, FinancialFactors.calculate_all) = saved
+    run.__name__ = test.__name__
+    run.__doc__ = test.__doc__
+    return run
+
+
+@_patched
+def test_portfolio_matches_single_runs(upstream):
+    """종목별 결과 = run_backtest, 가격은 배치 1회 + 벤치마크 1회"""
+    print("\n" + "=" * 60)
+    print("1. 포트폴리오 vs 단일 백테스트 테스트")
+    print("=" * 60)
+
+    tickers = ["AAA", "BBB", "CCC", "ZZZ"]
+    result = BacktestEngine.run_portfolio_backtest(
+        tickers, "US", "2020-01-01", "2022-12-30", rebalance_period=10, buy_threshold=56, sell_threshold=52
+    )
+    print(f"upstream: single={upstream.single}, bulk={upstream.bulk}")
+    assert upstream.bulk == [("AAA", "BBB", "CCC", "ZZZ")]
+    assert upstream.single.count("SPY") == 1
+    assert list(result["results"]) == ["AAA", "BBB", "CCC"] and "ZZZ" in result["failed"]
+
+    for t in ["AAA", "BBB", "CCC"]:
+        single = BacktestEngine.run_backtest(
+            t, "US", "2020-01-01", "2022-12-30", rebalance_period=10, buy_threshold=56, sell_threshold=52
+        )
+        got = result["results"][t]
+        assert np.isclose(got["total_return"], single["total_return"])
+        assert got["trade_count"] == single["trade_count"]
+        assert got["benchmark"] == single["benchmark"]
+    print("✅ PASS: 종목별 결과 동일, 업스트림 호출 일정")
+
+
+@_patched
+def test_basket_aggregate(upstream):
+    """동일/점수 비중 바스켓 자산 곡선"""
+    print("\n" + "=" * 60)
+    print("2. 바스켓 집계 테스트")
+    print("=" * 60)
+
+    kwargs = dict(market="US", start_date="2020-01-01", end_date="2022-12-30",
+                  rebalance_period=10, buy_threshold=56, sell_threshold=52)
+    equal = BacktestEngine.run_portfolio_backtest(["AAA", "BBB"], **kwargs)
+    growth = [pd.Series(equal["results"][t]["equity_curve"]) / 10000.0 for t in ["AAA", "BBB"]]
+    expected = (growth[0] + growth[1]) / 2 * 10000.0
+    assert np.isclose(equal["aggregate"]["final_value"], expected.iloc[-1])
+    assert equal["weights"] == {"AAA": 0.5, "BBB": 0.5}
+    assert "Max_Drawdown" in equal["aggregate"]["performance"]
+    assert "benchmark_return" in equal["aggregate"]["benchmark"]
+
+    scored = BacktestEngine.run_portfolio_backtest(
+        ["AAA", "BBB"], weighting="score", scores={"AAA": 75.0, "BBB": 25.0}, **kwargs
+    )
+    assert scored["weights"] == {"AAA": 0.75, "BBB": 0.25}
+    expected = (0.75 * growth[0] + 0.25 * growth[1]) * 10000.0
+    assert np.isclose(scored["aggregate"]["final_value"], expected.iloc[-1])
+    print(f"equal: {equal['aggregate']['total_return']:.2f}%, score: {scored['aggregate']['total_return']:.2f}%")
+    print("✅ PASS: 비중별 바스켓 집계")
+
+
+@_patched
+def test_theme_enrich_constant_calls(upstream):
+    """테마 백테스트: 종목 수와 무관하게 가격 배치 1회 + 벤치마크 1회"""
+    print("\n" + "=" * 60)
+    print("3. 테마 백테스트 업스트림 호출 테스트")
+    print("=" * 60)
+
+    from mcp_server.tools.theme_factor_integrator import ThemeFactorIntegrator
+
+    stocks = [{"ticker": t, "composite_score": 60.0 + i} for i, t in enumerate(["AAA", "BBB", "CCC", "DDD", "EEE"])]
+    enriched = ThemeFactorIntegrator.enrich_with_backtest(stocks, "2020-01-01", "2022-12-30", "US")
+    print(f"upstream: single={upstream.single}, bulk={len(upstream.bulk)}")
+    assert len(upstream.bulk) == 1 and upstream.single == ["SPY"]
+    assert all(s["backtest"]["total_return"] is not None for s in enriched)
+    assert set(enriched[0]["backtest"]) >= {"cagr", "max_drawdown", "sharpe_ratio", "win_rate", "trade_count"}
+    print("✅ PASS: 5종목 백테스트에 업스트림 2회")
+
+
+def main():
+    for test in (test_portfolio_matches_single_runs, test_basket_aggregate, test_theme_enrich_constant_calls):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""로컬 가격 저장소 테스트: 누락 구간만 다운로드 + 컬럼형 저장 (네트워크 불필요)"""
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools.price_store import PriceStore, period_to_start
+
+
+def _fake_fetcher(calls, holidays=(), basis=None):
+    """영업일 봉 (종가는 날짜에서 결정 → 재조회해도 같은 값), basis["factor"] 로 수정주가 기준 변경 흉내"""
+    def fetch(ticker, start, end):
+        calls.append((start, end))
+        idx = pd.bdate_range(start, end).difference(pd.to_datetime(list(holidays)))
+        factor = basis["factor"] if basis else 1.0
+        return pd.DataFrame({
+            "Date": idx,
+            "Open": 1.0, "High": 2.0, "Low": 0.5,
+            "Close": (idx - pd.Timestamp("2020-01-01")).days.to_numpy(dtype=float) * factor,
+            "Volume": 100.0,
+        })
+    return fetch
+
+
+def test_gap_only_fetch():
+    """겹치는 구간은 재다운로드하지 않음"""
+    print("\n" + "=" * 60)
+    print("1. 누락 구간만 다운로드 테스트")
+    print("=" * 60)
+
+    calls = []
+    store = PriceStore(root=tempfile.mkdtemp())
+    fetch = _fake_fetcher(calls)
+
+    first = store.get("AAPL", "2024-01-01", "2024-03-29", fetcher=fetch)
+    inner = store.get("AAPL", "2024-02-01", "2024-03-15", fetcher=fetch)
+    wider = store.get("AAPL", "2023-10-02", "2024-06-28", fetcher=fetch)
+
+    print(f"호출 구간: {calls}")
+    assert len(first) == len(pd.bdate_range("2024-01-01", "2024-03-29"))
+    assert len(inner) == len(pd.bdate_range("2024-02-01", "2024-03-15"))
+    assert len(wider) == len(pd.bdate_range("2023-10-02", "2024-06-28"))
+    assert calls == [
+        ("2024-01-01", "2024-03-29"),
+        ("2023-10-02", "2023-12-31"),
+        ("2024-03-23", "2024-06-28"),   # 꼬리는 저장된 마지막 7일을 겹쳐 수정주가 기준 확인
+    ]
+    assert list(wider.columns) == ["Date", "Open", "High", "Low", "Close", "Volume"]
+    assert wider["Date"].is_monotonic_increasing
+    print("✅ PASS: 겹치는 구간 재사용, 누락 구간만 추가")
+
+
+def test_failed_fetch_not_covered():
+    """업스트림 실패 구간은 커버리지로 기록하지 않음, 빈 응답은 휴장일로 커버 (꼬리는 임시)"""
+    print("\n" + "=" * 60)
+    print("2. 업스트림 실패 처리 테스트")
+    print("=" * 60)
+
+    store = PriceStore(root=tempfile.mkdtemp())
+
+    def broken(ticker, start, end):
+        raise RuntimeError("upstream down")
+
+    assert store.get("MSFT", "2024-01-01", "2024-02-01", fetcher=broken).empty
+    assert store.coverage("MSFT")["bars"] == 0
+
+    calls = []
+    df = store.get("MSFT", "2024-01-01", "2024-02-01", fetcher=_fake_fetcher(calls))
+    assert len(calls) == 1 and not df.empty
+
+    # 앞 구간 빈 응답 (휴장일 / 상장 전) 은 커버 처리 → 매 조회마다 다시 받지 않음
+    calls = []
+    holiday = _fake_fetcher(calls, holidays=["2023-12-29"])
+    assert len(store.get("MSFT", "2023-12-29", "2024-02-01", fetcher=holiday)) == len(df)
+    assert len(store.get("MSFT", "2023-12-29", "2024-02-01", fetcher=holiday)) == len(df)
+    assert calls == [("2023-12-29", "2023-12-31")] and store.coverage("MSFT")["start"] == "2023-12-29"
+
+    # 꼬리 빈 응답 (throttle / 아직 없는 봉) 은 임시: 갱신 주기 전에는 재조회하지 않고, 갱신 때 그 날부터 다시 받음
+    def empty(ticker, start, end):
+        calls.append((start, end))
+        return pd.DataFrame(columns=["Date", "Open", "High", "Low", "Close", "Volume"])
+
+    calls = []
+    assert len(store.get("MSFT", "2023-12-29", "2024-03-01", fetcher=empty)) == len(df)
+    assert len(store.get("MSFT", "2023-12-29", "2024-03-01", fetcher=empty)) == len(df)
+    assert calls == [("2024-01-26", "2024-03-01")] and store.coverage("MSFT")["provisional_from"] == "2024-02-02"
+    calls = []
+    wider = store.get("MSFT", "2023-12-29", "2024-03-01", fetcher=_fake_fetcher(calls), tail_refresh_sec=0)
+    assert calls == [("2024-01-26", "2024-03-01")]
+    assert len(wider) == len(pd.bdate_range("2024-01-01", "2024-03-01"))
+
+    calls = []
+    frames = store.get_many(["E1", "E2"], "2024-01-01", "2024-01-31", fetcher=empty,
+                            bulk_fetcher=lambda tickers, start, end: {t: empty(t, start, end) for t in tickers})
+    assert all(f.empty for f in frames.values())
+    good = []
+    frames = store.get_many(["E1", "E2"], "2024-01-01", "2024-01-31", fetcher=_fake_fetcher(good),
+                            tail_refresh_sec=0)
+    assert len(good) == 2 and all(len(f) == len(pd.bdate_range("2024-01-01", "2024-01-31")) for f in frames.values())
+    print("✅ PASS: 실패/빈 응답 후 재시도 시 정상 다운로드")
+
+
+def test_rebase_on_adjustment_change():
+    """꼬리 갱신 때 겹친 봉의 종가가 바뀌면 (분할/배당 수정주가) 전체 구간을 새 기준으로 다시 받음"""
+    print("\n" + "=" * 60)
+    print("2-1. 수정주가 기준 변경 테스트")
+    print("=" * 60)
+
+    calls, basis = [], {"factor": 1.0}
+    store = PriceStore(root=tempfile.mkdtemp())
+    fetch = _fake_fetcher(calls, basis=basis)
+    store.get("NVDA", "2024-01-01", "2024-03-29", fetcher=fetch)
+    store.get("NVDA", "2024-01-01", "2024-04-30", fetcher=fetch)
+    assert store.stats()["rebased"] == 0, "기준이 같으면 꼬리만 추가"
+
+    basis["factor"] = 0.1   # 10:1 분할
+    calls.clear()
+    df = store.get("NVDA", "2024-01-01", "2024-05-31", fetcher=fetch)
+    assert calls == [("2024-04-24", "2024-05-31"), ("2024-01-01", "2024-05-31")]
+    assert store.stats()["rebased"] == 1
+    expected = (df["Date"] - pd.Timestamp("2020-01-01")).dt.days * 0.1
+    assert np.allclose(df["Close"], expected), "모든 봉이 새 기준"
+    print("✅ PASS: 기준 변경 시 전체 재조회")
+
+
+def test_bulk_grouping():
+    """같은 누락 구간의 종목은 한 번의 bulk 호출로 묶음"""
+    print("\n" + "=" * 60)
+    print("3. 배치 조회 그룹핑 테스트")
+    print("=" * 60)
+
+    store = PriceStore(root=tempfile.mkdtemp())
+    single_calls, bulk_calls = [], []
+    fetch = _fake_fetcher(single_calls)
+
+    def bulk(tickers, start, end):
+        bulk_calls.append((tuple(tickers), start, end))
+        # 마지막 종목은 bulk 응답에서 누락 → 개별 조회로 폴백
+        return {t: fetch(t, start, end) for t in tickers[:-1]}
+
+    frames = store.get_many(["A", "B", "C"], "2024-01-01", "2024-01-31", fetcher=fetch, bulk_fetcher=bulk)
+    print(f"bulk: {bulk_calls}, single: {len(single_calls)}")
+    assert len(bulk_calls) == 1
+    assert all(not frames[t].empty for t in ("A", "B", "C"))
+    # A, B 는 bulk 응답 생성용 2회 + 누락된 C 개별 조회 1회
+    assert len(single_calls) == 3
+    print("✅ PASS: 그룹 조회 + 누락 종목 폴백")
+
+
+def test_period_to_start():
+    """yfinance period 문자열 변환"""
+    from datetime import date
+    today = date(2024, 6, 30)
+    assert period_to_start("6mo", today) == "2023-12-30"
+    assert period_to_start("2y", today) == "2022-06-30"
+    assert period_to_start("90d", today) == "2024-04-01"
+    assert period_to_start("ytd", today) == "2024-01-01"
+    print("✅ PASS: period 변환")
+
+
+def test_price_panel_shared():
+    """요청 단위 패널: 종목당 한 번 조회로 모멘텀/변동성/딥 계산 공유"""
+    print("\n" + "=" * 60)
+    print("4. 요청 단위 가격 패널 테스트")
+    print("=" * 60)
+
+    from mcp_server.tools import market_data, price_store
+    from mcp_server.tools.analytics import compute_dip_bonus_by_prices
+    from mcp_server.tools.price_panel import PricePanel, momentum_from_close
+
+    single_calls, bulk_calls = [], []
+    fetch = _fake_fetcher(single_calls)
+
+    def bulk(tickers, start, end, market=None):
+        bulk_calls.append(tuple(tickers))
+        return {t: fetch(t, start, end) for t in tickers}
+
+    saved = (price_store._price_store, market_data._fetch_prices_upstream, market_data._fetch_prices_upstream_bulk)
+    price_store._price_store = PriceStore(root=tempfile.mkdtemp())
+    market_data._fetch_prices_upstream = lambda t, s, e, interval="1d", market=None: fetch(t, s, e)
+    market_data._fetch_prices_upstream_bulk = bulk
+    try:
+        tickers = ["AAA", "BBB", "CCC"]
+        panel = PricePanel(period="1y").load(tickers)
+        single_calls.clear()
+        for t in tickers:
+            mom = panel.momentum(t)
+            vol = panel.volatility(t)
+            dip = panel.dip_bonus(t)
+            hist = market_data.get_price_history(t, period="1y")
+            assert mom == momentum_from_close(hist["Close"])
+            assert vol is not None and vol >= 0
+            assert dip == compute_dip_bonus_by_prices(t)
+        stats = panel.stats()
+        print(f"패널 계측: {stats}")
+        assert len(bulk_calls) == 1 and not single_calls
+        assert stats["panel_reads"] == 9 and stats["price_loads"] == 1
+        assert stats["panel_reuse"] == 8 and stats["store_upstream_fetches"] == 1, "bulk 1회, 개별 조회 없음"
+    finally:
+        price_store._price_store, market_data._fetch_prices_upstream, market_data._fetch_prices_upstream_bulk = saved
+    print("✅ PASS: 배치 1회 조회로 모든 지표 계산")
+
+
+def main():
+    for test in (test_gap_only_fetch, test_failed_fetch_not_covered, test_rebase_on_adjustment_change, test_bulk_grouping, test_period_to_start,
+                 test_price_panel_shared):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
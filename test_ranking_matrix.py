@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""벡터화 랭킹 코어 테스트: 행렬 정규화 결과가 기존 리스트 버전과 동일한지 + 대량 종목 속도"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from mcp_server.tools.ranking_engine import (
+    FACTORS,
+    HIGHER_IS_BETTER,
+    AdvancedRankingEngine,
+    FactorMatrix,
+    FactorScores,
+    zscore_normalize,
+    zscore_normalize_by_group,
+    zscore_normalize_matrix,
+    zscore_normalize_matrix_by_group,
+)
+
+SECTORS = ["Technology", "Energy", "Utilities", None, "Healthcare"]
+
+
+def _random_factors(n, seed=7):
+    rng = np.random.default_rng(seed)
+    factors = []
+    for i in range(n):
+        vals = {}
+        for name in FACTORS:
+            v = float(rng.normal(0, 1) * (50 if name == "valuation" else 1))
+            vals[name] = None if rng.random() < 0.1 else v
+        factors.append(FactorScores(
+            ticker=f"T{i:04d}", sector=SECTORS[i % len(SECTORS)], raw_metrics={"eventScore": 0.5}, **vals
+        ))
+    return factors
+
+
+def test_matrix_matches_list_version():
+    """행렬 정규화 = 기존 zscore_normalize (섹터 중립 포함)"""
+    print("\n" + "=" * 60)
+    print("1. 행렬 정규화 동등성 테스트")
+    print("=" * 60)
+
+    factors = _random_factors(60)
+    matrix = FactorMatrix.from_factors(factors)
+    for by_group in (False, True):
+        if by_group:
+            got = zscore_normalize_matrix_by_group(matrix.values, matrix.sectors, higher_is_better=HIGHER_IS_BETTER)
+        else:
+            got = zscore_normalize_matrix(matrix.values, higher_is_better=HIGHER_IS_BETTER)
+        for j, name in enumerate(FACTORS):
+            raw = [getattr(f, name) for f in factors]
+            if by_group:
+                expected = zscore_normalize_by_group(raw, matrix.sectors, higher_is_better=bool(HIGHER_IS_BETTER[j]))
+            else:
+                expected = zscore_normalize(raw, higher_is_better=bool(HIGHER_IS_BETTER[j]))
+            assert np.allclose(got[:, j], expected, atol=1e-4), name
+
+    # 결측 1개 이하 / 분산 0 인 팩터는 0.5
+    edge = zscore_normalize_matrix(np.array([[1.0, np.nan], [1.0, 2.0], [1.0, np.nan]]))
+    assert np.all(edge == 0.5)
+    print("✅ PASS: 리스트 버전과 동일한 점수")
+
+
+def test_rank_matrix_scoring():
+    """가중 점수/정렬이 섹터 가중치와 일치"""
+    print("\n" + "=" * 60)
+    print("2. rank_matrix 스코어링 테스트")
+    print("=" * 60)
+
+    engine = AdvancedRankingEngine()
+    engine.market_condition = "bull"
+    factors = _random_factors(25)
+    matrix = FactorMatrix.from_factors(factors)
+    dip = np.linspace(0, 1, 25)
+    ranked = engine.rank_matrix(matrix, sector_neutral=True, dip_bonus=dip, dip_weight=0.1)
+    results = engine._to_results(matrix, ranked)
+
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+    for r in results:
+        w = engine.get_weights(r["sector"])
+        base = sum(r[name] * w[name] for name in FACTORS)
+        assert abs(r["base_score"] - round(base, 4)) <= 1e-4
+        assert r["weights_applied"] == w
+        assert r["eventScore"] == 0.5
+    print("✅ PASS: 섹터/시장 가중치 반영 및 정렬")
+
+
+def test_rank_matrix_speed():
+    """대량 종목(전체 KRX 규모) 랭킹 속도"""
+    print("\n" + "=" * 60)
+    print("3. 대량 종목 랭킹 속도 테스트")
+    print("=" * 60)
+
+    engine = AdvancedRankingEngine()
+    factors = _random_factors(3000)
+    matrix = FactorMatrix.from_factors(factors)
+
+    start = time.perf_counter()
+    engine.rank_matrix(matrix, sector_neutral=True)
+    elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sectors = [f.sector for f in factors]
+    for j, name in enumerate(FACTORS):
+        zscore_normalize_by_group([getattr(f, name) for f in factors], sectors, higher_is_better=bool(HIGHER_IS_BETTER[j]))
+    for s in sectors:
+        engine.get_weights(s)
+    legacy = time.perf_counter() - start
+
+    print(f"rank_matrix: {elapsed * 1000:.1f}ms, 리스트 버전: {legacy * 1000:.1f}ms")
+    assert elapsed < 0.5
+    print("✅ PASS: 3000 종목 랭킹")
+
+
+def main():
+    for test in (test_matrix_matches_list_version, test_rank_matrix_scoring, test_rank_matrix_speed):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
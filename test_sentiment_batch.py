@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""여러 종목 LLM 감성 배치 테스트: 토큰 예산 묶음, 종목별 응답 분리, 파싱 실패/누락 시 종목별 대체 (네트워크 불필요)"""
+
+import sys
+import os
+import re
+import random
+import string
+from json import dumps
+import threading
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools import llm_cache as lc
+from mcp_server.tools import news_sentiment as ns
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, cache_manager
+
+TICKERS = [f"T{i:02d}" for i in range(20)]
+
+
+def _news(ticker):
+    mood = "surge beats expectations" if int(ticker[1:]) % 2 else "plunge misses estimates"
+    return [{"title": f"{ticker} shares {mood} #{j}", "snippet": f"{ticker} quarterly update {j} " * 3,
+             "date": "2026-10-15"} for j in range(10)]
+
+
+def _score(ticker):
+    return 0.5 if int(ticker[1:]) % 2 else -0.5
+
+
+class _FakeGemma:
+    """Gemini generateContent 대역 - 배치/단건 프롬프트 구분, 응답 손상 옵션"""
+
+    def __init__(self):
+        self.prompts = []
+        self.lock = threading.Lock()
+        self.drop = set()       # 배치 응답에서 빼먹을 종목
+        self.garbage = False    # 배치 응답을 JSON 이 아닌 문장으로
+
+    def post(self, url, json=None, timeout=None):
+        prompt = json["contents"][0]["parts"][0]["text"]
+        with self.lock:
+            self.prompts.append(prompt)
+        batch = re.findall(r"^### (\S+)$", prompt, flags=re.M)
+        if batch:
+            if self.garbage:
+                text = "Sorry, here is a prose answer instead of JSON."
+            else:
+                text = dumps({t: {"overall_sentiment": "bullish" if _score(t) > 0 else "bearish",
+                                  "sentiment_score": _score(t), "key_themes": [], "summary": t,
+                                  "confidence": 0.8}
+                              for t in batch if t not in self.drop})
+        else:
+            ticker = re.search(r"- (T\d\d) shares", prompt).group(1)
+            text = dumps({"overall_sentiment": "neutral", "sentiment_score": _score(ticker) / 2,
+                          "key_themes": [], "summary": "single", "confidence": 0.5})
+
+        class Resp:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+        return Resp()
+
+    @property
+    def batch_calls(self):
+        return sum(1 for p in self.prompts if "### " in p)
+
+    def __enter__(self):
+        self.saved = (ns.http_post, ns._fetch_ticker_news, lc._stats, cache_manager.cache, cache_manager.l1)
+        ns.http_post = self.post
+        ns._fetch_ticker_news = lambda ticker, lookback_days: _news(ticker)
+        lc._stats = lc.LLMCacheStats()
+        cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+        return self
+
+    def __exit__(self, *exc):
+        ns.http_post, ns._fetch_ticker_news, lc._stats, cache_manager.cache, cache_manager.l1 = self.saved
+        return False
+
+
+def test_compare_twenty_tickers_in_batches():
+    """20종목 비교는 토큰 예산 안에서 2~3회 호출, 종목별 점수로 분리"""
+    print("\n" + "=" * 60)
+    print("1. 20종목 배치 감성 테스트")
+    print("=" * 60)
+
+    with _FakeGemma() as fake:
+        out = ns.compare_tickers_sentiment(TICKERS, use_llm=True)
+        print(f"LLM calls for {len(TICKERS)} tickers: {len(fake.prompts)} (batched={fake.batch_calls})")
+        assert 2 <= len(fake.prompts) <= 3 and fake.batch_calls == len(fake.prompts)
+        rows = {r["ticker"]: r for r in out["tickers"]}
+        assert set(rows) == set(TICKERS)
+        assert all(rows[t]["llm_score"] == _score(t) for t in TICKERS)
+        assert rows["T01"]["llm_sentiment"] == "bullish" and rows["T00"]["llm_sentiment"] == "bearish"
+
+        # 종목별 결과는 analyze_ticker_news 캐시를 공유
+        single = ns.analyze_ticker_news("T03", use_llm=True)
+        assert single["llm_analysis"]["batch_size"] >= 2 and len(fake.prompts) <= 3
+
+        batches = ns.plan_sentiment_batches({t: _news(t) for t in TICKERS}, token_budget=1500, max_tickers=10)
+        assert sum(batches, []) == TICKERS and len(batches) > 2, "예산이 작으면 더 잘게 묶음"
+    print("✅ PASS: 배치 호출 + 종목별 분리")
+
+
+def test_fallback_per_ticker():
+    """응답에서 빠진 종목만, 파싱 실패 시 배치 전체를 종목별 호출로 대체"""
+    print("\n" + "=" * 60)
+    print("2. 종목별 대체 호출 테스트")
+    print("=" * 60)
+
+    news = {t: _news(t) for t in TICKERS[:6]}
+    with _FakeGemma() as fake:
+        fake.drop = {"T02"}
+        results = ns.analyze_with_llm_many(news)
+        assert list(results) == TICKERS[:6]
+        assert fake.batch_calls == 1 and len(fake.prompts) == 2, "누락된 T02 만 단건 호출"
+        assert results["T02"]["summary"] == "single" and "batch_size" not in results["T02"]
+        assert results["T01"]["batch_size"] == 6
+
+    with _FakeGemma() as fake:
+        fake.garbage = True
+        results = ns.analyze_with_llm_many(news)
+        assert fake.batch_calls == 1 and len(fake.prompts) == 1 + 6
+        assert all(r["summary"] == "single" for r in results.values())
+        assert lc.get_llm_cache_stats()["upstream_calls"] == 7, "파싱 실패한 배치 응답은 캐시하지 않음"
+
+    with _FakeGemma() as fake:
+        assert ns.analyze_with_llm_many({"T05": _news("T05"), "EMPTY": []}) == \
+            {"T05": ns.analyze_with_llm(_news("T05"))}
+        assert fake.batch_calls == 0, "종목 1개는 단건 프롬프트"
+    print("✅ PASS: 종목별 대체")
+
+
+def test_same_prompt_as_single_path():
+    """배치 경로와 analyze_news_sentiment(use_llm=True) 가 같은 순서(영향도순) 뉴스로 같은 프롬프트/캐시 키"""
+    print("\n" + "=" * 60)
+    print("3. 단건/배치 프롬프트 일치 테스트")
+    print("=" * 60)
+
+    rng = random.Random(3)
+    news = []
+    for j in range(15):   # 영향도 큰 뉴스가 뒤쪽 - 입력 순서 상위 10건과 영향도순 상위 10건이 다름
+        tail = " ".join("".join(rng.choice(string.ascii_lowercase) for _ in range(6)) for _ in range(6))
+        news.append({"title": f"T05 shares {'surge beats' if j >= 10 else 'notice'} {tail}", "snippet": tail,
+                     "date": "2026-10-15"})
+
+    with _FakeGemma() as fake:
+        ns._fetch_ticker_news = lambda ticker, lookback_days: news
+        batched = ns.analyze_tickers_news(["T05"], use_llm=True)["T05"]
+        single = ns.analyze_news_sentiment(news, use_llm=True)
+        print(f"prompts: {len(fake.prompts)}, llm cache: {lc.get_llm_cache_stats()}")
+        assert len(fake.prompts) == 1 and lc.get_llm_cache_stats()["upstream_calls"] == 1, "두 번째는 응답 캐시 적중"
+        assert single["llm_analysis"] == batched["llm_analysis"]
+        assert "surge beats" in fake.prompts[0].split("News:")[1].splitlines()[1]
+    print("✅ PASS: 같은 뉴스 순서 → 같은 프롬프트")
+
+
+def main():
+    for test in (test_compare_twenty_tickers_in_batches, test_fallback_per_ticker, test_same_prompt_as_single_path):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
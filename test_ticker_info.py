@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""TickerInfo 공유 테스트: 여러 모듈이 읽어도 .info/재무제표/옵션은 종목당 1회 조회 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import financial_factors as ff
+from mcp_server.tools import market_data as md
+from mcp_server.tools import portfolio_manager as pm
+from mcp_server.tools import ticker_info as ti
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, cache_manager
+from mcp_server.tools.financial_factors import FinancialFactors
+from mcp_server.tools.sentiment_analysis import SentimentFactors
+
+INFO = {
+    "returnOnEquity": 0.3, "returnOnAssets": 0.12, "debtToEquity": 150.0, "currentRatio": 1.1,
+    "dividendYield": 0.005, "payoutRatio": 0.15, "revenueGrowth": 0.08, "earningsGrowth": 0.1,
+    "shortRatio": 1.5, "recommendationMean": 2.0, "targetMeanPrice": 220.0, "currentPrice": 200.0,
+    "sector": "Technology", "industry": "Consumer Electronics", "shortName": "Fake Inc.",
+    "trailingPE": 30.0, "priceToBook": 40.0,
+}
+
+
+def _statement(rows):
+    cols = pd.to_datetime(["2025-09-30", "2024-09-30"])
+    return pd.DataFrame({c: [v * (1 - 0.1 * i) for v in rows.values()] for i, c in enumerate(cols)}, index=list(rows))
+
+
+class _FakeTicker:
+    """yf.Ticker 대역 - 속성 조회 횟수 기록"""
+    fetched = Counter()
+    lock = threading.Lock()
+    fail_info = 0
+    blank = 0   # 차단 시 yfinance 처럼 빈 .info / 빈 재무제표를 돌려줄 횟수
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def _hit(self, name):
+        with self.lock:
+            self.fetched[(self.symbol, name)] += 1
+        time.sleep(0.01)
+
+    @property
+    def info(self):
+        self._hit("info")
+        if _FakeTicker.fail_info:
+            _FakeTicker.fail_info -= 1
+            raise ConnectionError("scrape blocked")
+        if _FakeTicker.blank:
+            _FakeTicker.blank -= 1
+            return None
+        return dict(INFO)
+
+    @property
+    def financials(self):
+        self._hit("financials")
+        if _FakeTicker.blank:
+            _FakeTicker.blank -= 1
+            return pd.DataFrame()
+        return _statement({"Total Revenue": 4e11, "Operating Income": 1.2e11, "Net Income": 1e11})
+
+    @property
+    def balance_sheet(self):
+        self._hit("balance_sheet")
+        return _statement({"Total Assets": 3.5e11, "Stockholders Equity": 6e10, "Total Debt": 1e11})
+
+    @property
+    def cashflow(self):
+        self._hit("cashflow")
+        return _statement({"Free Cash Flow": 1e11})
+
+    @property
+    def dividends(self):
+        self._hit("dividends")
+        idx = pd.date_range("2024-02-01", periods=8, freq="QS", tz="America/New_York")
+        return pd.Series(np.linspace(0.24, 0.26, 8), index=idx)
+
+    @property
+    def options(self):
+        self._hit("options")
+        return ("2026-11-20", "2026-12-18")
+
+    def option_chain(self, expiry):
+        self._hit(f"option_chain:{expiry}")
+        chain = type("Chain", (), {})()
+        chain.calls = pd.DataFrame({"volume": [100.0, 50.0]})
+        chain.puts = pd.DataFrame({"volume": [60.0, 15.0]})
+        return chain
+
+    @property
+    def fast_info(self):
+        return None
+
+
+class _Patched:
+    def __enter__(self):
+        _FakeTicker.fetched.clear()
+        self.saved = (ti._ticker, md.yf.Ticker, ff._edgar_financials, cache_manager.cache, cache_manager.l1)
+        ti._ticker = _FakeTicker
+        md.yf.Ticker = _FakeTicker
+        ff._edgar_financials = lambda ticker: {}
+        cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+        return self
+
+    def __exit__(self, *exc):
+        ti._ticker, md.yf.Ticker, ff._edgar_financials, cache_manager.cache, cache_manager.l1 = self.saved
+        return False
+
+
+def test_one_fetch_per_field():
+    """재무/감성/포트폴리오/펀더멘털 스냅샷이 같은 종목의 속성을 한 번만 조회"""
+    print("\n" + "=" * 60)
+    print("1. 종목당 속성 1회 조회 테스트")
+    print("=" * 60)
+
+    with _Patched():
+        financial = FinancialFactors.calculate_all("FAKE")
+        market = SentimentFactors.calculate_market_sentiment("FAKE", market_vix=20.0)
+        analyst = SentimentFactors.analyze_analyst_opinion("FAKE")
+        filings = SentimentFactors.analyze_filings("FAKE")
+        info = pm._get_ticker_info("FAKE")
+        snapshot = md.get_fundamentals_snapshot.__wrapped__("FAKE")
+
+        fetched = dict(_FakeTicker.fetched)
+        print(f"upstream fetches: {fetched}")
+        assert all(n == 1 for n in fetched.values()), fetched
+        assert {"info", "financials", "balance_sheet", "cashflow", "dividends", "options"} <= {f for _, f in fetched}
+
+        assert financial["ROE"] == 0.3 and financial["Debt_to_Equity"] == 1.5
+        assert np.isclose(market["Put_Call_Ratio"], 0.5) and market["Market_VIX"] == 20.0
+        assert analyst["Analyst_Rating"] == 4.0 and np.isclose(analyst["Target_Price_Upside"], 10.0)
+        assert filings["Filing_Frequency"] == 4.0
+        assert info["sector"] == "Technology" and info["name"] == "Fake Inc."
+        assert snapshot["pe"] == 30.0 and snapshot["freeCashFlow"] == 1e11
+
+        # 다른 종목은 따로 조회
+        ti.get_ticker_info("OTHER").info
+        assert _FakeTicker.fetched[("OTHER", "info")] == 1
+    print("✅ PASS: 속성별 1회 조회")
+
+
+def test_concurrent_and_failures():
+    """동시 조회는 한 번으로 합치고, 실패/빈 응답은 캐시하지 않음"""
+    print("\n" + "=" * 60)
+    print("2. 동시 조회 / 실패 처리 테스트")
+    print("=" * 60)
+
+    with _Patched():
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            infos = list(pool.map(lambda _: ti.get_ticker_info("CONC").info, range(16)))
+        assert _FakeTicker.fetched[("CONC", "info")] == 1 and all(i == INFO for i in infos)
+
+        _FakeTicker.fail_info = 1
+        try:
+            ti.get_ticker_info("FLAKY").info
+            raise AssertionError("first fetch should raise")
+        except ConnectionError:
+            pass
+        assert ti.get_ticker_info("FLAKY").info == INFO, "실패 후 재시도"
+        assert _FakeTicker.fetched[("FLAKY", "info")] == 2
+
+        _FakeTicker.blank = 2
+        blocked = ti.get_ticker_info("BLANK")
+        assert blocked.info == {} and blocked.financials.empty, "빈 응답은 yf.Ticker 와 같은 타입"
+        assert ti.get_ticker_info("BLANK").info == INFO, "빈 .info 는 캐시하지 않고 재조회"
+        assert not ti.get_ticker_info("BLANK").financials.empty, "빈 재무제표도 재조회"
+        assert _FakeTicker.fetched[("BLANK", "info")] == 2 and _FakeTicker.fetched[("BLANK", "financials")] == 2
+
+        view = ti.get_ticker_info("CONC")
+        view.info["sector"] = "Mutated"
+        assert ti.get_ticker_info("CONC").info["sector"] == "Technology", "캐시 값은 호출자 간 격리"
+        assert list(view.option_chain().puts["volume"]) == [60.0, 15.0]
+        assert _FakeTicker.fetched[("CONC", "option_chain:2026-11-20")] == 1
+    print("✅ PASS: single-flight + 실패 재시도")
+
+
+def main():
+    for test in (test_one_fetch_per_field, test_concurrent_and_failures):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
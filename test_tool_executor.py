@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""툴 실행 계층 테스트: 블로킹 툴이 이벤트 루프를 막지 않는지 + 툴별 동시 실행 제한"""
+
+import sys
+import os
+import time
+import asyncio
+sys.path.insert(0, os.path.dirname(__file__))
+
+from mcp_server.tools.tool_executor import ToolExecutor, parse_limits
+
+
+async def _blocking_tool(seconds: float) -> float:
+    time.sleep(seconds)  # async 툴 안의 동기 호출 (yfinance 등)
+    return seconds
+
+
+def test_event_loop_not_blocked():
+    """블로킹 툴 실행 중에도 이벤트 루프가 다른 작업을 처리"""
+    print("\n" + "=" * 60)
+    print("1. 이벤트 루프 응답성 테스트")
+    print("=" * 60)
+
+    executor = ToolExecutor(max_workers=4, default_limit=4)
+    tool = executor.wrap(_blocking_tool, "slow")
+
+    async def main():
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        hb = asyncio.create_task(heartbeat())
+        start = time.perf_counter()
+        results = await asyncio.gather(*(tool(0.2) for _ in range(4)))
+        elapsed = time.perf_counter() - start
+        hb.cancel()
+        return results, elapsed, ticks
+
+    results, elapsed, ticks = asyncio.run(main())
+    executor.shutdown()
+    print(f"결과: {results}, 소요: {elapsed:.2f}s, heartbeat: {ticks}")
+    assert results == [0.2] * 4
+    assert elapsed < 0.6, "4개 툴이 병렬로 실행되어야 함"
+    assert ticks >= 5, "툴 실행 중 이벤트 루프가 멈추면 안 됨"
+    print("✅ PASS: 블로킹 툴 병렬 실행, 이벤트 루프 응답 유지")
+
+
+def test_per_tool_limit_and_metrics():
+    """툴별 동시 실행 한도 + 대기열 메트릭"""
+    print("\n" + "=" * 60)
+    print("2. 툴별 동시 실행 제한 테스트")
+    print("=" * 60)
+
+    executor = ToolExecutor(max_workers=8, default_limit=8, limits={"heavy": 1})
+    running, peak = 0, 0
+
+    def heavy():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        time.sleep(0.05)
+        running -= 1
+
+    def broken():
+        raise ValueError("boom")
+
+    async def main():
+        await asyncio.gather(*(executor.run("heavy", heavy) for _ in range(3)))
+        try:
+            await executor.run("broken", broken)
+        except ValueError:
+            pass
+
+    asyncio.run(main())
+    stats = executor.stats()
+    executor.shutdown()
+    heavy_stats = stats["tools"]["heavy"]
+    print(f"heavy: {heavy_stats}")
+    assert peak == 1
+    assert heavy_stats["limit"] == 1 and heavy_stats["completed"] == 3
+    assert heavy_stats["max_waiting"] == 2 and heavy_stats["waiting"] == 0
+    assert stats["tools"]["broken"]["failed"] == 1
+    assert stats["pool_queued"] == 0 and stats["pool_busy"] == 0
+    assert parse_limits("a=2, b = 3,bad,c=x") == {"a": 2, "b": 3}
+    print("✅ PASS: 한도 적용 및 메트릭 집계")
+
+
+def main():
+    for test in (test_event_loop_not_blocked, test_per_tool_limit_and_metrics):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
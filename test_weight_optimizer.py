@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""가중치 탐색 테스트: 패널 재사용 결과가 후보별 백테스트와 동일한지 + 탐색 방식/속도 (네트워크 불필요)"""
+
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+import pandas as pd
+
+from mcp_server.tools import weight_optimizer
+from mcp_server.tools.backtest_engine import BacktestEngine
+from mcp_server.tools.cache_backends import MemoryBackend
+from mcp_server.tools.cache_manager import L1Cache, TTL, cache_manager
+from mcp_server.tools.backtest_vectorized import build_factor_panel, run_vectorized_backtest
+from mcp_server.tools.weight_optimizer import evaluate_candidates, optimize, random_weights
+
+FIN_FACTORS = {'ROE': 0.18, 'Debt_to_Equity': 0.9, 'Current_Ratio': 1.6, 'Revenue_Growth': 0.12}
+
+
+def _synthetic_prices(years=6, seed=11):
+    rng = np.random.default_rng(seed)
+    idx = pd.bdate_range("2018-01-02", periods=252 * years)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.018, len(idx))))
+    spread = np.abs(rng.normal(0, 0.01, len(idx))) * close
+    return pd.DataFrame({
+        "Open": close, "High": close + spread, "Low": close - spread, "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, len(idx)).astype(float),
+    }, index=idx)
+
+
+def test_grid_matches_full_backtest():
+    """grid 탐색 최적 후보 = 후보별 백테스트 최고 수익률"""
+    print("\n" + "=" * 60)
+    print("1. grid 탐색 동등성 테스트")
+    print("=" * 60)
+
+    prices = _synthetic_prices()
+    panel = build_factor_panel(prices, "TEST", "US", 10, fin_factors=FIN_FACTORS)
+    candidates = random_weights(60, seed=1)
+
+    best = optimize(prices, "TEST", "US", candidates, 10, search="grid", buy_threshold=56, sell_threshold=52, panel=panel)
+    totals = []
+    for w in candidates:
+        r = run_vectorized_backtest(prices, "TEST", "US", w, 10, 56, 52, panel=panel)
+        totals.append((r['final_value'] - 10000.0) / 10000.0 * 100)
+    expected = int(np.argmax(totals))
+    print(f"best return: {best['total_return']:.2f}%, evaluations: {best['search']['evaluations']}")
+    assert best['weights'] == candidates[expected]
+    assert np.isclose(best['total_return'], totals[expected])
+    assert len(set(np.round(totals, 6))) > 1, "후보별 수익률이 달라야 의미 있는 탐색"
+    print("✅ PASS: 후보별 백테스트와 같은 최적 가중치")
+
+
+def test_random_halving_and_early_stop():
+    """random 추출 수, 조기 종료, successive halving 단계"""
+    print("\n" + "=" * 60)
+    print("2. random / halving / 조기 종료 테스트")
+    print("=" * 60)
+
+    prices = _synthetic_prices()
+    panel = build_factor_panel(prices, "TEST", "US", 10, fin_factors=FIN_FACTORS)
+    candidates = random_weights(300, seed=2)
+
+    rnd = optimize(prices, "TEST", "US", candidates, 10, search="random", n_samples=80, seed=3,
+                   buy_threshold=56, sell_threshold=52, panel=panel)
+    assert rnd['search']['candidates'] == 80 and rnd['search']['evaluations'] == 80
+
+    early = optimize(prices, "TEST", "US", candidates, 10, search="grid", patience=1, min_delta=1e9,
+                     batch_size=20, buy_threshold=56, sell_threshold=52, panel=panel)
+    assert early['search']['stopped_early'] and early['search']['evaluations'] == 40
+
+    halving = optimize(prices, "TEST", "US", candidates, 10, search="halving", eta=3,
+                       buy_threshold=56, sell_threshold=52, panel=panel)
+    rungs = halving['search']['rungs']
+    print(f"halving rungs: {rungs}, evaluations: {halving['search']['evaluations']}")
+    assert rungs[0]['candidates'] == 300 and rungs[-1]['rebalances'] == len(panel.dates)
+    assert [r['candidates'] for r in rungs] == sorted((r['candidates'] for r in rungs), reverse=True)
+    assert halving['search']['evaluations'] < 2 * 300
+    grid = optimize(prices, "TEST", "US", candidates, 10, buy_threshold=56, sell_threshold=52, panel=panel)
+    assert halving['total_return'] <= grid['total_return'] + 1e-9
+    print("✅ PASS: 탐색 방식별 평가 수")
+
+
+def test_batched_evaluation():
+    """500 후보 grid 탐색: 배치별 평가 결과 = 한 번에 평가, 평가 수/배치 수 (소요 시간은 출력만)"""
+    print("\n" + "=" * 60)
+    print("3. 500 후보 배치 평가 테스트")
+    print("=" * 60)
+
+    prices = _synthetic_prices()
+    panel = build_factor_panel(prices, "TEST", "US", 5, fin_factors=FIN_FACTORS)
+    candidates = random_weights(500, seed=4)
+    final_price = float(prices['Close'].iloc[-1])
+    expected = evaluate_candidates(panel, candidates, final_price, 56, 52, 10000.0)
+
+    batches = []
+    original = weight_optimizer.evaluate_candidates
+
+    def counting(panel, batch, *args):
+        batches.append(len(batch))
+        return original(panel, batch, *args)
+
+    weight_optimizer.evaluate_candidates = counting
+    try:
+        start = time.perf_counter()
+        best = optimize(prices, "TEST", "US", candidates, 5, buy_threshold=56, sell_threshold=52, panel=panel)
+        elapsed = time.perf_counter() - start
+    finally:
+        weight_optimizer.evaluate_candidates = original
+    print(f"500 candidates / {len(panel.dates)} rebalances: {elapsed:.3f}s, batches={len(batches)}")
+    assert best['search']['evaluations'] == 500 and batches == [50] * 10
+    i = int(np.argmax(expected))
+    assert best['weights'] == candidates[i] and np.isclose(best['total_return'], expected[i])
+    print("✅ PASS: 배치 평가 = 전체 평가, 후보당 1회")
+
+
+def test_load_panel_cache():
+    """가격/팩터 패널은 일봉 TTL 캐시 (만료 시 재조회), 호출자별 가격 사본"""
+    print("\n" + "=" * 60)
+    print("4. 패널 캐시 테스트")
+    print("=" * 60)
+
+    loads = []
+
+    def fake_load(ticker, start_date, end_date, market):
+        loads.append(ticker)
+        return _synthetic_prices(years=2)
+
+    saved = (BacktestEngine._load_prices, weight_optimizer.build_factor_panel, cache_manager.cache, cache_manager.l1)
+    BacktestEngine._load_prices = staticmethod(fake_load)
+    weight_optimizer.build_factor_panel = lambda p, t, m, r: build_factor_panel(p, t, m, r, fin_factors=FIN_FACTORS)
+    cache_manager.cache, cache_manager.l1 = MemoryBackend(), L1Cache()
+    try:
+        prices, panel = weight_optimizer.load_panel("TEST", "US", "2018-01-01", "2020-01-01", 10)
+        prices.iloc[0, 0] = -1.0
+        again, panel2 = weight_optimizer.load_panel("TEST", "US", "2018-01-01", "2020-01-01", 10)
+        assert loads == ["TEST"] and again.iloc[0, 0] > 0, "재사용하되 호출자 수정은 캐시에 반영되지 않음"
+        assert np.array_equal(panel.prices, panel2.prices)
+
+        key = cache_manager._make_key("optimizer_panel", "TEST", "US", "2018-01-01", "2020-01-01", 10)
+        _, expire_at = cache_manager.cache.get(key, None, expire_time=True)
+        assert expire_at is not None and expire_at - time.time() <= TTL.DAILY, "만료 없는 lru_cache 가 아님"
+        cache_manager.delete(key)
+        weight_optimizer.load_panel("TEST", "US", "2018-01-01", "2020-01-01", 10)
+        assert loads == ["TEST", "TEST"]
+    finally:
+        BacktestEngine._load_prices, weight_optimizer.build_factor_panel, cache_manager.cache, cache_manager.l1 = saved
+    print("✅ PASS: 패널 캐시")
+
+
+def main():
+    for test in (test_grid_matches_full_backtest, test_random_halving_and_early_stop, test_batched_evaluation,
+                 test_load_panel_cache):
+        test()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())